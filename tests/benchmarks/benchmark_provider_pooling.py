@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+Benchmarking script for pooled provider HTTP sessions.
+
+This script starts a local stub server that speaks the Ollama chat API and
+measures per-request latency and throughput of many concurrent agents,
+comparing a bare requests.post per generation with the provider's pooled
+synchronous and native async clients.
+"""
+
+import sys
+import time
+import json
+import asyncio
+import argparse
+import multiprocessing
+import statistics
+import concurrent.futures
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Callable
+
+import requests
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from triangulum_lx.providers.http_pool import PoolLimits
+from triangulum_lx.providers.local import OllamaProvider
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded server with a listen backlog large enough for a connection storm."""
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    """Answers every chat request with a fixed response after a short delay."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    delay = 0.005
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(self.delay)
+        body = json.dumps({"message": {"content": "ok"}, "eval_count": 1}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port_queue: multiprocessing.Queue, delay: float):
+    """Run the stub server; lives in its own process so it does not compete for the GIL."""
+    StubOllamaHandler.delay = delay
+    server = StubServer(("127.0.0.1", 0), StubOllamaHandler)
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+def summarize(name: str, latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Compute latency percentiles and throughput for one run."""
+    latencies = sorted(latencies)
+    result = {
+        "mode": name,
+        "requests": len(latencies),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "throughput_rps": len(latencies) / elapsed,
+    }
+    print(f"{name:>10}: p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms  "
+          f"{result['throughput_rps']:8.1f} req/s")
+    return result
+
+
+def run_threaded(name: str, call: Callable[[], None], agents: int, requests_per_agent: int) -> Dict[str, float]:
+    """Run ``agents`` threads that each issue ``requests_per_agent`` calls."""
+    def agent() -> List[float]:
+        latencies = []
+        for _ in range(requests_per_agent):
+            start = time.perf_counter()
+            call()
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=agents) as executor:
+        results = list(executor.map(lambda _: agent(), range(agents)))
+    elapsed = time.perf_counter() - start
+    return summarize(name, [latency for result in results for latency in result], elapsed)
+
+
+def run_async(provider: OllamaProvider, agents: int, requests_per_agent: int) -> Dict[str, float]:
+    """Run ``agents`` coroutines on one event loop using generate_async."""
+    async def agent() -> List[float]:
+        latencies = []
+        for _ in range(requests_per_agent):
+            start = time.perf_counter()
+            await provider.generate_async("ping")
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    async def main():
+        start = time.perf_counter()
+        results = await asyncio.gather(*[agent() for _ in range(agents)])
+        elapsed = time.perf_counter() - start
+        await provider.ashutdown()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(main())
+    return summarize("async", [latency for result in results for latency in result], elapsed)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark pooled provider HTTP sessions against a local stub server"
+    )
+    parser.add_argument(
+        "--agents",
+        type=int,
+        default=64,
+        help="Number of concurrent agents"
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=20,
+        help="Requests issued by each agent"
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=0.005,
+        help="Simulated server processing time in seconds"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Optional path of a JSON file for the results"
+    )
+    args = parser.parse_args()
+
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(port_queue, args.delay), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{port_queue.get(timeout=10)}"
+
+    limits = PoolLimits(max_connections=args.agents, max_keepalive_connections=args.agents)
+    payload = {"model": "stub", "messages": [{"role": "user", "content": "ping"}], "stream": False}
+
+    print(f"{args.agents} agents x {args.requests} requests against {base_url}")
+    results = []
+    try:
+        results.append(run_threaded(
+            "bare",
+            lambda: requests.post(f"{base_url}/api/chat", json=payload).json(),
+            args.agents, args.requests
+        ))
+
+        provider = OllamaProvider(base_url=base_url, model="stub", pool_limits=limits)
+        results.append(run_threaded("pooled", lambda: provider.generate("ping"), args.agents, args.requests))
+        provider.shutdown()
+
+        provider = OllamaProvider(base_url=base_url, model="stub", pool_limits=limits)
+        results.append(run_async(provider, args.agents, args.requests))
+    finally:
+        server.terminate()
+        server.join()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Unit tests for journaled thought chain persistence.
+
+These tests verify that adding a thought appends a constant amount of data,
+that load_chains replays journaled thoughts, branches and contexts over the
+snapshots, that compaction empties the journal and that a torn final record
+is ignored.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from triangulum_lx.agents.chain_journal import ChainJournal
+from triangulum_lx.agents.chain_node import ThoughtType, RelationshipType
+from triangulum_lx.agents.thought_chain_manager import ThoughtChainManager
+
+
+class TestChainJournal(unittest.TestCase):
+    """Test case for journaled ThoughtChainManager persistence."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = ThoughtChainManager(storage_dir=self.temp_dir, journal_sync_interval=0)
+        self.chain_id = self.manager.create_chain("session", creator_agent_id="agent")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.manager.close()
+        shutil.rmtree(self.temp_dir)
+
+    def add(self, manager, parent_id=None, **kwargs):
+        return manager.add_thought(
+            self.chain_id, ThoughtType.INFERENCE, {"text": "step"}, "agent",
+            parent_id=parent_id,
+            relationship=RelationshipType.DERIVES_FROM if parent_id else None,
+            **kwargs
+        )
+
+    def reload(self):
+        manager = ThoughtChainManager(storage_dir=self.temp_dir, journal_sync_interval=0)
+        self.assertEqual(manager.load_chains(), 1)
+        return manager
+
+    def test_constant_bytes_per_thought(self):
+        """Test that the snapshot is not rewritten and the journal grows linearly."""
+        journal_path = Path(self.temp_dir) / f"{self.chain_id}.journal"
+        snapshot = (Path(self.temp_dir) / f"{self.chain_id}.json").read_bytes()
+
+        parent_id = self.add(self.manager)
+        sizes = []
+        for _ in range(50):
+            parent_id = self.add(self.manager, parent_id)
+            sizes.append(journal_path.stat().st_size)
+
+        growth = [b - a for a, b in zip(sizes, sizes[1:])]
+        self.assertLess(max(growth) - min(growth), 10)
+        self.assertEqual((Path(self.temp_dir) / f"{self.chain_id}.json").read_bytes(), snapshot)
+
+    def test_replay_restores_thoughts_branches_and_contexts(self):
+        """Test that a new manager sees every journaled change."""
+        context = self.manager.get_chain_contexts(self.chain_id)[0]
+        root_id = self.add(self.manager, context_id=context.context_id)
+        child_id = self.add(self.manager, root_id, context_id=context.context_id)
+        branch_id = self.manager.create_branch(self.chain_id, "alternative")
+        self.add(self.manager, root_id, branch_id=branch_id)
+        self.manager.update_context(context.context_id, state_updates={"phase": "review"})
+
+        manager = self.reload()
+        chain = manager.get_chain(self.chain_id)
+        self.assertEqual(len(chain), 3)
+        self.assertEqual(chain.get_node(child_id).relationships[root_id], RelationshipType.DERIVES_FROM)
+        self.assertEqual(manager.get_branch(branch_id).name, "alternative")
+        self.assertEqual(len(manager.get_branch(branch_id).node_ids), 1)
+        state = manager.get_context(context.context_id).state
+        self.assertEqual(state["latest_thought_id"], child_id)
+        self.assertEqual(state["phase"], "review")
+        self.assertEqual(manager.agents_active_chains["agent"], {self.chain_id})
+
+        # Appending after a reload continues the sequence
+        self.add(manager, child_id)
+        manager.close()
+        self.assertEqual(len(self.reload().get_chain(self.chain_id)), 4)
+
+    def test_compaction_empties_journal(self):
+        """Test that the journal is folded into the snapshot once it is large enough."""
+        self.manager.compaction_min_entries = 10
+        for _ in range(25):
+            self.add(self.manager)
+
+        journal = self.manager._journals[self.chain_id]
+        self.assertEqual(journal.entries, 5)
+        self.assertEqual(len(list(ChainJournal.read(journal.path))), 5)
+        self.assertEqual(len(self.reload().get_chain(self.chain_id)), 25)
+
+    def test_torn_record_is_ignored(self):
+        """Test that a partially written final record does not prevent loading."""
+        self.add(self.manager)
+        self.add(self.manager)
+        self.manager.close()
+        with open(os.path.join(self.temp_dir, f"{self.chain_id}.journal"), "a") as f:
+            f.write('{"seq": 99, "op": "thou')
+
+        self.assertEqual(len(self.reload().get_chain(self.chain_id)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
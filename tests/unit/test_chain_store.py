@@ -0,0 +1,106 @@
+"""
+Unit tests for memory-bounded chain residency.
+
+These tests verify the LRU node cache limits, and that a ThoughtChainManager
+with a memory budget pages cold chains out to disk and transparently pages
+them back in on access.
+"""
+
+import shutil
+import tempfile
+import unittest
+
+from triangulum_lx.agents.chain_node import ThoughtType, RelationshipType
+from triangulum_lx.agents.chain_store import LRUCache
+from triangulum_lx.agents.thought_chain_manager import ThoughtChainManager
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test case for the LRUCache class."""
+
+    def test_evicts_least_recently_used(self):
+        """Test eviction order under the entry and byte limits."""
+        cache = LRUCache(max_entries=3, max_bytes=100)
+        for key in "abc":
+            cache.put(key, key.upper(), 30)
+        self.assertEqual(cache.get("a"), "A")
+
+        cache.put("d", "D", 30)
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.total_bytes, 90)
+
+        cache.put("e", "E", 50)
+        self.assertEqual(sorted(cache._entries), ["d", "e"])
+        self.assertEqual(cache.total_bytes, 80)
+
+        cache.put("huge", "H", 101)
+        self.assertNotIn("huge", cache)
+        self.assertEqual(cache.pop("d"), "D")
+        self.assertEqual(cache.total_bytes, 50)
+
+
+class TestChainPaging(unittest.TestCase):
+    """Test case for paging chains out of a ThoughtChainManager."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = ThoughtChainManager(storage_dir=self.temp_dir, journal_sync_interval=0,
+                                           memory_budget=20000)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.manager.close()
+        shutil.rmtree(self.temp_dir)
+
+    def fill(self, count=10, thoughts=5):
+        chains = {}
+        for i in range(count):
+            chain_id = self.manager.create_chain(f"chain{i}")
+            parent_id = None
+            node_ids = []
+            for j in range(thoughts):
+                parent_id = self.manager.add_thought(
+                    chain_id, ThoughtType.OBSERVATION, {"text": f"thought {j} " * 20}, "agent",
+                    parent_id=parent_id,
+                    relationship=RelationshipType.DERIVES_FROM if parent_id else None
+                )
+                node_ids.append(parent_id)
+            chains[chain_id] = node_ids
+        return chains
+
+    def test_resident_chains_stay_within_budget(self):
+        """Test that cold chains are paged out and paged back in on access."""
+        chains = self.fill()
+        store = self.manager.chains
+        self.assertEqual(len(store), 10)
+        self.assertLessEqual(store.resident_bytes, store.memory_budget)
+        self.assertGreater(store.stats["page_outs"], 0)
+
+        first_id = next(iter(chains))
+        self.assertFalse(store.is_resident(first_id))
+        node = self.manager.get_thought(first_id, chains[first_id][-1])
+        self.assertEqual(node.content["text"], "thought 4 " * 20)
+        self.assertTrue(store.is_resident(first_id))
+        self.assertEqual(len(self.manager.get_chain(first_id)), 5)
+        self.assertLessEqual(store.resident_bytes, store.memory_budget)
+
+    def test_paged_out_chains_accept_thoughts_and_reload(self):
+        """Test that a paged out chain can be extended and is persisted."""
+        chains = self.fill()
+        first_id = next(iter(chains))
+        self.manager.add_thought(first_id, ThoughtType.CONCLUSION, {"text": "done"}, "agent",
+                                 parent_id=chains[first_id][-1],
+                                 relationship=RelationshipType.DERIVES_FROM)
+        self.assertEqual(len(self.manager.search_thoughts("done")), 1)
+        self.manager.close()
+
+        manager = ThoughtChainManager(storage_dir=self.temp_dir, memory_budget=20000)
+        self.assertEqual(manager.load_chains(), 10)
+        self.assertEqual(len(manager.get_chain(first_id)), 6)
+        self.assertEqual(sum(len(manager.get_chain(chain_id)) for chain_id in chains), 51)
+        manager.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
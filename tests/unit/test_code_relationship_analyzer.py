@@ -6,9 +6,10 @@ import os
 import tempfile
 import unittest
 import json
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import patch, MagicMock
 
 from triangulum_lx.tooling.code_relationship_analyzer import CodeRelationshipAnalyzer
+from triangulum_lx.tooling.source_cache import SourceFile
 
 class TestCodeRelationshipAnalyzer(unittest.TestCase):
     """Tests for the CodeRelationshipAnalyzer class."""
@@ -185,9 +186,31 @@ def create_test_class():
             # Clean up the temporary file
             os.unlink(temp_path)
 
-    @patch("builtins.open", new_callable=mock_open, read_data="import os\nimport sys\n")
-    def test_analyze_file_with_mock(self, mock_file):
+    def test_relationships_are_sorted_unique_lists(self):
+        """Test that analysis results are deduplicated and sorted."""
+        relationships = self.analyzer.analyze_directory(self.temp_dir)
+        file1_path = next(path for path in relationships if path.endswith("file1.py"))
+        file2_path = next(path for path in relationships if path.endswith("file2.py"))
+
+        self.assertEqual(relationships[file1_path]["functions"],
+                         ["function1", "function2", "method1", "method2"])
+        self.assertEqual(relationships[file2_path]["imports"], [file1_path])
+        self.assertEqual(relationships[file2_path]["dependencies"], [file1_path])
+        self.assertEqual(relationships[file2_path]["function_calls"], {"function1": 1, "TestClass": 1})
+        self.assertEqual(self.analyzer.function_map["TestClass.method1"], file1_path)
+
+    def test_parallel_analysis_matches_serial(self):
+        """Test that worker processes produce the same relationships."""
+        serial = CodeRelationshipAnalyzer(max_workers=1).analyze_directory(self.temp_dir)
+        parallel = CodeRelationshipAnalyzer(max_workers=2, parallel_threshold=1).analyze_directory(self.temp_dir)
+        self.assertEqual(parallel, serial)
+
+    @patch("triangulum_lx.tooling.code_relationship_analyzer.get_source_cache")
+    def test_analyze_file_with_mock(self, mock_cache):
         """Test analyzing a file with a mock file."""
+        source = SourceFile("mock_file.py", "import os\nimport sys\n", "digest")
+        mock_cache.return_value.read.return_value = source
+
         # Mock ast.parse to return a simple AST
         with patch("ast.parse") as mock_parse:
             # Create a mock AST
@@ -202,8 +225,8 @@ def create_test_class():
             # Analyze a mock file
             self.analyzer._analyze_file("mock_file.py")
             
-            # Check that open was called
-            mock_file.assert_called_once_with("mock_file.py", "r", encoding="utf-8")
+            # Check that the file was read through the source cache
+            mock_cache.return_value.read.assert_called_once_with("mock_file.py")
             
             # Check that ast.parse was called
             mock_parse.assert_called_once()
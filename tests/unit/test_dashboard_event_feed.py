@@ -0,0 +1,181 @@
+"""
+Unit tests for the dashboard event feed.
+
+These tests verify sequence numbering, cursor-based catch-up, snapshot
+compaction of the event log, blocking waits for new events, and that the
+dashboard only holds the feed lock while it publishes.
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import shutil
+import threading
+
+from triangulum_lx.monitoring.dashboard_event_feed import DashboardEventFeed
+from triangulum_lx.monitoring.agentic_dashboard import AgenticDashboard
+
+
+class TestDashboardEventFeed(unittest.TestCase):
+    """Test case for the DashboardEventFeed class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.feed = DashboardEventFeed(self.temp_dir, max_buffered_events=3, snapshot_interval=2)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.feed.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_events_since_cursor(self):
+        """Test that clients only receive events after their cursor."""
+        for i in range(3):
+            self.feed.publish("thought", {"content": f"t{i}"})
+
+        events, needs_reset = self.feed.events_since(1)
+        self.assertFalse(needs_reset)
+        self.assertEqual([e["seq"] for e in events], [2, 3])
+        self.assertEqual(events[0]["data"], {"content": "t1"})
+        self.assertEqual(self.feed.events_since(3), ([], False))
+
+    def test_buffer_keeps_events_newer_than_snapshot(self):
+        """Test that unsnapshotted events are never dropped from the buffer."""
+        for i in range(5):
+            self.feed.publish("message", {"i": i})
+
+        events, needs_reset = self.feed.events_since(0)
+        self.assertFalse(needs_reset)
+        self.assertEqual(len(events), 5)
+
+        self.feed.write_snapshot({"messages": []})
+        self.feed.publish("message", {"i": 5})
+
+        events, needs_reset = self.feed.events_since(0)
+        self.assertTrue(needs_reset)
+        events, needs_reset = self.feed.events_since(self.feed.snapshot_sequence)
+        self.assertFalse(needs_reset)
+        self.assertEqual([e["seq"] for e in events], [6])
+
+    def test_snapshot_compacts_log(self):
+        """Test that the log only holds events newer than the snapshot."""
+        self.feed.publish("thought", {"content": "a"})
+        self.feed.publish("thought", {"content": "b"})
+        self.feed.flush()
+        self.assertTrue(self.feed.needs_snapshot())
+
+        self.feed.write_snapshot({"thought_chains": {"agent": ["a", "b"]}})
+        self.feed.publish("thought", {"content": "c"})
+        self.feed.flush()
+
+        with open(self.feed.snapshot_path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        with open(self.feed.log_path, encoding="utf-8") as f:
+            logged = [json.loads(line) for line in f]
+
+        self.assertEqual(snapshot["sequence"], 2)
+        self.assertEqual(snapshot["state"]["thought_chains"], {"agent": ["a", "b"]})
+        self.assertEqual([e["seq"] for e in logged], [3])
+        self.assertFalse(self.feed.needs_snapshot())
+
+    def test_snapshot_keeps_events_published_after_state(self):
+        """Test that events published after the state was read stay pending."""
+        state = {"thoughts": []}
+
+        def publish(content):
+            with self.feed.lock:
+                state["thoughts"].append(content)
+                self.feed.publish("thought", {"content": content})
+
+        publish("a")
+
+        # An event published after the snapshot captured its sequence (but
+        # before the log was truncated) must still reach the log
+        original_replace = os.replace
+
+        def replace_and_publish(src, dst):
+            original_replace(src, dst)
+            publish("b")
+
+        os.replace = replace_and_publish
+        try:
+            sequence = self.feed.write_snapshot(lambda: state)
+        finally:
+            os.replace = original_replace
+        self.feed.flush()
+
+        with open(self.feed.snapshot_path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        with open(self.feed.log_path, encoding="utf-8") as f:
+            logged = [json.loads(line) for line in f]
+
+        self.assertEqual(sequence, 1)
+        self.assertEqual(snapshot["state"]["thoughts"], ["a"])
+        self.assertEqual([e["data"]["content"] for e in logged], ["b"])
+
+    def test_wait_for_events(self):
+        """Test that waiting subscribers are woken by new events."""
+        timer = threading.Timer(0.05, self.feed.publish, args=("thought", {"content": "late"}))
+        timer.start()
+        events, needs_reset = self.feed.wait_for_events(0, timeout=5.0)
+        timer.join()
+
+        self.assertFalse(needs_reset)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["data"]["content"], "late")
+
+
+class TestAgenticDashboardFeed(unittest.TestCase):
+    """Test case for how the AgenticDashboard publishes to its feed."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.dashboard = AgenticDashboard(
+            output_dir=self.temp_dir, update_interval=0, enable_server=False, auto_open_browser=False
+        )
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.dashboard.event_feed.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_visualizers_update_outside_feed_lock(self):
+        """Test that visualizer file updates do not block other publishers."""
+        lock_free = []
+
+        def try_lock():
+            acquired = self.dashboard.event_feed.lock.acquire(timeout=1.0)
+            if acquired:
+                self.dashboard.event_feed.lock.release()
+            lock_free.append(acquired)
+
+        def check_lock():
+            # Another thread must be able to take the feed lock meanwhile
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+
+        for visualizer in (self.dashboard.thought_chain_visualizer,
+                           self.dashboard.agent_network_visualizer,
+                           self.dashboard.decision_tree_visualizer):
+            visualizer.update_visualizations = check_lock
+
+        self.dashboard.register_thought("agent", "chain", "thinking")
+        self.dashboard.register_message("agent", "other", "command")
+        tree_id = self.dashboard.create_decision_tree("agent")
+        node_id = self.dashboard.add_decision_node(tree_id, None, "Choose")
+        self.dashboard.add_alternative(tree_id, node_id, "Other")
+
+        self.assertGreaterEqual(len(lock_free), 5)
+        self.assertTrue(all(lock_free))
+        events, _ = self.dashboard.event_feed.events_since(0)
+        self.assertEqual([e["type"] for e in events], [
+            "thought", "message", "decision_tree", "decision_node", "decision_alternative"
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Unit tests for the decision tree visualizer.
+
+These tests verify the per-tree node index, the incrementally maintained
+depth and size, and node lookups used by alternatives and rejections.
+"""
+
+import unittest
+import tempfile
+import shutil
+
+from triangulum_lx.monitoring.decision_tree_visualizer import DecisionTreeVisualizer
+
+
+class TestDecisionTreeVisualizer(unittest.TestCase):
+    """Test case for the DecisionTreeVisualizer class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.visualizer = DecisionTreeVisualizer(
+            output_dir=self.temp_dir,
+            update_interval=3600,
+            enable_html_output=False
+        )
+        self.tree_id = self.visualizer.create_decision_tree("agent")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_depth_and_size_are_incremental(self):
+        """Test that depth and node count track inserts without re-walking."""
+        first = self.visualizer.add_decision_node(self.tree_id, None, name="first")
+        second = self.visualizer.add_decision_node(self.tree_id, first, name="second")
+        self.visualizer.add_decision_node(self.tree_id, None, name="sibling")
+        third = self.visualizer.add_decision_node(self.tree_id, second, name="third")
+
+        tree = self.visualizer.decision_trees[self.tree_id]
+        self.assertEqual(tree["node_count"], 5)
+        self.assertEqual(tree["depth"], 3)
+        self.assertEqual(self.visualizer.get_node_depth(self.tree_id, third), 3)
+        self.assertEqual(self.visualizer.get_parent_id(self.tree_id, third), second)
+        self.assertIsNone(self.visualizer.get_parent_id(self.tree_id, first))
+
+    def test_deep_chain_lookup(self):
+        """Test that lookups work on trees deeper than the recursion limit."""
+        parent_id = None
+        for i in range(3000):
+            parent_id = self.visualizer.add_decision_node(self.tree_id, parent_id, name=f"n{i}")
+
+        self.assertEqual(self.visualizer.decision_trees[self.tree_id]["depth"], 3000)
+        self.visualizer.add_alternative(self.tree_id, parent_id, name="alt")
+        self.visualizer.mark_alternative_rejected(self.tree_id, parent_id)
+
+        node = self.visualizer.get_node(self.tree_id, parent_id)
+        self.assertEqual(node["alternatives"][0]["name"], "alt")
+        self.assertTrue(node["rejected"])
+
+    def test_unknown_parent_and_duplicate_id(self):
+        """Test that invalid inserts are rejected and leave the tree unchanged."""
+        self.assertIsNone(self.visualizer.add_decision_node(self.tree_id, "missing", name="orphan"))
+        self.visualizer.add_decision_node(self.tree_id, None, node_id="fixed", name="first")
+        self.assertIsNone(self.visualizer.add_decision_node(self.tree_id, None, node_id="fixed", name="again"))
+        self.assertEqual(self.visualizer.decision_trees[self.tree_id]["node_count"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
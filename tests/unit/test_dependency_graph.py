@@ -1,8 +1,10 @@
 import unittest
 import os
+import random
 from unittest.mock import MagicMock, patch
+import networkx as nx
 from triangulum_lx.tooling.dependency_graph import DependencyGraphBuilder, DependencyAnalyzer
-from triangulum_lx.tooling.graph_models import DependencyGraph, FileNode, DependencyMetadata, DependencyType, LanguageType
+from triangulum_lx.tooling.graph_models import DependencyGraph, CompactDependencyGraph, FileNode, DependencyMetadata, DependencyType, LanguageType
 
 class TestDependencyGraph(unittest.TestCase):
     def setUp(self):
@@ -36,5 +38,104 @@ class TestDependencyGraph(unittest.TestCase):
             self.analyzer.visualize_graph("test.png")
             mock_savefig.assert_called_once_with("test.png")
 
+class TestCompactDependencyGraph(unittest.TestCase):
+    def setUp(self):
+        # file1 -> file2 -> file4, file1 -> file3 -> file5 -> file1
+        self.graph = DependencyGraph()
+        for i in range(1, 6):
+            self.graph.add_node(FileNode(path=f"file{i}.py", language=LanguageType.PYTHON))
+        for source, target in [(1, 2), (1, 3), (2, 4), (3, 5), (5, 1)]:
+            metadata = DependencyMetadata(dependency_type=DependencyType.IMPORT, confidence=source / 10)
+            self.graph.add_edge(f"file{source}.py", f"file{target}.py", metadata)
+
+    def test_freeze_is_cached_until_modified(self):
+        compact = self.graph.freeze()
+        self.assertIs(self.graph.freeze(), compact)
+        self.graph.add_node(FileNode(path="file6.py", language=LanguageType.PYTHON))
+        self.assertIsNot(self.graph.freeze(), compact)
+        self.assertIn("file6.py", self.graph.freeze())
+
+    def test_queries_match_dependency_graph(self):
+        compact = self.graph.freeze()
+        for path in self.graph:
+            self.assertEqual(compact.transitive_dependents(path), self.graph.transitive_dependents(path))
+            self.assertEqual(compact.transitive_dependencies(path), self.graph.transitive_dependencies(path))
+            self.assertEqual(compact.get_incoming_edges(path), self.graph.get_incoming_edges(path))
+            self.assertEqual(set(compact.successors(path)), set(self.graph.successors(path)))
+        self.assertEqual(compact.get_edge("file3.py", "file5.py").confidence, 0.3)
+        self.assertIsNone(compact.get_edge("file5.py", "file3.py"))
+        self.assertFalse(compact.has_path("file2.py", "file1.py"))
+        self.assertTrue(compact.has_path("file5.py", "file4.py"))
+        self.assertEqual([sorted(c) for c in compact.find_cycles()], [["file1.py", "file3.py", "file5.py"]])
+
+    def test_batched_reachability(self):
+        compact = self.graph.freeze()
+        ids = compact.ids_of(["file4.py", "file2.py", "file1.py", "missing.py"])
+        self.assertEqual(compact.reach_counts(ids, reverse=True).tolist(), [4, 3, 3])
+        self.assertEqual(compact.dependents_of(["file4.py", "file5.py"]),
+                         {"file1.py", "file2.py", "file3.py", "file5.py"})
+        self.assertEqual(compact.dependencies_of(["file1.py"], max_depth=1), {"file2.py", "file3.py"})
+
+    def test_read_only_and_round_trip(self):
+        compact = CompactDependencyGraph.from_graph(self.graph)
+        with self.assertRaises(TypeError):
+            compact.add_node(FileNode(path="file6.py", language=LanguageType.PYTHON))
+        restored = compact.to_graph()
+        self.assertEqual(sorted(restored.edges()), sorted(self.graph.edges()))
+
+class TestDependencyAnalyzerCentrality(unittest.TestCase):
+    def setUp(self):
+        self.graph = DependencyGraph()
+        for i in range(100):
+            self.graph.add_node(FileNode(path=f"file{i}.py", language=LanguageType.PYTHON))
+        rng = random.Random(7)
+        for _ in range(300):
+            source, target = rng.sample(range(100), 2)
+            metadata = DependencyMetadata(dependency_type=DependencyType.IMPORT)
+            self.graph.add_edge(f"file{source}.py", f"file{target}.py", metadata)
+        self.analyzer = DependencyAnalyzer(self.graph)
+
+    def _assert_matches_networkx_pagerank(self):
+        expected = nx.pagerank(self.analyzer.networkx_graph)
+        actual = self.analyzer.centrality_scores('pagerank')
+        for path, score in expected.items():
+            self.assertAlmostEqual(actual[path], score, places=4)
+
+    def test_pagerank_is_cached_per_graph_version(self):
+        self._assert_matches_networkx_pagerank()
+        with patch.object(self.analyzer, '_pagerank', wraps=self.analyzer._pagerank) as pagerank:
+            self.analyzer.get_most_central_files(n=5)
+            self.analyzer.prioritize_files(list(self.graph))
+            self.analyzer.get_impact_scores(list(self.graph))
+            self.assertEqual(pagerank.call_count, 0)
+
+            self.graph.add_edge("file2.py", "file9.py", DependencyMetadata(dependency_type=DependencyType.IMPORT))
+            self.analyzer.get_impact_score("file9.py")
+            self.assertEqual(pagerank.call_count, 1)
+
+    def test_warm_started_pagerank_after_update(self):
+        self.analyzer.centrality_scores('pagerank')
+        cold_iterations = self.analyzer.pagerank_iterations
+        self.graph.add_edge("file12.py", "file4.py", DependencyMetadata(dependency_type=DependencyType.IMPORT))
+        self._assert_matches_networkx_pagerank()
+        self.assertLess(self.analyzer.pagerank_iterations, cold_iterations)
+
+    def test_impact_scores_match_single_file_scores(self):
+        scores = self.analyzer.get_impact_scores(["file3.py", "missing.py", "file3.py"])
+        self.assertEqual(scores["missing.py"], 0.0)
+        pagerank = nx.pagerank(self.analyzer.networkx_graph)
+        expected = 0.7 * len(self.graph.transitive_dependents("file3.py")) / len(self.graph) + 0.3 * pagerank["file3.py"]
+        self.assertAlmostEqual(scores["file3.py"], expected, places=4)
+
+    def test_sampled_betweenness_error_bound(self):
+        self.assertIsNone(self.analyzer.betweenness_sample_size(100))
+        self.assertLess(self.analyzer.betweenness_sample_size(100000), 100000)
+        exact = nx.betweenness_centrality(self.analyzer.networkx_graph)
+
+        sampled = DependencyAnalyzer(self.graph, betweenness_epsilon=0.5, betweenness_delta=0.1)
+        self.assertEqual(sampled.betweenness_sample_size(100), 16)
+        for path, score in sampled.centrality_scores('betweenness').items():
+            self.assertLessEqual(abs(score - exact[path]), 0.5)
+
 if __name__ == "__main__":
     unittest.main()
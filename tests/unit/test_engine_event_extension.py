@@ -0,0 +1,165 @@
+"""
+Unit tests for event delivery in the engine event extension.
+
+These tests verify that handlers are looked up by event type, that queued
+events are delivered promptly in batches, that handlers run in parallel,
+and that backpressure and dropped events are counted.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from triangulum_lx.core.engine_event_extension import (
+    EngineEventExtension, EventHandler, CustomEventHandler
+)
+
+
+class TestEngineEventExtension(unittest.TestCase):
+    """Test case for the EngineEventExtension class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.extensions = []
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        for extension in self.extensions:
+            if extension.processing_thread and extension.processing_thread.is_alive():
+                extension.stop_event_processing()
+        shutil.rmtree(self.temp_dir)
+
+    def create_extension(self, **config):
+        config.setdefault("enable_learning", False)
+        config_path = os.path.join(self.temp_dir, f"config_{len(self.extensions)}.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+        extension = EngineEventExtension(config_path)
+        self.extensions.append(extension)
+        return extension
+
+    def test_handlers_are_indexed_by_type(self):
+        """Test that events only reach the handlers registered for their type."""
+        extension = self.create_extension(auto_process_events=False)
+        received = {"repair": [], "all": [], "filtered": []}
+
+        class SourceFilter(EventHandler):
+            def can_handle(self, event):
+                return event.source == "agent"
+
+            def handle_event(self, event):
+                received["filtered"].append(event.event_type)
+                return True
+
+        extension.register_event_handler(CustomEventHandler(
+            ["repair_action"], lambda event: received["repair"].append(event.event_type)))
+        extension.register_event_handler(CustomEventHandler(
+            ["*"], lambda event: received["all"].append(event.event_type)))
+        extension.register_event_handler(SourceFilter([]))
+
+        extension.emit_event("repair_action", "agent", {}, immediate=True)
+        extension.emit_event("test_result", "runner", {}, immediate=True)
+
+        self.assertEqual(received["repair"], ["repair_action"])
+        self.assertEqual(received["all"], ["repair_action", "test_result"])
+        self.assertEqual(received["filtered"], ["repair_action"])
+
+        handler = extension.event_handlers[0]
+        extension.unregister_event_handler(handler)
+        extension.emit_event("repair_action", "agent", {}, immediate=True)
+        self.assertEqual(received["repair"], ["repair_action"])
+        self.assertEqual(len(received["all"]), 3)
+
+    def test_events_are_delivered_promptly_in_batches(self):
+        """Test that queued events wake the processing thread and arrive in order."""
+        extension = self.create_extension(batch_size=50)
+        batches = []
+        delivered = threading.Event()
+
+        def handle_batch(events):
+            batches.append([event.data["i"] for event in events])
+            if sum(len(batch) for batch in batches) == 120:
+                delivered.set()
+            return True
+
+        # Hold the processing thread inside the first batch so the rest queues up
+        release = threading.Event()
+        extension.register_event_handler(CustomEventHandler(
+            ["hold"], lambda event: release.wait(5.0)))
+        extension.emit_event("hold", "test", {})
+        time.sleep(0.05)
+
+        extension.register_event_handler(CustomEventHandler(
+            ["metric"], lambda event: True, batch_func=handle_batch))
+        for i in range(120):
+            extension.emit_event("metric", "test", {"i": i})
+        release.set()
+
+        self.assertTrue(delivered.wait(1.0))
+        self.assertEqual([i for batch in batches for i in batch], list(range(120)))
+        self.assertEqual([len(batch) for batch in batches], [50, 50, 20])
+
+        start = time.monotonic()
+        extension.emit_event("metric", "test", {"i": 120})
+        while len(batches) < 4 and time.monotonic() - start < 1.0:
+            time.sleep(0.001)
+        self.assertLess(time.monotonic() - start, 0.08)
+
+        metrics = extension.get_metrics()
+        self.assertEqual(metrics["events_emitted"], 122)
+        self.assertEqual(metrics["events_processed"], 122)
+        self.assertEqual(metrics["events_dropped"], 0)
+
+    def test_handlers_run_in_parallel(self):
+        """Test that different handlers of a batch run on the handler pool."""
+        extension = self.create_extension(handler_workers=2)
+        barrier = threading.Barrier(2, timeout=2.0)
+        results = []
+        done = threading.Event()
+
+        def wait_for_other(event):
+            # Only passes if both handlers run at the same time
+            barrier.wait()
+            results.append(event.event_type)
+            if len(results) == 2:
+                done.set()
+            return True
+
+        extension.register_event_handler(CustomEventHandler(["agent_action"], wait_for_other))
+        extension.register_event_handler(CustomEventHandler(["agent_action"], wait_for_other))
+        extension.emit_event("agent_action", "test", {})
+
+        self.assertTrue(done.wait(3.0))
+        self.assertEqual(extension.get_metrics()["handler_failures"], 0)
+
+    def test_backpressure_and_drops_are_counted(self):
+        """Test that full queues block producers or drop events visibly."""
+        extension = self.create_extension(
+            auto_process_events=False, max_queue_size=3, overflow_policy="drop_oldest")
+        for i in range(5):
+            extension.emit_event("metric", "test", {"i": i})
+        self.assertEqual([event.data["i"] for event in extension.event_queue], [2, 3, 4])
+        self.assertEqual(extension.get_metrics()["events_dropped"], 2)
+
+        extension = self.create_extension(max_queue_size=2, overflow_policy="block")
+        received = []
+        extension.register_event_handler(CustomEventHandler(
+            ["metric"], lambda event: (time.sleep(0.01), received.append(event.data["i"]))))
+        for i in range(10):
+            extension.emit_event("metric", "test", {"i": i})
+        extension.stop_event_processing()
+
+        metrics = extension.get_metrics()
+        self.assertEqual(received, list(range(10)))
+        self.assertEqual(metrics["events_dropped"], 0)
+        self.assertGreater(metrics["backpressure_waits"], 0)
+        self.assertLessEqual(metrics["max_queue_depth"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
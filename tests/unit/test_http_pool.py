@@ -0,0 +1,129 @@
+"""
+Unit tests for pooled provider HTTP sessions.
+
+These tests run a local stub server that speaks the Ollama chat API and
+verify connection reuse, native async generation and streaming, and that
+the provider factory closes the pools it hands out.
+"""
+
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from triangulum_lx.providers.http_pool import HTTPSessionPool, PoolLimits
+from triangulum_lx.providers.local import OllamaProvider
+from triangulum_lx.providers.factory import ProviderFactory
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.ports.add(self.client_address[1])
+
+        content = payload["messages"][-1]["content"]
+        if payload.get("stream"):
+            body = b"".join(
+                json.dumps({"message": {"content": word}}).encode() + b"\n"
+                for word in content.split()
+            )
+        else:
+            body = json.dumps({"message": {"content": content}, "eval_count": 3}).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHTTPSessionPool(unittest.TestCase):
+    """Test case for HTTPSessionPool and the providers built on it."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        cls.server.ports = set()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.server.ports.clear()
+        self.provider = OllamaProvider(base_url=self.base_url, model="stub")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.provider.shutdown()
+
+    def test_connections_are_reused(self):
+        """Test that sequential requests share one keep-alive connection."""
+        for i in range(5):
+            response = self.provider.generate(f"hello {i}")
+            self.assertEqual(response.content, f"hello {i}")
+            self.assertEqual(response.tokens_used, 3)
+
+        self.assertEqual(len(self.server.ports), 1)
+
+    def test_stream(self):
+        """Test synchronous streaming over the pool."""
+        chunks = [chunk.content for chunk in self.provider.generate("a b c", stream=True)]
+        self.assertEqual(chunks, ["a", "b", "c"])
+
+    def test_async_generate_and_stream(self):
+        """Test native async generation with concurrent requests."""
+        async def run():
+            responses = await asyncio.gather(*[
+                self.provider.generate_async(f"request {i}") for i in range(8)
+            ])
+            chunks = [chunk.content async for chunk in self.provider.stream_async("x y")]
+            await self.provider.ashutdown()
+            return responses, chunks
+
+        responses, chunks = asyncio.run(run())
+        self.assertEqual([r.content for r in responses], [f"request {i}" for i in range(8)])
+        self.assertEqual(chunks, ["x", "y"])
+        self.assertLessEqual(len(self.server.ports), 8)
+
+    def test_closed_pool(self):
+        """Test that a closed pool rejects requests and providers reopen theirs."""
+        pool = HTTPSessionPool(PoolLimits(max_connections=2), base_url=self.base_url)
+        pool.close()
+        with self.assertRaises(RuntimeError):
+            pool.post_json("/api/chat", {})
+
+        self.provider.generate("before")
+        self.provider.shutdown()
+        self.assertEqual(self.provider.generate("after").content, "after")
+
+    def test_factory_configures_and_closes_pools(self):
+        """Test that the factory applies pool limits and closes pools on shutdown."""
+        factory = ProviderFactory({"http_pool": {"max_connections": 4}})
+        factory.register_provider("ollama", OllamaProvider)
+        self.addCleanup(ProviderFactory.PROVIDER_REGISTRY.pop, "ollama", None)
+        provider = factory.create_provider("ollama", {"base_url": self.base_url, "model": "stub"})
+        factory.active_providers["ollama"] = provider
+
+        self.assertEqual(provider.http_pool.limits.max_connections, 4)
+        pool = provider.http_pool
+        self.assertEqual(provider.generate("ping").content, "ping")
+
+        self.assertEqual(factory.shutdown_all_providers(), {"ollama": True})
+        self.assertTrue(pool.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Unit tests for the incremental text clusterer.
+
+These tests verify streaming cluster assignment, agreement with a full
+DBSCAN recluster, similarity lookups over the sparse segment store, and
+background reclustering.
+"""
+
+import threading
+import unittest
+
+from triangulum_lx.learning.incremental_clustering import IncrementalTextClusterer
+
+
+class TestIncrementalTextClusterer(unittest.TestCase):
+    """Test case for the IncrementalTextClusterer class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clusterer = IncrementalTextClusterer(ngram_range=(1, 2))
+        self.groups = {
+            "null": "if value is None return default",
+            "file": "with open path as handle read data",
+            "loop": "for index in range count append item"
+        }
+
+    def _add_groups(self, copies: int):
+        for i in range(copies):
+            for name, text in self.groups.items():
+                self.clusterer.add(f"{name}_{i}", text)
+
+    def _partition(self):
+        return sorted(sorted(members) for members in self.clusterer.clusters.values())
+
+    def test_streaming_assignment(self):
+        """Test that identical texts end up in the same cluster."""
+        self.assertIsNone(self.clusterer.add("null_0", self.groups["null"]))
+        self.assertIsNotNone(self.clusterer.add("null_1", self.groups["null"]))
+        self.assertEqual(self.clusterer.labels["null_0"], self.clusterer.labels["null_1"])
+
+        self.clusterer.add("unrelated", "completely different words here")
+        self.assertIsNone(self.clusterer.labels["unrelated"])
+
+    def test_recluster_matches_streaming_partition(self):
+        """Test that a full recluster agrees with streaming on separable data."""
+        self._add_groups(copies=20)
+        streaming = self._partition()
+
+        self.assertEqual(self.clusterer.recluster(), 3)
+        self.assertEqual(self._partition(), streaming)
+
+        # Items added after a recluster still join the right clusters
+        self.clusterer.add("file_new", self.groups["file"])
+        self.assertEqual(self.clusterer.labels["file_new"], self.clusterer.labels["file_0"])
+
+    def test_find_similar(self):
+        """Test similarity lookups across merged segments."""
+        self._add_groups(copies=5)
+        results = self.clusterer.find_similar("open path and read", top_k=3)
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(item_id.startswith("file_") for item_id, _ in results))
+
+    def test_load_clusters(self):
+        """Test restoring persisted clusters for known items only."""
+        self.clusterer.add("a", self.groups["null"], assign=False)
+        self.clusterer.add("b", self.groups["null"], assign=False)
+        self.clusterer.load_clusters({"cluster_4": ["a", "b", "missing"]})
+
+        self.assertEqual(self.clusterer.cluster_snapshot(), {"cluster_4": ["a", "b"]})
+        self.assertEqual(self.clusterer.add("c", self.groups["null"]), "cluster_4")
+        self.assertEqual(self.clusterer.add("d", self.groups["file"]), None)
+        self.assertEqual(self.clusterer.add("e", self.groups["file"]), "cluster_5")
+
+    def test_background_recluster_swaps_clusters(self):
+        """Test that reclustering publishes a new mapping and reports relabels."""
+        for i in range(3):
+            for name, text in self.groups.items():
+                self.clusterer.add(f"{name}_{i}", text, assign=False)
+        held = self.clusterer.clusters
+        changes = []
+        done = threading.Event()
+
+        def on_labels_changed():
+            changes.append(self.clusterer.pop_label_changes())
+            done.set()
+
+        self.clusterer.start_background_reclustering(0.01, on_labels_changed)
+        try:
+            self.assertTrue(done.wait(5.0))
+        finally:
+            self.clusterer.stop_background_reclustering(timeout=5.0)
+
+        # A reference taken before the recluster is never cleared underneath its reader
+        self.assertEqual(held, {})
+        self.assertIsNot(self.clusterer.clusters, held)
+        self.assertEqual(len(self.clusterer.clusters), 3)
+        self.assertEqual(len(changes[0]), 9)
+        self.assertTrue(all(label is not None for label in changes[0].values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
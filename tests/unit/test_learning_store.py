@@ -0,0 +1,156 @@
+"""
+Unit tests for the learning store.
+
+These tests verify append-only writes and index recovery, compaction of
+superseded records, one-time migration of legacy JSON data, and the
+learning components that persist through the store.
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import shutil
+
+from triangulum_lx.learning.learning_store import LearningStore
+from triangulum_lx.learning.replay_buffer import ReplayBuffer, Episode
+from triangulum_lx.learning.continuous_improvement import ContinuousImprovement
+
+
+class TestLearningStore(unittest.TestCase):
+    """Test case for the LearningStore class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "store")
+        self.store = LearningStore(self.path, num_shards=4, sync_interval=0)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _log_size(self):
+        return sum(os.path.getsize(os.path.join(self.path, f))
+                   for f in os.listdir(self.path) if f.endswith(".log"))
+
+    def test_put_get_delete_and_reopen(self):
+        """Test that the index is rebuilt from the logs on reopen."""
+        self.assertTrue(self.store.put("patterns", "a", {"value": 1}))
+        self.assertTrue(self.store.put("patterns", "b", {"value": 2}))
+        self.assertTrue(self.store.put("patterns", "a", {"value": 3}))
+        self.assertTrue(self.store.delete("patterns", "b"))
+        self.assertFalse(self.store.delete("patterns", "b"))
+        self.store.close()
+
+        self.store = LearningStore(self.path, num_shards=16)
+        self.assertEqual(self.store.num_shards, 4)
+        self.assertEqual(self.store.get("patterns", "a"), {"value": 3})
+        self.assertIsNone(self.store.get("patterns", "b"))
+        self.assertEqual(dict(self.store.items("patterns")), {"a": {"value": 3}})
+
+    def test_unchanged_values_are_not_written(self):
+        """Test that re-saving an identical value does not grow the log."""
+        self.store.put("parameters", "timeout", {"value": 30})
+        size = self._log_size()
+
+        self.assertFalse(self.store.put("parameters", "timeout", {"value": 30}))
+        self.assertEqual(self._log_size(), size)
+
+    def test_torn_record_is_dropped(self):
+        """Test that a partially written trailing record is truncated on open."""
+        self.store.put("episodes", "0", {"bug_id": "b0"})
+        self.store.close()
+
+        shard = next(f for f in sorted(os.listdir(self.path)) if f.endswith(".log")
+                     and os.path.getsize(os.path.join(self.path, f)))
+        with open(os.path.join(self.path, shard), "ab") as f:
+            f.write(b'["put","episodes","1"]\t{"bug_')
+
+        self.store = LearningStore(self.path)
+        self.assertEqual(self.store.keys("episodes"), ["0"])
+        self.assertTrue(self.store.put("episodes", "1", {"bug_id": "b1"}))
+        self.assertEqual(self.store.get("episodes", "1"), {"bug_id": "b1"})
+
+    def test_compaction(self):
+        """Test that shards holding mostly superseded records are compacted."""
+        self.store.close()
+        self.store = LearningStore(self.path, num_shards=1, min_compaction_bytes=1024)
+
+        for i in range(200):
+            self.store.put("metrics", "latency", {"value": i})
+        self.store.put("metrics", "errors", {"value": 1})
+
+        self.assertLess(self._log_size(), 2048)
+        self.assertEqual(self.store.get("metrics", "latency"), {"value": 199})
+        self.store.close()
+
+        self.store = LearningStore(self.path)
+        self.assertEqual(self.store.count("metrics"), 2)
+        self.assertEqual(self.store.get("metrics", "errors"), {"value": 1})
+
+    def test_import_legacy_runs_once(self):
+        """Test that a legacy source is only migrated once."""
+        records = lambda: iter([("patterns", "a", 1), ("patterns", "b", 2)])
+
+        self.assertEqual(self.store.import_legacy("patterns.json", records), 2)
+        self.store.delete("patterns", "a")
+        self.assertEqual(self.store.import_legacy("patterns.json", records), 0)
+        self.assertEqual(self.store.keys("patterns"), ["b"])
+
+
+class TestLearningStoreClients(unittest.TestCase):
+    """Test case for learning components persisted through the store."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_replay_buffer_migrates_and_loads_latest(self):
+        """Test that legacy episode files are migrated and only recent episodes load."""
+        for i in range(3):
+            episode = Episode(f"legacy{i}", 1, 1.0, True, 1, 0.5, 0, {"observer": 10})
+            with open(os.path.join(self.temp_dir, f"episode_legacy{i}_{i}.json"), "w") as f:
+                json.dump(episode.to_dict(), f)
+
+        buffer = ReplayBuffer(capacity=4, storage_path=self.temp_dir)
+        self.assertEqual(len(buffer.buffer), 3)
+        for i in range(3):
+            buffer.add(Episode(f"new{i}", 2, 2.0, False, 1, 0.1, 1, {}))
+        buffer.close()
+
+        reloaded = ReplayBuffer(capacity=4, storage_path=self.temp_dir)
+        self.assertEqual([ep.bug_id for ep in reloaded.buffer], ["legacy2", "new0", "new1", "new2"])
+        reloaded.close()
+
+    def test_continuous_improvement_migrates_legacy_database(self):
+        """Test that parameters and metric history survive the migration."""
+        database_path = os.path.join(self.temp_dir, "parameters.json")
+        with open(database_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "parameters": [{"name": "timeout", "value": 30, "min_value": 1,
+                                "max_value": 60, "step_size": 1, "description": "",
+                                "category": "general", "history": [],
+                                "created_at": "t0", "updated_at": "t0"}],
+                "metrics": {"latency": [{"timestamp": "t0", "value": 1.0}]}
+            }, f)
+
+        improvement = ContinuousImprovement(database_path=database_path)
+        self.assertEqual(improvement.get_parameter("timeout"), 30)
+        improvement.set_parameter("timeout", 45)
+        improvement.track_metric("latency", 2.0)
+        improvement.close()
+
+        reloaded = ContinuousImprovement(database_path=database_path)
+        self.assertEqual(reloaded.get_parameter("timeout"), 45)
+        self.assertEqual([s["value"] for s in reloaded.metrics["latency"]], [1.0, 2.0])
+        reloaded.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Unit tests for metric storage in the metrics collector.
+
+These tests verify that metric series stay bounded while keeping rollups of
+every sample, that quantile sketches meet their accuracy, and that samples
+and tick metrics are appended to compact files on disk.
+"""
+
+import csv
+import random
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from triangulum_lx.core.state import Phase
+from triangulum_lx.monitoring.metric_series import MetricSeries, QuantileSketch
+from triangulum_lx.monitoring.metrics import MetricsCollector
+
+
+class TestMetricSeries(unittest.TestCase):
+    """Test case for MetricSeries and QuantileSketch."""
+
+    def test_raw_samples_are_bounded_and_rolled_up(self):
+        """Test that old raw samples are overwritten but stay in the rollups."""
+        series = MetricSeries("tokens", raw_capacity=100, minute_capacity=30)
+        for second in range(3 * 3600):
+            series.add(float(second), second % 60)
+
+        timestamps, values = series.samples()
+        self.assertEqual(list(timestamps), [float(t) for t in range(3 * 3600 - 100, 3 * 3600)])
+        self.assertEqual(series.last, 59.0)
+        self.assertEqual(series.count, 3 * 3600)
+
+        minutes = series.points("1m")
+        self.assertEqual(len(minutes), 31)
+        self.assertEqual(minutes[-1], {
+            "start": 3 * 3600 - 60, "count": 60, "sum": 1770.0, "min": 0.0, "max": 59.0, "mean": 29.5
+        })
+        hours = series.points("1h")
+        self.assertEqual([row["count"] for row in hours], [3600, 3600, 3600])
+        self.assertLess(series.nbytes, 100 * 16 + 30 * 40 + 3 * 40 + 1024)
+
+        with self.assertRaises(ValueError):
+            series.points("1d")
+
+    def test_quantile_sketch_accuracy(self):
+        """Test that sketched quantiles are within the relative accuracy."""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(0, 2) for _ in range(20000)]
+        values += [-v for v in values[:2000]] + [0.0] * 100
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values[:10000]:
+            sketch.add(value)
+        other = QuantileSketch(relative_accuracy=0.01)
+        for value in values[10000:]:
+            other.add(value)
+        sketch.merge(other)
+
+        ordered = sorted(values)
+        for q in (0.01, 0.05, 0.1, 0.5, 0.9, 0.99):
+            expected = ordered[int(q * (len(ordered) - 1))]
+            self.assertAlmostEqual(sketch.quantile(q), expected, delta=abs(expected) * 0.01 + 1e-9)
+        self.assertEqual(sketch.quantile(1.0), max(values))
+        self.assertLess(len(sketch), 2000)
+        self.assertIsNone(QuantileSketch().quantile(0.5))
+
+
+class TestMetricsCollector(unittest.TestCase):
+    """Test case for the MetricsCollector class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.collector = MetricsCollector(storage_path=self.temp_dir, raw_capacity=50, flush_bytes=200)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_record_metric(self):
+        """Test numeric, latency and non-numeric metrics."""
+        for i in range(80):
+            self.collector.record_metric("queue_depth", i)
+            self.collector.record_metric("response_time", (i % 10) / 10)
+        self.collector.record_metric("init_mode", "parallel")
+
+        samples = self.collector.get_metric("queue_depth")
+        self.assertEqual(len(samples), 50)
+        self.assertEqual(samples[-1]["value"], 79.0)
+        self.assertEqual(self.collector.get_metric("queue_depth", "1m")[0]["count"], 80)
+        self.assertEqual(self.collector.get_metric("init_mode"), "parallel")
+        self.assertIsNone(self.collector.get_metric("missing"))
+
+        self.assertNotIn("p99", self.collector.get_metric_summary("queue_depth"))
+        summary = self.collector.get_metric_summary("response_time")
+        self.assertAlmostEqual(summary["p90"], 0.8, delta=0.008)
+        self.assertEqual(summary["max"], 0.9)
+        self.assertEqual(set(self.collector.get_all_metrics()), {"queue_depth", "response_time", "init_mode"})
+
+    def test_samples_and_ticks_are_appended_to_disk(self):
+        """Test the binary sample log and the append-only tick CSV."""
+        for i in range(30):
+            self.collector.record_metric("queue_depth", i)
+            self.collector.record_metric("tokens", i * 2)
+
+        engine = SimpleNamespace(
+            bugs=[SimpleNamespace(phase=Phase.WAIT), SimpleNamespace(phase=Phase.DONE)],
+            free_agents=3, monitor=SimpleNamespace(g_bits=1.5), tick_no=0
+        )
+        for tick in range(1, 11):
+            engine.tick_no = tick
+            self.collector.record_tick(engine)
+        summary = self.collector.finalize_run()
+
+        samples = MetricsCollector.load_samples(self.collector.run_path)
+        self.assertEqual(list(samples["queue_depth"][1]), [float(i) for i in range(30)])
+        self.assertEqual(list(samples["tokens"][1]), [float(i * 2) for i in range(30)])
+        self.assertEqual((self.collector.run_path / "metrics.bin").stat().st_size, 60 * 20)
+
+        with open(self.collector.run_path / "tick_metrics.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([int(row["tick_number"]) for row in rows], list(range(1, 11)))
+        self.assertEqual(rows[0]["bugs_done"], "1")
+        self.assertEqual(summary["metric_summaries"]["tokens"]["sum"], 870.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
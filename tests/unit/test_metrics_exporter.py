@@ -0,0 +1,158 @@
+"""
+Unit tests for the metrics exporters.
+
+These tests verify typed Prometheus metrics and the cached exposition,
+the append-only JSONL file exporter, and that the CSV exporter starts a new
+part instead of rewriting a file when columns change.
+"""
+
+import csv
+import gzip
+import json
+import shutil
+import tempfile
+import unittest
+import urllib.request
+
+from triangulum_lx.monitoring.metrics_exporter import (
+    PrometheusExporter, FileExporter, CSVExporter
+)
+
+
+class TestPrometheusExporter(unittest.TestCase):
+    """Test case for the PrometheusExporter class."""
+
+    def setUp(self):
+        """Start an exporter on a free port."""
+        self.exporter = PrometheusExporter(port=0)
+
+    def tearDown(self):
+        """Stop the exporter."""
+        self.exporter.shutdown()
+
+    def test_typed_metrics(self):
+        """Test the exposition of counters, gauges and histograms."""
+        requests = self.exporter.counter("requests_total", "Requests served", ["agent"])
+        requests.labels(agent="bug_detector").inc()
+        requests.labels("bug_detector").inc(2)
+        requests.labels(agent='say "hi"').inc()
+        self.exporter.gauge("queue_depth").set(4)
+        latency = self.exporter.histogram("latency_seconds", buckets=[0.1, 1.0])
+        for value in (0.05, 0.5, 5.0):
+            latency.observe(value)
+
+        self.assertEqual(self.exporter._format_metrics(), (
+            "# HELP requests_total Requests served\n"
+            "# TYPE requests_total counter\n"
+            'requests_total{agent="bug_detector"} 3\n'
+            'requests_total{agent="say \\"hi\\""} 1\n'
+            "# TYPE queue_depth gauge\n"
+            "queue_depth 4\n"
+            "# TYPE latency_seconds histogram\n"
+            'latency_seconds_bucket{le="0.1"} 1\n'
+            'latency_seconds_bucket{le="1.0"} 2\n'
+            'latency_seconds_bucket{le="+Inf"} 3\n'
+            "latency_seconds_sum 5.55\n"
+            "latency_seconds_count 3\n"
+        ))
+
+        self.assertIs(self.exporter.counter("requests_total", labelnames=["agent"]), requests)
+        with self.assertRaises(ValueError):
+            self.exporter.gauge("requests_total")
+        with self.assertRaises(ValueError):
+            requests.inc(-1)
+
+    def test_exposition_is_cached(self):
+        """Test that only changed samples are rendered again."""
+        gauges = [self.exporter.gauge(f"gauge_{i}") for i in range(100)]
+        for i, gauge in enumerate(gauges):
+            gauge.set(i)
+        first = self.exporter._exposition_bytes()
+        self.assertIs(self.exporter._exposition_bytes(), first)
+
+        gauges[50].set(-1)
+        second = self.exporter._exposition_bytes()
+        self.assertIn(b"gauge_50 -1\n", second)
+        for i, gauge in enumerate(gauges):
+            if i != 50:
+                self.assertIsNotNone(gauge._text)
+                self.assertIsNotNone(gauge.labels()._text)
+
+        with urllib.request.urlopen(f"http://127.0.0.1:{self.exporter.port}/metrics") as response:
+            self.assertEqual(response.read(), second)
+
+    def test_export_dictionary(self):
+        """Test that exported dictionaries become gauges."""
+        self.exporter.export({
+            "bugs": {"open": 3, "fixed": 5},
+            "cpu.percent": 12.5,
+            "history": [1, 2, 7],
+            "status": "running",
+            "_internal": 1
+        })
+        self.exporter.export({"bugs": {"open": 2}})
+
+        text = self.exporter._format_metrics()
+        self.assertIn("triangulum_bugs_open 2\n", text)
+        self.assertIn("triangulum_bugs_fixed 5\n", text)
+        self.assertIn("triangulum_cpu_percent 12.5\n", text)
+        self.assertIn("triangulum_history 7\n", text)
+        self.assertNotIn("status", text)
+        self.assertNotIn("internal", text)
+
+
+class TestFileExporters(unittest.TestCase):
+    """Test case for the FileExporter and CSVExporter classes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_file_exporter_appends_jsonl(self):
+        """Test that batches are appended as JSON lines, optionally gzipped."""
+        for compress in (False, True):
+            exporter = FileExporter(self.temp_dir, buffer_size=2, flush_interval=0, compress=compress)
+            for i in range(5):
+                exporter.export({"i": i})
+            self.assertEqual(len(exporter.buffer), 1)
+            exporter.close()
+
+            opener = gzip.open if compress else open
+            with opener(exporter.current_path(), "rt") as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual([record["i"] for record in records], list(range(5)))
+            self.assertIn("_timestamp", records[0])
+
+    def test_csv_exporter_starts_part_for_new_columns(self):
+        """Test that new columns never rewrite an existing CSV file."""
+        exporter = CSVExporter(self.temp_dir)
+        exporter.export({"a": 1})
+        exporter.export({"a": 2})
+        first_path = exporter.current_path
+        exporter.export({"a": 3, "b": {"c": 4}})
+        exporter.export({"b": {"c": 5}})
+        exporter._close_file()
+
+        with open(first_path, newline="") as f:
+            first = list(csv.DictReader(f))
+        with open(exporter.current_path, newline="") as f:
+            second = list(csv.DictReader(f))
+        self.assertNotEqual(first_path, exporter.current_path)
+        self.assertEqual([row["a"] for row in first], ["1", "2"])
+        self.assertEqual([(row["a"], row["b_c"]) for row in second], [("3", "4"), ("", "5")])
+        self.assertTrue(all(row["timestamp"] for row in first + second))
+
+        # A new exporter continues the latest part
+        exporter = CSVExporter(self.temp_dir)
+        exporter.export({"a": 6})
+        exporter._close_file()
+        with open(exporter.current_path, newline="") as f:
+            self.assertEqual(len(list(csv.DictReader(f))), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
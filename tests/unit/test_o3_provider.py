@@ -9,6 +9,7 @@ import json
 
 from triangulum_lx.providers.o3_provider import O3Provider, AgentRole, ModelConfig
 from triangulum_lx.providers.base import LLMResponse, Tool, ToolCall
+from triangulum_lx.providers.rate_limiter import RateLimit, configure_rate_limit, reset_rate_limiters
 
 class TestO3Provider(unittest.TestCase):
     """Test case for the O3Provider class."""
@@ -162,6 +163,39 @@ class TestO3Provider(unittest.TestCase):
         self.assertTrue(mock_api_request.called)
         self.assertEqual(mock_api_request.call_count, 3)  # Called for all 3 test cases
         
+    @patch('triangulum_lx.providers.o3_provider.O3Provider._api_request_with_backoff')
+    def test_generate_stream_settles_tokens(self, mock_api_request):
+        """Test that streams settle their token reservation when they end."""
+        self.addCleanup(reset_rate_limiters)
+        configure_rate_limit("openai", RateLimit(requests_per_minute=600, tokens_per_minute=100000))
+        limiter = self.provider.rate_limiter()
+
+        def chunk(content=None, total_tokens=None):
+            mock_chunk = MagicMock()
+            mock_chunk.model = "o3"
+            mock_chunk.choices = [MagicMock()] if content is not None else []
+            if content is not None:
+                mock_chunk.choices[0].delta.content = content
+            mock_chunk.usage = MagicMock(total_tokens=total_tokens) if total_tokens else None
+            return mock_chunk
+
+        # The final usage chunk is charged
+        mock_api_request.return_value = [chunk("Hello"), chunk(" world"), chunk(total_tokens=42)]
+        chunks = list(self.provider.generate("Test prompt", stream=True))
+        self.assertEqual("".join(c.content for c in chunks), "Hello world")
+        self.assertTrue(mock_api_request.call_args[0][0]["stream_options"]["include_usage"])
+        self.assertAlmostEqual(limiter._tokens.tokens, 100000 - 42, delta=1)
+        self.assertEqual(self.provider.get_statistics()["tokens_used"], 42)
+
+        # Without usage the prompt and the streamed text are estimated
+        limiter._tokens.tokens = limiter._tokens.capacity
+        mock_api_request.return_value = [chunk("x" * 400)]
+        list(self.provider.generate("Test prompt", stream=True))
+        used = 100000 - limiter._tokens.tokens
+        self.assertGreater(used, 100)
+        self.assertLess(used, 1000)
+        self.assertAlmostEqual(self.provider.get_statistics()["tokens_used"], 42 + used, delta=1)
+
     @patch('triangulum_lx.providers.o3_provider.O3Provider._api_request_with_backoff')
     def test_generate_with_tools_enhanced(self, mock_api_request):
         """Test tool-enabled generation with mocked API response."""
@@ -9,6 +9,7 @@ import unittest
 import os
 import tempfile
 import time
+import threading
 from unittest import mock
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -362,6 +363,71 @@ class TestOrchestratorAgent(unittest.TestCase):
         self.orchestrator.task_queue.remove_task("test_task_1")
         self.assertIsNone(self.orchestrator.task_queue.get_task("test_task_1"))
     
+    def test_task_queue_status_index(self):
+        """Test that the status index follows status changes, removal and retries."""
+        task_queue = self.orchestrator.task_queue
+        tasks = [
+            Task(id=f"indexed_{i}", type="file_healing", priority=TaskPriority.LOW,
+                 content={}, workflow_id=f"workflow_{i}", created_at=datetime.now())
+            for i in range(3)
+        ]
+        for task in tasks:
+            task_queue.add_task(task)
+        self.assertEqual([t.id for t in task_queue.get_tasks_by_status("pending")],
+                         ["indexed_0", "indexed_1", "indexed_2"])
+        
+        self.assertIs(task_queue.get_next_task(), tasks[0])
+        tasks[0].mark_started()
+        task_queue.update_task(tasks[0])
+        self.assertEqual([t.id for t in task_queue.get_tasks_by_status("in_progress")], ["indexed_0"])
+        self.assertEqual(len(task_queue.get_tasks_by_status("pending")), 2)
+        self.assertEqual(task_queue.indexed_status["indexed_0"], "in_progress")
+        
+        task_queue.remove_task("indexed_1")
+        self.assertEqual([t.id for t in task_queue.get_tasks_by_status("pending")], ["indexed_2"])
+        self.assertNotIn("indexed_1", task_queue.indexed_status)
+        
+        # Re-adding a known task for a retry puts it ahead of newer tasks
+        tasks[0].status = "pending"
+        task_queue.add_task(tasks[0])
+        self.assertEqual(task_queue.get_tasks_by_status("in_progress"), [])
+        self.assertEqual(task_queue.get_next_task().id, "indexed_0")
+        self.assertEqual(task_queue.get_next_task().id, "indexed_2")
+        self.assertIsNone(task_queue.get_next_task())
+    
+    def test_workers_wake_on_handoff_and_exit_on_shutdown(self):
+        """Test that queued tasks are processed without polling and threads stop on shutdown."""
+        with mock.patch('triangulum_lx.agents.base_agent.BaseAgent._register_with_message_bus'):
+            orchestrator = OrchestratorAgent(
+                agent_id="event_driven",
+                message_bus=self.message_bus,
+                config={"task_check_interval": 60, "worker_count": 3}
+            )
+        orchestrator._assign_task_to_agent = mock.MagicMock(return_value="agent")
+        processed = []
+        done = threading.Event()
+        
+        def process(task):
+            processed.append(task.id)
+            if len(processed) == 20:
+                done.set()
+            return {"status": "success"}
+        
+        orchestrator._process_file_healing_task = process
+        try:
+            task_ids = [orchestrator.enqueue_task("file_healing", {"file_path": "x.py"}) for _ in range(20)]
+            # Far less than one task_check_interval
+            self.assertTrue(done.wait(5.0))
+            self.assertEqual(sorted(processed), sorted(task_ids))
+        finally:
+            orchestrator.shutdown()
+        
+        self.assertFalse(orchestrator.task_distribution_thread.is_alive())
+        self.assertFalse(orchestrator.progress_thread.is_alive())
+        for thread in orchestrator.worker_threads:
+            self.assertFalse(thread.is_alive())
+        self.assertEqual(len(orchestrator.task_queue.get_tasks_by_status("completed")), 20)
+    
     def test_agent_registry(self):
         """Test agent registry functionality."""
         # Register an agent
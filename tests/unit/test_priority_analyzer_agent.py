@@ -46,5 +46,34 @@ class TestPriorityAnalyzerAgent(unittest.TestCase):
         self.assertEqual(response.content["status"], "success")
         self.assertIn("file_priorities", response.content)
 
+    def test_dependency_depths_condense_cycles(self):
+        relationships = {
+            "nodes": {"a.py": {}, "b.py": {}, "c.py": {}, "d.py": {}},
+            "edges": [
+                {"source": "a.py", "target": "b.py"},
+                {"source": "b.py", "target": "c.py"},
+                {"source": "c.py", "target": "b.py"},
+                {"source": "c.py", "target": "d.py"},
+            ],
+        }
+        depths = self.agent._calculate_dependency_depths(relationships)
+        self.assertEqual(depths, {"a.py": 2, "b.py": 1, "c.py": 1, "d.py": 0})
+
+    def test_dependency_depths_on_large_graphs(self):
+        # A ladder of diamonds has exponentially many paths; the chain is deeper than the recursion limit
+        relationships = {}
+        for i in range(3000):
+            relationships[f"n{i}.py"] = {"dependencies": [f"l{i}.py", f"r{i}.py"]}
+            relationships[f"l{i}.py"] = {"dependencies": [f"n{i + 1}.py"]}
+            relationships[f"r{i}.py"] = {"dependencies": [f"n{i + 1}.py"]}
+
+        depths = self.agent._calculate_dependency_depths(relationships)
+        self.assertEqual(depths["n0.py"], 6000)
+        self.assertEqual(depths["n3000.py"], 0)
+
+        with patch("networkx.condensation") as condensation:
+            self.assertEqual(self.agent._calculate_dependency_depths(relationships), depths)
+            condensation.assert_not_called()
+
 if __name__ == "__main__":
     unittest.main()
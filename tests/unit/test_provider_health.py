@@ -0,0 +1,201 @@
+"""
+Unit tests for provider health caching and latency-aware routing.
+
+These tests verify that health checks are cached and refreshed in the
+background, that rolling statistics track latency and errors, and that the
+factory routes to the provider with the best expected latency or cost.
+"""
+
+import threading
+import unittest
+
+from triangulum_lx.providers.base import BaseProvider
+from triangulum_lx.providers.factory import ProviderFactory
+from triangulum_lx.providers.health import HealthCache, ProviderStats, get_provider_stats
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingProvider(BaseProvider):
+    """Provider that counts its availability checks."""
+    checks = 0
+    available = True
+
+    def is_available(self) -> bool:
+        type(self).checks += 1
+        return type(self).available
+
+    def generate_response(self, messages, **kwargs) -> str:
+        return "ok"
+
+
+class FastProvider(CountingProvider):
+    checks = 0
+
+
+class SlowProvider(CountingProvider):
+    checks = 0
+
+
+class TestHealthCache(unittest.TestCase):
+    """Test case for the HealthCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.cache = HealthCache(ttl=10.0, clock=self.clock)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.cache.close()
+
+    def test_first_check_is_inline_then_cached(self):
+        """Test that only the first lookup waits for a check."""
+        calls = []
+        check = lambda: calls.append(1) or True
+
+        self.assertTrue(self.cache.statuses({"a": check})["a"].available)
+        for _ in range(100):
+            self.cache.statuses({"a": check})
+        self.assertEqual(len(calls), 1)
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        """Test that an expired entry is returned while a background check runs."""
+        self.cache.put("a", True)
+        self.clock.now = 20.0
+
+        release = threading.Event()
+        def slow_check():
+            release.wait(5)
+            return False
+
+        status = self.cache.statuses({"a": slow_check})["a"]
+        self.assertTrue(status.available)
+        # A second lookup does not start another check
+        future = self.cache.refresh("a", slow_check)
+        self.assertIs(self.cache.refresh("a", slow_check), future)
+
+        release.set()
+        self.assertFalse(future.result(timeout=5).available)
+        self.assertFalse(self.cache.get("a").available)
+
+    def test_failing_check_marks_unavailable(self):
+        """Test that a raising check is cached as unavailable with its error."""
+        def broken():
+            raise ConnectionError("refused")
+
+        status = self.cache.statuses({"a": broken})["a"]
+        self.assertFalse(status.available)
+        self.assertIn("refused", status.error)
+
+    def test_close_cancels_queued_checks(self):
+        """Test that closing the cache cancels checks that have not started."""
+        cache = HealthCache(ttl=10.0, max_workers=1, clock=self.clock)
+        started = threading.Event()
+        release = threading.Event()
+        def blocking_check():
+            started.set()
+            release.wait(5)
+            return True
+
+        running = cache.refresh("a", blocking_check)
+        self.assertTrue(started.wait(5))
+        queued = cache.refresh("b", lambda: True)
+        cache.close()
+        release.set()
+
+        self.assertTrue(queued.cancelled())
+        self.assertTrue(running.result(timeout=5).available)
+        self.assertIsNone(cache.get("b"))
+
+
+class TestProviderStats(unittest.TestCase):
+    """Test case for the ProviderStats class."""
+
+    def test_moving_averages(self):
+        """Test latency and error rate tracking per provider and model."""
+        stats = ProviderStats(alpha=0.5, clock=FakeClock())
+        stats.record("openai", "o3", 1.0)
+        stats.record("openai", "o3", 3.0)
+        stats.record("openai", "gpt-4o", 0.0, success=False)
+
+        self.assertAlmostEqual(stats.get("openai", "o3").latency, 2.0)
+        self.assertEqual(stats.get("openai", "o3").error_rate, 0.0)
+        self.assertEqual(stats.get("openai", "gpt-4o").error_rate, 1.0)
+        self.assertEqual(stats.get("openai").requests, 3)
+        self.assertAlmostEqual(stats.get("openai").error_rate, 0.5)
+        self.assertIn("openai/o3", stats.snapshot())
+
+
+class TestProviderRouting(unittest.TestCase):
+    """Test case for ProviderFactory.get_best_provider."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        FastProvider.checks = SlowProvider.checks = 0
+        FastProvider.available = SlowProvider.available = True
+        get_provider_stats().reset()
+
+        self.factory = ProviderFactory({"routing": {"cost_priors": {"slow": 0.0}}})
+        self.factory.register_provider("fast", FastProvider)
+        self.factory.register_provider("slow", SlowProvider)
+        self.addCleanup(ProviderFactory.PROVIDER_REGISTRY.pop, "fast", None)
+        self.addCleanup(ProviderFactory.PROVIDER_REGISTRY.pop, "slow", None)
+        self.factory.provider_configs = {"fast": {}, "slow": {}}
+        self.candidates = ["fast", "slow"]
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.factory.shutdown_all_providers()
+        get_provider_stats().reset()
+
+    def test_routes_by_latency_and_adapts(self):
+        """Test that routing follows observed latency and skips repeated checks."""
+        stats = get_provider_stats()
+        for _ in range(5):
+            stats.record("fast", None, 0.2)
+            stats.record("slow", None, 1.5)
+
+        for _ in range(50):
+            self.assertEqual(self.factory.get_best_provider(provider_types=self.candidates), "fast")
+        self.assertEqual(FastProvider.checks, 1)
+        self.assertEqual(SlowProvider.checks, 1)
+
+        # The fast backend degrades
+        for _ in range(20):
+            stats.record("fast", None, 4.0)
+        self.assertEqual(self.factory.get_best_provider(provider_types=self.candidates), "slow")
+
+    def test_errors_raise_expected_latency(self):
+        """Test that a provider failing most requests loses to a slower one."""
+        stats = get_provider_stats()
+        stats.record("fast", None, 0.2)
+        stats.record("slow", None, 0.8)
+        for _ in range(10):
+            stats.record("fast", None, 0.0, success=False)
+
+        self.assertEqual(self.factory.get_best_provider(provider_types=self.candidates), "slow")
+
+    def test_cost_objective_and_availability(self):
+        """Test cost routing and that unavailable providers are skipped."""
+        self.assertEqual(
+            self.factory.get_best_provider({"cost": "low"}, provider_types=self.candidates), "slow"
+        )
+
+        SlowProvider.available = False
+        self.factory.health_cache.invalidate()
+        self.assertEqual(
+            self.factory.get_best_provider({"cost": "low"}, provider_types=self.candidates), "fast"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Unit tests for provider rate limiting and request coalescing.
+
+These tests verify token bucket reservations, priority lanes, the
+process-wide limiter registry, and single-flight coalescing of identical
+sync and async provider requests.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from triangulum_lx.providers.rate_limiter import (
+    RateLimit, RateLimiter, Priority, SingleFlight, request_priority,
+    configure_rate_limit, get_rate_limiter, reset_rate_limiters, estimate_request_tokens,
+    current_priority
+)
+from triangulum_lx.providers.base import LLMProvider, LLMResponse
+from triangulum_lx.providers.local import OllamaProvider
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test case for the RateLimiter class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        reset_rate_limiters()
+
+    def test_request_bucket(self):
+        """Test that requests beyond the burst wait for the refill."""
+        limiter = RateLimiter(RateLimit(requests_per_minute=3, critical_reserve=0.0), self.clock)
+
+        self.assertEqual([limiter.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(limiter.reserve(), 20.0)
+        self.assertAlmostEqual(limiter.reserve(), 40.0)
+
+        self.clock.now = 60.0
+        self.assertAlmostEqual(limiter.reserve(), 0.0)
+        self.assertEqual(limiter.stats["throttled"], 2)
+
+    def test_priority_lanes(self):
+        """Test that critical requests can use capacity reserved from other lanes."""
+        limiter = RateLimiter(RateLimit(requests_per_minute=10, critical_reserve=0.1), self.clock)
+
+        for _ in range(8):
+            self.assertEqual(limiter.reserve(priority=Priority.BACKGROUND), 0.0)
+        self.assertGreater(limiter.reserve(priority=Priority.BACKGROUND), 0.0)
+
+        limiter = RateLimiter(RateLimit(requests_per_minute=10, critical_reserve=0.1), self.clock)
+        for _ in range(9):
+            limiter.reserve()
+        self.assertGreater(limiter.reserve(), 0.0)
+
+        limiter = RateLimiter(RateLimit(requests_per_minute=10, critical_reserve=0.1), self.clock)
+        for _ in range(9):
+            limiter.reserve()
+        with request_priority(Priority.CRITICAL):
+            self.assertEqual(limiter.reserve(), 0.0)
+
+    def test_priority_reaches_executor_threads(self):
+        """Test that the async provider methods run generate at the caller's priority."""
+        class PriorityProvider(LLMProvider):
+            def generate(self, prompt, **kwargs):
+                response = LLMResponse(content=current_priority().name, model="stub")
+                return iter([response]) if kwargs.get("stream") else response
+
+        provider = PriorityProvider(model="stub")
+
+        async def run():
+            with request_priority(Priority.CRITICAL):
+                response = await provider.generate_async("hello")
+                chunks = [chunk.content async for chunk in provider.stream_async("hello")]
+            return response.content, chunks
+
+        self.assertEqual(asyncio.run(run()), ("CRITICAL", ["CRITICAL"]))
+
+    def test_token_bucket_and_settle(self):
+        """Test that token reservations are corrected by the actual usage."""
+        limiter = RateLimiter(RateLimit(tokens_per_minute=1000, critical_reserve=0.0), self.clock)
+
+        self.assertEqual(limiter.reserve(tokens=900), 0.0)
+        self.assertGreater(limiter.reserve(tokens=200), 0.0)
+
+        limiter = RateLimiter(RateLimit(tokens_per_minute=1000, critical_reserve=0.0), self.clock)
+        limiter.reserve(tokens=900)
+        limiter.settle(900, 100)
+        self.assertEqual(limiter.reserve(tokens=800), 0.0)
+
+    def test_registry(self):
+        """Test that limiters are shared per provider model and follow configuration."""
+        default = RateLimit(requests_per_minute=50)
+        self.assertIs(get_rate_limiter("openai", "o3", default), get_rate_limiter("openai", "o3", default))
+        self.assertIsNone(get_rate_limiter("ollama", "llama3"))
+
+        configure_rate_limit("openai", RateLimit(requests_per_minute=5), model="gpt-4o")
+        self.assertEqual(get_rate_limiter("openai", "gpt-4o", default).limit.requests_per_minute, 5)
+        self.assertEqual(get_rate_limiter("openai", "o3", default).limit.requests_per_minute, 50)
+
+    def test_estimate_request_tokens(self):
+        """Test the token estimate of a chat payload."""
+        payload = {"messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 50}
+        self.assertEqual(estimate_request_tokens(payload), 150)
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test case for request coalescing."""
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        reset_rate_limiters()
+
+    def test_concurrent_calls_share_one_result(self):
+        """Test that concurrent calls with one key run the function once."""
+        flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def slow():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return "answer"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(4)]
+        for thread in followers:
+            thread.start()
+        for thread in [leader] + followers:
+            thread.join()
+
+        self.assertEqual(results, ["answer"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.stats["coalesced"], 4)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_errors_are_shared_and_not_cached(self):
+        """Test that a failed flight raises for all callers and is not remembered."""
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            flight.do("k", fail)
+        self.assertEqual(flight.do("k", lambda: 1), 1)
+
+    def test_provider_requests_are_coalesced(self):
+        """Test that identical async provider requests cost one call."""
+        provider = OllamaProvider(model="stub")
+        configure_rate_limit("ollama", RateLimit(requests_per_minute=600))
+        calls = []
+
+        async def send():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"message": {"content": "ok"}, "eval_count": 2, "prompt_eval_count": 3}
+
+        async def run():
+            payload = provider._build_payload("same question")
+            return await asyncio.gather(*[provider._arequest(payload, send) for _ in range(10)])
+
+        results = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(provider.rate_limiter().stats["requests"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -346,5 +346,70 @@ def get_data():
         self.assertIn("Unknown action", result["message"])
 
 
+class TestRelationshipAnalystPathQueries(unittest.TestCase):
+    """Test cases for path enumeration and changeset impact queries."""
+    
+    def setUp(self):
+        """Set up a diamond ladder graph: top -> a{i}/b{i} -> mid{i+1} -> ... -> bottom."""
+        self.agent = RelationshipAnalystAgent(agent_id="test_analyst", message_bus=MagicMock())
+        self.graph = DependencyGraph()
+        metadata = DependencyMetadata(dependency_type=DependencyType.IMPORT)
+        
+        levels = 12
+        paths = [f"mid{i}.py" for i in range(levels + 1)]
+        paths += [f"{side}{i}.py" for i in range(levels) for side in ("a", "b")]
+        for path in paths:
+            self.graph.add_node(FileNode(path=path, language=LanguageType.PYTHON))
+        for i in range(levels):
+            for side in ("a", "b"):
+                self.graph.add_edge(f"mid{i}.py", f"{side}{i}.py", metadata)
+                self.graph.add_edge(f"{side}{i}.py", f"mid{i + 1}.py", metadata)
+        self.graph.add_edge("mid0.py", "mid3.py", metadata)
+        
+        self.agent.graph = self.graph
+        self.agent.analyzer = DependencyAnalyzer(self.graph)
+    
+    def test_k_shortest_paths(self):
+        """Test that paths are streamed shortest first and capped."""
+        paths = self.agent.find_k_shortest_paths("mid0.py", "mid12.py", k=3)
+        self.assertEqual(len(paths), 3)
+        self.assertEqual(len(paths[0]), 20)
+        self.assertTrue(all(len(a) <= len(b) for a, b in zip(paths, paths[1:])))
+        self.assertEqual(len({tuple(path) for path in paths}), 3)
+        
+        # 2^12 + 2^9 paths exist; the cap keeps the enumeration bounded
+        self.assertEqual(len(self.agent.find_all_paths("mid0.py", "mid12.py", max_depth=25, max_paths=50)), 50)
+        self.assertEqual(self.agent.find_all_paths("mid0.py", "mid12.py", max_depth=19), [])
+        self.assertEqual(self.agent.find_all_paths("mid12.py", "mid0.py"), [])
+        self.assertEqual(self.agent.find_all_paths("mid0.py", "mid2.py"), 
+                         sorted(self.agent.find_all_paths("mid0.py", "mid2.py"), key=len))
+        self.assertEqual(len(self.agent.find_all_paths("mid0.py", "mid2.py")), 4)
+    
+    def test_impact_boundary_matches_per_file_bfs(self):
+        """Test the batched impact boundary against a plain per-file BFS."""
+        boundaries = self.agent.calculate_impact_boundary(max_depth=3)
+        for file_path, boundary in boundaries.items():
+            expected, level = set(), {file_path}
+            for _ in range(3):
+                level = {dep for f in level for dep in self.graph.get_incoming_edges(f)}
+                expected |= level
+            self.assertEqual(boundary, expected)
+        self.assertEqual(self.agent.calculate_impact_boundary(["missing.py"]), {"missing.py": set()})
+    
+    def test_changeset_impact_labels(self):
+        """Test that each dependent is labelled with its nearest modified file."""
+        impact = self.agent.calculate_changeset_impact(["mid3.py", "a5.py", "missing.py"])
+        
+        self.assertEqual(impact["mid0.py"], {"distance": 1, "source": "mid3.py"})
+        self.assertEqual(impact["b2.py"], {"distance": 1, "source": "mid3.py"})
+        self.assertEqual(impact["mid5.py"], {"distance": 1, "source": "a5.py"})
+        self.assertEqual(impact["a4.py"], {"distance": 2, "source": "a5.py"})
+        self.assertNotIn("mid3.py", impact)
+        self.assertNotIn("mid6.py", impact)
+        self.assertEqual(set(impact), self.agent.predict_impact(["mid3.py", "a5.py"]) - {"mid3.py", "a5.py"})
+        self.assertEqual(set(self.agent.calculate_changeset_impact(["mid3.py"], max_depth=1)),
+                         {"a2.py", "b2.py", "mid0.py"})
+
+
 if __name__ == "__main__":
     unittest.main()
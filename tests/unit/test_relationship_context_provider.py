@@ -73,5 +73,61 @@ class TestRelationshipContextProvider(unittest.TestCase):
         self.assertIn("func1", context)
         self.assertIn("func2", context)
 
+class TestRelationshipNeighbourhoods(unittest.TestCase):
+    """Test indexed adjacency and memoised neighbourhoods."""
+
+    def setUp(self):
+        """Set up a chain a -> b -> c -> d and a separate pair x <-> y."""
+        self.provider = RelationshipContextProvider()
+        self.relationships = {
+            "a.py": {"imports": ["b.py"], "imported_by": []},
+            "b.py": {"imports": ["c.py"], "imported_by": ["a.py"]},
+            "c.py": {"imports": ["d.py"], "imported_by": ["b.py"]},
+            "d.py": {"imports": [], "imported_by": ["c.py"]},
+            "x.py": {"imports": ["y.py"], "imported_by": ["y.py"]},
+            "y.py": {"imports": ["x.py"], "imported_by": ["x.py"]}
+        }
+        self.provider.load_relationships(self.relationships)
+
+    def test_neighbourhood_depths(self):
+        """Test k-hop neighbourhoods and the batch API."""
+        self.assertEqual(self.provider.get_related_files("a.py", max_depth=1), ["b.py"])
+        self.assertEqual(self.provider.get_related_files("a.py"), ["b.py", "c.py"])
+        self.assertEqual(self.provider.get_related_files("a.py", max_depth=5), ["b.py", "c.py", "d.py"])
+        self.assertEqual(self.provider.get_related_files("missing.py"), [])
+        self.assertEqual(
+            self.provider.get_related_files_batch(["b.py", "x.py"], max_depth=1),
+            {"b.py": ["a.py", "c.py"], "x.py": ["y.py"]}
+        )
+
+    def test_reload_invalidates_only_affected_entries(self):
+        """Test that reloading drops only neighbourhoods reaching changed files."""
+        self.provider.get_related_files("a.py")
+        self.provider.get_related_files("x.py")
+
+        changed = dict(self.relationships)
+        changed["c.py"] = {"imports": ["d.py", "e.py"], "imported_by": ["b.py"]}
+        self.provider.load_relationships(changed)
+        self.assertEqual(self.provider.stats["invalidations"], 1)
+
+        hits = self.provider.stats["hits"]
+        self.assertEqual(self.provider.get_related_files("x.py"), ["y.py"])
+        self.assertEqual(self.provider.stats["hits"], hits + 1)
+        self.assertEqual(self.provider.get_related_files("b.py"), ["a.py", "c.py", "d.py", "e.py"])
+
+        # Reloading identical relationships keeps every entry
+        self.provider.load_relationships(dict(changed))
+        self.assertEqual(self.provider.stats["invalidations"], 1)
+
+    def test_impact_and_circular_dependencies(self):
+        """Test impact analysis and circular dependency suggestions."""
+        impact = self.provider.get_impact_analysis("c.py")
+        self.assertEqual(impact["direct_dependents"], ["b.py"])
+        self.assertEqual(impact["indirect_dependents"], ["a.py", "d.py"])
+
+        self.assertEqual(self.provider.get_circular_dependencies(), [("x.py", "y.py")])
+        suggestions = self.provider.suggest_refactoring("y.py")
+        self.assertEqual([s["type"] for s in suggestions], ["resolve_circular_dependency"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for indexed conflict detection between repair plans.
+
+These tests verify the interval tree against brute-force overlap checks and
+that the change index finds the same conflicts as comparing every pair of
+changes, while tracking plans as they are created and applied.
+"""
+
+import random
+import unittest
+from unittest.mock import patch
+
+from triangulum_lx.tooling.interval_tree import IntervalTree
+from triangulum_lx.tooling.repair import (
+    ChangeIndex, ConflictType, FileChange, RepairPlan, RepairTool
+)
+
+
+def make_change(file_path, start, end):
+    return FileChange(file_path=file_path, start_line=start, end_line=end,
+                      original_content="", new_content="")
+
+
+class TestIntervalTree(unittest.TestCase):
+    """Test case for the IntervalTree class."""
+
+    def test_matches_brute_force(self):
+        """Test overlap queries against a linear scan while inserting and removing."""
+        rng = random.Random(7)
+        tree = IntervalTree()
+        intervals = {}
+        for key in range(500):
+            start = rng.randint(1, 1000)
+            intervals[key] = (start, start + rng.randint(0, 30))
+            tree.insert(*intervals[key], key, key)
+        for key in rng.sample(sorted(intervals), 200):
+            self.assertTrue(tree.remove(*intervals.pop(key), key))
+        self.assertFalse(tree.remove(1, 1, -1))
+        self.assertEqual(len(tree), 300)
+
+        for _ in range(200):
+            start = rng.randint(1, 1000)
+            end = start + rng.randint(0, 20)
+            expected = sorted(key for key, (s, e) in intervals.items() if s <= end and e >= start)
+            self.assertEqual(sorted(value for _, _, value in tree.overlapping(start, end)), expected)
+
+
+class TestChangeIndex(unittest.TestCase):
+    """Test case for the ChangeIndex class."""
+
+    def test_same_conflicts_as_pairwise_comparison(self):
+        """Test that indexed lookups agree with comparing every pair of changes."""
+        rng = random.Random(3)
+        plans = []
+        for p in range(20):
+            changes = []
+            for _ in range(10):
+                start = rng.randint(1, 300)
+                changes.append(make_change(f"file{rng.randint(0, 2)}.py", start, start + rng.randint(0, 5)))
+            plans.append(RepairPlan(id=f"plan{p:02d}", name=f"plan{p}", description="", changes=changes))
+
+        for plan in plans[1:]:
+            expected = [
+                (change1, change2, change1.conflicts_with(change2))
+                for change1 in plans[0].changes
+                for change2 in plan.changes
+                if change1.conflicts_with(change2) != ConflictType.NONE
+            ]
+            self.assertEqual(plans[0].conflicts_with(plan), expected)
+
+    def test_adjacent_and_removed_changes(self):
+        """Test adjacency detection and that removed plans are no longer reported."""
+        index = ChangeIndex()
+        index.add_plan(RepairPlan(id="a", name="a", description="",
+                                  changes=[make_change("x.py", 10, 12)]))
+
+        conflicts = index.find_conflicts(make_change("x.py", 13, 15))
+        self.assertEqual([(plan_id, conflict_type) for plan_id, _, _, conflict_type in conflicts],
+                         [("a", ConflictType.ADJACENT_LINES)])
+        self.assertEqual(index.find_conflicts(make_change("x.py", 14, 15)), [])
+        self.assertEqual(index.find_conflicts(make_change("y.py", 10, 12)), [])
+
+        self.assertTrue(index.remove_plan("a"))
+        self.assertEqual(index.find_conflicts(make_change("x.py", 11, 11)), [])
+
+
+class TestRepairToolConflicts(unittest.TestCase):
+    """Test case for RepairTool conflict checks."""
+
+    def test_active_conflicts_use_index(self):
+        """Test that only in-progress repairs block a plan."""
+        tool = RepairTool()
+        first = tool.create_repair_plan("first", "", [make_change("x.py", 1, 5)])
+        second = tool.create_repair_plan("second", "", [make_change("x.py", 5, 8)])
+        self.assertIn(first.id, tool.change_index)
+
+        self.assertEqual(tool._check_active_conflicts(second), [])
+        tool.active_repairs[first.id] = "transaction"
+        conflicts = tool._check_active_conflicts(second)
+        self.assertEqual([conflict["repair_id"] for conflict in conflicts], [first.id])
+        self.assertEqual(conflicts[0]["conflict_type"], "SAME_LINE")
+
+        # Indexed plans are looked up in the maintained index
+        with patch("triangulum_lx.tooling.repair.ChangeIndex", side_effect=AssertionError):
+            self.assertEqual(len(tool.detect_conflicts(first.id, second.id)), 1)
+
+        # Plans that left the index are still compared
+        tool.change_index.remove_plan(second.id)
+        self.assertEqual(len(tool.detect_conflicts(first.id, second.id)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
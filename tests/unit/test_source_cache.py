@@ -0,0 +1,104 @@
+"""
+Unit tests for the shared source and syntax tree cache.
+
+These tests verify that files are read and parsed once until they change,
+that callers holding the same text share one entry, that syntax errors are
+cached, that entries are evicted to stay within the memory budget and that
+parsed trees are reused from the disk tier.
+"""
+
+import os
+import ast
+import shutil
+import tempfile
+import unittest
+
+from triangulum_lx.tooling.source_cache import SourceCache
+
+
+class TestSourceCache(unittest.TestCase):
+    """Test case for the SourceCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "module.py")
+        self.write("def f():\n    return 1\n")
+        self.cache = SourceCache()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, text, path=None, mtime=1_000_000_000):
+        path = path or self.path
+        with open(path, "w", newline="") as f:
+            f.write(text)
+        # A modification time far in the past lets the stat be trusted
+        os.utime(path, (mtime, mtime))
+
+    def test_read_reuses_entry_until_file_changes(self):
+        """Test that an unchanged file is served from the cache."""
+        first = self.cache.read(self.path)
+        tree = first.tree
+        self.assertIs(self.cache.read(self.path), first)
+        self.assertIs(self.cache.read(self.path).tree, tree)
+
+        self.write("def g():\n    return 22\n", mtime=1_000_000_100)
+        second = self.cache.read(self.path)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.tree.body[0].name, "g")
+
+    def test_text_and_file_share_entry(self):
+        """Test that parsing held text reuses the tree of the read file."""
+        source = self.cache.read(self.path)
+        self.assertIs(self.cache.parse(source.text, self.path), source.tree)
+
+        self.write("x = 1\r\ny = 2\r\n")
+        self.assertEqual(self.cache.read(self.path).lines, ["x = 1", "y = 2"])
+
+    def test_syntax_error_is_cached(self):
+        """Test that invalid text raises the same SyntaxError every time."""
+        source = self.cache.source("def broken(:\n")
+        with self.assertRaises(SyntaxError) as first:
+            source.tree
+        with self.assertRaises(SyntaxError) as second:
+            self.cache.parse("def broken(:\n")
+        self.assertIs(first.exception, second.exception)
+
+    def test_evicts_to_stay_within_budget(self):
+        """Test that least recently used entries are evicted."""
+        cache = SourceCache(max_bytes=20000)
+        texts = [f"value_{i} = {i}\n" * 20 for i in range(10)]
+        for text in texts:
+            cache.parse(text)
+        self.assertLessEqual(cache.total_bytes, cache.max_bytes)
+        self.assertGreater(cache.stats["evictions"], 0)
+        self.assertLess(len(cache), 10)
+
+        misses = cache.stats["misses"]
+        cache.parse(texts[-1])
+        self.assertEqual(cache.stats["misses"], misses)
+
+    def test_disk_tier_shares_trees(self):
+        """Test that a fresh cache loads trees parsed by another cache."""
+        disk_dir = os.path.join(self.temp_dir, "trees")
+        SourceCache(disk_dir=disk_dir).read(self.path).tree
+
+        cache = SourceCache(disk_dir=disk_dir)
+        tree = cache.read(self.path).tree
+        self.assertEqual(cache.stats["disk_hits"], 1)
+        self.assertEqual(ast.dump(tree), ast.dump(ast.parse("def f():\n    return 1\n")))
+
+    def test_line_helpers(self):
+        """Test conversions between line numbers and offsets."""
+        source = self.cache.source("a = 1\nbb = 2\n\nccc = 3")
+        self.assertEqual(source.line(2), "bb = 2")
+        self.assertEqual(source.line(9), "")
+        self.assertEqual(source.offset(4, 2), 16)
+        self.assertEqual(source.lineno(16), 4)
+        self.assertEqual(source.lineno(0), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+"""
+Unit tests for atomic multi-file write-out.
+
+These tests verify that staged commits replace all files or none, keep
+file permissions, recover from interrupted commits through the journal,
+and that RepairTool.apply_repair leaves no file modified when a plan fails.
+"""
+
+import os
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from triangulum_lx.core.rollback_manager import RollbackManager
+from triangulum_lx.tooling.repair import FileChange, RepairStatus, RepairTool
+from triangulum_lx.tooling.staged_commit import StagedCommit, recover_journals
+
+
+class TestStagedCommit(unittest.TestCase):
+    """Test case for the StagedCommit class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal_dir = os.path.join(self.temp_dir, "journal")
+        self.paths = [os.path.join(self.temp_dir, f"file{i}.py") for i in range(3)]
+        for path in self.paths:
+            with open(path, "w") as f:
+                f.write("old")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_commit_replaces_all_files(self):
+        """Test that every staged file is written and permissions are kept."""
+        os.chmod(self.paths[0], 0o755)
+        commit = StagedCommit(self.journal_dir)
+        for path in self.paths:
+            commit.stage(path, "new")
+        self.assertEqual(len(commit.commit()), 3)
+
+        self.assertEqual([self.read(path) for path in self.paths], ["new"] * 3)
+        self.assertEqual(os.stat(self.paths[0]).st_mode & 0o777, 0o755)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ["file0.py", "file1.py", "file2.py", "journal"])
+        self.assertEqual(os.listdir(self.journal_dir), [])
+
+    def test_failed_replace_restores_files(self):
+        """Test that a failure while replacing puts back the files already replaced."""
+        real_replace = os.replace
+        calls = []
+
+        def failing_replace(src, dst):
+            if dst in self.paths:
+                calls.append(dst)
+                if len(calls) == 2:
+                    raise OSError("disk full")
+            return real_replace(src, dst)
+
+        commit = StagedCommit(self.journal_dir)
+        for path in self.paths:
+            commit.stage(path, "new")
+        with patch("triangulum_lx.tooling.staged_commit.os.replace", side_effect=failing_replace):
+            with self.assertRaises(OSError):
+                commit.commit()
+
+        self.assertEqual([self.read(path) for path in self.paths], ["old"] * 3)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ["file0.py", "file1.py", "file2.py", "journal"])
+
+    def test_recover_interrupted_commits(self):
+        """Test that committing journals roll forward and staging journals are discarded."""
+        dead = subprocess.Popen([sys.executable, "-c", "pass"])
+        dead.wait()
+        os.makedirs(self.journal_dir)
+
+        for name, state, target in (("a", "committing", self.paths[0]), ("b", "staging", self.paths[1])):
+            temp = target + ".tmp"
+            with open(temp, "w") as f:
+                f.write("new")
+            with open(os.path.join(self.journal_dir, f"{name}.json"), "w") as f:
+                json.dump({"id": name, "pid": dead.pid, "state": state,
+                           "entries": [{"target": target, "temp": temp}]}, f)
+
+        self.assertEqual(recover_journals(self.journal_dir), 2)
+        self.assertEqual(self.read(self.paths[0]), "new")
+        self.assertEqual(self.read(self.paths[1]), "old")
+        self.assertFalse(os.path.exists(self.paths[1] + ".tmp"))
+        self.assertEqual(os.listdir(self.journal_dir), [])
+
+    def test_recover_journal_of_restarted_process_with_same_pid(self):
+        """Test that a reused PID only protects journals written by this process."""
+        real_replace = os.replace
+
+        def crashing_replace(src, dst):
+            # Simulates the process dying before the first target is replaced
+            if dst in self.paths:
+                raise KeyboardInterrupt
+            return real_replace(src, dst)
+
+        commit = StagedCommit(self.journal_dir)
+        commit.stage(self.paths[0], "new")
+        with patch("triangulum_lx.tooling.staged_commit.os.replace", side_effect=crashing_replace):
+            with self.assertRaises(KeyboardInterrupt):
+                commit.commit()
+        self.assertEqual(recover_journals(self.journal_dir), 0)
+
+        # The same journal left behind by an earlier process that had our PID
+        with open(commit.journal_path) as f:
+            journal = json.load(f)
+        journal["instance"] = "previous-process"
+        with open(commit.journal_path, "w") as f:
+            json.dump(journal, f)
+
+        self.assertEqual(recover_journals(self.journal_dir), 1)
+        self.assertEqual(self.read(self.paths[0]), "new")
+        self.assertEqual(os.listdir(self.journal_dir), [])
+
+
+class TestApplyRepair(unittest.TestCase):
+    """Test case for the staged write-out of RepairTool.apply_repair."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.tool = RepairTool(rollback_manager=RollbackManager(os.path.join(self.temp_dir, "rollback")))
+        self.files = []
+        for i in range(2):
+            path = os.path.join(self.temp_dir, f"module{i}.py")
+            with open(path, "w") as f:
+                f.write("a = 1\nb = 2\nc = 3\n")
+            self.files.append(path)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def change(self, path, start, end, content):
+        return FileChange(file_path=path, start_line=start, end_line=end,
+                          original_content="", new_content=content)
+
+    def test_applies_all_changes(self):
+        """Test that several changes per file are applied in one write-out."""
+        plan = self.tool.create_repair_plan("fix", "", [
+            self.change(self.files[0], 1, 1, "a = 10"),
+            self.change(self.files[0], 3, 3, "c = 30"),
+            self.change(self.files[1], 2, 2, "b = 20"),
+        ])
+        result = self.tool.apply_repair(plan.id)
+
+        self.assertTrue(result["success"], result)
+        self.assertEqual(len(result["applied_changes"]), 3)
+        with open(self.files[0]) as f:
+            self.assertEqual(f.read(), "a = 10\nb = 2\nc = 30")
+        with open(self.files[1]) as f:
+            self.assertEqual(f.read(), "a = 1\nb = 20\nc = 3")
+
+    def test_failing_plan_modifies_nothing(self):
+        """Test that an invalid change in one file leaves the other files untouched."""
+        plan = self.tool.create_repair_plan("fix", "", [
+            self.change(self.files[0], 1, 1, "a = 10"),
+            self.change(self.files[1], 5, 6, "z = 0"),
+        ])
+        result = self.tool.apply_repair(plan.id)
+
+        self.assertFalse(result["success"])
+        self.assertEqual(plan.status, RepairStatus.FAILED)
+        for path in self.files:
+            with open(path) as f:
+                self.assertEqual(f.read(), "a = 1\nb = 2\nc = 3\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,6 +14,7 @@ import tempfile
 import shutil
 import threading
 import gzip
+import random
 from copy import deepcopy
 from pathlib import Path
 
@@ -620,6 +621,55 @@ class TestThoughtChain(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.chain.find_paths(source_id="nonexistent_source", target_id=node5.node_id)
     
+    def test_find_paths_bounded(self):
+        """Test limiting the number and length of enumerated paths."""
+        # A ladder of diamonds has 2^5 paths from root to the last node
+        previous = self.root_node.node_id
+        for level in range(5):
+            left, right, join = (f"{side}{level}" for side in ("left", "right", "join"))
+            for node_id, parent_id in ((left, previous), (right, previous), (join, left)):
+                self.chain.add_node(ChainNode(thought_type=ThoughtType.INFERENCE, content={},
+                                              author_agent_id="agent", node_id=node_id),
+                                    parent_id=parent_id, relationship=RelationshipType.DERIVES_FROM)
+            self.chain.add_relationship(right, join, RelationshipType.DERIVES_FROM)
+            previous = join
+
+        self.assertEqual(len(self.chain.find_paths(self.root_node.node_id, previous)), 32)
+        self.assertEqual(len(self.chain.find_paths(self.root_node.node_id, previous, max_paths=3)), 3)
+        self.assertEqual(self.chain.find_paths(self.root_node.node_id, previous, max_length=10), [])
+        self.assertEqual(len(self.chain.find_paths(self.root_node.node_id, previous, max_length=11)), 32)
+        self.assertEqual(next(self.chain.iter_paths(self.root_node.node_id, previous))[0], self.root_node.node_id)
+    
+    def test_cycle_checks_match_full_search(self):
+        """Test incremental cycle detection against a full graph search."""
+        rng = random.Random(11)
+        chain = ThoughtChain(name="random")
+        node_ids = []
+        for i in range(60):
+            node = ChainNode(thought_type=ThoughtType.INFERENCE, content={}, author_agent_id="agent")
+            parent_id = rng.choice(node_ids) if node_ids and rng.random() < 0.5 else None
+            chain.add_node(node, parent_id=parent_id,
+                           relationship=RelationshipType.SUPPORTS if parent_id else None)
+            node_ids.append(node.node_id)
+
+        for _ in range(400):
+            source_id, target_id = rng.sample(node_ids, 2)
+            if target_id in chain.get_node(source_id).relationships:
+                # Nodes keep one relationship per neighbour, so skip linked pairs
+                continue
+            relationship = rng.choice([RelationshipType.SUPPORTS, RelationshipType.PARALLEL])
+            creates_cycle = (relationship != RelationshipType.PARALLEL
+                             and chain._has_path(target_id, source_id, exclude_parallel=True))
+            if creates_cycle:
+                with self.assertRaises(ValueError):
+                    chain.add_relationship(source_id, target_id, relationship)
+            else:
+                self.assertTrue(chain.add_relationship(source_id, target_id, relationship))
+            if rng.random() < 0.05:
+                chain.remove_node(node_ids.pop(rng.randrange(len(node_ids))))
+
+        self.assertEqual(chain.validate(), (True, []))
+    
     def test_validate(self):
         """Test validation of a thought chain's integrity."""
         # Set up a simple chain
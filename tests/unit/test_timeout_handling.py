@@ -429,6 +429,91 @@ class TestOrchestratorTimeoutHandling(unittest.TestCase):
         # Verify that the monitor was notified
         engine_monitor.fail_operation.assert_called_once()
 
+    def test_timer_driven_timeout_and_milestones(self):
+        """Test that timeouts and milestones fire from the timer wheel."""
+        engine_monitor = MagicMock()
+        engine_monitor.create_operation.return_value = "operation"
+        with patch('triangulum_lx.agents.base_agent.BaseAgent._register_with_message_bus'):
+            orchestrator = OrchestratorAgent(
+                agent_id="timer_orchestrator",
+                message_bus=MagicMock(),
+                engine_monitor=engine_monitor,
+                config={
+                    "timeout": 0.2,
+                    "timeout_grace_period": 0.1,
+                    "progress_update_interval": 0.05,
+                    "timer_tick": 0.01,
+                    "max_retries": 1
+                }
+            )
+        orchestrator._assign_task_to_agent = MagicMock(return_value="test_agent")
+        orchestrator.broadcast_status = MagicMock()
+        release = threading.Event()
+        
+        def blocked_process(task):
+            release.wait(5.0)
+            return {"status": "success"}
+        
+        orchestrator._process_file_healing_task = blocked_process
+        try:
+            task_id = orchestrator.enqueue_task(
+                task_type="file_healing",
+                content={"file_path": "test.py"},
+                priority=TaskPriority.HIGH
+            )
+            task = orchestrator.task_queue.get_task(task_id)
+            deadline = time.time() + 5.0
+            while task.status != "failed" and time.time() < deadline:
+                time.sleep(0.02)
+            
+            self.assertEqual(task.status, "failed")
+            self.assertIn("timed out", task.last_error)
+            engine_monitor.timeout_operation.assert_called_once()
+            self.assertGreater(engine_monitor.update_operation.call_count, 1)
+            milestones = [
+                call.kwargs["metadata"]["progress"]
+                for call in orchestrator.broadcast_status.call_args_list
+                if call.kwargs["metadata"]["event_type"] == "progress_milestone"
+            ]
+            self.assertEqual(milestones, [25, 50, 75])
+            self.assertNotIn(task_id, orchestrator.task_timers)
+            self.assertEqual(orchestrator.timer_wheel.pending(), 0)
+            
+            # A worker finishing after the timeout does not revive the task
+            release.set()
+            time.sleep(0.1)
+            self.assertEqual(task.status, "failed")
+        finally:
+            release.set()
+            orchestrator.shutdown()
+
+    def test_task_is_tracked_before_it_is_queued(self):
+        """Test that a task carries its operation ID as soon as it can be assigned."""
+        engine_monitor = MagicMock()
+        engine_monitor.create_operation.return_value = "operation"
+        with patch('triangulum_lx.agents.base_agent.BaseAgent._register_with_message_bus'):
+            orchestrator = OrchestratorAgent(
+                agent_id="tracked_orchestrator",
+                message_bus=MagicMock(),
+                engine_monitor=engine_monitor
+            )
+        queued_metadata = []
+        add_task = orchestrator.task_queue.add_task
+        
+        def record_add_task(task):
+            queued_metadata.append(dict(task.content["_metadata"]))
+            return add_task(task)
+        
+        orchestrator.task_queue.add_task = record_add_task
+        try:
+            task_id = orchestrator.enqueue_task("file_healing", {"file_path": "test.py"}, callback=MagicMock())
+            
+            self.assertEqual(queued_metadata[0]["operation_id"], "operation")
+            self.assertEqual(orchestrator.operation_to_task_map["operation"], task_id)
+            self.assertIn(task_id, orchestrator.task_callbacks)
+        finally:
+            orchestrator.shutdown()
+
 
 if __name__ == '__main__':
     unittest.main()
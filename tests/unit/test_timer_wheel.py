@@ -0,0 +1,90 @@
+"""
+Unit tests for the hashed timer wheel.
+
+These tests verify that timers fire after their delay, that cancelled
+timers never fire, and that the wheel skips the ticks during which it was
+idle instead of replaying them.
+"""
+
+import threading
+import time
+import unittest
+
+from triangulum_lx.agents.timer_wheel import TimerWheel
+
+
+class TestTimerWheel(unittest.TestCase):
+    """Test case for the TimerWheel class."""
+
+    def setUp(self):
+        """Start a wheel on its own thread."""
+        self.wheel = TimerWheel(tick=0.01, slots=8)
+        self.thread = threading.Thread(target=self.wheel.run, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        """Stop the wheel."""
+        self.wheel.stop()
+        self.thread.join(timeout=1.0)
+        self.assertFalse(self.thread.is_alive())
+
+    def test_timer_fires(self):
+        """Test that a timer fires once after its delay with its arguments."""
+        fired = threading.Event()
+        calls = []
+
+        def callback(value):
+            calls.append((value, time.monotonic()))
+            fired.set()
+
+        start = time.monotonic()
+        self.wheel.schedule(0.05, callback, "value")
+        self.assertTrue(fired.wait(1.0))
+        self.assertEqual(calls[0][0], "value")
+        self.assertGreaterEqual(calls[0][1] - start, 0.04)
+        self.assertEqual(self.wheel.pending(), 0)
+
+        # Delays longer than one revolution of the ring wait for their rounds
+        fired.clear()
+        start = time.monotonic()
+        self.wheel.schedule(0.15, callback, "late")
+        self.assertTrue(fired.wait(1.0))
+        self.assertGreaterEqual(calls[1][1] - start, 0.14)
+
+    def test_cancelled_timer_does_not_fire(self):
+        """Test that cancelling a timer prevents it from firing."""
+        calls = []
+        handle = self.wheel.schedule(0.03, calls.append, "cancelled")
+        fired = threading.Event()
+        self.wheel.schedule(0.06, lambda: fired.set())
+        self.wheel.cancel(handle)
+        self.wheel.cancel(handle)
+        self.assertEqual(self.wheel.pending(), 1)
+
+        self.assertTrue(fired.wait(1.0))
+        self.assertEqual(calls, [])
+        self.assertEqual(self.wheel.pending(), 0)
+
+    def test_skips_idle_ticks(self):
+        """Test that the wheel does not replay ticks while it was empty."""
+        starts = []
+        advance = self.wheel._advance
+
+        def recording_advance():
+            starts.append((self.wheel._current_tick, self.wheel._now_tick()))
+            return advance()
+
+        self.wheel._advance = recording_advance
+        time.sleep(0.2)
+        fired = threading.Event()
+        self.wheel.schedule(0.02, fired.set)
+        self.assertTrue(fired.wait(1.0))
+
+        # The first advance after the idle period starts at the current tick
+        current_tick, now_tick = starts[0]
+        self.assertGreater(now_tick, 15)
+        self.assertGreaterEqual(current_tick, now_tick - 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
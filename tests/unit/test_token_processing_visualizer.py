@@ -0,0 +1,97 @@
+"""
+Unit tests for the token processing visualizer.
+
+These tests cover the incremental session aggregates, bounded token
+retention, and the append-only JSONL data log.
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import shutil
+import statistics
+from unittest.mock import patch
+
+import matplotlib
+matplotlib.use("Agg")
+
+from triangulum_lx.monitoring.token_processing_visualizer import TokenProcessingVisualizer
+
+
+class TestTokenProcessingVisualizer(unittest.TestCase):
+    """Test case for the TokenProcessingVisualizer class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.visualizer = TokenProcessingVisualizer(
+            output_dir=self.temp_dir,
+            update_interval=3600,
+            max_tokens_retained=5
+        )
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_running_aggregates(self):
+        """Test that averages and deviations match a full recomputation."""
+        session_id = self.visualizer.start_processing_session("agent")
+        confidences = [90.0, 40.0, 75.0, 60.0, 85.0, 20.0, 95.0]
+        times = [10.0, 12.5, 8.0, 30.0, 11.0, 9.0, 14.0]
+        for i, (confidence, elapsed) in enumerate(zip(confidences, times)):
+            self.visualizer.add_token(session_id, f"t{i}", confidence, elapsed)
+
+        session = self.visualizer.sessions[session_id]
+        self.assertEqual(session["token_count"], len(confidences))
+        self.assertAlmostEqual(session["average_confidence"], statistics.mean(confidences))
+        self.assertAlmostEqual(session["average_processing_time"], statistics.mean(times))
+        self.assertAlmostEqual(session["confidence_stddev"], statistics.pstdev(confidences))
+        self.assertAlmostEqual(session["processing_time_stddev"], statistics.pstdev(times))
+
+    def test_token_retention(self):
+        """Test that only the most recent tokens are kept in memory."""
+        session_id = self.visualizer.start_processing_session("agent")
+        for i in range(12):
+            self.visualizer.add_token(session_id, f"t{i}", 50.0, 1.0)
+
+        tokens = list(self.visualizer.token_data[session_id])
+        self.assertEqual(len(tokens), 5)
+        self.assertEqual([t["index"] for t in tokens], [7, 8, 9, 10, 11])
+        self.assertEqual(self.visualizer.sessions[session_id]["token_count"], 12)
+
+    def test_data_log_is_appended(self):
+        """Test that raw data is appended to the JSONL log on flush."""
+        session_id = self.visualizer.start_processing_session("agent")
+        for i in range(3):
+            self.visualizer.add_token(session_id, f"t{i}", 80.0, 2.0)
+        self.visualizer.update_visualizations()
+        self.visualizer.add_token(session_id, "t3", 80.0, 2.0)
+        self.visualizer.update_visualizations()
+
+        with open(self.visualizer.data_log_path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+
+        token_records = [r for r in records if r["type"] == "token"]
+        self.assertEqual([r["token"] for r in token_records], ["t0", "t1", "t2", "t3"])
+        self.assertEqual(records[0]["type"], "session")
+        self.assertEqual(records[0]["session_id"], session_id)
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "data", "all_sessions.json")))
+
+    def test_only_dirty_sessions_are_rendered(self):
+        """Test that unchanged sessions are not re-rendered on flush."""
+        first = self.visualizer.start_processing_session("agent_a")
+        second = self.visualizer.start_processing_session("agent_b")
+        self.visualizer.add_token(first, "a", 90.0, 1.0)
+        self.visualizer.add_token(second, "b", 90.0, 1.0)
+        self.visualizer.update_visualizations()
+
+        self.visualizer.add_token(second, "c", 90.0, 1.0)
+        with patch.object(self.visualizer, "_update_session_visualization") as mock_update:
+            self.visualizer.update_visualizations()
+            mock_update.assert_called_once_with(second)
+
+
+if __name__ == "__main__":
+    unittest.main()
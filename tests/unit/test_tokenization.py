@@ -0,0 +1,131 @@
+"""
+Unit tests for token counting and context packing.
+
+These tests verify memoised token counts, the knapsack packing of items
+under a token budget, and the packed context built by
+O3Provider.optimize_messages.
+"""
+
+import itertools
+import unittest
+from unittest.mock import patch
+
+from triangulum_lx.providers.o3_provider import O3Provider
+from triangulum_lx.providers.tokenization import (
+    TokenCountingService, RegexTokenizer, pack, get_token_counter
+)
+
+
+class CountingTokenizer(RegexTokenizer):
+    """Regex tokenizer that counts how often it runs."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def count(self, text: str) -> int:
+        self.calls += 1
+        return super().count(text)
+
+
+class TestTokenCountingService(unittest.TestCase):
+    """Test case for the TokenCountingService class."""
+
+    def test_counts_are_memoised(self):
+        """Test that each text is tokenized once until it is evicted."""
+        tokenizer = CountingTokenizer()
+        service = TokenCountingService(tokenizer, cache_size=2)
+
+        for _ in range(10):
+            self.assertEqual(service.count("This is a test sentence with some punctuation!"), 9)
+        self.assertEqual(tokenizer.calls, 1)
+        self.assertEqual(service.stats["hits"], 9)
+
+        service.count("a")
+        service.count("b")
+        service.count("This is a test sentence with some punctuation!")
+        self.assertEqual(tokenizer.calls, 4)
+
+    def test_message_overhead(self):
+        """Test that message counts include the per-message and reply overhead."""
+        service = TokenCountingService(RegexTokenizer())
+        message = {"role": "user", "content": "hello world"}
+
+        self.assertEqual(service.count_message(message), 6)
+        self.assertEqual(service.count_messages([message, message]), 15)
+
+
+class TestPack(unittest.TestCase):
+    """Test case for the pack function."""
+
+    def brute_force(self, costs, values, budget):
+        best = (0.0, [])
+        for size in range(len(costs) + 1):
+            for subset in itertools.combinations(range(len(costs)), size):
+                if sum(costs[i] for i in subset) <= budget:
+                    best = max(best, (sum(values[i] for i in subset), list(subset)))
+        return best[0]
+
+    def test_optimal_when_costs_fit_resolution(self):
+        """Test that packing matches the exhaustive optimum."""
+        costs = [5, 4, 6, 3, 7, 2, 8]
+        values = [10.0, 40.0, 30.0, 50.0, 35.0, 5.0, 25.0]
+        for budget in range(0, 36, 5):
+            kept = pack(costs, values, budget)
+            self.assertLessEqual(sum(costs[i] for i in kept), budget)
+            self.assertAlmostEqual(sum(values[i] for i in kept), self.brute_force(costs, values, budget))
+
+    def test_scaled_budget_is_never_exceeded(self):
+        """Test that rounding costs to buckets keeps the packing under the budget."""
+        costs = [1000 + 37 * i for i in range(40)]
+        values = [1.0 / (i + 1) for i in range(40)]
+        kept = pack(costs, values, 25000, resolution=64)
+        self.assertLessEqual(sum(costs[i] for i in kept), 25000)
+        self.assertIn(0, kept)
+
+    def test_required_items(self):
+        """Test that required items are kept even over budget."""
+        self.assertEqual(pack([50, 10, 10], [1.0, 1.0, 1.0], 40, required=[0]), [0])
+        self.assertEqual(pack([30, 10, 10], [0.1, 1.0, 1.0], 40, required=[0]), [0, 1])
+
+
+class TestOptimizeMessages(unittest.TestCase):
+    """Test case for O3Provider.optimize_messages."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        with patch('triangulum_lx.providers.openai.OpenAI'):
+            self.provider = O3Provider(api_key="test_key", token_limit_buffer=0)
+
+    def test_packs_short_messages_around_a_long_one(self):
+        """Test that a long old message is dropped instead of every older message."""
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": "Keep this question"},
+            {"role": "assistant", "content": "word " * 400},
+            {"role": "user", "content": "Short follow-up"},
+            {"role": "assistant", "content": "Short answer"},
+            {"role": "user", "content": "Latest question"},
+        ]
+        optimized = self.provider.optimize_messages(messages, 100)
+
+        self.assertEqual(optimized[0], messages[0])
+        self.assertIn("1 earlier messages were omitted", optimized[1]["content"])
+        self.assertEqual(optimized[2:], [messages[1]] + messages[3:])
+        self.assertLessEqual(get_token_counter().count_messages(optimized), 100)
+
+    def test_tool_results_stay_with_their_call(self):
+        """Test that tool results are dropped together with the requesting message."""
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "assistant", "content": "", "tool_calls": [{"id": "1", "function": {"name": "read"}}]},
+            {"role": "tool", "content": "data " * 400, "tool_call_id": "1"},
+            {"role": "user", "content": "Latest question"},
+        ]
+        optimized = self.provider.optimize_messages(messages, 100)
+
+        self.assertEqual([msg["role"] for msg in optimized], ["system", "system", "user"])
+        self.assertIn("2 earlier messages were omitted", optimized[1]["content"])
+
+
+if __name__ == "__main__":
+    unittest.main()
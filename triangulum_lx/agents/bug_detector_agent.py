@@ -37,6 +37,7 @@ from .message import AgentMessage, MessageType
 from .message_bus import MessageBus
 from .relationship_analyst_agent import RelationshipAnalystAgent
 from ..core.exceptions import TriangulumError
+from ..tooling.source_cache import get_source_cache
 
 logger = logging.getLogger(__name__)
 
@@ -1066,8 +1067,7 @@ class BugDetectorAgent(BaseAgent):
         # If encoding is provided, try it first
         if encoding:
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    return f.read()
+                return get_source_cache().read(file_path, encoding).text
             except UnicodeDecodeError as e:
                 errors.append(f"Failed to read with {encoding} encoding: {e}")
             except Exception as e:
@@ -1328,7 +1328,7 @@ class BugDetectorAgent(BaseAgent):
         try:
             # For Python, use the ast module
             if language == "python":
-                tree = ast.parse(content)
+                tree = get_source_cache().parse(content, file_path)
                 
                 # For null pointer bugs, look for if statements with None checks
                 if bug.bug_type == BugType.NULL_REFERENCE:
@@ -1426,7 +1426,8 @@ class BugDetectorAgent(BaseAgent):
         try:
             if language == "python":
                 # Parse Python AST
-                tree = ast.parse(content)
+                source = get_source_cache().source(content, file_path)
+                tree = source.tree
                 
                 # Find potential null pointer issues
                 for node in ast.walk(tree):
@@ -1436,14 +1437,7 @@ class BugDetectorAgent(BaseAgent):
                         line_num = getattr(node, 'lineno', 0)
                         
                         # Get code line
-                        if line_num > 0:
-                            lines = content.splitlines()
-                            if line_num <= len(lines):
-                                code_line = lines[line_num - 1]
-                            else:
-                                code_line = ""
-                        else:
-                            code_line = ""
+                        code_line = source.line(line_num)
                         
                         # Create a bug if we found a potential issue
                         if self._is_potential_null_access(node, tree):
@@ -0,0 +1,142 @@
+"""
+Chain Journal - Append-only persistence for thought chain mutations.
+
+Rewriting a whole thought chain after every thought writes O(n) bytes per
+thought. A ChainJournal instead appends one JSON line per mutation to a
+per-chain log, so a thought costs O(1) bytes. Writes are flushed to the OS
+immediately and fsynced in groups: the first write after a sync schedules
+one fsync ``sync_interval`` seconds later, which covers every record
+appended in between.
+
+Every record carries a sequence number. Snapshots store the sequence number
+they include, so replaying a journal over a snapshot skips the records the
+snapshot already contains, even if the process died between writing the
+snapshot and truncating the journal.
+"""
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class ChainJournal:
+    """Append-only JSON lines log of the mutations of one thought chain."""
+
+    def __init__(self,
+                path: Union[str, Path],
+                seq: int = 0,
+                entries: int = 0,
+                sync_interval: float = 0.05):
+        """
+        Initialize the journal.
+
+        Args:
+            path: Path of the journal file
+            seq: Sequence number of the last record already written
+            entries: Number of records already in the file
+            sync_interval: Seconds between group fsyncs (0 syncs every record)
+        """
+        self.path = Path(path)
+        self.seq = seq
+        self.entries = entries
+        self.sync_interval = sync_interval
+        self._file = None
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def append(self, op: str, **data: Any) -> int:
+        """
+        Append a mutation record.
+
+        Args:
+            op: Type of mutation
+            **data: JSON-serializable fields of the mutation
+
+        Returns:
+            int: Sequence number of the record
+        """
+        with self._lock:
+            self.seq += 1
+            line = json.dumps({"seq": self.seq, "op": op, **data}, default=str)
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.entries += 1
+            self._dirty = True
+
+            if self.sync_interval <= 0:
+                self._sync_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.sync_interval, self.sync)
+                self._timer.daemon = True
+                self._timer.start()
+            return self.seq
+
+    def _sync_locked(self) -> None:
+        if self._dirty and self._file is not None:
+            os.fsync(self._file.fileno())
+            self._dirty = False
+
+    def sync(self) -> None:
+        """Fsync all records appended so far."""
+        with self._lock:
+            self._timer = None
+            self._sync_locked()
+
+    def truncate(self) -> None:
+        """Drop all records, after they were compacted into a snapshot."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self.path.exists():
+                with open(self.path, "w", encoding="utf-8") as f:
+                    os.fsync(f.fileno())
+            self.entries = 0
+            self._dirty = False
+
+    def close(self) -> None:
+        """Sync and close the journal file."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._sync_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @staticmethod
+    def read(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+        """
+        Read the records of a journal file.
+
+        A torn record at the end of the file, left by a crash during a
+        write, ends the replay.
+
+        Args:
+            path: Path of the journal file
+
+        Yields:
+            Dict[str, Any]: Records in the order they were written
+        """
+        path = Path(path)
+        if not path.exists():
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logger.warning(f"Ignoring torn journal record at {path}:{line_number}")
+                    return
@@ -0,0 +1,259 @@
+"""
+Chain Store - Memory-bounded residency for thought chains and their nodes.
+
+LRUCache is an OrderedDict-based LRU cache with an entry limit and a byte
+budget; lookups, insertions and evictions are O(1). ChainStore is a mapping
+of chain IDs to chains that keeps only the most recently used chains in
+memory. When the resident chains exceed the memory budget, the least
+recently used ones are paged out through a callback (which writes them to
+disk) and paged back in transparently the next time they are looked up.
+"""
+
+import sys
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Set, Tuple
+
+from triangulum_lx.agents.chain_node import ChainNode
+from triangulum_lx.agents.thought_chain import ThoughtChain
+
+logger = logging.getLogger(__name__)
+
+# Approximate size of a ChainNode instance without its content and metadata
+NODE_OVERHEAD = 1024
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory used by a JSON-like value.
+
+    Args:
+        value: Value made of dicts, lists, tuples, sets, strings and scalars
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key) + estimate_size(item)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item)
+    return size
+
+
+def estimate_node_size(node: ChainNode) -> int:
+    """Estimate the memory used by a chain node."""
+    return NODE_OVERHEAD + estimate_size(node.content) + estimate_size(node.metadata)
+
+
+def estimate_chain_size(chain: ThoughtChain) -> int:
+    """Estimate the memory used by the nodes of a chain."""
+    return sum(estimate_node_size(node) for node in chain)
+
+
+class LRUCache:
+    """
+    Least recently used cache bounded by entry count and total bytes.
+
+    The cache is not thread-safe; callers serialize access.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries
+            max_bytes: Maximum total size of the entries (None for no limit)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: Dict[Hashable, Tuple[Any, int]] = OrderedDict()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value and mark it as most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return default
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int = 0) -> None:
+        """
+        Add or replace a value and evict least recently used entries.
+
+        Args:
+            key: Key of the value
+            value: Value to cache
+            size: Size of the value in bytes
+        """
+        self.pop(key)
+        if self.max_entries <= 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return
+        self._entries[key] = (value, size)
+        self.total_bytes += size
+        while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.total_bytes > self.max_bytes):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+            self.stats["evictions"] += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a value and return it."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        self.total_bytes -= entry[1]
+        return entry[0]
+
+    def clear(self) -> None:
+        """Remove all values."""
+        self._entries.clear()
+        self.total_bytes = 0
+
+
+class ChainStore(MutableMapping):
+    """
+    Mapping of chain IDs to chains that pages cold chains out of memory.
+
+    Membership tests and iteration over IDs never page chains in; looking a
+    chain up does.
+    """
+
+    def __init__(self,
+                memory_budget: Optional[int] = None,
+                page_out: Optional[Callable[[str, ThoughtChain], bool]] = None,
+                page_in: Optional[Callable[[str], ThoughtChain]] = None):
+        """
+        Initialize the store.
+
+        Args:
+            memory_budget: Maximum estimated size of the resident chains in
+                bytes (None keeps every chain in memory)
+            page_out: Called with a chain ID and chain to write the chain to
+                disk before it is dropped; returns False if it could not
+            page_in: Called with a chain ID to read a paged out chain
+        """
+        self.memory_budget = memory_budget
+        self._page_out = page_out
+        self._page_in = page_in
+        self._resident: Dict[str, ThoughtChain] = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._paged: Set[str] = set()
+        self.resident_bytes = 0
+        self._lock = threading.RLock()
+        self.stats = {
+            "page_ins": 0,
+            "page_outs": 0
+        }
+
+    def __getitem__(self, chain_id: str) -> ThoughtChain:
+        with self._lock:
+            chain = self._resident.get(chain_id)
+            if chain is not None:
+                self._resident.move_to_end(chain_id)
+                return chain
+            if chain_id not in self._paged:
+                raise KeyError(chain_id)
+
+            chain = self._page_in(chain_id)
+            self._paged.discard(chain_id)
+            self.stats["page_ins"] += 1
+            self._admit(chain_id, chain)
+            return chain
+
+    def __setitem__(self, chain_id: str, chain: ThoughtChain) -> None:
+        with self._lock:
+            self._discard(chain_id)
+            self._admit(chain_id, chain)
+
+    def __delitem__(self, chain_id: str) -> None:
+        with self._lock:
+            if chain_id not in self:
+                raise KeyError(chain_id)
+            self._discard(chain_id)
+
+    def __contains__(self, chain_id: object) -> bool:
+        return chain_id in self._resident or chain_id in self._paged
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._resident) + list(self._paged))
+
+    def __len__(self) -> int:
+        return len(self._resident) + len(self._paged)
+
+    def clear(self) -> None:
+        """Forget all chains without paging any in."""
+        with self._lock:
+            self._resident.clear()
+            self._sizes.clear()
+            self._paged.clear()
+            self.resident_bytes = 0
+
+    def is_resident(self, chain_id: str) -> bool:
+        """Check if a chain is currently held in memory."""
+        return chain_id in self._resident
+
+    def resize(self, chain_id: str, delta: Optional[int] = None) -> None:
+        """
+        Update the size of a resident chain after it changed.
+
+        Args:
+            chain_id: ID of the chain
+            delta: Change of the size in bytes (None re-estimates the chain)
+        """
+        with self._lock:
+            if chain_id not in self._resident:
+                return
+            if delta is None:
+                delta = estimate_chain_size(self._resident[chain_id]) - self._sizes[chain_id]
+            self._sizes[chain_id] += delta
+            self.resident_bytes += delta
+            self._enforce_budget()
+
+    def _discard(self, chain_id: str) -> None:
+        if chain_id in self._resident:
+            del self._resident[chain_id]
+            self.resident_bytes -= self._sizes.pop(chain_id)
+        self._paged.discard(chain_id)
+
+    def _admit(self, chain_id: str, chain: ThoughtChain) -> None:
+        size = estimate_chain_size(chain)
+        self._resident[chain_id] = chain
+        self._sizes[chain_id] = size
+        self.resident_bytes += size
+        self._enforce_budget()
+
+    def _enforce_budget(self) -> None:
+        """Page out least recently used chains until the budget is met."""
+        if self.memory_budget is None or self._page_out is None:
+            return
+        # The most recently used chain stays resident even if it is too large
+        while self.resident_bytes > self.memory_budget and len(self._resident) > 1:
+            chain_id, chain = next(iter(self._resident.items()))
+            if not self._page_out(chain_id, chain):
+                logger.warning(f"Could not page out chain {chain_id}; keeping it in memory")
+                return
+            del self._resident[chain_id]
+            self.resident_bytes -= self._sizes.pop(chain_id)
+            self._paged.add(chain_id)
+            self.stats["page_outs"] += 1
@@ -18,6 +18,8 @@ import heapq
 from enum import Enum
 import re
 
+from triangulum_lx.providers.tokenization import get_token_counter
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -907,29 +909,17 @@ class ContextPreserver:
         """
         Estimate the number of tokens in a text string.
         
+        Uses the shared token counting service, so counts agree with the
+        provider context packing and are memoised per text.
+        
         Args:
             text: Text to estimate token count for
             
         Returns:
             token_count: Estimated token count
         """
-        # In a real implementation, this would use model-specific tokenization
-        # For now, we'll use a simple approximation: ~1.3 tokens per word
-        
-        # Split into words
-        words = re.findall(r'\b\w+\b', text)
-        
-        # Estimate token count (4 chars ~= 1 token is another approximation)
-        char_count = len(text)
-        
-        # Blend word-based and char-based estimates
-        word_estimate = len(words) * 1.3
-        char_estimate = char_count / 4
-        
-        token_count = int((word_estimate + char_estimate) / 2)
-        
         # Ensure minimum of 1 token
-        return max(1, token_count)
+        return max(1, get_token_counter().count(text))
 
 
 # Example usage
@@ -27,6 +27,7 @@ from .base_agent import BaseAgent
 from .message import AgentMessage, MessageType, ConfidenceLevel
 from .message_bus import MessageBus
 from ..core.exceptions import TriangulumError, ImplementationError
+from ..tooling.source_cache import get_source_cache
 
 logger = logging.getLogger(__name__)
 
@@ -602,7 +603,7 @@ class ImplementationAgent(BaseAgent):
         
         # Parse Python AST
         try:
-            tree = ast.parse(content)
+            tree = get_source_cache().parse(content)
             
             # Extract function and class definitions
             functions = []
@@ -2576,7 +2577,7 @@ class ImplementationAgent(BaseAgent):
         # If using AST parsing and it's a Python file
         if parse:
             try:
-                tree = ast.parse(file_content)
+                tree = get_source_cache().parse(file_content)
                 
                 # Find all function definitions
                 for node in ast.walk(tree):
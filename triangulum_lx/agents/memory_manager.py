@@ -13,6 +13,7 @@ from typing import Dict, List, Any, Optional, Union, Callable, Set, Tuple
 import re
 
 from triangulum_lx.agents.message import AgentMessage, MessageType, ConversationMemory
+from triangulum_lx.providers.tokenization import get_token_counter, pack
 
 logger = logging.getLogger(__name__)
 
@@ -29,36 +30,34 @@ class RetrievalStrategy(enum.Enum):
 
 
 class TokenCounter:
-    """Utility class for counting tokens in text."""
+    """Utility class for counting tokens in text using the shared token counting service."""
     
     @staticmethod
     def count_tokens(text: str) -> int:
         """
-        Count the approximate number of tokens in a text.
-        This is a simple approximation - for production use, 
-        this should be replaced with a proper tokenizer.
+        Count the number of tokens in a text.
+        
+        Counts come from the process-wide token counting service, which uses
+        a BPE tokenizer when one is installed and memoises counts per text.
         
         Args:
             text: The text to count tokens for
             
         Returns:
-            int: Approximate token count
+            int: Token count
         """
-        # Simple approximation: split on whitespace and punctuation
-        # In production, use the actual tokenizer from the LLM provider
-        tokens = re.findall(r'\w+|[^\w\s]', text)
-        return len(tokens)
+        return get_token_counter().count(text)
     
     @staticmethod
     def count_message_tokens(message: AgentMessage) -> int:
         """
-        Count the approximate number of tokens in a message.
+        Count the number of tokens in a message.
         
         Args:
             message: The message to count tokens for
             
         Returns:
-            int: Approximate token count
+            int: Token count
         """
         # Convert message to JSON for token counting
         message_json = message.to_json()
@@ -74,6 +73,9 @@ class MemoryManager:
     and intelligent message selection to optimize context while staying within token limits.
     """
     
+    # Value of a message relative to the one ranked before it when packing the token budget
+    RANK_DECAY = 0.9
+    
     def __init__(self, max_tokens: int = 4000):
         """
         Initialize the memory manager.
@@ -410,32 +412,31 @@ class MemoryManager:
         """
         Apply token limit to a list of messages.
         
+        Messages are ranked by the retrieval strategy. The first message
+        that fits is always kept, and the remaining budget is packed with
+        the subset of messages of highest total rank value, so a long message
+        does not crowd out several shorter ones that fit.
+        
         Args:
-            messages: List of messages to apply limit to
+            messages: List of messages to apply limit to, most important first
             token_limit: Maximum number of tokens to include
             
         Returns:
-            List[AgentMessage]: Messages within token limit
+            List[AgentMessage]: Messages within token limit, in ranked order
         """
-        result = []
-        token_count = 0
-        
+        costs = []
         for message in messages:
             message_tokens = TokenCounter.count_message_tokens(message)
-            
-            # Skip if this single message exceeds the token limit
-            if not result and message_tokens > token_limit:
+            if message_tokens > token_limit:
                 logger.warning(f"Message {message.message_id} exceeds token limit ({message_tokens} > {token_limit})")
-                continue
-            
-            # Add message if it fits within the limit
-            if token_count + message_tokens <= token_limit:
-                result.append(message)
-                token_count += message_tokens
-            else:
-                break
+            costs.append(message_tokens)
+        
+        first = next((i for i, cost in enumerate(costs) if cost <= token_limit), None)
+        if first is None:
+            return []
         
-        return result
+        values = [self.RANK_DECAY ** rank for rank in range(len(messages))]
+        return [messages[i] for i in pack(costs, values, token_limit, required=[first])]
     
     def summarize_conversation(self, conversation: ConversationMemory, max_tokens: int = 200) -> str:
         """
@@ -11,15 +11,16 @@ import os
 import time
 import traceback
 import threading
-import queue
 import enum
 from typing import Dict, List, Set, Tuple, Any, Optional, Union, Callable
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 
 from .base_agent import BaseAgent
 from .message import AgentMessage, MessageType, ConfidenceLevel
 from .message_bus import MessageBus
+from .timer_wheel import TimerWheel
 from ..core.exceptions import TriangulumError
 
 logger = logging.getLogger(__name__)
@@ -286,7 +287,9 @@ class TaskQueue:
     Priority queue for orchestration tasks.
     
     This class manages the queue of tasks to be executed by the orchestrator,
-    with priority-based scheduling.
+    with priority-based scheduling. Tasks are also indexed by status, so
+    looking up the tasks with one status does not scan every task ever
+    queued; call update_task after changing the status of a task.
     """
     
     def __init__(self, max_size: int = 100):
@@ -297,27 +300,44 @@ class TaskQueue:
             max_size: Maximum size of the queue
         """
         self.tasks = {}  # task_id -> Task
-        self.queues = {
-            TaskPriority.CRITICAL: queue.PriorityQueue(max_size),
-            TaskPriority.HIGH: queue.PriorityQueue(max_size),
-            TaskPriority.MEDIUM: queue.PriorityQueue(max_size),
-            TaskPriority.LOW: queue.PriorityQueue(max_size),
-            TaskPriority.BACKGROUND: queue.PriorityQueue(max_size)
-        }
+        self.max_size = max_size
+        # One FIFO per priority; tasks are enqueued in creation order, so
+        # older tasks come first without a heap
+        self.queues = {priority: deque() for priority in TaskPriority}
+        self.status_index = {}  # status -> {task_id: Task} in insertion order
+        self.indexed_status = {}  # task_id -> status the task is indexed under
         self.lock = threading.RLock()
     
     def add_task(self, task: Task):
         """
         Add a task to the queue.
         
+        Adding a task that is already known puts it back at the front of its
+        priority, for example to retry it.
+        
         Args:
             task: The task to add
         """
         with self.lock:
-            self.tasks[task.id] = task
-            # Use creation time as secondary priority (older tasks first)
-            priority_tuple = (task.priority, task.created_at.timestamp())
-            self.queues[task.priority].put((priority_tuple, task.id))
+            known = task.id in self.tasks
+            self._index_task(task)
+            task_queue = self.queues[task.priority]
+            if known:
+                task_queue.appendleft(task.id)
+            else:
+                task_queue.append(task.id)
+            if len(task_queue) > self.max_size:
+                logger.warning(f"{len(task_queue)} tasks of priority {task.priority.name} are waiting "
+                               f"(max_size {self.max_size})")
+    
+    def _index_task(self, task: Task):
+        """Store a task and move it to the index of its current status."""
+        previous_status = self.indexed_status.get(task.id)
+        if previous_status is not None:
+            self.status_index[previous_status].pop(task.id, None)
+        self.tasks[task.id] = task
+        self.indexed_status[task.id] = task.status
+        self.status_index.setdefault(task.status, {})[task.id] = task
     
     def get_next_task(self) -> Optional[Task]:
         """
@@ -329,8 +349,9 @@ class TaskQueue:
         with self.lock:
             # Try to get a task from each queue in priority order
             for priority in TaskPriority:
-                if not self.queues[priority].empty():
-                    _, task_id = self.queues[priority].get()
+                task_queue = self.queues[priority]
+                while task_queue:
+                    task_id = task_queue.popleft()
                     if task_id in self.tasks:
                         return self.tasks[task_id]
             
@@ -360,8 +381,8 @@ class TaskQueue:
             True if the task was removed, False otherwise
         """
         with self.lock:
-            if task_id in self.tasks:
-                del self.tasks[task_id]
+            if self.tasks.pop(task_id, None) is not None:
+                self.status_index[self.indexed_status.pop(task_id)].pop(task_id, None)
                 return True
             return False
     
@@ -374,7 +395,7 @@ class TaskQueue:
         """
         with self.lock:
             if task.id in self.tasks:
-                self.tasks[task.id] = task
+                self._index_task(task)
     
     def get_tasks_by_status(self, status: str) -> List[Task]:
         """
@@ -387,7 +408,7 @@ class TaskQueue:
             List of tasks with the specified status
         """
         with self.lock:
-            return [task for task in self.tasks.values() if task.status == status]
+            return list(self.status_index.get(status, {}).values())
     
     def get_tasks_by_workflow(self, workflow_id: str) -> List[Task]:
         """
@@ -499,18 +520,25 @@ class OrchestratorAgent(BaseAgent):
         self.task_results = {}
         self.error_counts = {}
         
-        # Task distribution and worker thread control
+        # Task distribution and worker thread control. The distribution
+        # thread blocks on task_event until a task is enqueued and hands
+        # assigned tasks to the workers through ready_tasks.
         self.task_distribution_thread = None
         self.worker_threads = []
         self.task_event = threading.Event()
         self.shutdown_event = threading.Event()
+        self.ready_tasks = deque()
+        self.ready_condition = threading.Condition()
         
         # Locks for thread safety
         self.task_lock = threading.RLock()
         self.result_lock = threading.RLock()
         
-        # Timeout and progress tracking
+        # Timeout and progress tracking run on a timer wheel instead of
+        # periodically scanning the active tasks
         self.progress_thread = None
+        self.timer_wheel = TimerWheel(tick=self.config.get("timer_tick", 0.1))
+        self.task_timers = {}  # task_id -> {timer name: handle}
         self.operation_to_task_map = {}  # Map operation IDs to task IDs for cross-referencing
         self.task_progress_events = {}  # Store task progress milestones for event emission
         
@@ -571,161 +599,218 @@ class OrchestratorAgent(BaseAgent):
         logger.info(f"Started task distribution, {self.worker_count} worker threads, and progress tracking")
         
     def _progress_tracking_loop(self):
-        """Monitor task progress and handle timeouts."""
-        while not self.shutdown_event.is_set():
-            try:
-                # Get active tasks
-                tasks = self.task_queue.get_tasks_by_status("in_progress")
-                current_time = time.time()
-                
-                for task in tasks:
-                    # Check for timeout
-                    if task.task_start_time and self.timeout > 0:
-                        elapsed = current_time - task.task_start_time
-                        
-                        # Calculate percentage based on elapsed time vs timeout
-                        # Cap at 99% until explicitly completed
-                        estimated_percentage = min(99.0, (elapsed / self.timeout) * 100.0)
-                        
-                        # Update operation progress in the engine monitor if available
-                        operation_id = task.content.get("_metadata", {}).get("operation_id")
-                        if operation_id and self._engine_monitor:
-                            # Calculate appropriate step based on workflow stage
-                            current_step = task.current_step if hasattr(task, 'current_step') else 1
-                            total_steps = task.total_steps if hasattr(task, 'total_steps') else 5
-                            
-                            # Update the operation progress
-                            self._engine_monitor.update_operation(
-                                operation_id=operation_id,
-                                current_step=current_step,
-                                total_steps=total_steps,
-                                details={
-                                    "estimated_percentage": estimated_percentage,
-                                    "elapsed_time": elapsed,
-                                    "task_id": task.id,
-                                    "status": task.status
-                                }
-                            )
-                            
-                            # Emit progress event if enabled
-                            if self.enable_progress_events:
-                                # Check for milestone events (25%, 50%, 75%)
-                                for milestone in [25, 50, 75]:
-                                    milestone_key = f"{task.id}_milestone_{milestone}"
-                                    if estimated_percentage >= milestone and milestone_key not in self.task_progress_events:
-                                        self.task_progress_events[milestone_key] = True
-                                        logger.info(f"Task {task.id} reached {milestone}% progress milestone")
-                                        
-                                        # Broadcast status for monitoring
-                                        self.broadcast_status(
-                                            status=f"Task {task.id} reached {milestone}% completion",
-                                            metadata={
-                                                "task_id": task.id,
-                                                "progress": milestone,
-                                                "event_type": "progress_milestone"
-                                            }
-                                        )
-                            
-                            # Check for timeout
-                            if elapsed > self.timeout + self.timeout_grace_period:
-                                logger.warning(f"Task {task.id} timed out after {elapsed:.1f} seconds (timeout: {self.timeout}s)")
-                                
-                                # Gracefully cancel the operation
-                                with self.task_lock:
-                                    # Mark the task as failed due to timeout
-                                    task.mark_failed(f"Operation timed out after {elapsed:.1f} seconds")
-                                    task.processing_stages.append("Timed out")
-                                    self.task_queue.update_task(task)
-                                    
-                                    # Cancel the operation in the engine monitor
-                                    self._engine_monitor.timeout_operation(
-                                        operation_id=operation_id,
-                                        details={
-                                            "task_id": task.id,
-                                            "elapsed_time": elapsed,
-                                            "timeout": self.timeout
-                                        }
-                                    )
-                                    
-                                    # Emit timeout event
-                                    self.broadcast_status(
-                                        status=f"Task {task.id} timed out after {elapsed:.1f} seconds",
-                                        metadata={
-                                            "task_id": task.id,
-                                            "elapsed_time": elapsed,
-                                            "timeout": self.timeout,
-                                            "event_type": "timeout"
-                                        }
-                                    )
-                                    
-                                    # Remove from pending tasks if present
-                                    if task.workflow_id in self.pending_tasks:
-                                        del self.pending_tasks[task.workflow_id]
-                
-                # Sleep for the progress update interval
-                time.sleep(self.progress_update_interval)
-                
-            except Exception as e:
-                logger.error(f"Error in progress tracking loop: {str(e)}")
-                logger.debug(traceback.format_exc())
-                time.sleep(self.progress_update_interval)  # Sleep to avoid spinning on errors
+        """Run the timer wheel that drives progress updates and timeouts."""
+        try:
+            self.timer_wheel.run()
+        except Exception as e:
+            logger.error(f"Error in progress tracking loop: {str(e)}")
+            logger.debug(traceback.format_exc())
+    
+    def _track_task_progress(self, task: Task):
+        """
+        Schedule the progress updates, milestones and timeout of a started task.
+        
+        Args:
+            task: The task that was just started
+        """
+        operation_id = task.content.get("_metadata", {}).get("operation_id")
+        if not (operation_id and self._engine_monitor and self.timeout > 0):
+            return
+        
+        handles = {
+            "progress": self.timer_wheel.schedule(self.progress_update_interval, self._update_task_progress, task),
+            "timeout": self.timer_wheel.schedule(
+                self.timeout + self.timeout_grace_period, self._handle_task_timeout, task)
+        }
+        if self.enable_progress_events:
+            # Milestone events at 25%, 50% and 75% of the timeout
+            for milestone in [25, 50, 75]:
+                handles[f"milestone_{milestone}"] = self.timer_wheel.schedule(
+                    self.timeout * milestone / 100.0, self._emit_progress_milestone, task, milestone)
+        
+        with self.task_lock:
+            self.task_timers[task.id] = handles
+    
+    def _cancel_task_timers(self, task_id: str):
+        """Cancel the progress timers of a task that is no longer running."""
+        with self.task_lock:
+            handles = self.task_timers.pop(task_id, {})
+        for handle in handles.values():
+            self.timer_wheel.cancel(handle)
+    
+    def _update_task_progress(self, task: Task):
+        """Report the estimated progress of a running task to the engine monitor."""
+        if task.status != "in_progress":
+            return
+        
+        elapsed = time.time() - task.task_start_time
+        
+        # Calculate percentage based on elapsed time vs timeout
+        # Cap at 99% until explicitly completed
+        estimated_percentage = min(99.0, (elapsed / self.timeout) * 100.0)
+        
+        # Calculate appropriate step based on workflow stage
+        current_step = task.current_step if hasattr(task, 'current_step') else 1
+        total_steps = task.total_steps if hasattr(task, 'total_steps') else 5
+        
+        # Update the operation progress
+        self._engine_monitor.update_operation(
+            operation_id=task.content["_metadata"]["operation_id"],
+            current_step=current_step,
+            total_steps=total_steps,
+            details={
+                "estimated_percentage": estimated_percentage,
+                "elapsed_time": elapsed,
+                "task_id": task.id,
+                "status": task.status
+            }
+        )
+        
+        with self.task_lock:
+            # Replace the handle of the update that just fired
+            if task.status == "in_progress" and task.id in self.task_timers:
+                self.task_timers[task.id]["progress"] = self.timer_wheel.schedule(
+                    self.progress_update_interval, self._update_task_progress, task)
+    
+    def _emit_progress_milestone(self, task: Task, milestone: int):
+        """Broadcast that a running task reached a progress milestone."""
+        milestone_key = f"{task.id}_milestone_{milestone}"
+        if task.status != "in_progress" or milestone_key in self.task_progress_events:
+            return
+        
+        self.task_progress_events[milestone_key] = True
+        logger.info(f"Task {task.id} reached {milestone}% progress milestone")
+        
+        # Broadcast status for monitoring
+        self.broadcast_status(
+            status=f"Task {task.id} reached {milestone}% completion",
+            metadata={
+                "task_id": task.id,
+                "progress": milestone,
+                "event_type": "progress_milestone"
+            }
+        )
+    
+    def _handle_task_timeout(self, task: Task):
+        """Fail a task that ran longer than the timeout and its grace period."""
+        operation_id = task.content.get("_metadata", {}).get("operation_id")
+        
+        # Gracefully cancel the operation
+        with self.task_lock:
+            if task.status != "in_progress":
+                return
+            elapsed = time.time() - task.task_start_time
+            logger.warning(f"Task {task.id} timed out after {elapsed:.1f} seconds (timeout: {self.timeout}s)")
+            
+            # Mark the task as failed due to timeout
+            task.mark_failed(f"Operation timed out after {elapsed:.1f} seconds")
+            task.last_error = f"Operation timed out after {elapsed:.1f} seconds"
+            task.processing_stages.append("Timed out")
+            self.task_queue.update_task(task)
+            self._cancel_task_timers(task.id)
+            
+            # Cancel the operation in the engine monitor
+            self._engine_monitor.timeout_operation(
+                operation_id=operation_id,
+                details={
+                    "task_id": task.id,
+                    "elapsed_time": elapsed,
+                    "timeout": self.timeout
+                }
+            )
+            
+            # Emit timeout event
+            self.broadcast_status(
+                status=f"Task {task.id} timed out after {elapsed:.1f} seconds",
+                metadata={
+                    "task_id": task.id,
+                    "elapsed_time": elapsed,
+                    "timeout": self.timeout,
+                    "event_type": "timeout"
+                }
+            )
+            
+            # Remove from pending tasks if present
+            if task.workflow_id in self.pending_tasks:
+                del self.pending_tasks[task.workflow_id]
     
     def _task_distribution_loop(self):
         """Main loop for distributing tasks to worker threads."""
         while not self.shutdown_event.is_set():
             try:
-                # Get next task from queue based on priority
-                task = self.task_queue.get_next_task()
-                
-                if task is not None and task.status == "pending":
-                    # Check if task can be assigned to an agent
-                    assigned_agent_id = self._assign_task_to_agent(task)
-                    
-                    if assigned_agent_id:
-                        # Mark task as in progress and assign to agent
-                        with self.task_lock:
-                            task.mark_started()
-                            task.assigned_agent = assigned_agent_id
-                            task.task_start_time = time.time()
-                            task.processing_stages.append(f"Assigned to agent {assigned_agent_id}")
-                            self.task_queue.update_task(task)
-                            
-                            # Store metadata about assigned agent
-                            if not task.content.get("_metadata"):
-                                task.content["_metadata"] = {}
-                            task.content["_metadata"]["assigned_agent"] = assigned_agent_id
-                            task.content["_metadata"]["assigned_at"] = datetime.now().isoformat()
-                        
-                        # Signal workers that a task is available
-                        self.task_event.set()
-                        logger.info(f"Task {task.id} assigned to agent {assigned_agent_id}")
-                    else:
-                        # No agent available for this task, put it back in the queue
-                        # with a delay to avoid busy waiting on unavailable agents
-                        logger.warning(f"No agent available for task {task.id} with required capabilities: {task.required_capabilities}")
-                        task.retry_count += 1
-                        task.last_error = "No agent available with required capabilities"
-                        
-                        # If we've tried too many times, mark as failed
-                        if task.retry_count >= task.max_retries:
-                            with self.task_lock:
-                                task.mark_failed("Failed to find available agent after maximum retries")
-                                self.task_queue.update_task(task)
-                            logger.error(f"Task {task.id} failed after {task.retry_count} attempts to find an agent")
-                        else:
-                            # Record this attempt in processing stages
-                            task.processing_stages.append(f"No agent available (attempt {task.retry_count})")
-                            self.task_queue.update_task(task)
-                            # Sleep a bit longer than normal to allow agents to become available
-                            time.sleep(self.task_check_interval * 2)
+                # Block until a task is enqueued (or shutdown is requested)
+                self.task_event.wait()
+                self.task_event.clear()
                 
-                # Sleep a bit to avoid busy waiting
-                time.sleep(self.task_check_interval)
+                # Distribute every queued task in priority order
+                while not self.shutdown_event.is_set():
+                    task = self.task_queue.get_next_task()
+                    if task is None:
+                        break
+                    if task.status == "pending":
+                        self._distribute_task(task)
             
             except Exception as e:
                 logger.error(f"Error in task distribution loop: {str(e)}")
                 logger.debug(traceback.format_exc())
     
+    def _distribute_task(self, task: Task):
+        """
+        Assign a pending task to an agent and hand it to a worker.
+        
+        Args:
+            task: The task taken from the queue
+        """
+        # Check if task can be assigned to an agent
+        assigned_agent_id = self._assign_task_to_agent(task)
+        
+        if assigned_agent_id:
+            # Mark task as in progress and assign to agent
+            with self.task_lock:
+                task.mark_started()
+                task.assigned_agent = assigned_agent_id
+                task.task_start_time = time.time()
+                task.processing_stages.append(f"Assigned to agent {assigned_agent_id}")
+                self.task_queue.update_task(task)
+                
+                # Store metadata about assigned agent
+                if not task.content.get("_metadata"):
+                    task.content["_metadata"] = {}
+                task.content["_metadata"]["assigned_agent"] = assigned_agent_id
+                task.content["_metadata"]["assigned_at"] = datetime.now().isoformat()
+            
+            self._track_task_progress(task)
+            
+            # Hand the task to a waiting worker
+            with self.ready_condition:
+                self.ready_tasks.append(task)
+                self.ready_condition.notify()
+            logger.info(f"Task {task.id} assigned to agent {assigned_agent_id}")
+        else:
+            # No agent available for this task, put it back in the queue
+            # after a delay to give agents time to become available
+            logger.warning(f"No agent available for task {task.id} with required capabilities: {task.required_capabilities}")
+            task.retry_count += 1
+            task.last_error = "No agent available with required capabilities"
+            
+            # If we've tried too many times, mark as failed
+            if task.retry_count >= task.max_retries:
+                with self.task_lock:
+                    task.mark_failed("Failed to find available agent after maximum retries")
+                    self.task_queue.update_task(task)
+                logger.error(f"Task {task.id} failed after {task.retry_count} attempts to find an agent")
+            else:
+                # Record this attempt in processing stages
+                task.processing_stages.append(f"No agent available (attempt {task.retry_count})")
+                self.task_queue.update_task(task)
+                self.timer_wheel.schedule(self.task_check_interval * 2, self._requeue_task, task)
+    
+    def _requeue_task(self, task: Task):
+        """Put a pending task back in the queue and wake the distribution thread."""
+        if task.status == "pending":
+            self.task_queue.add_task(task)
+            self.task_event.set()
+    
     def _assign_task_to_agent(self, task: Task) -> Optional[str]:
         """
         Assign a task to an appropriate agent based on capabilities or target agent type.
@@ -796,30 +881,21 @@ class OrchestratorAgent(BaseAgent):
     
     def _worker_loop(self):
         """Worker loop for processing tasks."""
-        while not self.shutdown_event.is_set():
+        while True:
             try:
-                # Wait for task to be available
-                self.task_event.wait(self.task_check_interval)
-                self.task_event.clear()
-                
-                # Look for in_progress tasks
-                in_progress_tasks = self.task_queue.get_tasks_by_status("in_progress")
-                
-                if not in_progress_tasks:
-                    continue
+                # Wait for the distribution thread to hand over a task
+                with self.ready_condition:
+                    while not self.ready_tasks and not self.shutdown_event.is_set():
+                        self.ready_condition.wait()
+                    if self.shutdown_event.is_set():
+                        return
+                    task = self.ready_tasks.popleft()
                 
-                # Try to claim a task using task_lock to avoid race conditions
-                task = None
+                # Skip tasks that were cancelled or timed out while waiting
                 with self.task_lock:
-                    for t in in_progress_tasks:
-                        # Check if task is being processed by another worker
-                        if t.workflow_id not in self.pending_tasks:
-                            task = t
-                            self.pending_tasks[t.workflow_id] = True
-                            break
-                
-                if task is None:
-                    continue
+                    if task.status != "in_progress":
+                        continue
+                    self.pending_tasks[task.workflow_id] = True
                 
                 # Process the task
                 try:
@@ -834,8 +910,10 @@ class OrchestratorAgent(BaseAgent):
                     
                     # Mark task as completed
                     with self.task_lock:
-                        task.mark_completed(result)
-                        self.task_queue.update_task(task)
+                        self._cancel_task_timers(task.id)
+                        if task.status == "in_progress":
+                            task.mark_completed(result)
+                            self.task_queue.update_task(task)
                         
                         # Store result
                         with self.result_lock:
@@ -859,14 +937,17 @@ class OrchestratorAgent(BaseAgent):
                     
                     # Mark task as failed
                     with self.task_lock:
-                        task.mark_failed(str(e))
-                        self.task_queue.update_task(task)
+                        self._cancel_task_timers(task.id)
+                        timed_out = task.status != "in_progress"
+                        if not timed_out:
+                            task.mark_failed(str(e))
+                            self.task_queue.update_task(task)
                         
                         # Check if task can be retried
-                        if task.can_retry(self.max_retries):
+                        if not timed_out and task.can_retry(self.max_retries):
                             logger.info(f"Retrying task {task.id} (attempt {task.attempts}/{self.max_retries})")
                             task.status = "pending"
-                            self.task_queue.update_task(task)
+                            self._requeue_task(task)
                         else:
                             # Store failure result
                             with self.result_lock:
@@ -897,6 +978,12 @@ class OrchestratorAgent(BaseAgent):
         logger.info("Shutting down OrchestratorAgent")
         self.shutdown_event.set()
         
+        # Wake the threads that block waiting for work
+        self.task_event.set()
+        with self.ready_condition:
+            self.ready_condition.notify_all()
+        self.timer_wheel.stop()
+        
         # Wait for worker threads to terminate
         for thread in self.worker_threads:
             thread.join(timeout=5.0)
@@ -981,9 +1068,6 @@ class OrchestratorAgent(BaseAgent):
         task.content["_metadata"]["created_at"] = task.created_at.isoformat()
         task.content["_metadata"]["priority"] = str(priority)
         
-        # Add task to queue
-        self.task_queue.add_task(task)
-        
         # Register callback if provided
         if callback:
             self.task_callbacks[task_id] = callback
@@ -999,15 +1083,14 @@ class OrchestratorAgent(BaseAgent):
             self._engine_monitor.start_operation(operation_id)
             
             # Store operation ID in task metadata
-            if not task.content.get("_metadata"):
-                task.content["_metadata"] = {}
             task.content["_metadata"]["operation_id"] = operation_id
             
             # Map operation ID to task ID for lookup
             self.operation_to_task_map[operation_id] = task_id
-            
-            # Update task in queue with metadata
-            self.task_queue.update_task(task)
+        
+        # Add task to queue only once it is fully set up: the distributor may
+        # assign it as soon as it is queued
+        self.task_queue.add_task(task)
         
         logger.info(f"Enqueued {task_type} task with ID {task_id} and priority {priority}")
         
@@ -1339,6 +1422,7 @@ class OrchestratorAgent(BaseAgent):
                 task.completed_at = datetime.now()
                 task.processing_stages.append("Cancelled by user request")
                 self.task_queue.update_task(task)
+                self._cancel_task_timers(task_id)
                 
                 # Cancel any associated operation
                 operation_id = task.content.get("_metadata", {}).get("operation_id")
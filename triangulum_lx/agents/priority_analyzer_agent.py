@@ -16,6 +16,8 @@ from typing import Dict, Any, Optional, List, Tuple, Set
 from enum import Enum
 import math
 
+import networkx as nx
+
 from .base_agent import BaseAgent
 from .message import AgentMessage, MessageType, ConfidenceLevel
 
@@ -99,6 +101,9 @@ class PriorityAnalyzerAgent(BaseAgent):
         # Cache for priority calculations
         self.priority_cache = {}
         
+        # Dependency depths of the last relationships snapshot
+        self._depth_cache: Optional[Tuple[Tuple[Tuple[str, Tuple[str, ...]], ...], Dict[str, int]]] = None
+        
         # History of priority analyses
         self.analysis_history = []
         
@@ -688,57 +693,72 @@ class PriorityAnalyzerAgent(BaseAgent):
         """
         Calculate the maximum dependency depth for each file.
         
+        Strongly connected components (import cycles) are condensed into
+        single nodes, and the longest path is computed once per component in
+        reverse topological order, so the whole pass runs in O(V + E). Files in
+        the same cycle share a depth. Results are cached for the last
+        relationships snapshot.
+        
         Args:
-            relationships: Dictionary representing the dependency graph
+            relationships: Dictionary representing the dependency graph, either
+                as ``{"nodes": ..., "edges": [...]}`` or as a mapping of file
+                paths to their ``dependencies`` and ``dependents``
             
         Returns:
             Dictionary mapping file paths to their maximum dependency depth
         """
-        depths = {}
-        visited = set()
-        
-        # Extract nodes and edges from relationships data
-        nodes = relationships.get("nodes", {})
-        edges = relationships.get("edges", [])
+        dependency_map = self._build_dependency_map(relationships)
+        
+        snapshot = tuple((file_path, tuple(deps)) for file_path, deps in dependency_map.items())
+        if self._depth_cache is not None and self._depth_cache[0] == snapshot:
+            return dict(self._depth_cache[1])
+        
+        graph = nx.DiGraph()
+        graph.add_nodes_from(dependency_map)
+        for file_path, dependencies in dependency_map.items():
+            graph.add_edges_from((file_path, dep) for dep in dependencies)
+        
+        condensed = nx.condensation(graph)
+        component_depths = {}
+        for component in reversed(list(nx.topological_sort(condensed))):
+            component_depths[component] = max(
+                (component_depths[successor] + 1 for successor in condensed.successors(component)),
+                default=0
+            )
         
-        # Build a dependency map
-        dependency_map = {}
-        for file_path in nodes:
-            dependency_map[file_path] = []
+        mapping = condensed.graph["mapping"]
+        depths = {file_path: component_depths[mapping[file_path]] for file_path in graph}
         
-        for edge in edges:
-            source = edge.get("source", "")
-            target = edge.get("target", "")
-            if source and target:
-                if source not in dependency_map:
-                    dependency_map[source] = []
-                dependency_map[source].append(target)
+        self._depth_cache = (snapshot, depths)
+        return dict(depths)
+    
+    def _build_dependency_map(self, relationships: Dict[str, Any]) -> Dict[str, List[str]]:
+        """
+        Build a file -> dependencies map from either relationships format.
         
-        def calculate_depth(file_path: str, current_depth: int = 0) -> int:
-            if file_path in visited:
-                return 0  # Avoid cycles
-            
-            visited.add(file_path)
-            
-            if file_path not in dependency_map:
-                return current_depth
-            
-            dependencies = dependency_map[file_path]
-            if not dependencies:
-                return current_depth
-            
-            max_depth = current_depth
-            for dep in dependencies:
-                depth = calculate_depth(dep, current_depth + 1)
-                max_depth = max(max_depth, depth)
+        Args:
+            relationships: Dictionary representing the dependency graph
             
-            visited.remove(file_path)
-            return max_depth
+        Returns:
+            Dictionary mapping file paths to the files they depend on
+        """
+        dependency_map = {}
         
-        for file_path in dependency_map:
-            depths[file_path] = calculate_depth(file_path)
+        if "edges" in relationships or "nodes" in relationships:
+            for file_path in relationships.get("nodes", {}):
+                dependency_map[file_path] = []
+            
+            for edge in relationships.get("edges", []):
+                source = edge.get("source", "")
+                target = edge.get("target", "")
+                if source and target:
+                    dependency_map.setdefault(source, []).append(target)
+        else:
+            for file_path, file_relationships in relationships.items():
+                if isinstance(file_relationships, dict):
+                    dependency_map[file_path] = list(file_relationships.get("dependencies", []))
         
-        return depths
+        return dependency_map
 
     def _estimate_complexity(
         self, 
@@ -10,9 +10,13 @@ import os
 import time
 import logging
 import json
-from typing import Dict, List, Set, Any, Optional, Tuple
+from typing import Dict, List, Set, Any, Optional, Tuple, Iterator
 from collections import defaultdict
 from datetime import datetime
+from itertools import islice
+
+import networkx as nx
+import numpy as np
 
 from .base_agent import BaseAgent
 from .message import AgentMessage, MessageType
@@ -218,10 +222,9 @@ class RelationshipAnalystAgent(BaseAgent):
             raise ValueError("No analysis has been performed yet. Call analyze_codebase first.")
         
         if transitive:
-            return self.graph.transitive_dependents(file_path)
+            return self.graph.freeze().transitive_dependents(file_path)
         else:
-            incoming = self.graph.get_incoming_edges(file_path)
-            return {edge.source for edge in incoming}
+            return set(self.graph.get_incoming_edges(file_path))
     
     def get_file_dependencies(self, file_path: str, transitive: bool = False) -> Set[str]:
         """
@@ -238,10 +241,9 @@ class RelationshipAnalystAgent(BaseAgent):
             raise ValueError("No analysis has been performed yet. Call analyze_codebase first.")
         
         if transitive:
-            return self.graph.transitive_dependencies(file_path)
+            return self.graph.freeze().transitive_dependencies(file_path)
         else:
-            outgoing = self.graph.get_outgoing_edges(file_path)
-            return {edge.target for edge in outgoing}
+            return set(self.graph.get_outgoing_edges(file_path))
     
     def calculate_impact_boundary(self, files: Optional[List[str]] = None, max_depth: int = 2) -> Dict[str, Set[str]]:
         """
@@ -263,28 +265,135 @@ class RelationshipAnalystAgent(BaseAgent):
         # If no files specified, use all files in the graph
         if files is None:
             files = list(self.graph)
-            
+        
+        compact = self.graph.freeze()
+        # Plain lists: per-element lookups on numpy arrays are much slower
+        indptr = compact.in_indptr.tolist()
+        indices = compact.in_indices.tolist()
+        paths = compact.paths
+        path_ids = compact.path_ids
         impact_boundaries = {}
+        
         for file_path in files:
-            impact_boundary = set()
-            current_level = {file_path}
-            
-            # BFS to find the impact boundary
-            for depth in range(max_depth):
-                next_level = set()
-                for current_file in current_level:
-                    if current_file in self.graph:
-                        dependents = {edge.source for edge in self.graph.get_incoming_edges(current_file)}
-                        next_level.update(dependents)
-                
-                impact_boundary.update(next_level)
-                current_level = next_level
-                
-            impact_boundaries[file_path] = impact_boundary
-            
+            # Breadth-first over dependents, bounded by max_depth, so the cost is
+            # proportional to the boundary rather than to the whole graph
+            reached = set()
+            frontier = [path_ids[file_path]] if file_path in path_ids else []
+            depth = 0
+            while frontier and (max_depth is None or depth < max_depth):
+                depth += 1
+                next_frontier = []
+                for current in frontier:
+                    for dependent in indices[indptr[current]:indptr[current + 1]]:
+                        if dependent not in reached:
+                            reached.add(dependent)
+                            next_frontier.append(dependent)
+                frontier = next_frontier
+            impact_boundaries[file_path] = {paths[i] for i in reached}
+        
         return impact_boundaries
     
-    def find_all_paths(self, source: str, target: str, max_depth: int = 10) -> List[List[str]]:
+    def calculate_changeset_impact(
+        self,
+        modified_files: List[str],
+        max_depth: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Calculate the impact of a whole changeset in one multi-source traversal.
+        
+        Every file that depends on the changeset is labelled with its distance
+        from the nearest modified file and the modified file that reached it.
+        
+        Args:
+            modified_files: List of file paths that will be modified
+            max_depth: Maximum depth to search in the dependency graph
+            
+        Returns:
+            Dictionary mapping each impacted file (excluding the modified files)
+            to ``{"distance": int, "source": str}``
+        """
+        if not self.graph:
+            raise ValueError("No analysis has been performed yet. Call analyze_codebase first.")
+        
+        compact = self.graph.freeze()
+        distance, nearest = compact.nearest_sources(
+            compact.ids_of(modified_files), reverse=True, max_depth=max_depth
+        )
+        
+        impacted = np.flatnonzero(distance > 0)
+        paths = compact.paths
+        return {
+            paths[i]: {"distance": d, "source": paths[src]}
+            for i, d, src in zip(impacted.tolist(), distance[impacted].tolist(), nearest[impacted].tolist())
+        }
+    
+    def iter_shortest_paths(
+        self,
+        source: str,
+        target: str,
+        max_depth: Optional[int] = None
+    ) -> Iterator[List[str]]:
+        """
+        Lazily enumerate simple paths between two files, shortest first.
+        
+        Paths are produced by Yen's algorithm, so each one costs a bounded
+        number of shortest-path searches and consumers only pay for the paths
+        they take.
+        
+        Args:
+            source: Source file path
+            target: Target file path
+            max_depth: Maximum number of files on a path
+            
+        Yields:
+            Paths (each path is a list of file paths) in order of length
+        """
+        if not self.graph:
+            raise ValueError("No analysis has been performed yet. Call analyze_codebase first.")
+        
+        G = (self.analyzer or DependencyAnalyzer(self.graph)).networkx_graph
+        if source not in G or target not in G:
+            return
+        if source == target:
+            yield [source]
+            return
+        
+        try:
+            for path in nx.shortest_simple_paths(G, source, target):
+                if max_depth is not None and len(path) > max_depth:
+                    return
+                yield path
+        except nx.NetworkXNoPath:
+            return
+    
+    def find_k_shortest_paths(
+        self,
+        source: str,
+        target: str,
+        k: int = 10,
+        max_depth: Optional[int] = None
+    ) -> List[List[str]]:
+        """
+        Find the k shortest simple paths between two files.
+        
+        Args:
+            source: Source file path
+            target: Target file path
+            k: Maximum number of paths to return
+            max_depth: Maximum number of files on a path
+            
+        Returns:
+            Up to k paths (each path is a list of file paths), shortest first
+        """
+        return list(islice(self.iter_shortest_paths(source, target, max_depth), k))
+    
+    def find_all_paths(
+        self,
+        source: str,
+        target: str,
+        max_depth: int = 10,
+        max_paths: Optional[int] = 1000
+    ) -> List[List[str]]:
         """
         Find all paths between two files in the dependency graph.
         
@@ -292,37 +401,15 @@ class RelationshipAnalystAgent(BaseAgent):
             source: Source file path
             target: Target file path
             max_depth: Maximum depth to search
+            max_paths: Maximum number of paths to return (None for no limit)
             
         Returns:
-            List of paths (each path is a list of file paths)
+            List of paths (each path is a list of file paths), shortest first
         """
         if not self.graph:
             raise ValueError("No analysis has been performed yet. Call analyze_codebase first.")
         
-        # Simple BFS to find all paths
-        paths = []
-        queue = [[source]]
-        
-        while queue:
-            path = queue.pop(0)
-            current = path[-1]
-            
-            # Found a path to the target
-            if current == target:
-                paths.append(path)
-                continue
-                
-            # Max depth reached
-            if len(path) >= max_depth:
-                continue
-                
-            # Add all neighbors to the queue
-            if current in self.graph:
-                for edge in self.graph.get_outgoing_edges(current):
-                    if edge.target not in path:  # Avoid cycles
-                        queue.append(path + [edge.target])
-                        
-        return paths
+        return list(islice(self.iter_shortest_paths(source, target, max_depth), max_paths))
     
     def predict_impact(self, modified_files: List[str]) -> Set[str]:
         """
@@ -337,12 +424,8 @@ class RelationshipAnalystAgent(BaseAgent):
         if not self.graph:
             raise ValueError("No analysis has been performed yet. Call analyze_codebase first.")
         
-        impacted = set()
-        for file_path in modified_files:
-            dependents = self.graph.transitive_dependents(file_path)
-            impacted.update(dependents)
-            
-        return impacted
+        # Single multi-source traversal over the frozen graph
+        return self.graph.freeze().dependents_of(modified_files)
     
     def _count_languages(self) -> Dict[str, int]:
         """
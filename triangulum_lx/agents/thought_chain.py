@@ -361,6 +361,11 @@ class ThoughtChain:
         # Leaf nodes (those without children in this chain)
         self._leaf_node_ids: Set[str] = set()
         
+        # Topological order of the nodes over non-PARALLEL links, kept up to
+        # date incrementally for cycle checks (None until rebuilt)
+        self._topo_order: Optional[Dict[str, int]] = {}
+        self._next_topo_index = 0
+        
         # Schema version
         self.schema_version = "1.0"
     
@@ -409,8 +414,11 @@ class ThoughtChain:
         # This is a leaf node until it gets children
         self._leaf_node_ids.add(node.node_id)
         
-        # Add the node to the chain
+        # Add the node to the chain; it follows every existing node in the topological order
         self._nodes[node.node_id] = node
+        if self._topo_order is not None:
+            self._topo_order[node.node_id] = self._next_topo_index
+            self._next_topo_index += 1
         
         # Update timestamp
         self.updated_at = time.time()
@@ -450,7 +458,9 @@ class ThoughtChain:
                 # If the child now has no parents, it's a root or orphan
                 if not self._nodes[child_id].parent_ids:
                     if reconnect_orphans and node.parent_ids:
-                        # Connect the orphan to this node's parents
+                        # Connect the orphan to this node's parents; the new links
+                        # may not agree with the topological order
+                        self._topo_order = None
                         for parent_id in node.parent_ids:
                             if parent_id in self._nodes:
                                 relationship = node.get_relationship_to(parent_id)
@@ -469,6 +479,8 @@ class ThoughtChain:
         
         # Remove the node from the chain
         del self._nodes[node_id]
+        if self._topo_order is not None:
+            self._topo_order.pop(node_id, None)
         
         # Update timestamp
         self.updated_at = time.time()
@@ -754,17 +766,48 @@ class ThoughtChain:
         
         return results
     
-    def find_paths(self, source_id: str, target_id: str) -> List[List[str]]:
+    def find_paths(self, source_id: str, target_id: str,
+                  max_paths: Optional[int] = None,
+                  max_length: Optional[int] = None) -> List[List[str]]:
         """
         Find all paths between two nodes.
         
         Args:
             source_id: ID of the source node
             target_id: ID of the target node
+            max_paths: Optional maximum number of paths to return
+            max_length: Optional maximum number of nodes in a path
             
         Returns:
             List[List[str]]: List of paths (each path is a list of node IDs)
             
+        Raises:
+            ValueError: If either node doesn't exist in the chain
+        """
+        paths = []
+        for path in self.iter_paths(source_id, target_id, max_length=max_length):
+            if max_paths is not None and len(paths) >= max_paths:
+                break
+            paths.append(path)
+        return paths
+    
+    def iter_paths(self, source_id: str, target_id: str,
+                  max_length: Optional[int] = None) -> Iterator[List[str]]:
+        """
+        Lazily enumerate the paths between two nodes.
+        
+        The search only enters nodes from which the target can be reached,
+        so no work is spent on dead ends, and it uses an explicit stack
+        instead of recursion.
+        
+        Args:
+            source_id: ID of the source node
+            target_id: ID of the target node
+            max_length: Optional maximum number of nodes in a path
+            
+        Yields:
+            List[str]: Paths from source to target (each path is a list of node IDs)
+            
         Raises:
             ValueError: If either node doesn't exist in the chain
         """
@@ -774,32 +817,49 @@ class ThoughtChain:
         if target_id not in self._nodes:
             raise ValueError(f"Target node {target_id} does not exist in chain {self.chain_id}")
         
-        # Use depth-first search to find paths
-        paths = []
-        visited = set()
+        return self._iter_paths(source_id, target_id, max_length)
+    
+    def _iter_paths(self, source_id: str, target_id: str,
+                   max_length: Optional[int]) -> Iterator[List[str]]:
+        # Nodes that can reach the target
+        can_reach = {target_id}
+        queue = deque([target_id])
+        while queue:
+            for parent_id in self._nodes[queue.popleft()].parent_ids:
+                if parent_id in self._nodes and parent_id not in can_reach:
+                    can_reach.add(parent_id)
+                    queue.append(parent_id)
+        if source_id not in can_reach:
+            return
+        
+        # Depth-first search; each stack entry holds the remaining children of a path node
+        path = [source_id]
+        on_path = {source_id}
+        stack = [iter(self._nodes[source_id].child_ids)]
+        if source_id == target_id:
+            yield path.copy()
+            return
         
-        def dfs(current_id: str, path: List[str]):
-            """Recursive depth-first search for paths."""
-            path.append(current_id)
-            visited.add(current_id)
+        while stack:
+            child_id = next(stack[-1], None)
+            if child_id is None:
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+            if child_id not in can_reach or child_id in on_path:
+                continue
             
-            if current_id == target_id:
-                # Found a path to the target
-                paths.append(path.copy())
-            else:
-                # Continue the search with children
-                for child_id in self._nodes[current_id].child_ids:
-                    if child_id in self._nodes and child_id not in visited:
-                        dfs(child_id, path)
+            if child_id == target_id:
+                if max_length is None or len(path) < max_length:
+                    yield path + [child_id]
+                continue
             
-            # Backtrack
-            path.pop()
-            visited.remove(current_id)
-        
-        # Start the search
-        dfs(source_id, [])
-        
-        return paths
+            if max_length is not None and len(path) + 1 >= max_length:
+                continue
+            
+            path.append(child_id)
+            on_path.add(child_id)
+            stack.append(iter(self._nodes[child_id].child_ids))
     
     def validate(self) -> Tuple[bool, List[str]]:
         """
@@ -831,8 +891,12 @@ class ThoughtChain:
                 if rel_id not in node.parent_ids and rel_id not in node.child_ids:
                     errors.append(f"Node {node_id} has relationship to {rel_id} but it's neither parent nor child")
         
-        # Check for cycles (except for PARALLEL relationships)
+        # Check for cycles (except for PARALLEL relationships); only nodes that
+        # cannot be put in topological order can be part of one
+        order = self._compute_topo_order()
         for node_id in self._nodes:
+            if node_id in order:
+                continue
             for child_id in self._nodes[node_id].child_ids:
                 if child_id in self._nodes and self._nodes[node_id].get_relationship_to(child_id) != RelationshipType.PARALLEL:
                     if self._has_path(child_id, node_id, exclude_parallel=True):
@@ -853,6 +917,12 @@ class ThoughtChain:
         """
         Check if adding a relationship from source to target would create a cycle.
         
+        Uses the Pearce-Kelly dynamic topological sort: if source already
+        precedes target in the order, the link is safe in O(1). Otherwise
+        only the nodes ordered between target and source are searched, and
+        if no cycle is found they are reordered so that source precedes
+        target once the link is added.
+        
         Args:
             source_id: ID of the source node
             target_id: ID of the target node
@@ -860,8 +930,96 @@ class ThoughtChain:
         Returns:
             bool: True if adding the relationship would create a cycle
         """
-        # If target is already an ancestor of source, adding this link would create a cycle
-        return self._has_path(target_id, source_id, exclude_parallel=True)
+        order = self._ensure_topo_order()
+        if order is None:
+            # The chain already contains a cycle; fall back to a full search
+            return self._has_path(target_id, source_id, exclude_parallel=True)
+        
+        if source_id == target_id:
+            return True
+        lower, upper = order[target_id], order[source_id]
+        if upper < lower:
+            return False
+        
+        # Forward search from target through nodes ordered before source
+        forward = [target_id]
+        seen = {target_id}
+        stack = [target_id]
+        while stack:
+            node = self._nodes[stack.pop()]
+            for child_id in node.child_ids:
+                if child_id in seen or child_id not in self._nodes:
+                    continue
+                if node.relationships.get(child_id) == RelationshipType.PARALLEL:
+                    continue
+                if child_id == source_id:
+                    # If target is already an ancestor of source, adding this link would create a cycle
+                    return True
+                if order[child_id] < upper:
+                    seen.add(child_id)
+                    forward.append(child_id)
+                    stack.append(child_id)
+        
+        # Backward search from source through nodes ordered after target
+        backward = [source_id]
+        seen = {source_id}
+        stack = [source_id]
+        while stack:
+            node_id = stack.pop()
+            for parent_id in self._nodes[node_id].parent_ids:
+                if parent_id in seen or parent_id not in self._nodes:
+                    continue
+                if self._nodes[parent_id].relationships.get(node_id) == RelationshipType.PARALLEL:
+                    continue
+                if order[parent_id] > lower:
+                    seen.add(parent_id)
+                    backward.append(parent_id)
+                    stack.append(parent_id)
+        
+        # Reuse the indices of the affected nodes: ancestors of source first, then descendants of target
+        backward.sort(key=order.__getitem__)
+        forward.sort(key=order.__getitem__)
+        indices = sorted(order[node_id] for node_id in backward + forward)
+        for node_id, index in zip(backward + forward, indices):
+            order[node_id] = index
+        
+        return False
+    
+    def _ensure_topo_order(self) -> Optional[Dict[str, int]]:
+        """Get the topological order, rebuilding it if needed; None if the chain has a cycle."""
+        if self._topo_order is None:
+            order = self._compute_topo_order()
+            if len(order) < len(self._nodes):
+                return None
+            self._topo_order = order
+            self._next_topo_index = len(order)
+        return self._topo_order
+    
+    def _compute_topo_order(self) -> Dict[str, int]:
+        """
+        Order the nodes so that every non-PARALLEL link goes forward.
+        
+        Returns:
+            Dict[str, int]: Index of each node; nodes on or behind a cycle are missing
+        """
+        in_degree = {node_id: 0 for node_id in self._nodes}
+        for node in self._nodes.values():
+            for child_id in node.child_ids:
+                if child_id in in_degree and node.relationships.get(child_id) != RelationshipType.PARALLEL:
+                    in_degree[child_id] += 1
+        
+        queue = deque(node_id for node_id, degree in in_degree.items() if degree == 0)
+        order = {}
+        while queue:
+            node_id = queue.popleft()
+            order[node_id] = len(order)
+            node = self._nodes[node_id]
+            for child_id in node.child_ids:
+                if child_id in in_degree and node.relationships.get(child_id) != RelationshipType.PARALLEL:
+                    in_degree[child_id] -= 1
+                    if in_degree[child_id] == 0:
+                        queue.append(child_id)
+        return order
     
     def _has_path(self, source_id: str, target_id: str, exclude_parallel: bool = False) -> bool:
         """
@@ -915,6 +1073,9 @@ class ThoughtChain:
         if connect_roots and root_relationship is None:
             raise ValueError("root_relationship must be provided when connect_roots is True")
         
+        # Links are added without cycle checks; rebuild the order when it is next needed
+        self._topo_order = None
+        
         # Copy nodes from the other chain
         for node_id, node in other_chain._nodes.items():
             if node_id not in self._nodes:
@@ -1088,6 +1249,7 @@ class ThoughtChain:
         # Set root and leaf node sets
         chain._root_node_ids = set(data.get("root_node_ids", []))
         chain._leaf_node_ids = set(data.get("leaf_node_ids", []))
+        chain._topo_order = None
         
         # Reconnect relationships
         for node_id, node in chain._nodes.items():
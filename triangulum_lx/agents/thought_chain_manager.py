@@ -14,11 +14,12 @@ import threading
 from typing import Dict, List, Optional, Set, Any, Tuple, Callable, Union
 from pathlib import Path
 from functools import lru_cache
-from collections import defaultdict
 
 from triangulum_lx.agents.chain_node import ChainNode, ThoughtType, RelationshipType
 from triangulum_lx.agents.thought_chain import ThoughtChain, TraversalOrder
 from triangulum_lx.agents.memory_manager import MemoryManager
+from triangulum_lx.agents.chain_journal import ChainJournal
+from triangulum_lx.agents.chain_store import ChainStore, LRUCache, estimate_node_size
 
 logger = logging.getLogger(__name__)
 
@@ -294,17 +295,39 @@ class ThoughtChainManager:
                 storage_dir: Optional[str] = None,
                 enable_caching: bool = True,
                 cache_size: int = 128,
-                memory_manager: Optional[MemoryManager] = None):
+                memory_manager: Optional[MemoryManager] = None,
+                journal_sync_interval: float = 0.05,
+                compaction_min_entries: int = 1000,
+                cache_max_bytes: Optional[int] = 16 * 1024 * 1024,
+                memory_budget: Optional[int] = None):
         """
         Initialize the thought chain manager.
         
+        Changes to stored chains are appended to a per-chain journal and
+        folded into the chain's snapshot once the journal outgrows it (and
+        holds at least compaction_min_entries records), so each thought costs
+        O(1) amortized bytes written.
+        
+        With a storage_dir and a memory_budget, the least recently used
+        chains are paged out to disk once the resident chains exceed the
+        budget, and paged back in when they are accessed again.
+        
         Args:
             storage_dir: Optional directory for storing thought chains
             enable_caching: Whether to enable caching for performance optimization
-            cache_size: Size of the LRU cache for frequently accessed nodes
+            cache_size: Maximum number of nodes in the LRU node cache (across all chains)
             memory_manager: Optional memory manager for token-efficient retrieval
-        """
-        self.chains: Dict[str, ThoughtChain] = {}
+            journal_sync_interval: Seconds between group fsyncs of the journals (0 syncs every write)
+            compaction_min_entries: Minimum number of journal records before a snapshot is written
+            cache_max_bytes: Maximum estimated size of the cached nodes
+            memory_budget: Maximum estimated size in bytes of the chains held in memory
+                (None keeps all chains in memory; requires storage_dir)
+        """
+        self.chains: ChainStore = ChainStore(
+            memory_budget=memory_budget if storage_dir else None,
+            page_out=self._page_out_chain,
+            page_in=self._page_in_chain
+        )
         self.chains_by_name: Dict[str, str] = {}  # name -> chain_id
         self.agents_active_chains: Dict[str, Set[str]] = {}  # agent_id -> set of chain_ids
         self.storage_dir = storage_dir
@@ -320,8 +343,7 @@ class ThoughtChainManager:
         # Performance optimization
         self.enable_caching = enable_caching
         self.cache_size = cache_size
-        self._node_cache: Dict[str, Dict[str, ChainNode]] = {}  # chain_id -> (node_id -> ChainNode)
-        self._access_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))  # chain_id -> (node_id -> count)
+        self._node_cache = LRUCache(cache_size, cache_max_bytes)  # (chain_id, node_id) -> ChainNode
         
         # Thread safety
         self._lock = threading.RLock()
@@ -329,6 +351,11 @@ class ThoughtChainManager:
         # Memory manager integration
         self.memory_manager = memory_manager or MemoryManager()
         
+        # Append-only journals of stored chains
+        self.journal_sync_interval = journal_sync_interval
+        self.compaction_min_entries = compaction_min_entries
+        self._journals: Dict[str, ChainJournal] = {}  # chain_id -> ChainJournal
+        
         if storage_dir:
             # Create storage directory if it doesn't exist
             Path(storage_dir).mkdir(parents=True, exist_ok=True)
@@ -380,10 +407,6 @@ class ThoughtChainManager:
                     self.agents_active_chains[creator_agent_id] = set()
                 self.agents_active_chains[creator_agent_id].add(chain_id)
             
-            # Initialize cache for this chain
-            if self.enable_caching:
-                self._node_cache[chain_id] = {}
-            
             # Create a default branch if requested
             if create_default_branch:
                 branch = ChainBranch(
@@ -509,9 +532,10 @@ class ThoughtChainManager:
             node_id = chain.add_node(node, parent_id=parent_id, relationship=relationship)
             
             # Add to cache if enabled
-            if self.enable_caching and chain_id in self._node_cache:
-                self._node_cache[chain_id][node_id] = node
-                self._access_counts[chain_id][node_id] += 1
+            node_size = estimate_node_size(node)
+            if self.enable_caching:
+                self._node_cache.put((chain_id, node_id), node, node_size)
+            self.chains.resize(chain_id, node_size)
             
             # Add to branch if specified
             if branch_id:
@@ -535,13 +559,17 @@ class ThoughtChainManager:
             
             logger.info(f"Added thought to chain {chain.name} (ID: {chain_id}): {thought_type.value} by {author_agent_id}")
             
-            # Save the chain if storage is enabled
+            # Journal the thought if storage is enabled
             if self.storage_dir:
-                self._save_chain(chain)
-                
-                # Save branch and context if specified
-                if branch_id or context_id:
-                    self._save_chain_metadata(chain_id)
+                self._log(
+                    chain_id, "thought",
+                    node=node.to_dict(),
+                    parent_id=parent_id,
+                    relationship=relationship.value if relationship else None,
+                    branch_id=branch_id,
+                    context_id=context_id,
+                    updated_at=chain.updated_at
+                )
             
             return node_id
     
@@ -569,7 +597,7 @@ class ThoughtChainManager:
         """
         chain_id = self.chains_by_name.get(name)
         if chain_id:
-            return self.chains.get(chain_id)
+            return self.get_chain(chain_id)
         return None
     
     def get_thought(self, chain_id: str, node_id: str) -> Optional[ChainNode]:
@@ -585,10 +613,10 @@ class ThoughtChainManager:
         """
         with self._lock:
             # Check cache first if enabled
-            if self.enable_caching and chain_id in self._node_cache and node_id in self._node_cache[chain_id]:
-                # Update access count
-                self._access_counts[chain_id][node_id] += 1
-                return self._node_cache[chain_id][node_id]
+            if self.enable_caching:
+                node = self._node_cache.get((chain_id, node_id))
+                if node is not None:
+                    return node
             
             # Get from chain
             chain = self.get_chain(chain_id)
@@ -596,14 +624,8 @@ class ThoughtChainManager:
                 node = chain.get_node(node_id)
                 
                 # Add to cache if enabled
-                if self.enable_caching and node and chain_id in self._node_cache:
-                    # Check if cache is full
-                    if len(self._node_cache[chain_id]) >= self.cache_size:
-                        # Evict least recently used node
-                        self._evict_lru_node(chain_id)
-                    
-                    self._node_cache[chain_id][node_id] = node
-                    self._access_counts[chain_id][node_id] = 1
+                if self.enable_caching and node:
+                    self._node_cache.put((chain_id, node_id), node, estimate_node_size(node))
                 
                 return node
             
@@ -668,12 +690,11 @@ class ThoughtChainManager:
         """
         results = []
         
-        # Determine which chains to search
-        chains_to_search = []
+        # Determine which chains to search; paged out chains are paged in one at a time
         if chain_ids:
-            chains_to_search = [self.chains[cid] for cid in chain_ids if cid in self.chains]
+            chains_to_search = (self.chains[cid] for cid in chain_ids if cid in self.chains)
         else:
-            chains_to_search = list(self.chains.values())
+            chains_to_search = self.chains.values()
         
         # Search each chain
         for chain in chains_to_search:
@@ -812,10 +833,11 @@ class ThoughtChainManager:
         # Merge the source chain into the target chain
         try:
             target_chain.merge(source_chain, connect_roots=connect_roots, root_relationship=root_relationship)
+            self.chains.resize(target_chain_id)
             
             # Save the target chain if storage is enabled
             if self.storage_dir:
-                self._save_chain(target_chain)
+                self.compact_chain(target_chain_id)
             
             # Update agents active chains
             for agent_id, chain_ids in self.agents_active_chains.items():
@@ -850,6 +872,7 @@ class ThoughtChainManager:
         
         # Remove the chain
         del self.chains[chain_id]
+        self._uncache_chain(chain)
         
         # Remove the chain from chains_by_name
         for name, cid in list(self.chains_by_name.items()):
@@ -861,11 +884,15 @@ class ThoughtChainManager:
             if chain_id in chain_ids:
                 chain_ids.remove(chain_id)
         
-        # Delete the chain file if storage is enabled
+        # Delete the chain and journal files if storage is enabled
         if self.storage_dir:
-            chain_file = Path(self.storage_dir) / f"{chain_id}.json"
-            if chain_file.exists():
-                chain_file.unlink()
+            journal = self._journals.pop(chain_id, None)
+            if journal:
+                journal.close()
+            
+            for chain_file in (self._chain_path(chain_id), self._journal_path(chain_id)):
+                if chain_file.exists():
+                    chain_file.unlink()
         
         logger.info(f"Deleted thought chain: {chain.name} (ID: {chain_id})")
         
@@ -906,7 +933,9 @@ class ThoughtChainManager:
             return 0
         
         # Clear existing chains
+        self.close()
         self.chains.clear()
+        self._node_cache.clear()
         self.chains_by_name.clear()
         self.agents_active_chains.clear()
         
@@ -930,6 +959,11 @@ class ThoughtChainManager:
                 self.chains[chain.chain_id] = chain
                 self.chains_by_name[chain.name] = chain.chain_id
                 
+                # Load the chain's metadata (branches and contexts) and
+                # replay the changes journaled since the snapshots
+                metadata_seq = self._load_chain_metadata(chain.chain_id)
+                self._replay_journal(chain, chain_data.get("journal_seq", 0), metadata_seq or 0)
+                
                 # Update agents active chains
                 for node in chain:
                     agent_id = node.author_agent_id
@@ -937,9 +971,6 @@ class ThoughtChainManager:
                         self.agents_active_chains[agent_id] = set()
                     self.agents_active_chains[agent_id].add(chain.chain_id)
                 
-                # Load the chain's metadata (branches and contexts)
-                self._load_chain_metadata(chain.chain_id)
-                
                 count += 1
             except Exception as e:
                 logger.error(f"Error loading chain from {chain_file}: {e}")
@@ -1022,9 +1053,9 @@ class ThoughtChainManager:
             
             logger.info(f"Created new branch '{name}' (ID: {branch.branch_id}) in chain {chain.name}")
             
-            # Save branch metadata if storage is enabled
+            # Journal the branch if storage is enabled
             if self.storage_dir:
-                self._save_chain_metadata(chain_id)
+                self._log(chain_id, "branch", branch=branch.to_dict())
             
             return branch.branch_id
     
@@ -1116,9 +1147,9 @@ class ThoughtChainManager:
             
             logger.info(f"Merged branch {source_branch.name} into {target_branch.name} using strategy '{strategy}'")
             
-            # Save branch metadata if storage is enabled
+            # Journal the merged branch if storage is enabled
             if self.storage_dir:
-                self._save_chain_metadata(target_branch.chain_id)
+                self._log(target_branch.chain_id, "branch", branch=target_branch.to_dict())
             
             return True
     
@@ -1167,11 +1198,10 @@ class ThoughtChainManager:
                     if not in_other_branch:
                         chain.remove_node(node_id)
                         
-                        # Remove from cache if enabled
-                        if self.enable_caching and chain_id in self._node_cache and node_id in self._node_cache[chain_id]:
-                            del self._node_cache[chain_id][node_id]
-                            if node_id in self._access_counts[chain_id]:
-                                del self._access_counts[chain_id][node_id]
+                        # Remove from cache
+                        self._node_cache.pop((chain_id, node_id))
+                
+                self.chains.resize(chain_id)
             
             # Remove branch from contexts
             for context_id, context in self.contexts.items():
@@ -1183,9 +1213,13 @@ class ThoughtChainManager:
             
             logger.info(f"Deleted branch {branch.name} (ID: {branch_id})")
             
-            # Save metadata if storage is enabled
+            # Journal the deletion if storage is enabled; removed nodes are
+            # written out with a new snapshot instead
             if self.storage_dir:
-                self._save_chain_metadata(chain_id)
+                if delete_nodes and chain_id in self.chains:
+                    self.compact_chain(chain_id)
+                else:
+                    self._log(chain_id, "branch_deleted", branch_id=branch_id)
             
             return True
     
@@ -1249,9 +1283,9 @@ class ThoughtChainManager:
             
             logger.info(f"Created new context '{name}' (ID: {context.context_id}) for chain {self.chains[chain_id].name}")
             
-            # Save context metadata if storage is enabled
+            # Journal the context if storage is enabled
             if self.storage_dir:
-                self._save_chain_metadata(chain_id)
+                self._log(chain_id, "context", context=context.to_dict())
             
             return context.context_id
     
@@ -1347,9 +1381,9 @@ class ThoughtChainManager:
                 for goal in goals:
                     context.add_goal(goal)
             
-            # Save context metadata if storage is enabled
+            # Journal the context if storage is enabled
             if self.storage_dir:
-                self._save_chain_metadata(context.chain_id)
+                self._log(context.chain_id, "context", context=context.to_dict())
             
             return True
     
@@ -1383,9 +1417,9 @@ class ThoughtChainManager:
             
             logger.info(f"Deleted context {context.name} (ID: {context_id})")
             
-            # Save metadata if storage is enabled
+            # Journal the deletion if storage is enabled
             if self.storage_dir:
-                self._save_chain_metadata(chain_id)
+                self._log(chain_id, "context_deleted", context_id=context_id)
             
             return True
     
@@ -1480,46 +1514,99 @@ class ThoughtChainManager:
             chain = self.chains[chain_id]
             
             # Clear the node cache for this chain
-            if self.enable_caching and chain_id in self._node_cache:
-                self._node_cache[chain_id].clear()
-                self._access_counts[chain_id].clear()
+            self._uncache_chain(chain)
             
-            # Reset internal data structures for better memory usage
-            nodes_copy = {node_id: node for node_id, node in chain._nodes.items()}
-            chain._nodes.clear()
-            chain._nodes.update(nodes_copy)
+            # Rebuild the node dict to release the space of removed nodes
+            chain._nodes = dict(chain._nodes)
+            self.chains.resize(chain_id)
             
             # Save the optimized chain if storage is enabled
             if self.storage_dir:
-                self._save_chain(chain)
+                self.compact_chain(chain_id)
             
             logger.info(f"Optimized chain {chain.name} (ID: {chain_id})")
             
             return True
     
-    def _evict_lru_node(self, chain_id: str) -> None:
+    def compact_chain(self, chain_id: str) -> bool:
         """
-        Evict the least recently used node from the cache.
+        Write a snapshot of a chain and its metadata and empty its journal.
         
         Args:
-            chain_id: ID of the chain to evict from
+            chain_id: ID of the chain to compact
+            
+        Returns:
+            bool: True if the snapshots were written
         """
-        if chain_id not in self._node_cache or not self._node_cache[chain_id]:
-            return
+        with self._lock:
+            if not self.storage_dir or chain_id not in self.chains:
+                return False
+            
+            if not (self._save_chain(self.chains[chain_id]) and self._save_chain_metadata(chain_id)):
+                return False
+            
+            self._journal(chain_id).truncate()
+            return True
+    
+    def flush(self) -> None:
+        """Sync all journaled changes to disk."""
+        with self._lock:
+            for journal in self._journals.values():
+                journal.sync()
+    
+    def close(self) -> None:
+        """Sync and close the journals of all chains."""
+        with self._lock:
+            for journal in self._journals.values():
+                journal.close()
+            self._journals.clear()
+    
+    def _uncache_chain(self, chain: ThoughtChain) -> None:
+        """Remove the nodes of a chain from the node cache."""
+        for node_id in chain._nodes:
+            self._node_cache.pop((chain.chain_id, node_id))
+    
+    def _page_out_chain(self, chain_id: str, chain: ThoughtChain) -> bool:
+        """
+        Write a chain to disk so it can be dropped from memory.
+        
+        A chain whose journal is empty already matches its snapshot and is
+        not written again.
+        
+        Args:
+            chain_id: ID of the chain
+            chain: The chain to page out
+            
+        Returns:
+            bool: True if the chain can be dropped from memory
+        """
+        if not self.storage_dir:
+            return False
         
-        # Find the node with the lowest access count
-        min_count = float('inf')
-        min_node_id = None
+        journal = self._journal(chain_id)
+        if journal.entries or not self._chain_path(chain_id).exists():
+            if not (self._save_chain(chain) and self._save_chain_metadata(chain_id)):
+                return False
+            journal.truncate()
         
-        for node_id, count in self._access_counts[chain_id].items():
-            if count < min_count and node_id in self._node_cache[chain_id]:
-                min_count = count
-                min_node_id = node_id
+        self._uncache_chain(chain)
+        logger.debug(f"Paged out chain {chain.name} (ID: {chain_id})")
+        return True
+    
+    def _page_in_chain(self, chain_id: str) -> ThoughtChain:
+        """
+        Read a paged out chain from its snapshot.
         
-        # Remove the node from cache
-        if min_node_id:
-            del self._node_cache[chain_id][min_node_id]
-            del self._access_counts[chain_id][min_node_id]
+        Args:
+            chain_id: ID of the chain
+            
+        Returns:
+            ThoughtChain: The chain
+        """
+        with open(self._chain_path(chain_id), "r") as f:
+            chain = ThoughtChain.from_dict(json.load(f))
+        logger.debug(f"Paged in chain {chain.name} (ID: {chain_id})")
+        return chain
     
     def _save_chain(self, chain: ThoughtChain) -> bool:
         """
@@ -1541,11 +1628,10 @@ class ThoughtChainManager:
         try:
             # Convert the chain to a dictionary
             chain_data = chain.to_dict()
+            chain_data["journal_seq"] = self._journal(chain.chain_id).seq
             
             # Save the chain to file
-            chain_file = storage_path / f"{chain.chain_id}.json"
-            with open(chain_file, "w") as f:
-                json.dump(chain_data, f, indent=2)
+            self._write_json(self._chain_path(chain.chain_id), chain_data)
             
             return True
         except Exception as e:
@@ -1589,20 +1675,19 @@ class ThoughtChainManager:
                 "chain_id": chain_id,
                 "branches": branch_data,
                 "contexts": context_data,
-                "updated_at": time.time()
+                "updated_at": time.time(),
+                "journal_seq": self._journal(chain_id).seq
             }
             
             # Save metadata to file
-            metadata_file = storage_path / f"{chain_id}_metadata.json"
-            with open(metadata_file, "w") as f:
-                json.dump(metadata, f, indent=2)
+            self._write_json(storage_path / f"{chain_id}_metadata.json", metadata)
             
             return True
         except Exception as e:
             logger.error(f"Error saving metadata for chain {chain_id}: {e}")
             return False
     
-    def _load_chain_metadata(self, chain_id: str) -> bool:
+    def _load_chain_metadata(self, chain_id: str) -> Optional[int]:
         """
         Load branch and context metadata for a chain.
         
@@ -1610,14 +1695,15 @@ class ThoughtChainManager:
             chain_id: ID of the chain to load metadata for
             
         Returns:
-            bool: True if the metadata was loaded successfully, False otherwise
+            int or None: Last journal sequence number included in the
+                metadata, or None if the metadata could not be loaded
         """
         if not self.storage_dir:
-            return False
+            return None
         
         metadata_file = Path(self.storage_dir) / f"{chain_id}_metadata.json"
         if not metadata_file.exists():
-            return False
+            return None
         
         try:
             # Load metadata from file
@@ -1644,7 +1730,157 @@ class ThoughtChainManager:
                 
                 self.chain_contexts[chain_id].add(context.context_id)
             
-            return True
+            return metadata.get("journal_seq", 0)
         except Exception as e:
             logger.error(f"Error loading metadata for chain {chain_id}: {e}")
-            return False
+            return None
+    
+    def _chain_path(self, chain_id: str) -> Path:
+        return Path(self.storage_dir) / f"{chain_id}.json"
+    
+    def _journal_path(self, chain_id: str) -> Path:
+        return Path(self.storage_dir) / f"{chain_id}.journal"
+    
+    def _write_json(self, path: Path, data: Dict[str, Any]) -> None:
+        """Atomically replace a JSON file, so a crash leaves the old or the new snapshot."""
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    
+    def _journal(self, chain_id: str) -> ChainJournal:
+        """Get the journal of a chain, creating it on first use."""
+        journal = self._journals.get(chain_id)
+        if journal is None:
+            journal = ChainJournal(self._journal_path(chain_id), sync_interval=self.journal_sync_interval)
+            self._journals[chain_id] = journal
+        return journal
+    
+    def _log(self, chain_id: str, op: str, **data: Any) -> None:
+        """
+        Append a change to the journal of a chain.
+        
+        The chain is compacted once its journal holds as many records as
+        the chain has nodes outside the journal, so the O(n) snapshot is
+        written at most once every n changes.
+        
+        Args:
+            chain_id: ID of the changed chain
+            op: Type of change
+            **data: Fields of the change
+        """
+        if chain_id not in self.chains:
+            return
+        
+        try:
+            journal = self._journal(chain_id)
+            journal.append(op, **data)
+        except Exception as e:
+            logger.error(f"Error journaling {op} for chain {chain_id}: {e}")
+            return
+        
+        # entries >= len / 2 holds once the journal has outgrown the snapshot
+        if journal.entries >= max(self.compaction_min_entries, len(self.chains[chain_id]) // 2):
+            self.compact_chain(chain_id)
+    
+    def _replay_journal(self, chain: ThoughtChain, chain_seq: int, metadata_seq: int) -> int:
+        """
+        Apply the journaled changes that are newer than the loaded snapshots.
+        
+        Args:
+            chain: Chain loaded from its snapshot
+            chain_seq: Last sequence number included in the chain snapshot
+            metadata_seq: Last sequence number included in the metadata snapshot
+            
+        Returns:
+            int: Number of records replayed
+        """
+        chain_id = chain.chain_id
+        seq = max(chain_seq, metadata_seq)
+        entries = 0
+        
+        for record in ChainJournal.read(self._journal_path(chain_id)):
+            entries += 1
+            seq = max(seq, record["seq"])
+            op = record["op"]
+            
+            if op == "thought":
+                node_data = record["node"]
+                node_id = node_data["node_id"]
+                
+                if record["seq"] > chain_seq and node_id not in chain:
+                    node = ChainNode.from_dict(dict(node_data))
+                    node.parent_ids = set()
+                    node.child_ids = set()
+                    node.relationships = {}
+                    relationship = record.get("relationship")
+                    chain.add_node(
+                        node,
+                        parent_id=record.get("parent_id"),
+                        relationship=RelationshipType(relationship) if relationship else None
+                    )
+                    chain.updated_at = record.get("updated_at", chain.updated_at)
+                
+                if record["seq"] > metadata_seq:
+                    branch_id = record.get("branch_id")
+                    if branch_id in self.branches:
+                        branch = self.branches[branch_id]
+                        branch.add_node(node_id)
+                        if not branch.root_node_id and not record.get("parent_id"):
+                            branch.root_node_id = node_id
+                    
+                    context_id = record.get("context_id")
+                    if context_id in self.contexts:
+                        context = self.contexts[context_id]
+                        context.update_state("latest_thought_id", node_id)
+                        context.update_state("latest_thought_type", node_data["thought_type"])
+                        context.update_state("latest_author", node_data["author_agent_id"])
+            
+            elif record["seq"] <= metadata_seq:
+                continue
+            
+            elif op == "branch":
+                branch = ChainBranch.from_dict(record["branch"])
+                self.branches[branch.branch_id] = branch
+                self.chain_branches.setdefault(chain_id, set()).add(branch.branch_id)
+            
+            elif op == "branch_deleted":
+                branch_id = record["branch_id"]
+                self.branches.pop(branch_id, None)
+                if chain_id in self.chain_branches:
+                    self.chain_branches[chain_id].discard(branch_id)
+                    if not self.chain_branches[chain_id]:
+                        del self.chain_branches[chain_id]
+                for context in self.contexts.values():
+                    if context.current_branch_id == branch_id:
+                        context.current_branch_id = None
+            
+            elif op == "context":
+                context = ReasoningContext.from_dict(record["context"])
+                self.contexts[context.context_id] = context
+                self.chain_contexts.setdefault(chain_id, set()).add(context.context_id)
+            
+            elif op == "context_deleted":
+                context_id = record["context_id"]
+                self.contexts.pop(context_id, None)
+                if chain_id in self.chain_contexts:
+                    self.chain_contexts[chain_id].discard(context_id)
+                    if not self.chain_contexts[chain_id]:
+                        del self.chain_contexts[chain_id]
+            
+            else:
+                logger.warning(f"Unknown journal operation '{op}' for chain {chain_id}")
+        
+        self._journals[chain_id] = ChainJournal(
+            self._journal_path(chain_id),
+            seq=seq,
+            entries=entries,
+            sync_interval=self.journal_sync_interval
+        )
+        
+        if entries:
+            logger.info(f"Replayed {entries} journal records for chain {chain.name} (ID: {chain_id})")
+        
+        return entries
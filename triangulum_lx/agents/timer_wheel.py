@@ -0,0 +1,142 @@
+"""
+Timer Wheel - Hashed timing wheel for many short-lived timers.
+
+Timers are hashed into a fixed ring of slots by the tick at which they
+expire, so scheduling and cancelling a timer are O(1) and each tick only
+looks at the timers of one slot. The thread running the wheel sleeps until
+the next tick while timers are pending and blocks without waking up while
+there are none.
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TimerHandle:
+    """Handle of a scheduled timer, used to cancel it."""
+
+    __slots__ = ("deadline_tick", "callback", "args", "cancelled")
+
+    def __init__(self, deadline_tick: int, callback: Callable[..., Any], args: tuple):
+        self.deadline_tick = deadline_tick
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+
+class TimerWheel:
+    """Hashed timing wheel that runs callbacks on its own thread."""
+
+    def __init__(self, tick: float = 0.1, slots: int = 512):
+        """
+        Initialize the timer wheel.
+
+        Args:
+            tick: Resolution of the wheel in seconds
+            slots: Number of slots in the ring
+        """
+        self.tick = tick
+        self._slots: List[List[TimerHandle]] = [[] for _ in range(slots)]
+        self._start = time.monotonic()
+        self._current_tick = 0
+        self._pending = 0
+        self._stopped = False
+        self._condition = threading.Condition()
+
+    def _now_tick(self) -> int:
+        return int((time.monotonic() - self._start) / self.tick)
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        """
+        Run a callback after a delay.
+
+        Args:
+            delay: Delay in seconds, rounded up to whole ticks
+            callback: Function to call on the wheel thread
+            *args: Arguments for the callback
+
+        Returns:
+            Handle that can be passed to cancel
+        """
+        ticks = max(1, -int(-delay // self.tick))
+        with self._condition:
+            handle = TimerHandle(self._now_tick() + ticks, callback, args)
+            self._slots[handle.deadline_tick % len(self._slots)].append(handle)
+            self._pending += 1
+            if self._pending == 1:
+                # The wheel thread may be blocked waiting for the first timer
+                self._condition.notify()
+            return handle
+
+    def cancel(self, handle: Optional[TimerHandle]) -> None:
+        """Cancel a timer if it has not fired yet."""
+        if handle is None:
+            return
+        with self._condition:
+            if not handle.cancelled:
+                handle.cancelled = True
+                self._pending -= 1
+
+    def pending(self) -> int:
+        """Get the number of timers that have not fired or been cancelled."""
+        return self._pending
+
+    def stop(self) -> None:
+        """Stop the run loop."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def run(self) -> None:
+        """Fire timers as they expire until stop is called."""
+        while True:
+            with self._condition:
+                while not self._stopped and self._pending == 0:
+                    self._condition.wait()
+                    # Skip the ticks during which the wheel was empty
+                    self._current_tick = max(self._current_tick, self._now_tick() - 1)
+                if self._stopped:
+                    return
+
+                next_time = self._start + (self._current_tick + 1) * self.tick
+                delay = next_time - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    if self._stopped:
+                        return
+
+                expired = self._advance()
+
+            for handle in expired:
+                try:
+                    handle.callback(*handle.args)
+                except Exception as e:
+                    logger.error(f"Error in timer callback {handle.callback}: {e}")
+
+    def _advance(self) -> List[TimerHandle]:
+        """Move the wheel up to the current tick and collect expired timers."""
+        expired = []
+        now_tick = self._now_tick()
+        while self._current_tick < now_tick:
+            self._current_tick += 1
+            index = self._current_tick % len(self._slots)
+            slot = self._slots[index]
+            if not slot:
+                continue
+            remaining = []
+            for handle in slot:
+                if handle.cancelled:
+                    continue
+                if handle.deadline_tick <= self._current_tick:
+                    # Mark as done so a late cancel does not change the count
+                    handle.cancelled = True
+                    self._pending -= 1
+                    expired.append(handle)
+                else:
+                    remaining.append(handle)
+            self._slots[index] = remaining
+        return expired
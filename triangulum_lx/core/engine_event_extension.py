@@ -14,6 +14,7 @@ import time
 import logging
 import threading
 import uuid
+import concurrent.futures
 from typing import Dict, List, Any, Optional, Set, Tuple, Union, Callable
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -83,8 +84,15 @@ class EngineEvent:
 class EventHandler:
     """
     Base class for event handlers.
+    
+    The extension looks handlers up by the types in ``event_types`` ("*"
+    matches every type). Subclasses that override ``can_handle`` are still
+    asked about every event. Handlers that set ``supports_batches`` receive
+    all their events of a batch in one ``handle_events`` call.
     """
     
+    supports_batches = False
+    
     def __init__(self, event_types: List[str]):
         """
         Initialize an event handler.
@@ -104,7 +112,7 @@ class EventHandler:
         Returns:
             True if this handler can handle the event, False otherwise
         """
-        return event.event_type in self.event_types
+        return "*" in self.event_types or event.event_type in self.event_types
     
     def handle_event(self, event: EngineEvent) -> bool:
         """
@@ -117,6 +125,19 @@ class EventHandler:
             True if the event was handled successfully, False otherwise
         """
         raise NotImplementedError("Subclasses must implement handle_event")
+    
+    def handle_events(self, events: List[EngineEvent]) -> bool:
+        """
+        Handle a batch of events, oldest first.
+        
+        Args:
+            events: Events to handle
+            
+        Returns:
+            True if all events were handled successfully, False otherwise
+        """
+        results = [self.handle_event(event) for event in events]
+        return all(result is not False for result in results)
 
 
 class LearningEventHandler(EventHandler):
@@ -356,6 +377,14 @@ class LearningEventHandler(EventHandler):
 class EngineEventExtension:
     """
     Extends the core engine with event handling capabilities.
+    
+    Queued events are handed to a processing thread that wakes up as soon as
+    events arrive and delivers them in batches. Handlers are looked up by
+    event type, and the handlers of a batch can run in parallel on a thread
+    pool; each handler still sees its events in emission order. When the
+    queue is full, producers wait for room (backpressure) before the
+    configured overflow policy drops an event; both are counted in
+    ``get_metrics``.
     """
     
     def __init__(self, config_path: Optional[str] = None):
@@ -370,20 +399,40 @@ class EngineEventExtension:
         
         # Initialize event handlers
         self.event_handlers: List[EventHandler] = []
+        self._handlers_lock = threading.Lock()
+        self._handler_index: Dict[str, Tuple[Tuple[EventHandler, bool], ...]] = {}
         
         # Initialize learning manager if available
         self.learning_manager = None
         if HAVE_LEARNING_MANAGER and self.config.get("enable_learning", True):
             self.learning_manager = LearningManager()
-            self.event_handlers.append(LearningEventHandler(self.learning_manager))
+            self.register_event_handler(LearningEventHandler(self.learning_manager))
         
         # Initialize event queue
         self.event_queue = deque()
-        self.queue_lock = threading.Lock()
+        self.queue_condition = threading.Condition()
+        
+        # Delivery counters, see get_metrics
+        self.metrics = {
+            "events_emitted": 0,
+            "events_processed": 0,
+            "events_dropped": 0,
+            "handler_failures": 0,
+            "batches_processed": 0,
+            "backpressure_waits": 0,
+            "backpressure_wait_seconds": 0.0,
+            "max_queue_depth": 0
+        }
+        self._metrics_lock = threading.Lock()
+        
+        # Set on the threads that dispatch events, so that handlers emitting
+        # events of their own never wait for room in the queue
+        self._dispatch_state = threading.local()
         
         # Initialize event processing thread
         self.stop_event = threading.Event()
         self.processing_thread = None
+        self.handler_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
         
         if self.config.get("auto_process_events", True):
             self.start_event_processing()
@@ -399,7 +448,10 @@ class EngineEventExtension:
             "enable_learning": True,
             "auto_process_events": True,
             "max_queue_size": 1000,
-            "processing_interval_ms": 100,
+            "batch_size": 100,
+            "handler_workers": 4,
+            "overflow_policy": "block",  # block, drop_oldest or drop_newest
+            "enqueue_timeout_ms": 1000,
             "event_types": {
                 "agent_action": True,
                 "agent_error": True,
@@ -468,7 +520,9 @@ class EngineEventExtension:
         Args:
             handler: Event handler to register
         """
-        self.event_handlers.append(handler)
+        with self._handlers_lock:
+            self.event_handlers.append(handler)
+            self._handler_index = {}
         logger.info(f"Registered event handler for event types: {handler.event_types}")
     
     def unregister_event_handler(self, handler: EventHandler):
@@ -478,9 +532,38 @@ class EngineEventExtension:
         Args:
             handler: Event handler to unregister
         """
-        if handler in self.event_handlers:
+        with self._handlers_lock:
+            if handler not in self.event_handlers:
+                return
             self.event_handlers.remove(handler)
-            logger.info(f"Unregistered event handler for event types: {handler.event_types}")
+            self._handler_index = {}
+        logger.info(f"Unregistered event handler for event types: {handler.event_types}")
+    
+    def _handlers_for(self, event_type: str) -> Tuple[Tuple[EventHandler, bool], ...]:
+        """
+        Get the handlers for an event type in registration order.
+        
+        Args:
+            event_type: Type of event
+            
+        Returns:
+            Tuple of (handler, needs_can_handle_check) pairs
+        """
+        index = self._handler_index
+        handlers = index.get(event_type)
+        if handlers is None:
+            with self._handlers_lock:
+                handlers = tuple(
+                    (handler, type(handler).can_handle is not EventHandler.can_handle)
+                    for handler in self.event_handlers
+                    if type(handler).can_handle is not EventHandler.can_handle
+                    or "*" in handler.event_types
+                    or event_type in handler.event_types
+                )
+                # Registering a handler replaces the index, so only fill
+                # the one these handlers were read for
+                index[event_type] = handlers
+        return handlers
     
     def emit_event(self, 
                   event_type: str,
@@ -505,23 +588,73 @@ class EngineEventExtension:
         
         # Create event
         event = EngineEvent(event_type, source, data)
+        self._count("events_emitted")
         
         # Process event
         if immediate:
             self._process_event(event)
         else:
-            with self.queue_lock:
-                # Check queue size
-                max_queue_size = self.config.get("max_queue_size", 1000)
-                if len(self.event_queue) >= max_queue_size:
-                    # Remove oldest event
-                    self.event_queue.popleft()
-                
-                # Add event to queue
-                self.event_queue.append(event)
+            self._enqueue(event)
         
         return event.event_id
     
+    def _enqueue(self, event: EngineEvent):
+        """
+        Add an event to the queue, applying the overflow policy when it is full.
+        
+        Args:
+            event: Event to queue
+        """
+        max_queue_size = self.config.get("max_queue_size", 1000)
+        policy = self.config.get("overflow_policy", "block")
+        dispatching = getattr(self._dispatch_state, "active", False)
+        
+        with self.queue_condition:
+            processing = self.processing_thread is not None and self.processing_thread.is_alive()
+            if len(self.event_queue) >= max_queue_size and policy == "block" and processing and not dispatching:
+                # Wait for the processing thread to make room
+                start = time.monotonic()
+                timeout = self.config.get("enqueue_timeout_ms", 1000) / 1000.0
+                self.queue_condition.wait_for(
+                    lambda: len(self.event_queue) < max_queue_size or self.stop_event.is_set(),
+                    timeout=timeout
+                )
+                self._count("backpressure_waits")
+                self._count("backpressure_wait_seconds", time.monotonic() - start)
+            
+            if len(self.event_queue) >= max_queue_size and not dispatching:
+                self._count("events_dropped")
+                dropped = self.metrics["events_dropped"]
+                if dropped & (dropped - 1) == 0:
+                    # Log at 1, 2, 4, 8, ... drops to stay visible without flooding
+                    logger.warning(f"Event queue full ({max_queue_size} events), {dropped} events dropped so far")
+                if policy == "drop_newest":
+                    return
+                self.event_queue.popleft()
+            
+            self.event_queue.append(event)
+            with self._metrics_lock:
+                self.metrics["max_queue_depth"] = max(self.metrics["max_queue_depth"], len(self.event_queue))
+            self.queue_condition.notify_all()
+    
+    def _count(self, name: str, amount: Union[int, float] = 1):
+        """Increment a delivery counter."""
+        with self._metrics_lock:
+            self.metrics[name] += amount
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get event delivery metrics.
+        
+        Returns:
+            Dictionary with counters of emitted, processed and dropped events,
+            handler failures, backpressure waits and the current queue depth
+        """
+        with self._metrics_lock:
+            metrics = dict(self.metrics)
+        metrics["queue_depth"] = len(self.event_queue)
+        return metrics
+    
     def start_event_processing(self):
         """Start event processing thread."""
         if self.processing_thread and self.processing_thread.is_alive():
@@ -530,47 +663,56 @@ class EngineEventExtension:
         
         logger.info("Starting event processing thread")
         self.stop_event.clear()
+        workers = self.config.get("handler_workers", 4)
+        if workers > 1 and self.handler_pool is None:
+            self.handler_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="engine-event-handler"
+            )
         self.processing_thread = threading.Thread(target=self._event_processing_loop, daemon=True)
         self.processing_thread.start()
     
     def stop_event_processing(self):
-        """Stop event processing thread."""
+        """Stop event processing thread after delivering the queued events."""
         if not self.processing_thread or not self.processing_thread.is_alive():
             logger.warning("Event processing thread is not running")
             return
         
         logger.info("Stopping event processing thread")
-        self.stop_event.set()
+        with self.queue_condition:
+            self.stop_event.set()
+            self.queue_condition.notify_all()
         self.processing_thread.join(timeout=5)
         
         if self.processing_thread.is_alive():
             logger.warning("Event processing thread did not terminate cleanly")
         else:
             logger.info("Event processing thread stopped")
+            if self.handler_pool is not None:
+                self.handler_pool.shutdown(wait=True)
+                self.handler_pool = None
     
     def _event_processing_loop(self):
-        """Event processing loop."""
-        while not self.stop_event.is_set():
-            try:
-                # Process events in queue
-                events_to_process = []
-                
-                with self.queue_lock:
-                    # Get all events from queue
-                    while self.event_queue and len(events_to_process) < 100:  # Process up to 100 events at a time
-                        events_to_process.append(self.event_queue.popleft())
+        """Deliver queued events in batches until stopped and drained."""
+        self._dispatch_state.active = True
+        batch_size = max(1, self.config.get("batch_size", 100))
+        while True:
+            with self.queue_condition:
+                while not self.event_queue and not self.stop_event.is_set():
+                    self.queue_condition.wait()
+                if not self.event_queue:
+                    return
                 
-                # Process events
-                for event in events_to_process:
-                    self._process_event(event)
-                
-                # Sleep for a short time
-                processing_interval = self.config.get("processing_interval_ms", 100) / 1000.0
-                time.sleep(processing_interval)
+                events_to_process = []
+                while self.event_queue and len(events_to_process) < batch_size:
+                    events_to_process.append(self.event_queue.popleft())
                 
+                # Producers blocked on a full queue can continue
+                self.queue_condition.notify_all()
+            
+            try:
+                self._dispatch(events_to_process)
             except Exception as e:
                 logger.error(f"Error in event processing loop: {e}")
-                time.sleep(1.0)  # Sleep for a second on error
     
     def _process_event(self, event: EngineEvent):
         """
@@ -579,19 +721,76 @@ class EngineEventExtension:
         Args:
             event: Event to process
         """
-        # Find handlers for this event
-        handlers = [h for h in self.event_handlers if h.can_handle(event)]
+        self._dispatch([event])
+    
+    def _dispatch(self, events: List[EngineEvent]):
+        """
+        Deliver a batch of events to their handlers.
         
-        if not handlers:
-            logger.debug(f"No handlers found for event {event.event_id} of type {event.event_type}")
-            return
+        Each handler receives its events of the batch in order, at once if it
+        supports batches. Different handlers run in parallel on the handler
+        pool when there is one.
         
-        # Process event with each handler
-        for handler in handlers:
-            try:
-                handler.handle_event(event)
-            except Exception as e:
-                logger.error(f"Error handling event {event.event_id} with handler {handler.__class__.__name__}: {e}")
+        Args:
+            events: Events to deliver, oldest first
+        """
+        handler_events: Dict[int, Tuple[EventHandler, List[EngineEvent]]] = {}
+        for event in events:
+            handlers = self._handlers_for(event.event_type)
+            if not handlers:
+                logger.debug(f"No handlers found for event {event.event_id} of type {event.event_type}")
+            for handler, needs_check in handlers:
+                if needs_check and not handler.can_handle(event):
+                    continue
+                entry = handler_events.get(id(handler))
+                if entry is None:
+                    entry = handler_events[id(handler)] = (handler, [])
+                entry[1].append(event)
+        
+        work = list(handler_events.values())
+        if self.handler_pool is not None and len(work) > 1:
+            futures = [self.handler_pool.submit(self._run_handler, handler, batch) for handler, batch in work]
+            failures = sum(future.result() for future in futures)
+        else:
+            failures = sum(self._run_handler(handler, batch) for handler, batch in work)
+        
+        with self._metrics_lock:
+            self.metrics["events_processed"] += len(events)
+            self.metrics["handler_failures"] += failures
+            self.metrics["batches_processed"] += 1
+    
+    def _run_handler(self, handler: EventHandler, events: List[EngineEvent]) -> int:
+        """
+        Run one handler on its events.
+        
+        Args:
+            handler: Handler to run
+            events: Events for the handler, oldest first
+            
+        Returns:
+            Number of events the handler failed on
+        """
+        active = getattr(self._dispatch_state, "active", False)
+        self._dispatch_state.active = True
+        try:
+            if handler.supports_batches:
+                try:
+                    return 0 if handler.handle_events(events) is not False else len(events)
+                except Exception as e:
+                    logger.error(f"Error handling {len(events)} events with handler {handler.__class__.__name__}: {e}")
+                    return len(events)
+            
+            failures = 0
+            for event in events:
+                try:
+                    if handler.handle_event(event) is False:
+                        failures += 1
+                except Exception as e:
+                    logger.error(f"Error handling event {event.event_id} with handler {handler.__class__.__name__}: {e}")
+                    failures += 1
+            return failures
+        finally:
+            self._dispatch_state.active = active
     
     def get_learning_manager(self) -> Optional[LearningManager]:
         """
@@ -608,16 +807,22 @@ class CustomEventHandler(EventHandler):
     Custom event handler for specific event processing.
     """
     
-    def __init__(self, event_types: List[str], handler_func: Callable[[EngineEvent], bool]):
+    def __init__(self,
+                 event_types: List[str],
+                 handler_func: Callable[[EngineEvent], bool],
+                 batch_func: Optional[Callable[[List[EngineEvent]], bool]] = None):
         """
         Initialize a custom event handler.
         
         Args:
             event_types: Types of events this handler can process
             handler_func: Function to handle events
+            batch_func: Optional function to handle a batch of events at once
         """
         super().__init__(event_types)
         self.handler_func = handler_func
+        self.batch_func = batch_func
+        self.supports_batches = batch_func is not None
     
     def handle_event(self, event: EngineEvent) -> bool:
         """
@@ -630,6 +835,20 @@ class CustomEventHandler(EventHandler):
             True if the event was handled successfully, False otherwise
         """
         return self.handler_func(event)
+    
+    def handle_events(self, events: List[EngineEvent]) -> bool:
+        """
+        Handle a batch of events using the batch function if one was provided.
+        
+        Args:
+            events: Events to handle
+            
+        Returns:
+            True if the events were handled successfully, False otherwise
+        """
+        if self.batch_func is None:
+            return super().handle_events(events)
+        return self.batch_func(events)
 
 
 def main():
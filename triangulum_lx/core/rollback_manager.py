@@ -592,6 +592,46 @@ class TransactionManager:
                 logger.error(f"Error adding snapshot for {file_path}: {e}")
                 return None
     
+    def add_file_snapshots(
+        self,
+        transaction_id: TransactionID,
+        file_paths: List[str],
+        snapshot_type: SnapshotType = SnapshotType.FULL
+    ) -> List[FileSnapshot]:
+        """
+        Add snapshots of several files to a transaction, saving it once.
+        
+        Args:
+            transaction_id: ID of the transaction
+            file_paths: Paths to the files
+            snapshot_type: Type of snapshot to create
+            
+        Returns:
+            The created snapshots (files that failed are skipped)
+        """
+        with self.lock:
+            transaction = self.active_transactions.get(transaction_id)
+            if not transaction:
+                logger.error(f"Transaction {transaction_id} not found or not active")
+                return []
+            
+            snapshots = []
+            for file_path in file_paths:
+                try:
+                    snapshot = FileSnapshot(
+                        file_path=file_path,
+                        snapshot_type=snapshot_type
+                    )
+                    transaction.add_snapshot(snapshot)
+                    snapshots.append(snapshot)
+                except Exception as e:
+                    logger.error(f"Error adding snapshot for {file_path}: {e}")
+            
+            # Save the transaction
+            self._save_transaction(transaction)
+            
+            return snapshots
+    
     def get_active_transactions(self) -> List[Transaction]:
         """
         Get all active transactions.
@@ -1142,6 +1182,38 @@ class RollbackManager:
         """
         return self.transaction_manager.rollback_transaction(transaction_id)
     
+    def add_file_snapshots(
+        self,
+        file_paths: List[str],
+        transaction_id: Optional[TransactionID] = None,
+        snapshot_type: SnapshotType = SnapshotType.FULL
+    ) -> List[FileSnapshot]:
+        """
+        Add snapshots of several files to the current or specified transaction.
+        
+        Args:
+            file_paths: Paths to the files
+            transaction_id: ID of the transaction, or None for current
+            snapshot_type: Type of snapshot to create
+            
+        Returns:
+            The created snapshots
+        """
+        with self.lock:
+            # Use current transaction if none specified
+            if transaction_id is None:
+                if not self.transaction_manager.transaction_stack:
+                    logger.error("No active transaction")
+                    return []
+                
+                transaction_id = self.transaction_manager.transaction_stack[-1]
+            
+            return self.transaction_manager.add_file_snapshots(
+                transaction_id=transaction_id,
+                file_paths=file_paths,
+                snapshot_type=snapshot_type
+            )
+    
     def get_active_transactions(self) -> List[Transaction]:
         """
         Get all active transactions.
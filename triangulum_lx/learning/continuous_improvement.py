@@ -33,6 +33,8 @@ except ImportError:
     logger.warning("Machine learning dependencies not available. Using basic improvement mechanisms only.")
     HAVE_ML_DEPS = False
 
+from .learning_store import LearningStore
+
 
 class Parameter:
     """
@@ -393,18 +395,27 @@ class ContinuousImprovement:
     Automatically adjusts system parameters and models based on operational experience and feedback.
     """
     
-    def __init__(self, database_path: Optional[str] = None):
+    # Number of samples kept per tracked metric
+    MAX_METRIC_SAMPLES = 1000
+    
+    def __init__(self, database_path: Optional[str] = None, storage_path: Optional[str] = None):
         """
         Initialize the continuous improvement system.
         
         Args:
-            database_path: Path to the database file
+            database_path: Path to the legacy JSON database, which is migrated
+                into the parameter store on first use
+            storage_path: Directory of the parameter store (defaults to the
+                database path with a ``.store`` suffix)
         """
         self.database_path = database_path or "triangulum_lx/config/parameters.json"
+        self.storage_path = storage_path or os.path.splitext(self.database_path)[0] + ".store"
+        self.store: Optional[LearningStore] = None
         self.parameters: Dict[str, Parameter] = {}
         self.experiments: Dict[str, Experiment] = {}
         self.models: Dict[str, Model] = {}
         self.metrics: Dict[str, List[Dict[str, Any]]] = {}
+        self._metric_sequences: Dict[str, int] = {}  # next store sequence number per metric
         
         # Initialize improvement thread
         self.stop_event = threading.Event()
@@ -419,63 +430,125 @@ class ContinuousImprovement:
             self._initialize_default_parameters()
     
     def _load_parameters(self):
-        """Load parameters from the database file."""
-        if os.path.exists(self.database_path):
-            try:
-                with open(self.database_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Load parameters
-                for param_data in data.get("parameters", []):
-                    param = Parameter.from_dict(param_data)
-                    self.parameters[param.name] = param
-                
-                # Load experiments
-                for exp_data in data.get("experiments", []):
-                    experiment = Experiment.from_dict(exp_data)
-                    self.experiments[experiment.experiment_id] = experiment
-                
-                # Load models
-                for model_data in data.get("models", []):
-                    model = Model.from_dict(model_data)
-                    self.models[model.model_id] = model
-                
-                # Load metrics
-                self.metrics = data.get("metrics", {})
-                
-                logger.info(f"Loaded {len(self.parameters)} parameters from {self.database_path}")
-            except Exception as e:
-                logger.error(f"Error loading parameters: {e}")
-                self.parameters = {}
-                self.experiments = {}
-                self.models = {}
-                self.metrics = {}
-        else:
-            logger.info("No parameter database found. Starting with default parameters.")
-    
-    def _save_parameters(self):
-        """Save parameters to the database file."""
+        """Load parameters from the parameter store, migrating the legacy database first."""
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.database_path), exist_ok=True)
+            self.store = LearningStore(self.storage_path)
+            if os.path.exists(self.database_path):
+                self.store.import_legacy(os.path.basename(self.database_path), self._legacy_records)
             
-            # Prepare data for serialization
-            data = {
-                "parameters": [param.to_dict() for param in self.parameters.values()],
-                "experiments": [exp.to_dict() for exp in self.experiments.values()],
-                "models": [model.to_dict() for model in self.models.values()],
-                "metrics": self.metrics,
-                "last_updated": datetime.now().isoformat()
-            }
+            # Load parameters
+            for name, param_data in self.store.items("parameters"):
+                self.parameters[name] = Parameter.from_dict(param_data)
+            
+            # Load experiments
+            for experiment_id, exp_data in self.store.items("experiments"):
+                self.experiments[experiment_id] = Experiment.from_dict(exp_data)
+            
+            # Load models
+            for model_id, model_data in self.store.items("models"):
+                self.models[model_id] = Model.from_dict(model_data)
+            
+            # Load metrics; samples are keyed "<metric>/<sequence>" and only the
+            # retained tail of each metric is read
+            sample_keys = defaultdict(list)
+            for key in self.store.keys("metric_samples"):
+                name, sequence = key.rsplit("/", 1)
+                sample_keys[name].append(int(sequence))
             
-            # Save to file
-            with open(self.database_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, default=str)
+            for name, sequences in sample_keys.items():
+                sequences.sort()
+                keys = [f"{name}/{sequence:012d}" for sequence in sequences[-self.MAX_METRIC_SAMPLES:]]
+                self.metrics[name] = [sample for _, sample in self.store.items("metric_samples", keys)]
+                self._metric_sequences[name] = sequences[-1] + 1
             
-            logger.info(f"Saved {len(self.parameters)} parameters to {self.database_path}")
+            logger.info(f"Loaded {len(self.parameters)} parameters from {self.storage_path}")
+        except Exception as e:
+            logger.error(f"Error loading parameters: {e}")
+            self.parameters = {}
+            self.experiments = {}
+            self.models = {}
+            self.metrics = {}
+            self._metric_sequences = {}
+    
+    def _legacy_records(self):
+        """Yield store records from the JSON database written by earlier versions."""
+        with open(self.database_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        for param_data in data.get("parameters", []):
+            yield "parameters", param_data["name"], param_data
+        
+        for exp_data in data.get("experiments", []):
+            yield "experiments", exp_data["experiment_id"], exp_data
+        
+        for model_data in data.get("models", []):
+            yield "models", model_data["model_id"], model_data
+        
+        for name, samples in data.get("metrics", {}).items():
+            for sequence, sample in enumerate(samples):
+                yield "metric_samples", f"{name}/{sequence:012d}", sample
+    
+    def _save_parameters(self, collection: Optional[str] = None, key: Optional[str] = None):
+        """
+        Append changed records to the parameter store.
+        
+        Args:
+            collection: Collection of the changed record (parameters,
+                experiments or models). When omitted every record is offered
+                to the store, which skips the ones that did not change.
+            key: Key of the changed record
+        """
+        if self.store is None:
+            return
+        
+        records = {
+            "parameters": self.parameters,
+            "experiments": self.experiments,
+            "models": self.models
+        }
+        
+        try:
+            if collection is None:
+                written = 0
+                for name, objects in records.items():
+                    for object_key, obj in list(objects.items()):
+                        written += self.store.put(name, object_key, obj.to_dict())
+                logger.debug(f"Saved {written} changed records to {self.storage_path}")
+            else:
+                self.store.put(collection, key, records[collection][key].to_dict())
         except Exception as e:
             logger.error(f"Error saving parameters: {e}")
     
+    def _save_metric_sample(self, name: str, sample: Dict[str, Any]):
+        """
+        Append a metric sample to the parameter store and drop the sample that
+        fell out of the retained history.
+        
+        Args:
+            name: Metric name
+            sample: Metric sample
+        """
+        if self.store is None:
+            return
+        
+        try:
+            sequence = self._metric_sequences.get(name, 0)
+            self._metric_sequences[name] = sequence + 1
+            self.store.put("metric_samples", f"{name}/{sequence:012d}", sample)
+            
+            expired = sequence - self.MAX_METRIC_SAMPLES
+            if expired >= 0:
+                self.store.delete("metric_samples", f"{name}/{expired:012d}")
+        except Exception as e:
+            logger.error(f"Error saving metric {name}: {e}")
+    
+    def close(self):
+        """Stop the improvement thread and close the parameter store."""
+        if self.improvement_thread and self.improvement_thread.is_alive():
+            self.stop_improvement_thread()
+        if self.store is not None:
+            self.store.close()
+    
     def _initialize_default_parameters(self):
         """Initialize default parameters."""
         default_parameters = [
@@ -594,7 +667,7 @@ class ContinuousImprovement:
         self.parameters[name].update(value, reason)
         
         # Save parameters
-        self._save_parameters()
+        self._save_parameters("parameters", name)
         
         return True
     
@@ -609,17 +682,18 @@ class ContinuousImprovement:
         if name not in self.metrics:
             self.metrics[name] = []
         
-        self.metrics[name].append({
+        sample = {
             "timestamp": datetime.now().isoformat(),
             "value": value
-        })
+        }
+        self.metrics[name].append(sample)
         
         # Limit metric history
-        if len(self.metrics[name]) > 1000:
-            self.metrics[name] = self.metrics[name][-1000:]
+        if len(self.metrics[name]) > self.MAX_METRIC_SAMPLES:
+            self.metrics[name] = self.metrics[name][-self.MAX_METRIC_SAMPLES:]
         
-        # Save parameters
-        self._save_parameters()
+        # Save metric
+        self._save_metric_sample(name, sample)
     
     def create_experiment(self, 
                          name: str,
@@ -655,7 +729,7 @@ class ContinuousImprovement:
         self.experiments[experiment_id] = experiment
         
         # Save parameters
-        self._save_parameters()
+        self._save_parameters("experiments", experiment_id)
         
         logger.info(f"Created experiment {experiment_id}")
         return experiment_id
@@ -677,7 +751,7 @@ class ContinuousImprovement:
         self.experiments[experiment_id].start()
         
         # Save parameters
-        self._save_parameters()
+        self._save_parameters("experiments", experiment_id)
         
         logger.info(f"Started experiment {experiment_id}")
         return True
@@ -699,7 +773,7 @@ class ContinuousImprovement:
         self.experiments[experiment_id].stop()
         
         # Save parameters
-        self._save_parameters()
+        self._save_parameters("experiments", experiment_id)
         
         logger.info(f"Stopped experiment {experiment_id}")
         return True
@@ -757,7 +831,7 @@ class ContinuousImprovement:
         self.experiments[experiment_id].add_result(variant, metric, value)
         
         # Save parameters
-        self._save_parameters()
+        self._save_parameters("experiments", experiment_id)
         
         return True
     
@@ -801,7 +875,7 @@ class ContinuousImprovement:
         self.models[model_id] = model
         
         # Save parameters
-        self._save_parameters()
+        self._save_parameters("models", model_id)
         
         logger.info(f"Registered model {model_id}")
         return model_id
@@ -824,7 +898,7 @@ class ContinuousImprovement:
         self.models[model_id].update_metrics(metrics)
         
         # Save parameters
-        self._save_parameters()
+        self._save_parameters("models", model_id)
         
         return True
     
@@ -846,7 +920,7 @@ class ContinuousImprovement:
         self.models[model_id].update_parameters(parameters)
         
         # Save parameters
-        self._save_parameters()
+        self._save_parameters("models", model_id)
         
         return True
     
@@ -867,7 +941,7 @@ class ContinuousImprovement:
         self.models[model_id].set_trained()
         
         # Save parameters
-        self._save_parameters()
+        self._save_parameters("models", model_id)
         
         return True
     
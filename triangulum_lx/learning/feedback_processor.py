@@ -12,6 +12,7 @@ import os
 import json
 import time
 import logging
+import threading
 import hashlib
 import re
 from typing import Dict, List, Any, Optional, Set, Tuple, Union, Callable
@@ -26,15 +27,16 @@ logger = logging.getLogger("triangulum.feedback_processor")
 # Try to import optional dependencies
 try:
     import numpy as np
-    from sklearn.feature_extraction.text import TfidfVectorizer
     from sklearn.metrics.pairwise import cosine_similarity
-    from sklearn.cluster import DBSCAN
     from sklearn.ensemble import RandomForestClassifier
     HAVE_ML_DEPS = True
 except ImportError:
     logger.warning("Machine learning dependencies not available. Using basic feedback processing only.")
     HAVE_ML_DEPS = False
 
+from .incremental_clustering import IncrementalTextClusterer, HAVE_ML_DEPS as HAVE_CLUSTERING_DEPS
+from .learning_store import LearningStore
+
 
 class FeedbackItem:
     """
@@ -209,88 +211,164 @@ class FeedbackProcessor:
     Processes feedback to improve system performance and repair effectiveness.
     """
     
-    def __init__(self, database_path: Optional[str] = None):
+    def __init__(self,
+                 database_path: Optional[str] = None,
+                 recluster_interval: float = 3600.0,
+                 storage_path: Optional[str] = None):
         """
         Initialize the feedback processor.
         
         Args:
-            database_path: Path to the feedback database file
+            database_path: Path to the legacy JSON feedback database, which is
+                migrated into the feedback store on first use
+            recluster_interval: Seconds between full background reclusterings
+                (0 disables the background worker)
+            storage_path: Directory of the feedback store (defaults to the
+                database path with a ``.store`` suffix)
         """
         self.database_path = database_path or "triangulum_lx/learning/feedback.json"
+        self.storage_path = storage_path or os.path.splitext(self.database_path)[0] + ".store"
+        self.store: Optional[LearningStore] = None
         self.feedback_items: Dict[str, FeedbackItem] = {}
         self.repair_effectiveness: Dict[str, RepairEffectiveness] = {}
-        self.feedback_clusters: Dict[str, List[str]] = {}
+        self._feedback_clusters: Dict[str, List[str]] = {}  # used without the clusterer
+        self._label_lock = threading.Lock()
         self.learning_signals: List[Dict[str, Any]] = []
+        self._saved_signal_count = 0
         
-        # Initialize vectorizer for similarity matching
-        self.vectorizer = None
-        if HAVE_ML_DEPS:
-            self.vectorizer = TfidfVectorizer(
-                analyzer='word',
+        # Initialize incremental clusterer for similarity matching
+        self.clusterer = None
+        if HAVE_CLUSTERING_DEPS:
+            self.clusterer = IncrementalTextClusterer(
                 token_pattern=r'\b\w+\b',
                 ngram_range=(1, 2),
-                max_features=5000
+                eps=0.3,
+                min_samples=2
             )
         
         # Load feedback if available
         self._load_feedback()
+        
+        if self.clusterer is not None and recluster_interval > 0:
+            self.clusterer.start_background_reclustering(recluster_interval, self._save_cluster_labels)
+    
+    @property
+    def feedback_clusters(self) -> Dict[str, List[str]]:
+        """Mapping of cluster key to feedback IDs, copied under the clusterer's lock."""
+        if self.clusterer is not None:
+            return self.clusterer.cluster_snapshot()
+        return self._feedback_clusters
     
     def _load_feedback(self):
-        """Load feedback from the database file."""
-        if os.path.exists(self.database_path):
-            try:
-                with open(self.database_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Load feedback items
-                for feedback_data in data.get("feedback_items", []):
-                    feedback = FeedbackItem.from_dict(feedback_data)
-                    self.feedback_items[feedback.feedback_id] = feedback
-                
-                # Load repair effectiveness
-                for effectiveness_data in data.get("repair_effectiveness", []):
-                    effectiveness = RepairEffectiveness.from_dict(effectiveness_data)
-                    self.repair_effectiveness[effectiveness.repair_id] = effectiveness
-                
-                # Load feedback clusters
-                self.feedback_clusters = data.get("feedback_clusters", {})
-                
-                # Load learning signals
-                self.learning_signals = data.get("learning_signals", [])
-                
-                logger.info(f"Loaded {len(self.feedback_items)} feedback items from {self.database_path}")
-            except Exception as e:
-                logger.error(f"Error loading feedback: {e}")
-                self.feedback_items = {}
-                self.repair_effectiveness = {}
-                self.feedback_clusters = {}
-                self.learning_signals = []
-        else:
-            logger.info("No feedback database found. Starting with empty database.")
+        """Load feedback from the feedback store, migrating the legacy database first."""
+        try:
+            self.store = LearningStore(self.storage_path)
+            if os.path.exists(self.database_path):
+                self.store.import_legacy(os.path.basename(self.database_path), self._legacy_records)
+            
+            # Load feedback items
+            for feedback_id, feedback_data in self.store.items("feedback_items"):
+                self.feedback_items[feedback_id] = FeedbackItem.from_dict(feedback_data)
+            
+            # Load repair effectiveness
+            for repair_id, effectiveness_data in self.store.items("repair_effectiveness"):
+                self.repair_effectiveness[repair_id] = RepairEffectiveness.from_dict(effectiveness_data)
+            
+            # Load feedback clusters
+            clusters = defaultdict(list)
+            for feedback_id, cluster_key in self.store.items("cluster_labels"):
+                clusters[cluster_key].append(feedback_id)
+            self._feedback_clusters = dict(clusters)
+            
+            if self.clusterer is not None:
+                for feedback_id, feedback in self.feedback_items.items():
+                    self.clusterer.add(feedback_id, feedback.content, assign=False)
+                self.clusterer.load_clusters(self._feedback_clusters)
+                self.clusterer.pop_label_changes()
+            
+            # Load learning signals (keys are zero-padded sequence numbers)
+            signal_keys = sorted(self.store.keys("learning_signals"))
+            self.learning_signals = [signal for _, signal in self.store.items("learning_signals", signal_keys)]
+            self._saved_signal_count = len(self.learning_signals)
+            
+            logger.info(f"Loaded {len(self.feedback_items)} feedback items from {self.storage_path}")
+        except Exception as e:
+            logger.error(f"Error loading feedback: {e}")
+            self.feedback_items = {}
+            self.repair_effectiveness = {}
+            self._feedback_clusters = {}
+            if self.clusterer is not None:
+                self.clusterer.load_clusters({})
+            self.learning_signals = []
+            self._saved_signal_count = 0
     
-    def _save_feedback(self):
-        """Save feedback to the database file."""
+    def _legacy_records(self):
+        """Yield store records from the JSON database written by earlier versions."""
+        with open(self.database_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        for feedback_data in data.get("feedback_items", []):
+            yield "feedback_items", feedback_data["feedback_id"], feedback_data
+        
+        for effectiveness_data in data.get("repair_effectiveness", []):
+            yield "repair_effectiveness", effectiveness_data["repair_id"], effectiveness_data
+        
+        for cluster_key, feedback_ids in data.get("feedback_clusters", {}).items():
+            for feedback_id in feedback_ids:
+                yield "cluster_labels", feedback_id, cluster_key
+        
+        for index, signal in enumerate(data.get("learning_signals", [])):
+            yield "learning_signals", f"{index:012d}", signal
+    
+    def _save_feedback(self, feedback_id: str):
+        """
+        Append a processed feedback item and the state it changed to the feedback store.
+        
+        Args:
+            feedback_id: ID of the feedback item that was processed
+        """
+        if self.store is None:
+            return
+        
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.database_path), exist_ok=True)
+            feedback = self.feedback_items[feedback_id]
+            self.store.put("feedback_items", feedback_id, feedback.to_dict())
+            
+            repair_id = feedback.context.get("repair_id")
+            if repair_id in self.repair_effectiveness:
+                self.store.put("repair_effectiveness", repair_id, self.repair_effectiveness[repair_id].to_dict())
             
-            # Prepare data for serialization
-            data = {
-                "feedback_items": [feedback.to_dict() for feedback in self.feedback_items.values()],
-                "repair_effectiveness": [effectiveness.to_dict() for effectiveness in self.repair_effectiveness.values()],
-                "feedback_clusters": self.feedback_clusters,
-                "learning_signals": self.learning_signals,
-                "last_updated": datetime.now().isoformat()
-            }
+            self._save_cluster_labels()
             
-            # Save to file
-            with open(self.database_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, default=str)
+            # Learning signals are append-only
+            for index in range(self._saved_signal_count, len(self.learning_signals)):
+                self.store.put("learning_signals", f"{index:012d}", self.learning_signals[index])
+            self._saved_signal_count = len(self.learning_signals)
             
-            logger.info(f"Saved {len(self.feedback_items)} feedback items to {self.database_path}")
+            logger.debug(f"Saved feedback {feedback_id} to {self.storage_path}")
         except Exception as e:
             logger.error(f"Error saving feedback: {e}")
     
+    def _save_cluster_labels(self):
+        """Append the cluster assignments changed since the last save to the feedback store."""
+        if self.store is None or self.clusterer is None:
+            return
+        
+        # Serialized so an older label can never overwrite a newer one
+        with self._label_lock:
+            for item_id, cluster_key in self.clusterer.pop_label_changes().items():
+                if cluster_key is None:
+                    self.store.delete("cluster_labels", item_id)
+                else:
+                    self.store.put("cluster_labels", item_id, cluster_key)
+    
+    def close(self):
+        """Stop background reclustering and close the feedback store."""
+        if self.clusterer is not None:
+            self.clusterer.stop_background_reclustering()
+        if self.store is not None:
+            self.store.close()
+    
     def process_feedback(self, 
                         source_type: str,
                         content: str,
@@ -353,10 +431,10 @@ class FeedbackProcessor:
                 self.repair_effectiveness[repair_id] = effectiveness
         
         # Update feedback clusters
-        self._update_feedback_clusters()
+        self._update_feedback_clusters(feedback_id)
         
         # Save feedback
-        self._save_feedback()
+        self._save_feedback(feedback_id)
         
         logger.info(f"Processed feedback {feedback_id} from {source_type}")
         return feedback_id
@@ -745,42 +823,23 @@ class FeedbackProcessor:
         
         return signals
     
-    def _update_feedback_clusters(self):
-        """Update feedback clusters based on similarity."""
-        if not HAVE_ML_DEPS or len(self.feedback_items) < 2:
-            # Skip clustering if ML dependencies are not available or not enough feedback
+    def _update_feedback_clusters(self, feedback_id: str):
+        """
+        Assign a new feedback item to a cluster based on similarity.
+        
+        The item is vectorized and matched against its nearest neighbours
+        incrementally; full reclustering runs periodically in the background.
+        
+        Args:
+            feedback_id: ID of the feedback item that was added
+        """
+        if self.clusterer is None:
+            # Skip clustering if ML dependencies are not available
             return
         
         try:
-            # Extract feedback texts for vectorization
-            feedback_texts = []
-            feedback_ids = []
-            
-            for feedback_id, feedback in self.feedback_items.items():
-                feedback_text = feedback.content
-                feedback_texts.append(feedback_text)
-                feedback_ids.append(feedback_id)
-            
-            # Vectorize feedback
-            X = self.vectorizer.fit_transform(feedback_texts)
-            
-            # Cluster feedback using DBSCAN
-            clustering = DBSCAN(eps=0.3, min_samples=2).fit(X.toarray())
-            
-            # Update feedback clusters
-            self.feedback_clusters = {}
-            for i, cluster_id in enumerate(clustering.labels_):
-                if cluster_id == -1:
-                    # Noise points (no cluster)
-                    continue
-                
-                cluster_key = f"cluster_{cluster_id}"
-                if cluster_key not in self.feedback_clusters:
-                    self.feedback_clusters[cluster_key] = []
-                
-                self.feedback_clusters[cluster_key].append(feedback_ids[i])
-            
-            logger.info(f"Updated feedback clusters: {len(self.feedback_clusters)} clusters")
+            cluster_key = self.clusterer.add(feedback_id, self.feedback_items[feedback_id].content)
+            logger.debug(f"Assigned feedback {feedback_id} to {cluster_key or 'no cluster'}")
         except Exception as e:
             logger.error(f"Error updating feedback clusters: {e}")
     
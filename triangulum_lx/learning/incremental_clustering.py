@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Incremental Text Clustering
+
+This module provides streaming similarity clustering for the learning
+components. Texts are vectorized with a stateless hashing vectorizer,
+weighted with incrementally maintained document frequencies, and stored as
+sparse rows. New items are assigned to clusters with a sparse cosine
+neighbour search, so ingesting one item never refits the vectorizer or
+densifies the corpus. A full DBSCAN recluster, which also refreshes the
+IDF weights and merges clusters that streaming assignment kept apart, runs
+on a schedule in a background worker.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("triangulum.incremental_clustering")
+
+# Try to import optional dependencies
+try:
+    import numpy as np
+    from scipy import sparse
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.preprocessing import normalize
+    from sklearn.cluster import DBSCAN
+    HAVE_ML_DEPS = True
+except ImportError:
+    logger.warning("Machine learning dependencies not available. Incremental clustering is disabled.")
+    HAVE_ML_DEPS = False
+
+
+class IncrementalTextClusterer:
+    """
+    Streaming DBSCAN-style clustering of short texts.
+
+    Semantics follow ``DBSCAN(eps, min_samples)`` on L2-normalized TF-IDF
+    vectors: two items are neighbours when their Euclidean distance is at
+    most ``eps``, which for unit vectors is a cosine similarity of at least
+    ``1 - eps**2 / 2``. Streaming assignment attaches a new item to the
+    cluster of its most similar clustered neighbour, or starts a new cluster
+    once it has ``min_samples - 1`` unclustered neighbours; the periodic full
+    recluster restores exact DBSCAN labels.
+
+    Stored vectors are kept in a log-structured list of CSC segments whose
+    sizes follow a binary counter, so appends cost amortised O(log n) and a
+    neighbour query only touches the postings of the query's features.
+    """
+
+    # Segments with at least this many rows keep a CSC copy for column lookups
+    CSC_SEGMENT_ROWS = 512
+
+    def __init__(self,
+                 token_pattern: str = r'\b\w+\b',
+                 ngram_range: Tuple[int, int] = (1, 1),
+                 n_features: int = 2 ** 18,
+                 eps: float = 0.3,
+                 min_samples: int = 2):
+        """
+        Initialize the clusterer.
+
+        Args:
+            token_pattern: Regular expression used to tokenize texts
+            ngram_range: Range of word n-grams to extract
+            n_features: Number of hashed feature columns
+            eps: DBSCAN neighbourhood radius on normalized vectors
+            min_samples: DBSCAN minimum neighbourhood size (including the item)
+        """
+        if not HAVE_ML_DEPS:
+            raise ImportError("IncrementalTextClusterer requires numpy, scipy and scikit-learn")
+
+        self.vectorizer = HashingVectorizer(
+            analyzer='word',
+            token_pattern=token_pattern,
+            ngram_range=ngram_range,
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None
+        )
+        self.eps = eps
+        self.min_samples = max(1, min_samples)
+        self.min_similarity = 1.0 - (eps ** 2) / 2.0
+
+        self.item_ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._counts: List[Any] = []  # raw hashed term counts per item (CSR rows)
+        self._doc_freq = np.zeros(n_features, dtype=np.int64)
+        self._segments: List[Tuple[int, Any, Any]] = []  # (first position, CSR rows, CSC copy or None)
+
+        self.labels: Dict[str, Optional[str]] = {}
+        # Replaced rather than cleared in place, so unlocked readers never see a
+        # partial mapping; cluster_snapshot() gives a consistent copy
+        self.clusters: Dict[str, List[str]] = {}
+        self._next_cluster = 0
+        self._changed_labels: Set[str] = set()  # items relabelled since the last pop
+
+        self._lock = threading.RLock()
+        self._added_since_recluster = 0
+        self._worker: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._positions
+
+    def _weight(self, counts: Any, n_docs: int) -> Any:
+        """Apply smoothed IDF weights and L2-normalize sparse rows."""
+        weighted = counts.astype(np.float64)
+        weighted.sort_indices()
+        doc_freq = self._doc_freq[weighted.indices]
+        weighted.data *= np.log((1.0 + n_docs) / (1.0 + doc_freq)) + 1.0
+        if weighted.shape[0] > 1:
+            return normalize(weighted, norm='l2')
+        norm = np.sqrt(np.dot(weighted.data, weighted.data))
+        if norm > 0:
+            weighted.data /= norm
+        return weighted
+
+    def _make_segment(self, start: int, rows: Any) -> Tuple[int, Any, Any]:
+        """Build a segment; large ones get a CSC copy for column lookups."""
+        columns = rows.tocsc() if rows.shape[0] >= self.CSC_SEGMENT_ROWS else None
+        return (start, rows, columns)
+
+    def _append_segment(self, position: int, row: Any):
+        """Append a weighted row and merge equally sized trailing segments."""
+        self._segments.append(self._make_segment(position, row))
+        while (len(self._segments) >= 2 and
+               self._segments[-2][1].shape[0] <= self._segments[-1][1].shape[0]):
+            start, first, _ = self._segments[-2]
+            second = self._segments[-1][1]
+            merged = sparse.vstack([first, second], format='csr')
+            self._segments[-2:] = [self._make_segment(start, merged)]
+
+    def _segment_scores(self, segment: Tuple[int, Any, Any], row: Any) -> Any:
+        """Cosine similarities between ``row`` and every item of a segment."""
+        _, rows, columns = segment
+        if columns is not None:
+            return columns[:, row.indices] @ row.data
+
+        # Small segment: match its column indices against the sorted query
+        # indices directly, which avoids any O(n_features) conversions.
+        if not rows.nnz:
+            return np.zeros(rows.shape[0])
+        positions = np.searchsorted(row.indices, rows.indices)
+        positions[positions == len(row.indices)] = 0
+        matched = row.indices[positions] == rows.indices
+        contributions = np.where(matched, rows.data * row.data[positions], 0.0)
+        row_ids = np.repeat(np.arange(rows.shape[0]), np.diff(rows.indptr))
+        return np.bincount(row_ids, weights=contributions, minlength=rows.shape[0])
+
+    def _similarities(self, row: Any) -> List[Tuple[int, float]]:
+        """Find stored items whose cosine similarity to ``row`` reaches the threshold."""
+        if not row.nnz:
+            return []
+
+        matches = []
+        for segment in self._segments:
+            start = segment[0]
+            scores = self._segment_scores(segment, row)
+            hits = np.nonzero(scores >= self.min_similarity)[0]
+            matches.extend((start + int(i), float(scores[i])) for i in hits)
+        return matches
+
+    def add(self, item_id: str, text: str, assign: bool = True) -> Optional[str]:
+        """
+        Add an item and assign it to a cluster.
+
+        Args:
+            item_id: Unique identifier of the item
+            text: Text to vectorize
+            assign: Whether to run streaming cluster assignment
+
+        Returns:
+            The key of the cluster the item joined, or None for noise
+        """
+        counts = sparse.csr_matrix(self.vectorizer.transform([text]))
+        with self._lock:
+            if item_id in self._positions:
+                return self.labels.get(item_id)
+
+            position = len(self.item_ids)
+            self._doc_freq[counts.indices] += 1
+            row = self._weight(counts, position + 1)
+
+            neighbours = self._similarities(row) if assign else []
+
+            self.item_ids.append(item_id)
+            self._positions[item_id] = position
+            self._counts.append(counts)
+            self._append_segment(position, row)
+            self.labels[item_id] = None
+            self._added_since_recluster += 1
+
+            if assign:
+                self._assign(item_id, neighbours)
+            return self.labels[item_id]
+
+    def _assign(self, item_id: str, neighbours: List[Tuple[int, float]]):
+        """Streaming DBSCAN-style assignment from precomputed neighbours."""
+        if len(neighbours) + 1 < self.min_samples:
+            return
+
+        best_cluster = None
+        best_score = -1.0
+        for position, score in neighbours:
+            cluster_key = self.labels.get(self.item_ids[position])
+            if cluster_key is not None and score > best_score:
+                best_cluster, best_score = cluster_key, score
+
+        if best_cluster is None:
+            best_cluster = f"cluster_{self._next_cluster}"
+            self._next_cluster += 1
+            members = []
+            for position, _ in neighbours:
+                neighbour_id = self.item_ids[position]
+                self.labels[neighbour_id] = best_cluster
+                members.append(neighbour_id)
+                self._changed_labels.add(neighbour_id)
+            self.clusters = {**self.clusters, best_cluster: members}
+
+        self.labels[item_id] = best_cluster
+        self.clusters[best_cluster].append(item_id)
+        self._changed_labels.add(item_id)
+
+    def find_similar(self, text: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Find the stored items most similar to a text.
+
+        Args:
+            text: Text to compare against the stored items
+            top_k: Maximum number of results
+
+        Returns:
+            List of (item_id, cosine similarity) tuples, most similar first
+        """
+        counts = sparse.csr_matrix(self.vectorizer.transform([text]))
+        with self._lock:
+            if not self.item_ids or not counts.nnz:
+                return []
+            row = self._weight(counts, len(self.item_ids))
+            scored = []
+            for segment in self._segments:
+                start = segment[0]
+                scores = self._segment_scores(segment, row)
+                candidates = np.nonzero(scores > 0)[0]
+                scored.extend((float(scores[i]), start + int(i)) for i in candidates)
+            scored.sort(reverse=True)
+            return [(self.item_ids[position], score) for score, position in scored[:top_k]]
+
+    def cluster_snapshot(self) -> Dict[str, List[str]]:
+        """Get a consistent copy of the current clusters."""
+        with self._lock:
+            return {key: list(members) for key, members in self.clusters.items()}
+
+    def pop_label_changes(self) -> Dict[str, Optional[str]]:
+        """
+        Get the items whose cluster changed since the previous call.
+
+        Returns:
+            Mapping of item ID to its current cluster key (None for noise)
+        """
+        with self._lock:
+            changes = {item_id: self.labels.get(item_id) for item_id in self._changed_labels}
+            self._changed_labels.clear()
+            return changes
+
+    def load_clusters(self, clusters: Dict[str, List[str]]):
+        """
+        Restore previously computed clusters for items already added.
+
+        Args:
+            clusters: Mapping of cluster key to item IDs
+        """
+        with self._lock:
+            previous = dict(self.labels)
+            loaded = {}
+            for item_id in self.labels:
+                self.labels[item_id] = None
+
+            for cluster_key, members in clusters.items():
+                known = [m for m in members if m in self._positions]
+                if not known:
+                    continue
+                loaded[cluster_key] = known
+                for member in known:
+                    self.labels[member] = cluster_key
+                suffix = cluster_key.rsplit("_", 1)[-1]
+                if suffix.isdigit():
+                    self._next_cluster = max(self._next_cluster, int(suffix) + 1)
+            self.clusters = loaded
+
+            self._changed_labels.update(
+                item_id for item_id, label in self.labels.items() if previous.get(item_id) != label
+            )
+
+    def recluster(self) -> int:
+        """
+        Run a full DBSCAN over all items and refresh the IDF weights.
+
+        The expensive part runs without holding the lock; items added in the
+        meantime are assigned against the new clusters afterwards.
+
+        Returns:
+            Number of clusters found
+        """
+        with self._lock:
+            n_items = len(self.item_ids)
+            if n_items == 0:
+                return 0
+            counts = sparse.vstack(self._counts[:n_items], format='csr')
+            weighted = self._weight(counts, n_items)
+            self._added_since_recluster = 0
+
+        if n_items >= self.min_samples:
+            labels = DBSCAN(eps=self.eps, min_samples=self.min_samples).fit(weighted).labels_
+        else:
+            labels = np.full(n_items, -1)
+
+        with self._lock:
+            late_items = list(range(n_items, len(self.item_ids)))
+            previous = dict(self.labels)
+
+            clusters: Dict[str, List[str]] = {}
+            for item_id in self.item_ids:
+                self.labels[item_id] = None
+            for position, label in enumerate(labels):
+                if label == -1:
+                    continue
+                cluster_key = f"cluster_{label}"
+                item_id = self.item_ids[position]
+                self.labels[item_id] = cluster_key
+                clusters.setdefault(cluster_key, []).append(item_id)
+            self.clusters = clusters
+            self._next_cluster = int(labels.max()) + 1 if len(labels) and labels.max() >= 0 else 0
+
+            self._segments = [self._make_segment(0, weighted)]
+            for position in late_items:
+                row = self._weight(self._counts[position], len(self.item_ids))
+                neighbours = self._similarities(row)
+                self._append_segment(position, row)
+                self._assign(self.item_ids[position], neighbours)
+
+            self._changed_labels.update(
+                item_id for item_id, label in self.labels.items() if previous.get(item_id) != label
+            )
+
+            logger.info(f"Reclustered {n_items} items into {len(self.clusters)} clusters")
+            return len(self.clusters)
+
+    def start_background_reclustering(self,
+                                      interval: float,
+                                      on_labels_changed: Optional[Callable[[], None]] = None):
+        """
+        Start a daemon thread that reclusters on a fixed schedule.
+
+        A scheduled run is skipped when no items were added since the last one.
+
+        Args:
+            interval: Seconds between reclustering runs
+            on_labels_changed: Called after a run that relabelled items, so
+                the owner can persist ``pop_label_changes()``
+        """
+        if self._worker and self._worker.is_alive():
+            return
+
+        self._stop_event.clear()
+
+        def run():
+            while not self._stop_event.wait(interval):
+                if self._added_since_recluster == 0:
+                    continue
+                try:
+                    self.recluster()
+                    if on_labels_changed is not None and self._changed_labels:
+                        on_labels_changed()
+                except Exception as e:
+                    logger.error(f"Error during background reclustering: {e}")
+
+        self._worker = threading.Thread(target=run, name="triangulum-recluster", daemon=True)
+        self._worker.start()
+
+    def stop_background_reclustering(self, timeout: Optional[float] = None):
+        """Stop the background reclustering thread."""
+        self._stop_event.set()
+        if self._worker:
+            self._worker.join(timeout=timeout)
+            self._worker = None
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Learning Store
+
+This module provides the shared persistence layer for the learning package.
+Records are grouped into named collections and appended to a fixed number of
+shard logs. An in-memory index maps every key to the location of its latest
+value, so saving a change appends one line instead of rewriting the whole
+database. Values are only read from disk when they are requested, shards are
+compacted individually once most of their bytes are superseded records, and
+fsync calls are batched over a configurable interval.
+"""
+
+import os
+import json
+import time
+import zlib
+import hashlib
+import logging
+import threading
+import weakref
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Iterable, Callable
+
+logger = logging.getLogger("triangulum.learning_store")
+
+# Collection used for store bookkeeping such as completed migrations
+META_COLLECTION = "_meta"
+
+STORE_FORMAT = 1
+
+
+class _Shard:
+    """
+    One append-only log file and the index of the live records it holds.
+
+    Each line of the log is ``[op, collection, key]`` as JSON, a tab, and the
+    JSON encoded value. JSON never emits a raw tab, so the header can be split
+    off and indexed without decoding the value.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # collection -> key -> (value offset, value length, digest, record length)
+        self.index: Dict[str, Dict[str, Tuple[int, int, bytes, int]]] = {}
+        self.size = 0
+        self.live_bytes = 0
+        self.dirty = False
+        self.file = None
+
+    def open(self):
+        """Open the log and rebuild the index from its records."""
+        self.file = open(self.path, 'a+b')
+        self.file.seek(0)
+
+        offset = 0
+        for line in self.file:
+            if not line.endswith(b"\n"):
+                # Torn write from a crash; drop the partial record
+                logger.warning(f"Truncating partial record at offset {offset} in {self.path}")
+                self.file.truncate(offset)
+                break
+
+            try:
+                head, data = line[:-1].split(b"\t", 1)
+                op, collection, key = json.loads(head)
+            except ValueError:
+                logger.warning(f"Skipping unreadable record at offset {offset} in {self.path}")
+                offset += len(line)
+                continue
+
+            self._apply(op, collection, key, offset + len(head) + 1, data, len(line))
+            offset += len(line)
+
+        self.size = offset
+
+    def _apply(self, op: str, collection: str, key: str, value_offset: int, data: bytes, record_length: int):
+        """Update the index for a record appended at ``value_offset``."""
+        entries = self.index.setdefault(collection, {})
+        old = entries.get(key)
+        if old is not None:
+            self.live_bytes -= old[3]
+
+        if op == "put":
+            entries[key] = (value_offset, len(data), _digest(data), record_length)
+            self.live_bytes += record_length
+        else:
+            entries.pop(key, None)
+            if not entries:
+                del self.index[collection]
+
+    def append(self, op: str, collection: str, key: str, data: bytes):
+        """Append a record and update the index."""
+        head = json.dumps([op, collection, key]).encode('utf-8')
+        record = head + b"\t" + data + b"\n"
+        self.file.write(record)
+        self.file.flush()
+
+        self._apply(op, collection, key, self.size + len(head) + 1, data, len(record))
+        self.size += len(record)
+        self.dirty = True
+
+    def read(self, entry: Tuple[int, int, bytes, int]) -> bytes:
+        """Read the value bytes of an index entry."""
+        self.file.seek(entry[0])
+        return self.file.read(entry[1])
+
+    def sync(self):
+        """Flush the log to stable storage if it has unsynced writes."""
+        if self.dirty and self.file is not None:
+            os.fsync(self.file.fileno())
+            self.dirty = False
+
+    def compact(self):
+        """Rewrite the log so that it only holds live records."""
+        temp_path = f"{self.path}.compact"
+        index = {}
+        offset = 0
+
+        with open(temp_path, 'wb') as out:
+            for collection, entries in self.index.items():
+                compacted = index.setdefault(collection, {})
+                for key, entry in entries.items():
+                    data = self.read(entry)
+                    head = json.dumps(["put", collection, key]).encode('utf-8')
+                    record = head + b"\t" + data + b"\n"
+                    out.write(record)
+                    compacted[key] = (offset + len(head) + 1, len(data), entry[2], len(record))
+                    offset += len(record)
+            out.flush()
+            os.fsync(out.fileno())
+
+        self.file.close()
+        os.replace(temp_path, self.path)
+        _fsync_directory(os.path.dirname(self.path))
+
+        self.file = open(self.path, 'a+b')
+        self.index = index
+        self.size = offset
+        self.live_bytes = offset
+        self.dirty = False
+
+    def close(self):
+        """Sync and close the log file."""
+        if self.file is not None:
+            self.sync()
+            self.file.close()
+            self.file = None
+
+
+def _digest(data: bytes) -> bytes:
+    """Fingerprint of a serialized value, used to skip unchanged writes."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _fsync_directory(path: str):
+    """Persist a rename in ``path``; not supported on every platform."""
+    try:
+        fd = os.open(path or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _close_shards(shards: List[_Shard]):
+    for shard in shards:
+        try:
+            shard.close()
+        except Exception as e:
+            logger.error(f"Error closing learning store shard {shard.path}: {e}")
+
+
+class LearningStore:
+    """
+    Sharded append-only key-value store for learning data.
+
+    Keys are hashed to one of ``num_shards`` log files. Writing a value that
+    is identical to the stored one is a no-op, so callers can re-save records
+    freely and only actual changes reach the disk.
+    """
+
+    def __init__(self,
+                 path: str,
+                 num_shards: int = 8,
+                 sync_interval: float = 1.0,
+                 compaction_ratio: float = 0.5,
+                 min_compaction_bytes: int = 1 << 20):
+        """
+        Open (or create) a learning store.
+
+        Args:
+            path: Directory holding the shard logs
+            num_shards: Number of shard logs for a new store; existing stores
+                keep the shard count they were created with
+            sync_interval: Minimum seconds between fsync calls (0 syncs
+                every write)
+            compaction_ratio: Fraction of superseded bytes in a shard that
+                triggers its compaction
+            min_compaction_bytes: Shards smaller than this are never compacted
+        """
+        self.path = path
+        self.sync_interval = sync_interval
+        self.compaction_ratio = compaction_ratio
+        self.min_compaction_bytes = min_compaction_bytes
+
+        self._lock = threading.RLock()
+        self._last_sync = time.monotonic()
+        self.closed = False
+
+        os.makedirs(path, exist_ok=True)
+        self.num_shards = self._load_manifest(max(1, num_shards))
+
+        self._shards = [
+            _Shard(os.path.join(path, f"shard-{i:03d}.log"))
+            for i in range(self.num_shards)
+        ]
+        for shard in self._shards:
+            shard.open()
+
+        self._finalizer = weakref.finalize(self, _close_shards, self._shards)
+
+    def _load_manifest(self, num_shards: int) -> int:
+        """Read the shard count of an existing store or record it for a new one."""
+        manifest_path = os.path.join(self.path, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return int(json.load(f)["num_shards"])
+
+        temp_path = f"{manifest_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"format": STORE_FORMAT, "num_shards": num_shards}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, manifest_path)
+        return num_shards
+
+    def _shard_for(self, collection: str, key: str) -> _Shard:
+        hashed = zlib.crc32(f"{collection}\x00{key}".encode('utf-8'))
+        return self._shards[hashed % self.num_shards]
+
+    def get(self, collection: str, key: str, default: Any = None) -> Any:
+        """
+        Read a single value.
+
+        Args:
+            collection: Collection name
+            key: Record key
+            default: Value returned when the key does not exist
+
+        Returns:
+            The stored value or ``default``
+        """
+        with self._lock:
+            shard = self._shard_for(collection, key)
+            entry = shard.index.get(collection, {}).get(key)
+            if entry is None:
+                return default
+            return json.loads(shard.read(entry))
+
+    def put(self, collection: str, key: str, value: Any) -> bool:
+        """
+        Store a value, replacing any previous value for the key.
+
+        Args:
+            collection: Collection name
+            key: Record key
+            value: JSON-serializable value
+
+        Returns:
+            True if a record was written, False if the value was unchanged
+        """
+        data = json.dumps(value, default=str, separators=(',', ':')).encode('utf-8')
+        with self._lock:
+            shard = self._shard_for(collection, key)
+            entry = shard.index.get(collection, {}).get(key)
+            if entry is not None and entry[2] == _digest(data):
+                return False
+            self._append(shard, "put", collection, key, data)
+            return True
+
+    def delete(self, collection: str, key: str) -> bool:
+        """
+        Remove a key.
+
+        Args:
+            collection: Collection name
+            key: Record key
+
+        Returns:
+            True if the key existed
+        """
+        with self._lock:
+            shard = self._shard_for(collection, key)
+            if key not in shard.index.get(collection, {}):
+                return False
+            self._append(shard, "delete", collection, key, b"null")
+            return True
+
+    def _append(self, shard: _Shard, op: str, collection: str, key: str, data: bytes):
+        if self.closed:
+            raise RuntimeError(f"Learning store {self.path} is closed")
+
+        shard.append(op, collection, key, data)
+
+        if self.sync_interval <= 0 or time.monotonic() - self._last_sync >= self.sync_interval:
+            self._sync_locked()
+
+        dead_bytes = shard.size - shard.live_bytes
+        if shard.size >= self.min_compaction_bytes and dead_bytes > shard.size * self.compaction_ratio:
+            logger.debug(f"Compacting {shard.path} ({dead_bytes} of {shard.size} bytes superseded)")
+            shard.compact()
+
+    def keys(self, collection: str) -> List[str]:
+        """Get the keys of a collection, in no particular order."""
+        with self._lock:
+            keys = []
+            for shard in self._shards:
+                keys.extend(shard.index.get(collection, {}))
+            return keys
+
+    def count(self, collection: str) -> int:
+        """Get the number of records in a collection."""
+        with self._lock:
+            return sum(len(shard.index.get(collection, {})) for shard in self._shards)
+
+    def items(self, collection: str, keys: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterate over the records of a collection, reading values lazily.
+
+        Records deleted while iterating are skipped; updated records yield
+        their latest value.
+
+        Args:
+            collection: Collection name
+            keys: Only yield these keys, in this order (defaults to all keys)
+
+        Yields:
+            (key, value) tuples
+        """
+        for key in (self.keys(collection) if keys is None else list(keys)):
+            with self._lock:
+                shard = self._shard_for(collection, key)
+                entry = shard.index.get(collection, {}).get(key)
+                if entry is None:
+                    continue
+                data = shard.read(entry)
+            yield key, json.loads(data)
+
+    def import_legacy(self, name: str, records: Callable[[], Iterable[Tuple[str, str, Any]]]) -> int:
+        """
+        Import records from a legacy source exactly once.
+
+        The migration is recorded in the store, so later calls with the same
+        name are no-ops even if the legacy source still exists.
+
+        Args:
+            name: Unique name of the legacy source
+            records: Callable producing (collection, key, value) tuples
+
+        Returns:
+            Number of imported records (0 if the source was already imported)
+        """
+        marker = f"migrated:{name}"
+        with self._lock:
+            if self.get(META_COLLECTION, marker) is not None:
+                return 0
+
+            count = 0
+            for collection, key, value in records():
+                self.put(collection, key, value)
+                count += 1
+
+            self.put(META_COLLECTION, marker, {
+                "records": count,
+                "migrated_at": datetime.now().isoformat()
+            })
+            self.sync()
+
+        logger.info(f"Migrated {count} records from {name} into {self.path}")
+        return count
+
+    def _sync_locked(self):
+        for shard in self._shards:
+            shard.sync()
+        self._last_sync = time.monotonic()
+
+    def sync(self):
+        """Flush all pending writes to stable storage."""
+        with self._lock:
+            self._sync_locked()
+
+    def compact(self):
+        """Compact every shard regardless of its garbage ratio."""
+        with self._lock:
+            for shard in self._shards:
+                if shard.size > shard.live_bytes:
+                    shard.compact()
+
+    def close(self):
+        """Sync and close the store."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            self._finalizer()
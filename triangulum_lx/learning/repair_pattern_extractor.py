@@ -11,6 +11,7 @@ import os
 import json
 import time
 import logging
+import threading
 import hashlib
 import difflib
 import re
@@ -26,14 +27,15 @@ logger = logging.getLogger("triangulum.repair_pattern_extractor")
 # Try to import optional dependencies
 try:
     import numpy as np
-    from sklearn.feature_extraction.text import TfidfVectorizer
     from sklearn.metrics.pairwise import cosine_similarity
-    from sklearn.cluster import DBSCAN
     HAVE_ML_DEPS = True
 except ImportError:
     logger.warning("Machine learning dependencies not available. Using basic pattern extraction only.")
     HAVE_ML_DEPS = False
 
+from .incremental_clustering import IncrementalTextClusterer, HAVE_ML_DEPS as HAVE_CLUSTERING_DEPS
+from .learning_store import LearningStore
+
 
 class RepairPattern:
     """
@@ -132,74 +134,134 @@ class RepairPatternExtractor:
     Extracts repair patterns from successful fixes.
     """
     
-    def __init__(self, database_path: Optional[str] = None):
+    def __init__(self,
+                 database_path: Optional[str] = None,
+                 recluster_interval: float = 3600.0,
+                 storage_path: Optional[str] = None):
         """
         Initialize the repair pattern extractor.
         
         Args:
-            database_path: Path to the pattern database file
+            database_path: Path to the legacy JSON pattern database, which is
+                migrated into the pattern store on first use
+            recluster_interval: Seconds between full background reclusterings
+                (0 disables the background worker)
+            storage_path: Directory of the pattern store (defaults to the
+                database path with a ``.store`` suffix)
         """
         self.database_path = database_path or "triangulum_lx/learning/repair_patterns.json"
+        self.storage_path = storage_path or os.path.splitext(self.database_path)[0] + ".store"
+        self.store: Optional[LearningStore] = None
         self.patterns: Dict[str, RepairPattern] = {}
-        self.pattern_clusters: Dict[str, List[str]] = {}
+        self._pattern_clusters: Dict[str, List[str]] = {}  # used without the clusterer
+        self._label_lock = threading.Lock()
         
-        # Initialize vectorizer for similarity matching
-        self.vectorizer = None
-        if HAVE_ML_DEPS:
-            self.vectorizer = TfidfVectorizer(
-                analyzer='word',
+        # Initialize incremental clusterer for similarity matching
+        self.clusterer = None
+        if HAVE_CLUSTERING_DEPS:
+            self.clusterer = IncrementalTextClusterer(
                 token_pattern=r'[a-zA-Z_][a-zA-Z0-9_]*|\S',
                 ngram_range=(1, 3),
-                max_features=5000
+                eps=0.3,
+                min_samples=2
             )
         
         # Load patterns if available
         self._load_patterns()
+        
+        if self.clusterer is not None and recluster_interval > 0:
+            self.clusterer.start_background_reclustering(recluster_interval, self._save_cluster_labels)
     
-    def _load_patterns(self):
-        """Load patterns from the database file."""
-        if os.path.exists(self.database_path):
-            try:
-                with open(self.database_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Load patterns
-                for pattern_data in data.get("patterns", []):
-                    pattern = RepairPattern.from_dict(pattern_data)
-                    self.patterns[pattern.pattern_id] = pattern
-                
-                # Load pattern clusters
-                self.pattern_clusters = data.get("pattern_clusters", {})
-                
-                logger.info(f"Loaded {len(self.patterns)} patterns from {self.database_path}")
-            except Exception as e:
-                logger.error(f"Error loading patterns: {e}")
-                self.patterns = {}
-                self.pattern_clusters = {}
-        else:
-            logger.info("No pattern database found. Starting with empty database.")
+    @property
+    def pattern_clusters(self) -> Dict[str, List[str]]:
+        """Mapping of cluster key to pattern IDs, copied under the clusterer's lock."""
+        if self.clusterer is not None:
+            return self.clusterer.cluster_snapshot()
+        return self._pattern_clusters
     
-    def _save_patterns(self):
-        """Save patterns to the database file."""
+    def _load_patterns(self):
+        """Load patterns from the pattern store, migrating the legacy database first."""
         try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.database_path), exist_ok=True)
+            self.store = LearningStore(self.storage_path)
+            if os.path.exists(self.database_path):
+                self.store.import_legacy(os.path.basename(self.database_path), self._legacy_records)
             
-            # Prepare data for serialization
-            data = {
-                "patterns": [pattern.to_dict() for pattern in self.patterns.values()],
-                "pattern_clusters": self.pattern_clusters,
-                "last_updated": datetime.now().isoformat()
-            }
+            # Load patterns
+            for pattern_id, pattern_data in self.store.items("patterns"):
+                self.patterns[pattern_id] = RepairPattern.from_dict(pattern_data)
             
-            # Save to file
-            with open(self.database_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, default=str)
+            # Load pattern clusters
+            clusters = defaultdict(list)
+            for pattern_id, cluster_key in self.store.items("cluster_labels"):
+                clusters[cluster_key].append(pattern_id)
+            self._pattern_clusters = dict(clusters)
             
-            logger.info(f"Saved {len(self.patterns)} patterns to {self.database_path}")
+            if self.clusterer is not None:
+                for pattern_id, pattern in self.patterns.items():
+                    self.clusterer.add(pattern_id, self._pattern_text(pattern), assign=False)
+                self.clusterer.load_clusters(self._pattern_clusters)
+                self.clusterer.pop_label_changes()
+            
+            logger.info(f"Loaded {len(self.patterns)} patterns from {self.storage_path}")
+        except Exception as e:
+            logger.error(f"Error loading patterns: {e}")
+            self.patterns = {}
+            self._pattern_clusters = {}
+            if self.clusterer is not None:
+                self.clusterer.load_clusters({})
+    
+    def _legacy_records(self):
+        """Yield store records from the JSON database written by earlier versions."""
+        with open(self.database_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        for pattern_data in data.get("patterns", []):
+            yield "patterns", pattern_data["pattern_id"], pattern_data
+        
+        for cluster_key, pattern_ids in data.get("pattern_clusters", {}).items():
+            for pattern_id in pattern_ids:
+                yield "cluster_labels", pattern_id, cluster_key
+    
+    def _save_patterns(self, *pattern_ids: str):
+        """
+        Append changed patterns and cluster assignments to the pattern store.
+        
+        Args:
+            pattern_ids: IDs of the patterns that changed
+        """
+        if self.store is None:
+            return
+        
+        try:
+            for pattern_id in pattern_ids:
+                self.store.put("patterns", pattern_id, self.patterns[pattern_id].to_dict())
+            
+            self._save_cluster_labels()
+            
+            logger.debug(f"Saved {len(pattern_ids)} patterns to {self.storage_path}")
         except Exception as e:
             logger.error(f"Error saving patterns: {e}")
     
+    def _save_cluster_labels(self):
+        """Append the cluster assignments changed since the last save to the pattern store."""
+        if self.store is None or self.clusterer is None:
+            return
+        
+        # Serialized so an older label can never overwrite a newer one
+        with self._label_lock:
+            for pattern_id, cluster_key in self.clusterer.pop_label_changes().items():
+                if cluster_key is None:
+                    self.store.delete("cluster_labels", pattern_id)
+                else:
+                    self.store.put("cluster_labels", pattern_id, cluster_key)
+    
+    def close(self):
+        """Stop background reclustering and close the pattern store."""
+        if self.clusterer is not None:
+            self.clusterer.stop_background_reclustering()
+        if self.store is not None:
+            self.store.close()
+    
     def extract_pattern(self, 
                        bug_type: str,
                        before_code: str,
@@ -259,10 +321,10 @@ class RepairPatternExtractor:
         self.patterns[pattern_id] = pattern
         
         # Update pattern clusters
-        self._update_pattern_clusters()
+        self._update_pattern_clusters(pattern_id)
         
         # Save patterns
-        self._save_patterns()
+        self._save_patterns(pattern_id)
         
         logger.info(f"Extracted pattern {pattern_id} for bug type {bug_type}")
         return pattern_id
@@ -672,41 +734,26 @@ class RepairPatternExtractor:
         
         return generalized
     
-    def _update_pattern_clusters(self):
-        """Update pattern clusters based on similarity."""
-        if not HAVE_ML_DEPS or len(self.patterns) < 2:
-            # Skip clustering if ML dependencies are not available or not enough patterns
+    def _pattern_text(self, pattern: RepairPattern) -> str:
+        """Get the text used to compare a pattern with other patterns."""
+        return f"{pattern.before_pattern} {pattern.after_pattern}"
+    
+    def _update_pattern_clusters(self, pattern_id: str):
+        """
+        Assign a new pattern to a cluster based on similarity.
+        
+        The pattern is vectorized and matched against its nearest neighbours
+        incrementally; full reclustering runs periodically in the background.
+        
+        Args:
+            pattern_id: ID of the pattern that was added
+        """
+        if self.clusterer is None:
+            # Skip clustering if ML dependencies are not available
             return
         
         try:
-            # Extract pattern texts for vectorization
-            pattern_texts = []
-            pattern_ids = []
-            
-            for pattern_id, pattern in self.patterns.items():
-                pattern_text = f"{pattern.before_pattern} {pattern.after_pattern}"
-                pattern_texts.append(pattern_text)
-                pattern_ids.append(pattern_id)
-            
-            # Vectorize patterns
-            X = self.vectorizer.fit_transform(pattern_texts)
-            
-            # Cluster patterns using DBSCAN
-            clustering = DBSCAN(eps=0.3, min_samples=2).fit(X.toarray())
-            
-            # Update pattern clusters
-            self.pattern_clusters = {}
-            for i, cluster_id in enumerate(clustering.labels_):
-                if cluster_id == -1:
-                    # Noise points (no cluster)
-                    continue
-                
-                cluster_key = f"cluster_{cluster_id}"
-                if cluster_key not in self.pattern_clusters:
-                    self.pattern_clusters[cluster_key] = []
-                
-                self.pattern_clusters[cluster_key].append(pattern_ids[i])
-            
-            logger.info(f"Updated pattern clusters: {len(self.pattern_clusters)} clusters")
+            cluster_key = self.clusterer.add(pattern_id, self._pattern_text(self.patterns[pattern_id]))
+            logger.debug(f"Assigned pattern {pattern_id} to {cluster_key or 'no cluster'}")
         except Exception as e:
             logger.error(f"Error updating pattern clusters: {e}")
@@ -18,6 +18,8 @@ from typing import Dict, List, Any, Optional, Union, Tuple
 from pathlib import Path
 from collections import Counter, defaultdict
 
+from .learning_store import LearningStore
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -138,7 +140,8 @@ class RepairPatternLearner:
         Initialize the repair pattern learner.
         
         Args:
-            patterns_dir: Directory to store learned patterns
+            patterns_dir: Directory to store learned patterns; pattern files
+                written by earlier versions are migrated into its pattern store
             verification_dir: Directory containing verification results
             enable_auto_learning: Whether to automatically learn patterns
             min_examples_for_pattern: Minimum examples needed to create a pattern
@@ -152,8 +155,9 @@ class RepairPatternLearner:
         self.confidence_threshold = confidence_threshold
         self.learning_rate = learning_rate
         
-        # Create patterns directory
+        # Create patterns directory and open the pattern store
         os.makedirs(patterns_dir, exist_ok=True)
+        self.store = LearningStore(os.path.join(patterns_dir, "patterns.store"))
         
         # Load existing patterns
         self.patterns = {}
@@ -162,37 +166,51 @@ class RepairPatternLearner:
         logger.info(f"RepairPatternLearner initialized with {len(self.patterns)} patterns")
     
     def _load_patterns(self):
-        """Load patterns from the patterns directory."""
-        pattern_files = [f for f in os.listdir(self.patterns_dir) if f.endswith('.json')]
+        """Load patterns from the pattern store, migrating legacy pattern files first."""
+        if any(f.endswith('.json') for f in os.listdir(self.patterns_dir)):
+            self.store.import_legacy("pattern_files", self._legacy_records)
         
-        for file_name in pattern_files:
+        for pattern_id, pattern_data in self.store.items("patterns"):
             try:
-                file_path = os.path.join(self.patterns_dir, file_name)
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    pattern_data = json.load(f)
-                
                 pattern = RepairPattern.from_dict(pattern_data)
                 self.patterns[pattern.pattern_id] = pattern
                 logger.debug(f"Loaded pattern {pattern.pattern_id}: {pattern.name}")
             
             except Exception as e:
-                logger.warning(f"Error loading pattern from {file_name}: {e}")
+                logger.warning(f"Error loading pattern {pattern_id}: {e}")
         
         logger.info(f"Loaded {len(self.patterns)} repair patterns")
     
+    def _legacy_records(self):
+        """Yield store records from the per-pattern JSON files written by earlier versions."""
+        for file_name in os.listdir(self.patterns_dir):
+            if not file_name.endswith('.json'):
+                continue
+            
+            try:
+                file_path = os.path.join(self.patterns_dir, file_name)
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    pattern_data = json.load(f)
+            except Exception as e:
+                logger.warning(f"Error loading pattern from {file_name}: {e}")
+                continue
+            
+            yield "patterns", pattern_data["pattern_id"], pattern_data
+    
     def _save_pattern(self, pattern: RepairPattern):
         """
-        Save a pattern to disk.
+        Append a pattern to the pattern store.
         
         Args:
             pattern: The pattern to save
         """
-        file_path = os.path.join(self.patterns_dir, f"{pattern.pattern_id}.json")
+        self.store.put("patterns", pattern.pattern_id, pattern.to_dict())
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(pattern.to_dict(), f, indent=2)
-        
-        logger.debug(f"Saved pattern {pattern.pattern_id} to {file_path}")
+        logger.debug(f"Saved pattern {pattern.pattern_id} to {self.store.path}")
+    
+    def close(self):
+        """Close the pattern store."""
+        self.store.close()
     
     def learn_from_verification(self, verification_results: Dict) -> List[RepairPattern]:
         """
@@ -13,6 +13,8 @@ from typing import List, Dict, Any, Optional, Deque
 from pathlib import Path
 import logging
 
+from .learning_store import LearningStore
+
 # Setup logging
 logger = logging.getLogger("triangulum.replay_buffer")
 
@@ -58,11 +60,13 @@ class ReplayBuffer:
         
         Args:
             capacity: Maximum number of episodes to store
-            storage_path: Path to save episodes (if provided)
+            storage_path: Directory to save episodes in (if provided)
         """
         self.buffer: Deque[Episode] = deque(maxlen=capacity)
         self.capacity = capacity
         self.storage_path = Path(storage_path) if storage_path else None
+        self.store: Optional[LearningStore] = None
+        self._next_sequence = 0
         
         # Create storage directory if needed
         if self.storage_path:
@@ -142,56 +146,70 @@ class ReplayBuffer:
     
     def _save_episode(self, episode: Episode) -> None:
         """
-        Save an episode to disk.
+        Append an episode to the episode store.
         
         Args:
             episode: Episode to save
         """
-        if not self.storage_path:
+        if not self.store:
             return
         
         try:
-            # Create a filename based on bug_id and timestamp
-            timestamp = int(time.time())
-            filename = f"episode_{episode.bug_id}_{timestamp}.json"
-            file_path = self.storage_path / filename
-            
-            # Save as JSON
-            with open(file_path, 'w') as f:
-                json.dump(episode.to_dict(), f, indent=2)
+            # Keys are zero-padded sequence numbers, so they sort chronologically
+            self.store.put("episodes", f"{self._next_sequence:012d}", episode.to_dict())
+            self._next_sequence += 1
                 
         except Exception as e:
             logger.error(f"Error saving episode: {e}")
     
     def _load_from_storage(self) -> None:
-        """Load episodes from disk storage."""
+        """Load the most recent episodes from the episode store."""
         if not self.storage_path or not self.storage_path.exists():
             return
         
         try:
-            # Load all JSON files in the directory
-            episode_files = list(self.storage_path.glob("episode_*.json"))
+            self.store = LearningStore(str(self.storage_path / "episodes.store"))
+            if any(self.storage_path.glob("episode_*.json")):
+                self.store.import_legacy("episode_files", self._legacy_records)
             
-            # Sort by modification time (newest first)
-            episode_files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+            # Only the newest episodes that fit in the buffer are read
+            keys = sorted(self.store.keys("episodes"))
+            if keys:
+                self._next_sequence = int(keys[-1]) + 1
             
-            # Load up to capacity
             loaded_count = 0
-            for file_path in episode_files[:self.capacity]:
+            for key, data in self.store.items("episodes", keys[-self.capacity:]):
                 try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                        episode = Episode.from_dict(data)
-                        self.buffer.append(episode)
-                        loaded_count += 1
+                    self.buffer.append(Episode.from_dict(data))
+                    loaded_count += 1
                 except Exception as e:
-                    logger.warning(f"Error loading episode from {file_path}: {e}")
+                    logger.warning(f"Error loading episode {key}: {e}")
             
             logger.info(f"Loaded {loaded_count} episodes from storage")
             
         except Exception as e:
             logger.error(f"Error loading episodes from storage: {e}")
     
+    def _legacy_records(self):
+        """Yield store records from the per-episode JSON files written by earlier versions."""
+        # Oldest first, so sequence numbers follow the original order
+        episode_files = sorted(self.storage_path.glob("episode_*.json"), key=lambda p: p.stat().st_mtime)
+        
+        for sequence, file_path in enumerate(episode_files):
+            try:
+                with open(file_path, 'r') as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.warning(f"Error loading episode from {file_path}: {e}")
+                continue
+            
+            yield "episodes", f"{sequence:012d}", data
+    
+    def close(self) -> None:
+        """Close the episode store."""
+        if self.store:
+            self.store.close()
+    
     def save_all(self, path: Optional[str] = None) -> bool:
         """
         Save all episodes to a single JSON file.
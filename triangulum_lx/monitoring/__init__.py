@@ -1,16 +1,20 @@
 """Monitoring and metrics components for Triangulum."""
 
 from .metrics import MetricsCollector, TickMetrics, AgentMetrics, BugMetrics
+from .metric_series import MetricSeries, QuantileSketch
 from .visualization import create_dashboard
 from .system_monitor import SystemMonitor
 from .metrics_exporter import (
     MetricsExporter, FileExporter, PrometheusExporter,
-    CSVExporter, MultiExporter, create_exporter
+    CSVExporter, MultiExporter, create_exporter,
+    CounterMetric, GaugeMetric, HistogramMetric
 )
 
 __all__ = [
     'MetricsCollector', 'TickMetrics', 'AgentMetrics', 'BugMetrics',
+    'MetricSeries', 'QuantileSketch',
     'create_dashboard', 'SystemMonitor', 'MetricsExporter',
     'FileExporter', 'PrometheusExporter', 'CSVExporter',
-    'MultiExporter', 'create_exporter'
+    'MultiExporter', 'create_exporter', 'CounterMetric', 'GaugeMetric',
+    'HistogramMetric'
 ]
@@ -325,7 +325,8 @@ class AgentNetworkVisualizer:
                         target_agent: str, 
                         message_type: str, 
                         content: Optional[str] = None,
-                        metadata: Optional[Dict] = None):
+                        metadata: Optional[Dict] = None,
+                        auto_update: bool = True):
         """
         Register a message between agents.
         
@@ -335,6 +336,10 @@ class AgentNetworkVisualizer:
             message_type: Type of message (command, response, etc.)
             content: Optional message content
             metadata: Optional additional metadata
+            auto_update: Whether to update the visualizations when they are due
+        
+        Returns:
+            The message record that was stored
         """
         timestamp = datetime.datetime.now().isoformat()
         
@@ -401,9 +406,11 @@ class AgentNetworkVisualizer:
         
         # Update visualizations if needed
         current_time = time.time()
-        if current_time - self.last_update >= self.update_interval:
+        if auto_update and current_time - self.last_update >= self.update_interval:
             self.update_visualizations()
             self.last_update = current_time
+        
+        return message
     
     def update_visualizations(self):
         """Update all visualizations based on current network data."""
@@ -15,8 +15,10 @@ import time
 import threading
 import webbrowser
 import random
+from collections import deque
 from typing import Dict, List, Any, Optional, Union, Callable
 from http.server import HTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
 import socketserver
 import socket
 
@@ -25,6 +27,7 @@ from triangulum_lx.monitoring.thought_chain_visualizer import ThoughtChainVisual
 from triangulum_lx.monitoring.agent_network_visualizer import AgentNetworkVisualizer
 from triangulum_lx.monitoring.decision_tree_visualizer import DecisionTreeVisualizer
 from triangulum_lx.monitoring.feedback_handler import FeedbackHandler
+from triangulum_lx.monitoring.dashboard_event_feed import DashboardEventFeed
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,10 +36,64 @@ logger = logging.getLogger(__name__)
 class DashboardHandler(SimpleHTTPRequestHandler):
     """Custom handler for the dashboard HTTP server."""
     
-    def __init__(self, *args, dashboard_root=None, **kwargs):
+    # Seconds between keep-alive comments on an idle event stream
+    heartbeat_interval = 15.0
+    
+    def __init__(self, *args, dashboard_root=None, event_feed=None, **kwargs):
         self.dashboard_root = dashboard_root
+        self.event_feed = event_feed
         super().__init__(*args, **kwargs)
     
+    def do_GET(self):
+        """Serve the event stream endpoint or fall back to static files."""
+        if self.event_feed is not None and urlparse(self.path).path == "/events":
+            self._stream_events()
+        else:
+            super().do_GET()
+    
+    def _stream_events(self):
+        """
+        Stream dashboard events as Server-Sent Events.
+        
+        The client passes the last sequence number it has seen either as the
+        ``cursor`` query parameter or through the ``Last-Event-ID`` header on
+        reconnect. If the cursor is older than the buffered history, a
+        ``reset`` event tells the client to reload ``data/snapshot.json``.
+        """
+        query = parse_qs(urlparse(self.path).query)
+        try:
+            cursor = int(self.headers.get("Last-Event-ID") or query.get("cursor", ["0"])[0])
+        except ValueError:
+            cursor = 0
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "keep-alive")
+        self.end_headers()
+        
+        try:
+            while not self.event_feed.closed:
+                events, needs_reset = self.event_feed.wait_for_events(
+                    cursor, timeout=self.heartbeat_interval, limit=500
+                )
+                if needs_reset:
+                    cursor = self.event_feed.snapshot_sequence
+                    payload = json.dumps({"sequence": cursor})
+                    self.wfile.write(f"event: reset\ndata: {payload}\n\n".encode("utf-8"))
+                elif events:
+                    chunks = []
+                    for event in events:
+                        payload = json.dumps(event, default=str)
+                        chunks.append(f"id: {event['seq']}\nevent: {event['type']}\ndata: {payload}\n\n")
+                    self.wfile.write("".join(chunks).encode("utf-8"))
+                    cursor = events[-1]["seq"]
+                else:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+    
     def translate_path(self, path):
         """Translate URL paths to filesystem paths."""
         if self.dashboard_root:
@@ -66,7 +123,9 @@ class AgenticDashboard:
                  update_interval: float = 0.5,
                  enable_server: bool = True,
                  server_port: int = 8080,
-                 auto_open_browser: bool = True):
+                 auto_open_browser: bool = True,
+                 snapshot_interval: int = 1000,
+                 max_timeline_events: int = 200):
         """
         Initialize the agentic dashboard.
         
@@ -76,6 +135,8 @@ class AgenticDashboard:
             enable_server: Whether to start an HTTP server for the dashboard
             server_port: Port to use for the HTTP server
             auto_open_browser: Whether to automatically open a browser window
+            snapshot_interval: Number of feed events between compacted snapshots
+            max_timeline_events: Number of recent events shown on the main page timeline
         """
         self.output_dir = output_dir
         self.update_interval = update_interval
@@ -109,6 +170,12 @@ class AgenticDashboard:
             update_interval=update_interval
         )
         
+        # Initialize incremental event feed for dashboard clients
+        self.event_feed = DashboardEventFeed(
+            data_dir=os.path.join(output_dir, "data"),
+            snapshot_interval=snapshot_interval
+        )
+        
         # Initialize feedback handler
         self.feedback_handler = FeedbackHandler(agent_manager=self)  # Pass self as agent_manager
         
@@ -128,6 +195,7 @@ class AgenticDashboard:
         
         # Initialize activity tracking
         self.agent_activity = {}  # agent_id -> activity info
+        self.timeline = deque(maxlen=max_timeline_events)  # recent thoughts and messages
         self.last_update = time.time()
         self.server = None
         self.server_thread = None
@@ -142,6 +210,9 @@ class AgenticDashboard:
         # Create the main dashboard HTML
         self._create_main_dashboard()
         
+        # Write the initial snapshot so clients can cold-load before any events
+        self._write_snapshot()
+        
         # Start HTTP server if enabled
         if self.enable_server:
             self._start_server()
@@ -195,6 +266,17 @@ class AgenticDashboard:
                 with open(timeline_dest, 'w', encoding='utf-8') as f:
                     f.write(content)
             
+            # Copy the event feed client shared by the visualization pages
+            feed_src = os.path.join(self.templates_dir, "dashboard_feed.js")
+            feed_dest = os.path.join(self.output_dir, "dashboard_feed.js")
+            
+            if os.path.exists(feed_src):
+                with open(feed_src, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                with open(feed_dest, 'w', encoding='utf-8') as f:
+                    f.write(content)
+            
             logger.info("Dashboard templates copied to output directories")
         
         except Exception as e:
@@ -697,65 +779,23 @@ class AgenticDashboard:
                 detailed_progress += f"<li><strong>{agent_id}</strong>: {activity.get('description', 'No activity')}</li>"
         detailed_progress += "</ul>"
         
-        # Generate timeline events HTML
+        # Generate timeline events HTML from the bounded recent timeline
         timeline_events = ""
-        all_events = []
-        
-        # Collect all thoughts and messages
-        try:
-            if hasattr(self.thought_chain_visualizer, 'thought_chains'):
-                for chain_id, chain in self.thought_chain_visualizer.thought_chains.items():
-                    if isinstance(chain, dict) and "thoughts" in chain and isinstance(chain["thoughts"], list):
-                        for thought in chain["thoughts"]:
-                            if isinstance(thought, dict):
-                                all_events.append({
-                                    "type": "thought",
-                                    "timestamp": thought.get("timestamp", "Unknown"),
-                                    "agent_id": thought.get("agent_id", "Unknown"),
-                                    "content": f"Thought ({thought.get('thought_type', 'Unknown')}): {thought.get('content', 'No content')}"
-                                })
-        except Exception as e:
-            logger.error(f"Error processing thought chains: {e}")
-        
-        try:
-            if hasattr(self.agent_network_visualizer, 'messages'):
-                if isinstance(self.agent_network_visualizer.messages, list):
-                    for message in self.agent_network_visualizer.messages:
-                        if isinstance(message, dict):
-                            all_events.append({
-                                "type": "message",
-                                "timestamp": message.get("timestamp", "Unknown"),
-                                "agent_id": message.get("source_agent", "Unknown"),
-                                "content": f"Message to {message.get('target_agent', 'Unknown')} ({message.get('message_type', 'Unknown')}): {message.get('content', '')}"
-                            })
-        except Exception as e:
-            logger.error(f"Error processing messages: {e}")
-        
-        try:
-            # Sort events by timestamp - with type checking
-            all_events.sort(key=lambda x: x.get("timestamp", "") if isinstance(x, dict) else "")
+        for event in self.timeline:
+            try:
+                timestamp = datetime.datetime.fromisoformat(event.get("timestamp", "")).strftime("%H:%M:%S")
+            except (ValueError, TypeError, AttributeError):
+                timestamp = "Unknown"
             
-            # Create timeline HTML
-            for event in all_events:
-                if not isinstance(event, dict):
-                    continue
-                
-                try:
-                    timestamp = datetime.datetime.fromisoformat(event.get("timestamp", "")).strftime("%H:%M:%S")
-                except (ValueError, TypeError, AttributeError):
-                    timestamp = "Unknown"
-                
-                timeline_events += f"""
-                <div class="timeline-event">
-                    <div class="timeline-event-header">
-                        <div class="timeline-agent">{event.get('agent_id', 'Unknown')}</div>
-                        <div class="timeline-timestamp">{timestamp}</div>
-                    </div>
-                    <div class="timeline-content">{event.get('content', 'No content')}</div>
+            timeline_events += f"""
+            <div class="timeline-event">
+                <div class="timeline-event-header">
+                    <div class="timeline-agent">{event.get('agent_id', 'Unknown')}</div>
+                    <div class="timeline-timestamp">{timestamp}</div>
                 </div>
-                """
-        except Exception as e:
-            logger.error(f"Error sorting timeline events: {e}")
+                <div class="timeline-content">{event.get('content', 'No content')}</div>
+            </div>
+            """
         
         # Replace template placeholders
         html = template.replace("{{global_progress_percent}}", str(global_percent))
@@ -792,10 +832,13 @@ class AgenticDashboard:
                 return
             
             # Create handler class with dashboard root
-            handler = lambda *args, **kwargs: DashboardHandler(*args, dashboard_root=self.output_dir, **kwargs)
+            handler = lambda *args, **kwargs: DashboardHandler(
+                *args, dashboard_root=self.output_dir, event_feed=self.event_feed, **kwargs
+            )
             
-            # Create server
-            self.server = socketserver.TCPServer(("", port), handler)
+            # Create server; event streams are long-lived, so serve each client on its own thread
+            self.server = socketserver.ThreadingTCPServer(("", port), handler)
+            self.server.daemon_threads = True
             
             # Start server in a separate thread
             self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
@@ -867,6 +910,8 @@ class AgenticDashboard:
             "percent_complete": percent_complete
         }
         
+        self.event_feed.publish("agent_progress", {"agent_id": agent_id, **progress})
+        
         # Update visualizations if needed
         current_time = time.time()
         if current_time - self.last_update >= self.update_interval:
@@ -912,6 +957,8 @@ class AgenticDashboard:
             else:
                 self.global_progress["estimated_completion"] = now.isoformat()
         
+        self.event_feed.publish("global_progress", dict(self.global_progress))
+        
         # Update visualizations if needed
         current_time = time.time()
         if current_time - self.last_update >= self.update_interval:
@@ -935,13 +982,23 @@ class AgenticDashboard:
             metadata: Additional metadata for the thought
         """
         # Register thought with the thought chain visualizer
-        self.thought_chain_visualizer.register_thought(
-            agent_id=agent_id,
-            chain_id=chain_id,
-            content=content,
-            thought_type=thought_type,
-            metadata=metadata
-        )
+        with self.event_feed.lock:
+            thought = self.thought_chain_visualizer.register_thought(
+                agent_id=agent_id,
+                chain_id=chain_id,
+                content=content,
+                thought_type=thought_type,
+                metadata=metadata,
+                auto_update=False
+            )
+            self.event_feed.publish("thought", thought)
+        self._update_visualizer(self.thought_chain_visualizer)
+        self.timeline.append({
+            "type": "thought",
+            "timestamp": thought["timestamp"],
+            "agent_id": agent_id,
+            "content": f"Thought ({thought_type}): {content}"
+        })
         
         # Update agent progress - increment thought count
         if agent_id in self.agent_progress:
@@ -973,13 +1030,23 @@ class AgenticDashboard:
             metadata: Optional additional metadata
         """
         # Register message with the agent network visualizer
-        self.agent_network_visualizer.register_message(
-            source_agent=source_agent,
-            target_agent=target_agent,
-            message_type=message_type,
-            content=content,
-            metadata=metadata
-        )
+        with self.event_feed.lock:
+            message = self.agent_network_visualizer.register_message(
+                source_agent=source_agent,
+                target_agent=target_agent,
+                message_type=message_type,
+                content=content,
+                metadata=metadata,
+                auto_update=False
+            )
+            self.event_feed.publish("message", message)
+        self._update_visualizer(self.agent_network_visualizer)
+        self.timeline.append({
+            "type": "message",
+            "timestamp": message["timestamp"],
+            "agent_id": source_agent,
+            "content": f"Message to {target_agent} ({message_type}): {content or ''}"
+        })
         
         # Update visualizations if needed
         current_time = time.time()
@@ -1002,11 +1069,19 @@ class AgenticDashboard:
         Returns:
             tree_id: ID of the created tree
         """
-        tree_id = self.decision_tree_visualizer.create_decision_tree(
-            agent_id=agent_id,
-            name=name,
-            description=description
-        )
+        with self.event_feed.lock:
+            tree_id = self.decision_tree_visualizer.create_decision_tree(
+                agent_id=agent_id,
+                name=name,
+                description=description,
+                auto_update=False
+            )
+            
+            tree = self.decision_tree_visualizer.decision_trees[tree_id]
+            self.event_feed.publish("decision_tree", {
+                key: value for key, value in tree.items() if key != "root"
+            })
+        self._update_visualizer(self.decision_tree_visualizer)
         
         # Update visualizations if needed
         current_time = time.time()
@@ -1041,16 +1116,32 @@ class AgenticDashboard:
         Returns:
             node_id: ID of the created node
         """
-        node_id = self.decision_tree_visualizer.add_decision_node(
-            tree_id=tree_id,
-            parent_id=parent_id,
-            name=name,
-            node_type=node_type,
-            content=content,
-            confidence=confidence,
-            alternatives=alternatives,
-            metadata=metadata
-        )
+        with self.event_feed.lock:
+            node_id = self.decision_tree_visualizer.add_decision_node(
+                tree_id=tree_id,
+                parent_id=parent_id,
+                name=name,
+                node_type=node_type,
+                content=content,
+                confidence=confidence,
+                alternatives=alternatives,
+                metadata=metadata,
+                auto_update=False
+            )
+            
+            if node_id is not None:
+                self.event_feed.publish("decision_node", {
+                    "tree_id": tree_id,
+                    "parent_id": parent_id,
+                    "id": node_id,
+                    "name": name,
+                    "type": node_type,
+                    "content": content,
+                    "confidence": confidence,
+                    "alternatives": alternatives or [],
+                    "metadata": metadata or {}
+                })
+        self._update_visualizer(self.decision_tree_visualizer)
         
         # Update visualizations if needed
         current_time = time.time()
@@ -1078,14 +1169,26 @@ class AgenticDashboard:
             confidence: Confidence level (0-100) for this alternative
             metadata: Additional metadata for the alternative
         """
-        self.decision_tree_visualizer.add_alternative(
-            tree_id=tree_id,
-            node_id=node_id,
-            name=name,
-            content=content,
-            confidence=confidence,
-            metadata=metadata
-        )
+        with self.event_feed.lock:
+            self.decision_tree_visualizer.add_alternative(
+                tree_id=tree_id,
+                node_id=node_id,
+                name=name,
+                content=content,
+                confidence=confidence,
+                metadata=metadata,
+                auto_update=False
+            )
+            
+            self.event_feed.publish("decision_alternative", {
+                "tree_id": tree_id,
+                "node_id": node_id,
+                "name": name,
+                "content": content,
+                "confidence": confidence,
+                "metadata": metadata or {}
+            })
+        self._update_visualizer(self.decision_tree_visualizer)
         
         # Update visualizations if needed
         current_time = time.time()
@@ -1093,6 +1196,13 @@ class AgenticDashboard:
             self.update_dashboard()
             self.last_update = current_time
     
+    def _update_visualizer(self, visualizer):
+        """Update a visualizer's files when due, outside the feed lock."""
+        current_time = time.time()
+        if current_time - visualizer.last_update >= visualizer.update_interval:
+            visualizer.update_visualizations()
+            visualizer.last_update = current_time
+    
     def update_dashboard(self):
         """Update all dashboard visualizations and data."""
         try:
@@ -1101,73 +1211,10 @@ class AgenticDashboard:
             self.agent_network_visualizer.update_visualizations()
             self.decision_tree_visualizer.update_visualizations()
             
-            # Export JSON data for each visualization
-            # Thought chains data
-            try:
-                if hasattr(self.thought_chain_visualizer, 'thought_chains'):
-                    thought_chains_path = os.path.join(self.output_dir, "thought_chains", "thought_chains.json")
-                    with open(thought_chains_path, 'w', encoding='utf-8') as f:
-                        json.dump(self.thought_chain_visualizer.thought_chains, f, indent=2)
-            except Exception as e:
-                logger.error(f"Error exporting thought chains data: {e}")
-                
-            # Agent network data
-            try:
-                if hasattr(self.agent_network_visualizer, 'messages'):
-                    messages_path = os.path.join(self.output_dir, "agent_network", "messages.json")
-                    with open(messages_path, 'w', encoding='utf-8') as f:
-                        json.dump(self.agent_network_visualizer.messages, f, indent=2)
-            except Exception as e:
-                logger.error(f"Error exporting messages data: {e}")
-                
-            # Decision trees data
-            try:
-                if hasattr(self.decision_tree_visualizer, 'trees'):
-                    trees_path = os.path.join(self.output_dir, "decision_trees", "decision_trees.json")
-                    with open(trees_path, 'w', encoding='utf-8') as f:
-                        json.dump(self.decision_tree_visualizer.trees, f, indent=2)
-            except Exception as e:
-                logger.error(f"Error exporting decision trees data: {e}")
-                
-            # Timeline events data
-            try:
-                all_events = []
-                
-                # Collect thoughts for timeline
-                if hasattr(self.thought_chain_visualizer, 'thought_chains'):
-                    for chain_id, chain in self.thought_chain_visualizer.thought_chains.items():
-                        if isinstance(chain, dict) and "thoughts" in chain and isinstance(chain["thoughts"], list):
-                            for thought in chain["thoughts"]:
-                                if isinstance(thought, dict):
-                                    all_events.append({
-                                        "type": "thought",
-                                        "timestamp": thought.get("timestamp", "Unknown"),
-                                        "agent_id": thought.get("agent_id", "Unknown"),
-                                        "content": f"Thought ({thought.get('thought_type', 'Unknown')}): {thought.get('content', 'No content')}"
-                                    })
-                
-                # Collect messages for timeline
-                if hasattr(self.agent_network_visualizer, 'messages'):
-                    if isinstance(self.agent_network_visualizer.messages, list):
-                        for message in self.agent_network_visualizer.messages:
-                            if isinstance(message, dict):
-                                all_events.append({
-                                    "type": "message",
-                                    "timestamp": message.get("timestamp", "Unknown"),
-                                    "agent_id": message.get("source_agent", "Unknown"),
-                                    "content": f"Message to {message.get('target_agent', 'Unknown')} ({message.get('message_type', 'Unknown')}): {message.get('content', '')}"
-                                })
-                
-                # Sort events by timestamp
-                all_events.sort(key=lambda x: x.get("timestamp", "") if isinstance(x, dict) else "")
-                
-                # Save timeline data
-                timeline_path = os.path.join(self.output_dir, "timeline", "timeline_events.json")
-                with open(timeline_path, 'w', encoding='utf-8') as f:
-                    json.dump(all_events, f, indent=2)
-                    
-            except Exception as e:
-                logger.error(f"Error exporting timeline data: {e}")
+            # Persist new events; full data files are only rewritten as periodic snapshots
+            self.event_feed.flush()
+            if self.event_feed.needs_snapshot():
+                self._write_snapshot()
             
             # Regenerate main dashboard
             template_path = os.path.join(self.templates_dir, "dashboard.html")
@@ -1201,6 +1248,68 @@ class AgenticDashboard:
         except Exception as e:
             logger.error(f"Error updating dashboard: {e}")
     
+    def _build_timeline_events(self) -> List[Dict]:
+        """Build the full timeline of thoughts and messages."""
+        all_events = []
+        
+        for thoughts in self.thought_chain_visualizer.thought_chains.values():
+            for thought in thoughts:
+                all_events.append({
+                    "type": "thought",
+                    "timestamp": thought.get("timestamp", "Unknown"),
+                    "agent_id": thought.get("agent_id", "Unknown"),
+                    "content": f"Thought ({thought.get('thought_type', 'Unknown')}): {thought.get('content', 'No content')}"
+                })
+        
+        for message in self.agent_network_visualizer.messages:
+            all_events.append({
+                "type": "message",
+                "timestamp": message.get("timestamp", "Unknown"),
+                "agent_id": message.get("source_agent", "Unknown"),
+                "content": f"Message to {message.get('target_agent', 'Unknown')} ({message.get('message_type', 'Unknown')}): {message.get('content', '')}"
+            })
+        
+        all_events.sort(key=lambda x: x.get("timestamp", ""))
+        return all_events
+    
+    def _write_snapshot(self):
+        """
+        Write a compacted snapshot of the full dashboard state.
+        
+        Besides ``data/snapshot.json`` (used by clients for cold loads before
+        following the event stream), this refreshes the per-visualization
+        JSON files for consumers that still read them directly.
+        """
+        state = {}
+        
+        def build_state():
+            # Runs under the feed lock, together with reading its sequence
+            state.update({
+                "thought_chains": self.thought_chain_visualizer.thought_chains,
+                "messages": self.agent_network_visualizer.messages,
+                "decision_trees": self.decision_tree_visualizer.decision_trees,
+                "timeline_events": self._build_timeline_events(),
+                "global_progress": self.global_progress,
+                "agent_progress": self.agent_progress,
+                "agent_activity": self.agent_activity
+            })
+            return state
+        
+        self.event_feed.write_snapshot(build_state)
+        
+        exports = [
+            (os.path.join(self.output_dir, "thought_chains", "thought_chains.json"), state["thought_chains"]),
+            (os.path.join(self.output_dir, "agent_network", "messages.json"), state["messages"]),
+            (os.path.join(self.output_dir, "decision_trees", "decision_trees.json"), state["decision_trees"]),
+            (os.path.join(self.output_dir, "timeline", "timeline_events.json"), state["timeline_events"])
+        ]
+        for path, data in exports:
+            try:
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+            except Exception as e:
+                logger.error(f"Error exporting dashboard data to {path}: {e}")
+    
     def save_dashboard_state(self, output_path: Optional[str] = None):
         """
         Save the current dashboard state to a JSON file.
@@ -1233,6 +1342,8 @@ class AgenticDashboard:
         self.thought_chain_visualizer.save_thought_chains()
         self.agent_network_visualizer.save_network_data()
         self.save_dashboard_state()
+        self._write_snapshot()
+        self.event_feed.close()
         
         # Stop server if running
         if self.server:
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Dashboard Event Feed
+
+This module provides an append-only, sequence-numbered event log for the
+agentic dashboard. Producers publish thoughts, messages and decision nodes
+as they happen; dashboard clients follow the feed from a cursor (over
+Server-Sent Events) and receive only the events they have not seen yet.
+Periodic compacted snapshots let new clients cold-load the full state
+without replaying the entire history.
+"""
+
+import os
+import json
+import logging
+import datetime
+import threading
+from collections import deque
+from typing import Dict, List, Any, Callable, Optional, Tuple, Union
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class DashboardEventFeed:
+    """
+    Append-only event log with sequence numbers and snapshot compaction.
+
+    Events are kept in an in-memory buffer for live subscribers and appended
+    to ``events.jsonl`` in the data directory. When a snapshot is written the
+    on-disk log is compacted so that it only holds events newer than the
+    snapshot; ``snapshot.json`` plus ``events.jsonl`` always describe the
+    complete state.
+    """
+
+    def __init__(self,
+                 data_dir: str,
+                 max_buffered_events: int = 10000,
+                 snapshot_interval: int = 1000):
+        """
+        Initialize the event feed.
+
+        Args:
+            data_dir: Directory holding the event log and snapshot files
+            max_buffered_events: Number of events kept in memory for subscribers
+            snapshot_interval: Number of events between compacted snapshots
+        """
+        self.data_dir = data_dir
+        self.max_buffered_events = max(1, max_buffered_events)
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.log_path = os.path.join(data_dir, "events.jsonl")
+        self.snapshot_path = os.path.join(data_dir, "snapshot.json")
+
+        os.makedirs(data_dir, exist_ok=True)
+
+        self._events = deque()  # buffered events, oldest first
+        self._pending = []  # events not yet appended to the log
+        self._sequence = 0
+        self._snapshot_sequence = 0
+        self._condition = threading.Condition()
+        self._log_lock = threading.Lock()  # serializes writes to the log file
+        self.closed = False
+
+        # A new feed starts a new log
+        open(self.log_path, 'w', encoding='utf-8').close()
+
+    @property
+    def last_sequence(self) -> int:
+        """Sequence number of the most recently published event."""
+        return self._sequence
+
+    @property
+    def snapshot_sequence(self) -> int:
+        """Sequence number covered by the latest snapshot."""
+        return self._snapshot_sequence
+
+    @property
+    def lock(self) -> threading.Condition:
+        """
+        Reentrant lock guarding the sequence numbers.
+
+        Producers that update their own state and then publish the change
+        hold this lock across both steps, so a snapshot never contains a
+        change whose event is numbered after the snapshot.
+        """
+        return self._condition
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> int:
+        """
+        Append an event to the feed and wake up waiting subscribers.
+
+        Args:
+            event_type: Type of the event (thought, message, decision_node, ...)
+            data: JSON-serializable event payload
+
+        Returns:
+            The sequence number assigned to the event
+        """
+        with self._condition:
+            self._sequence += 1
+            event = {
+                "seq": self._sequence,
+                "type": event_type,
+                "timestamp": datetime.datetime.now().isoformat(),
+                "data": data
+            }
+            self._events.append(event)
+            self._pending.append(event)
+
+            # Only drop events that are already covered by a snapshot, so a
+            # client can always recover with snapshot + buffered events.
+            while (len(self._events) > self.max_buffered_events and
+                   self._events[0]["seq"] <= self._snapshot_sequence):
+                self._events.popleft()
+
+            self._condition.notify_all()
+            return self._sequence
+
+    def events_since(self, cursor: int, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Get the events published after a cursor.
+
+        Args:
+            cursor: Sequence number of the last event the client has seen
+            limit: Maximum number of events to return
+
+        Returns:
+            Tuple of (events, needs_reset). ``needs_reset`` is True when the
+            cursor is older than the buffered history and the client has to
+            reload the snapshot first.
+        """
+        with self._condition:
+            return self._events_since_locked(cursor, limit)
+
+    def wait_for_events(self,
+                        cursor: int,
+                        timeout: Optional[float] = None,
+                        limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Block until events newer than the cursor are available.
+
+        Args:
+            cursor: Sequence number of the last event the client has seen
+            timeout: Maximum time to wait in seconds
+            limit: Maximum number of events to return
+
+        Returns:
+            Tuple of (events, needs_reset), see ``events_since``
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.closed or self._sequence > cursor,
+                timeout=timeout
+            )
+            return self._events_since_locked(cursor, limit)
+
+    def _events_since_locked(self, cursor: int, limit: Optional[int]) -> Tuple[List[Dict[str, Any]], bool]:
+        """Collect events after ``cursor``; the condition lock must be held."""
+        if cursor >= self._sequence:
+            return [], False
+
+        if not self._events or self._events[0]["seq"] > cursor + 1:
+            return [], True
+
+        # Buffered sequence numbers are contiguous, so the cursor maps to an offset
+        start = cursor + 1 - self._events[0]["seq"]
+        stop = len(self._events) if limit is None else min(len(self._events), start + limit)
+        return [self._events[i] for i in range(start, stop)], False
+
+    def needs_snapshot(self) -> bool:
+        """Check whether enough events accumulated to warrant a new snapshot."""
+        return self._sequence - self._snapshot_sequence >= self.snapshot_interval
+
+    def flush(self):
+        """Append pending events to the on-disk event log."""
+        with self._log_lock:
+            with self._condition:
+                pending, self._pending = self._pending, []
+
+            if not pending:
+                return
+
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    for event in pending:
+                        f.write(json.dumps(event, default=str))
+                        f.write("\n")
+            except Exception as e:
+                logger.error(f"Error appending dashboard events to {self.log_path}: {e}")
+
+    def write_snapshot(self, state: Union[Dict[str, Any], Callable[[], Dict[str, Any]]]) -> int:
+        """
+        Write a compacted snapshot and truncate the event log.
+
+        The state is serialized and the covered sequence number captured under
+        the feed lock, so events published concurrently are either part of the
+        snapshot or numbered after it. Pass a callable to also build the state
+        under that lock.
+
+        Args:
+            state: Full JSON-serializable dashboard state, or a callable
+                returning it
+
+        Returns:
+            The sequence number covered by the snapshot
+        """
+        with self._log_lock:
+            with self._condition:
+                if callable(state):
+                    state = state()
+                sequence = self._sequence
+                payload = json.dumps({
+                    "sequence": sequence,
+                    "timestamp": datetime.datetime.now().isoformat(),
+                    "state": state
+                }, default=str)
+                # Events after ``sequence`` still have to reach the log
+                self._pending = [e for e in self._pending if e["seq"] > sequence]
+
+            temp_path = f"{self.snapshot_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(temp_path, self.snapshot_path)
+
+            # Everything up to ``sequence`` is in the snapshot now
+            open(self.log_path, 'w', encoding='utf-8').close()
+
+        with self._condition:
+            self._snapshot_sequence = sequence
+            while (len(self._events) > self.max_buffered_events and
+                   self._events[0]["seq"] <= self._snapshot_sequence):
+                self._events.popleft()
+
+        logger.debug(f"Dashboard snapshot written at sequence {sequence}")
+        return sequence
+
+    def close(self):
+        """Close the feed and release waiting subscribers."""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+        self.flush()
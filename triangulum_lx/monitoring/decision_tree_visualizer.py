@@ -50,6 +50,11 @@ class DecisionTreeVisualizer:
         # Initialize decision tree storage
         self.decision_trees = {}  # tree_id -> tree data
         self.agent_trees = {}  # agent_id -> list of tree_ids
+        
+        # Per-tree node indexes, kept outside the serialized tree data
+        self._node_index = {}  # tree_id -> {node_id -> node}
+        self._parent_index = {}  # tree_id -> {node_id -> parent node_id (None for root children)}
+        self._node_depths = {}  # tree_id -> {node_id -> depth}
         self.last_update = time.time()
         
         # Templates for visualization
@@ -527,7 +532,8 @@ class DecisionTreeVisualizer:
     def create_decision_tree(self, 
                            agent_id: str, 
                            name: Optional[str] = None,
-                           description: Optional[str] = None) -> str:
+                           description: Optional[str] = None,
+                           auto_update: bool = True) -> str:
         """
         Create a new decision tree.
         
@@ -535,6 +541,7 @@ class DecisionTreeVisualizer:
             agent_id: ID of the agent that owns the tree
             name: Optional name for the tree
             description: Optional description of the tree
+            auto_update: Whether to update the visualizations when they are due
         
         Returns:
             tree_id: ID of the created tree
@@ -566,6 +573,9 @@ class DecisionTreeVisualizer:
         
         # Add to storage
         self.decision_trees[tree_id] = tree
+        self._node_index[tree_id] = {}
+        self._parent_index[tree_id] = {}
+        self._node_depths[tree_id] = {}
         
         # Initialize agent's tree list if needed
         if agent_id not in self.agent_trees:
@@ -576,7 +586,7 @@ class DecisionTreeVisualizer:
         
         # Update visualizations if needed
         current_time = time.time()
-        if current_time - self.last_update >= self.update_interval:
+        if auto_update and current_time - self.last_update >= self.update_interval:
             self.update_visualizations()
             self.last_update = current_time
         
@@ -592,7 +602,8 @@ class DecisionTreeVisualizer:
                          content: Optional[str] = None,
                          confidence: Optional[float] = None,
                          alternatives: Optional[List[Dict]] = None,
-                         metadata: Optional[Dict] = None) -> str:
+                         metadata: Optional[Dict] = None,
+                         auto_update: bool = True) -> str:
         """
         Add a decision node to a tree.
         
@@ -606,6 +617,7 @@ class DecisionTreeVisualizer:
             confidence: Confidence level (0-100) for this decision
             alternatives: List of alternative decisions that were not taken
             metadata: Additional metadata for the node
+            auto_update: Whether to update the visualizations when they are due
         
         Returns:
             node_id: ID of the created node
@@ -632,57 +644,84 @@ class DecisionTreeVisualizer:
             "children": []
         }
         
+        node_index = self._node_index[tree_id]
+        if node_id in node_index:
+            logger.warning(f"Node {node_id} already exists in tree {tree_id}")
+            return None
+        
         # Add node to tree
         if parent_id is None:
             # Add to root
             tree["root"]["children"].append(node)
+            depth = 1
         else:
             # Find parent node
-            parent_node = self._find_node(tree["root"], parent_id)
+            parent_node = node_index.get(parent_id)
             if parent_node:
                 parent_node["children"].append(node)
+                depth = self._node_depths[tree_id][parent_id] + 1
             else:
                 logger.warning(f"Parent node {parent_id} not found in tree {tree_id}")
                 return None
         
+        node_index[node_id] = node
+        self._parent_index[tree_id][node_id] = parent_id
+        self._node_depths[tree_id][node_id] = depth
+        
         # Update tree metadata
         tree["last_updated"] = datetime.datetime.now().isoformat()
         tree["node_count"] = tree.get("node_count", 0) + 1
         
-        # Update tree depth
-        depth = self._calculate_tree_depth(tree["root"])
-        tree["depth"] = depth
+        # Nodes are only ever added, so the depth can only grow
+        tree["depth"] = max(tree.get("depth", 0), depth)
         
         # Update visualizations if needed
         current_time = time.time()
-        if current_time - self.last_update >= self.update_interval:
+        if auto_update and current_time - self.last_update >= self.update_interval:
             self.update_visualizations()
             self.last_update = current_time
         
         logger.debug(f"Added node {node_id} to tree {tree_id}")
         return node_id
     
-    def _find_node(self, root: Dict, node_id: str) -> Optional[Dict]:
-        """Find a node by ID in the tree."""
-        if root.get("id") == node_id:
-            return root
+    def get_node(self, tree_id: str, node_id: str) -> Optional[Dict]:
+        """
+        Get a node by ID.
         
-        for child in root.get("children", []):
-            found = self._find_node(child, node_id)
-            if found:
-                return found
+        Args:
+            tree_id: ID of the tree
+            node_id: ID of the node
         
-        return None
+        Returns:
+            The node data, or None if the tree or node does not exist
+        """
+        return self._node_index.get(tree_id, {}).get(node_id)
     
-    def _calculate_tree_depth(self, node: Dict, current_depth: int = 0) -> int:
-        """Calculate the depth of a tree."""
-        if not node.get("children"):
-            return current_depth
+    def get_parent_id(self, tree_id: str, node_id: str) -> Optional[str]:
+        """
+        Get the ID of a node's parent.
         
-        child_depths = [self._calculate_tree_depth(child, current_depth + 1) 
-                       for child in node.get("children", [])]
+        Args:
+            tree_id: ID of the tree
+            node_id: ID of the node
         
-        return max(child_depths) if child_depths else current_depth
+        Returns:
+            The parent node ID, or None for children of the root and unknown nodes
+        """
+        return self._parent_index.get(tree_id, {}).get(node_id)
+    
+    def get_node_depth(self, tree_id: str, node_id: str) -> Optional[int]:
+        """
+        Get the depth of a node (children of the root are at depth 1).
+        
+        Args:
+            tree_id: ID of the tree
+            node_id: ID of the node
+        
+        Returns:
+            The node depth, or None if the tree or node does not exist
+        """
+        return self._node_depths.get(tree_id, {}).get(node_id)
     
     def mark_alternative_rejected(self, tree_id: str, node_id: str, rejected: bool = True):
         """
@@ -700,7 +739,7 @@ class DecisionTreeVisualizer:
         tree = self.decision_trees[tree_id]
         
         # Find node
-        node = self._find_node(tree["root"], node_id)
+        node = self._node_index[tree_id].get(node_id)
         if node:
             node["rejected"] = rejected
             
@@ -721,7 +760,8 @@ class DecisionTreeVisualizer:
                        name: str,
                        content: Optional[str] = None,
                        confidence: Optional[float] = None,
-                       metadata: Optional[Dict] = None):
+                       metadata: Optional[Dict] = None,
+                       auto_update: bool = True):
         """
         Add an alternative to a decision node.
         
@@ -732,6 +772,7 @@ class DecisionTreeVisualizer:
             content: Detailed content/description of the alternative
             confidence: Confidence level (0-100) for this alternative
             metadata: Additional metadata for the alternative
+            auto_update: Whether to update the visualizations when they are due
         """
         if tree_id not in self.decision_trees:
             logger.warning(f"Tree {tree_id} does not exist")
@@ -740,7 +781,7 @@ class DecisionTreeVisualizer:
         tree = self.decision_trees[tree_id]
         
         # Find node
-        node = self._find_node(tree["root"], node_id)
+        node = self._node_index[tree_id].get(node_id)
         if node:
             # Initialize alternatives list if needed
             if "alternatives" not in node:
@@ -761,7 +802,7 @@ class DecisionTreeVisualizer:
             
             # Update visualizations if needed
             current_time = time.time()
-            if current_time - self.last_update >= self.update_interval:
+            if auto_update and current_time - self.last_update >= self.update_interval:
                 self.update_visualizations()
                 self.last_update = current_time
         else:
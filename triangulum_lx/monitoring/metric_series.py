@@ -0,0 +1,313 @@
+"""
+Metric Series - Bounded, columnar storage for numeric metric samples.
+
+Each series keeps its most recent raw samples in fixed-size ``array('d')``
+columns, folds every sample into per-minute and per-hour rollups, and can
+maintain a streaming quantile sketch for latency-type metrics. Memory per
+series is bounded no matter how long a run lasts.
+"""
+
+import math
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+
+class RingBuffer:
+    """Fixed-capacity columns of doubles; the oldest row is overwritten when full."""
+
+    def __init__(self, capacity: int, columns: int = 2):
+        """
+        Initialize the ring buffer.
+
+        Args:
+            capacity: Maximum number of rows kept
+            columns: Number of columns per row
+        """
+        self.capacity = max(1, capacity)
+        self._columns = [array('d') for _ in range(columns)]
+        self._head = 0  # oldest row once the buffer is full
+
+    def __len__(self) -> int:
+        return len(self._columns[0])
+
+    def append(self, *row: float) -> None:
+        """Add a row, overwriting the oldest one when the buffer is full."""
+        if len(self._columns[0]) < self.capacity:
+            for column, value in zip(self._columns, row):
+                column.append(value)
+        else:
+            for column, value in zip(self._columns, row):
+                column[self._head] = value
+            self._head = (self._head + 1) % self.capacity
+
+    def column(self, index: int) -> array:
+        """Get a copy of a column, oldest row first."""
+        column = self._columns[index]
+        return column[self._head:] + column[:self._head]
+
+    def last(self, index: int) -> Optional[float]:
+        """Get the newest value of a column."""
+        column = self._columns[index]
+        if not column:
+            return None
+        return column[(self._head - 1) % len(column)]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the column storage."""
+        return sum(column.buffer_info()[1] * column.itemsize for column in self._columns)
+
+
+class QuantileSketch:
+    """
+    DDSketch-style streaming quantiles with bounded relative error.
+
+    Values are counted in logarithmically sized buckets, so any quantile is
+    returned within ``relative_accuracy`` of the true value while memory only
+    grows with the logarithm of the value range.
+    """
+
+    MIN_MAGNITUDE = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        """
+        Initialize the sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of returned quantiles
+            max_buckets: Bucket limit per sign; the smallest magnitudes are
+                merged beyond it
+        """
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Add a value to the sketch."""
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value > self.MIN_MAGNITUDE:
+            self._add_to(self._positive, value)
+        elif value < -self.MIN_MAGNITUDE:
+            self._add_to(self._negative, -value)
+        else:
+            self.zero_count += 1
+
+    def _add_to(self, buckets: Dict[int, int], magnitude: float) -> None:
+        key = math.ceil(math.log(magnitude) / self._log_gamma)
+        if key in buckets:
+            buckets[key] += 1
+            return
+        buckets[key] = 1
+        if len(buckets) > self.max_buckets:
+            # Fold the smallest magnitudes into one bucket
+            keys = sorted(buckets)
+            excess = keys[:len(keys) - self.max_buckets + 1]
+            buckets[excess[-1]] = sum(buckets.pop(k) for k in excess[:-1]) + buckets[excess[-1]]
+
+    def _value(self, key: int) -> float:
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            The estimated value, or None if the sketch is empty
+        """
+        if self.count == 0:
+            return None
+        rank = min(max(q, 0.0), 1.0) * (self.count - 1)
+
+        seen = 0
+        for key in sorted(self._negative, reverse=True):
+            seen += self._negative[key]
+            if seen > rank:
+                return max(self.min, -self._value(key))
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self._positive):
+            seen += self._positive[key]
+            if seen > rank:
+                return min(self.max, self._value(key))
+        return self.max
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Add the values counted by another sketch with the same accuracy."""
+        for key, count in other._positive.items():
+            self._positive[key] = self._positive.get(key, 0) + count
+        for key, count in other._negative.items():
+            self._negative[key] = self._negative.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def __len__(self) -> int:
+        return len(self._positive) + len(self._negative)
+
+
+class Rollup:
+    """Fixed-interval aggregates (count, sum, min, max) of a series."""
+
+    FIELDS = ("start", "count", "sum", "min", "max")
+
+    def __init__(self, interval: float, capacity: int):
+        """
+        Initialize the rollup.
+
+        Args:
+            interval: Bucket width in seconds
+            capacity: Number of completed buckets kept
+        """
+        self.interval = interval
+        self.buckets = RingBuffer(capacity, len(self.FIELDS))
+        self._current: Optional[List[float]] = None
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Fold a sample into the bucket of its timestamp."""
+        start = timestamp - timestamp % self.interval
+        current = self._current
+        # Samples older than the open bucket (clock adjustments) stay in it
+        if current is None or start > current[0]:
+            if current is not None:
+                self.buckets.append(*current)
+            current = self._current = [start, 0, 0.0, value, value]
+        current[1] += 1
+        current[2] += value
+        if value < current[3]:
+            current[3] = value
+        if value > current[4]:
+            current[4] = value
+
+    def rows(self) -> List[Dict[str, float]]:
+        """Get the buckets, oldest first, including the open one."""
+        columns = [self.buckets.column(i) for i in range(len(self.FIELDS))]
+        rows = [dict(zip(self.FIELDS, values)) for values in zip(*columns)]
+        if self._current is not None:
+            rows.append(dict(zip(self.FIELDS, self._current)))
+        for row in rows:
+            row["count"] = int(row["count"])
+            row["mean"] = row["sum"] / row["count"]
+        return rows
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the bucket storage."""
+        return self.buckets.nbytes
+
+
+class MetricSeries:
+    """Raw samples, rollups and optional quantiles of one numeric metric."""
+
+    RESOLUTIONS = {"1m": 60.0, "1h": 3600.0}
+
+    def __init__(self,
+                 name: str,
+                 raw_capacity: int = 3600,
+                 minute_capacity: int = 7 * 24 * 60,
+                 hour_capacity: int = 90 * 24,
+                 quantiles: bool = False,
+                 relative_accuracy: float = 0.01):
+        """
+        Initialize the series.
+
+        Args:
+            name: Metric name
+            raw_capacity: Number of raw samples kept (one hour at 1 Hz)
+            minute_capacity: Number of one-minute buckets kept (one week)
+            hour_capacity: Number of one-hour buckets kept (90 days)
+            quantiles: Whether to keep a quantile sketch of all samples
+            relative_accuracy: Relative error of the quantile sketch
+        """
+        self.name = name
+        self.raw = RingBuffer(raw_capacity, 2)
+        self.rollups = {
+            "1m": Rollup(self.RESOLUTIONS["1m"], minute_capacity),
+            "1h": Rollup(self.RESOLUTIONS["1h"], hour_capacity)
+        }
+        self.sketch = QuantileSketch(relative_accuracy) if quantiles else None
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Record a sample."""
+        value = float(value)
+        self.raw.append(timestamp, value)
+        for rollup in self.rollups.values():
+            rollup.add(timestamp, value)
+        if self.sketch is not None:
+            self.sketch.add(value)
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def last(self) -> Optional[float]:
+        """Most recent value."""
+        return self.raw.last(1)
+
+    def samples(self) -> Tuple[array, array]:
+        """Get the retained raw (timestamps, values), oldest first."""
+        return self.raw.column(0), self.raw.column(1)
+
+    def points(self, resolution: str = "raw") -> List[Dict[str, float]]:
+        """
+        Get the series at a resolution.
+
+        Args:
+            resolution: "raw", "1m" or "1h"
+
+        Returns:
+            Raw samples as {'value', 'timestamp'} dicts, or rollup buckets
+            with start, count, sum, min, max and mean
+        """
+        if resolution == "raw":
+            timestamps, values = self.samples()
+            return [{'value': v, 'timestamp': t} for t, v in zip(timestamps, values)]
+        if resolution not in self.rollups:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        return self.rollups[resolution].rows()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile over all samples, or None without a sketch."""
+        return self.sketch.quantile(q) if self.sketch is not None else None
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Get count, sum, min, max, mean, last and (if sketched) p50/p90/p99."""
+        summary = {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "mean": self.total / self.count if self.count else None,
+            "last": self.last
+        }
+        if self.sketch is not None:
+            for q in (0.5, 0.9, 0.99):
+                summary[f"p{int(q * 100)}"] = self.sketch.quantile(q)
+        return summary
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the sample and rollup columns."""
+        return self.raw.nbytes + sum(rollup.nbytes for rollup in self.rollups.values())
@@ -1,10 +1,21 @@
+import csv
 import time
 import json
+import struct
+from array import array
+from collections import deque
 from pathlib import Path
 import numpy as np
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Any, Union
+from dataclasses import dataclass, asdict, fields
+from typing import Deque, Dict, List, Optional, Any, Tuple, Union
 from ..core.state import Phase
+from .metric_series import MetricSeries
+
+# Metrics with these suffixes get a quantile sketch by default
+LATENCY_SUFFIXES = ("_time", "_latency", "_duration", "_seconds", "_ms")
+
+# Persisted sample: metric id, timestamp, value
+SAMPLE_RECORD = struct.Struct("<Idd")
 
 @dataclass
 class ComprehensiveMetrics:
@@ -69,9 +80,25 @@ class BugMetrics:
 
 
 class MetricsCollector:
-    """Collects and stores system metrics."""
+    """Collects and stores system metrics.
+    
+    Numeric metrics are kept as bounded ``MetricSeries`` (recent raw samples
+    plus one-minute and one-hour rollups) and appended to a compact binary
+    sample log; tick and agent metrics are appended to CSV files.
+    """
     
-    def __init__(self, storage_path: str = "metrics"):
+    def __init__(self, storage_path: str = "metrics",
+                 raw_capacity: int = 3600,
+                 tick_history: int = 10000,
+                 flush_bytes: int = 64 * 1024):
+        """Initialize the collector.
+        
+        Args:
+            storage_path: Directory holding one subdirectory per run
+            raw_capacity: Number of raw samples kept in memory per metric
+            tick_history: Number of tick metrics kept in memory
+            flush_bytes: Buffered sample bytes that trigger a write to disk
+        """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(exist_ok=True, parents=True)
         
@@ -79,7 +106,7 @@ class MetricsCollector:
         self.run_path = self.storage_path / f"run_{self.current_run_id}"
         self.run_path.mkdir(exist_ok=True)
         
-        self.tick_metrics: List[TickMetrics] = []
+        self.tick_metrics: Deque[TickMetrics] = deque(maxlen=tick_history)
         self.agent_metrics: Dict[str, List[AgentMetrics]] = {}
         self.bug_metrics: Dict[str, BugMetrics] = {}
         self.comprehensive_metrics: Optional[ComprehensiveMetrics] = None
@@ -91,42 +118,82 @@ class MetricsCollector:
         self.bugs_resolved = 0
         self.bugs_escalated = 0
         
-        # General metrics storage
-        self.general_metrics: Dict[str, Union[int, float, List]] = {}
+        # General metrics storage: a series per numeric metric, the latest
+        # value for anything else
+        self.general_metrics: Dict[str, Any] = {}
+        self.raw_capacity = raw_capacity
+        self.flush_bytes = flush_bytes
+        self._metric_ids: Dict[str, int] = {}
+        self._sample_buffer = bytearray()
+        
+        # Records not yet appended to disk
+        self._pending_ticks: List[TickMetrics] = []
+        self._pending_agent_metrics: List[AgentMetrics] = []
     
-    def record_metric(self, name: str, value: Union[int, float]) -> None:
+    def record_metric(self, name: str, value: Any, quantiles: Optional[bool] = None) -> None:
         """Record a general metric value.
         
         Args:
             name: Metric name
-            value: Metric value
+            value: Metric value; non-numeric values only keep the latest value
+            quantiles: Whether to track quantiles of the metric (by default
+                for names ending in a latency suffix such as ``_time``)
         """
-        if name not in self.general_metrics:
-            self.general_metrics[name] = []
-        
-        if isinstance(self.general_metrics[name], list):
-            self.general_metrics[name].append({
-                'value': value,
-                'timestamp': time.time() - self.start_time
-            })
-        else:
-            # Convert to list if it was a single value
-            old_value = self.general_metrics[name]
-            self.general_metrics[name] = [
-                {'value': old_value, 'timestamp': 0},
-                {'value': value, 'timestamp': time.time() - self.start_time}
-            ]
+        if not isinstance(value, (int, float)):
+            self.general_metrics[name] = value
+            return
+        
+        series = self.general_metrics.get(name)
+        if not isinstance(series, MetricSeries):
+            if quantiles is None:
+                quantiles = name.endswith(LATENCY_SUFFIXES)
+            series = self.general_metrics[name] = MetricSeries(
+                name, raw_capacity=self.raw_capacity, quantiles=quantiles
+            )
+        
+        timestamp = time.time() - self.start_time
+        series.add(timestamp, value)
+        
+        self._sample_buffer += SAMPLE_RECORD.pack(self._metric_id(name), timestamp, value)
+        if len(self._sample_buffer) >= self.flush_bytes:
+            self.flush_metrics()
     
-    def get_metric(self, name: str) -> Optional[Union[int, float, List]]:
+    def _metric_id(self, name: str) -> int:
+        """Get the id of a metric in the sample log, registering new names."""
+        metric_id = self._metric_ids.get(name)
+        if metric_id is None:
+            metric_id = self._metric_ids[name] = len(self._metric_ids)
+            with open(self.run_path / 'metric_names.json', 'w') as f:
+                json.dump(list(self._metric_ids), f)
+        return metric_id
+    
+    def get_metric(self, name: str, resolution: str = "raw") -> Optional[Any]:
         """Get a metric value.
         
+        Args:
+            name: Metric name
+            resolution: "raw", "1m" or "1h" for numeric metrics
+            
+        Returns:
+            Retained samples as {'value', 'timestamp'} dicts (or rollup
+            buckets), the value of a non-numeric metric, or None if not found
+        """
+        value = self.general_metrics.get(name)
+        if isinstance(value, MetricSeries):
+            return value.points(resolution)
+        return value
+    
+    def get_metric_summary(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get count, sum, min, max, mean, last and quantiles of a numeric metric.
+        
         Args:
             name: Metric name
             
         Returns:
-            Metric value or None if not found
+            Summary dictionary or None if the metric is not numeric
         """
-        return self.general_metrics.get(name)
+        series = self.general_metrics.get(name)
+        return series.summary() if isinstance(series, MetricSeries) else None
     
     def get_all_metrics(self) -> Dict[str, Any]:
         """Get all general metrics.
@@ -134,7 +201,37 @@ class MetricsCollector:
         Returns:
             Dictionary of all metrics
         """
-        return self.general_metrics.copy()
+        return {name: self.get_metric(name) for name in self.general_metrics}
+    
+    def flush_metrics(self) -> None:
+        """Append buffered metric samples to the binary sample log."""
+        if not self._sample_buffer:
+            return
+        with open(self.run_path / 'metrics.bin', 'ab') as f:
+            f.write(self._sample_buffer)
+        self._sample_buffer = bytearray()
+    
+    @staticmethod
+    def load_samples(run_path: Union[str, Path]) -> Dict[str, Tuple[array, array]]:
+        """Read the sample log of a run.
+        
+        Args:
+            run_path: Directory of the run
+            
+        Returns:
+            Dictionary mapping metric names to (timestamps, values) arrays
+        """
+        run_path = Path(run_path)
+        with open(run_path / 'metric_names.json') as f:
+            names = json.load(f)
+        samples = {name: (array('d'), array('d')) for name in names}
+        with open(run_path / 'metrics.bin', 'rb') as f:
+            data = f.read()
+        for metric_id, timestamp, value in SAMPLE_RECORD.iter_unpack(data):
+            timestamps, values = samples[names[metric_id]]
+            timestamps.append(timestamp)
+            values.append(value)
+        return samples
 
     def record_comprehensive_metrics(self, metrics: ComprehensiveMetrics):
         """Records the comprehensive self-assessment metrics."""
@@ -169,6 +266,7 @@ class MetricsCollector:
         )
         
         self.tick_metrics.append(metrics)
+        self._pending_ticks.append(metrics)
         self.total_ticks = engine.tick_no
         
         # Update bug counts
@@ -205,6 +303,7 @@ class MetricsCollector:
         )
         
         self.agent_metrics[agent_id].append(metrics)
+        self._pending_agent_metrics.append(metrics)
         
         # Save metrics periodically
         if len(self.agent_metrics[agent_id]) % 10 == 0:
@@ -290,6 +389,16 @@ class MetricsCollector:
             }
         
         summary['agent_summaries'] = agent_summaries
+        summary['metric_summaries'] = {
+            name: series.summary()
+            for name, series in self.general_metrics.items()
+            if isinstance(series, MetricSeries)
+        }
+        
+        # Write out everything still buffered
+        self.flush_metrics()
+        self._save_tick_metrics()
+        self._save_agent_metrics()
         
         # Save summary
         with open(self.run_path / 'summary.json', 'w') as f:
@@ -298,19 +407,28 @@ class MetricsCollector:
         return summary
     
     def _save_tick_metrics(self) -> None:
-        """Save tick metrics to disk."""
-        data = [asdict(m) for m in self.tick_metrics]
-        with open(self.run_path / 'tick_metrics.json', 'w') as f:
-            json.dump(data, f, indent=2)
+        """Append new tick metrics to disk."""
+        self._append_csv('tick_metrics.csv', TickMetrics, self._pending_ticks)
+        self._pending_ticks = []
+        self.flush_metrics()
     
     def _save_agent_metrics(self) -> None:
-        """Save agent metrics to disk."""
-        data = {
-            agent_id: [asdict(m) for m in metrics]
-            for agent_id, metrics in self.agent_metrics.items()
-        }
-        with open(self.run_path / 'agent_metrics.json', 'w') as f:
-            json.dump(data, f, indent=2)
+        """Append new agent metrics to disk."""
+        self._append_csv('agent_metrics.csv', AgentMetrics, self._pending_agent_metrics)
+        self._pending_agent_metrics = []
+    
+    def _append_csv(self, file_name: str, record_type: type, records: List[Any]) -> None:
+        """Append dataclass records to a CSV file, writing the header once."""
+        if not records:
+            return
+        path = self.run_path / file_name
+        names = [field.name for field in fields(record_type)]
+        write_header = not path.exists()
+        with open(path, 'a', newline='') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(names)
+            writer.writerows([getattr(record, name) for name in names] for record in records)
     
     def _save_bug_metrics(self) -> None:
         """Save bug metrics to disk."""
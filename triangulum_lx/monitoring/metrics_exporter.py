@@ -4,12 +4,16 @@ Metrics exporter for Triangulum.
 Exports system metrics to external systems for long-term storage and analysis.
 """
 
+import re
 import json
+import gzip
+import math
 import time
+import bisect
 import logging
 import os
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple, Union
 import threading
 import socket
 import csv
@@ -52,22 +56,27 @@ class FileExporter(MetricsExporter):
     """
     Exports metrics to files on disk.
     
-    This exporter writes metrics to JSON files in a specified directory.
+    This exporter appends metrics as JSON lines to one file per day in a
+    specified directory, optionally as concatenated gzip members.
     """
     
     def __init__(self, 
                 output_dir: Union[str, Path], 
-                filename_template: str = "metrics_{timestamp}.json",
+                filename_template: str = "metrics_{date}.jsonl",
                 buffer_size: int = 100,
-                flush_interval: int = 60):
+                flush_interval: int = 60,
+                compress: bool = False):
         """
         Initialize the file exporter.
         
         Args:
             output_dir: Directory to write metrics to
-            filename_template: Template for filenames
+            filename_template: Template for filenames ({date} and {timestamp}
+                are filled in on each flush)
             buffer_size: How many metrics to buffer before writing
             flush_interval: Seconds between forced flushes
+            compress: Whether to gzip each flushed batch (".gz" is appended
+                to the filename)
         """
         super().__init__("file")
         self.output_dir = Path(output_dir)
@@ -75,8 +84,10 @@ class FileExporter(MetricsExporter):
         self.buffer: List[Dict[str, Any]] = []
         self.buffer_size = buffer_size
         self.flush_interval = flush_interval
+        self.compress = compress
         self.last_flush = time.time()
         self.lock = threading.RLock()
+        self.write_lock = threading.Lock()
         
         # Create output directory if it doesn't exist
         self.output_dir.mkdir(exist_ok=True, parents=True)
@@ -92,9 +103,8 @@ class FileExporter(MetricsExporter):
                 time.sleep(self.flush_interval)
                 
                 # Check if we need to flush
-                with self.lock:
-                    if self.buffer and time.time() - self.last_flush >= self.flush_interval:
-                        self._flush()
+                if self.buffer and time.time() - self.last_flush >= self.flush_interval:
+                    self._flush()
         
         thread = threading.Thread(
             target=flush_loop, 
@@ -121,46 +131,310 @@ class FileExporter(MetricsExporter):
             })
             
             # Flush if buffer is full
-            if len(self.buffer) >= self.buffer_size:
-                return self._flush()
+            if len(self.buffer) < self.buffer_size:
+                return True
             
-        return True
+        return self._flush()
     
     def _flush(self) -> bool:
         """
-        Flush buffered metrics to disk.
+        Append buffered metrics to the current file.
         
         Returns:
             bool: True if flush was successful
         """
-        with self.lock:
-            if not self.buffer:
+        # Writers are serialized so batches land in order; exporting
+        # threads only wait for the buffer swap
+        with self.write_lock:
+            with self.lock:
+                batch, self.buffer = self.buffer, []
+                self.last_flush = time.time()
+            
+            if not batch:
                 return True
             
             try:
-                # Create filename
-                timestamp = int(time.time())
-                filename = self.filename_template.format(timestamp=timestamp)
-                file_path = self.output_dir / filename
+                file_path = self.current_path()
+                data = "".join(
+                    json.dumps(record, separators=(",", ":"), default=str) + "\n"
+                    for record in batch
+                ).encode("utf-8")
                 
-                # Write metrics to file
-                with open(file_path, 'w') as f:
-                    json.dump({
-                        "batch_timestamp": timestamp,
-                        "metrics_count": len(self.buffer),
-                        "metrics": self.buffer
-                    }, f, indent=2)
+                with open(file_path, 'ab') as f:
+                    f.write(gzip.compress(data) if self.compress else data)
                 
-                # Clear buffer and update last flush time
-                self.buffer = []
-                self.last_flush = time.time()
-                
-                logger.debug(f"Flushed metrics to {file_path}")
+                logger.debug(f"Appended {len(batch)} metrics to {file_path}")
                 return True
                 
             except Exception as e:
                 logger.error(f"Error flushing metrics: {e}")
+                with self.lock:
+                    self.buffer[:0] = batch
                 return False
+    
+    def current_path(self) -> Path:
+        """
+        Get the file the next flush appends to.
+        
+        Returns:
+            Path of the current metrics file
+        """
+        filename = self.filename_template.format(
+            date=datetime.now().strftime("%Y%m%d"),
+            timestamp=int(time.time())
+        )
+        if self.compress:
+            filename += ".gz"
+        return self.output_dir / filename
+    
+    def close(self) -> bool:
+        """
+        Flush any buffered metrics.
+        
+        Returns:
+            bool: True if the final flush was successful
+        """
+        return self._flush()
+
+
+def _format_value(value: Union[int, float]) -> str:
+    """Format a sample value for the Prometheus text format."""
+    if isinstance(value, int):
+        return str(int(value))
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def _format_labels(labels: Sequence[Tuple[str, Any]]) -> str:
+    """Format a label set, escaping the values."""
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class _MetricFamily:
+    """
+    A named metric with a fixed set of label names.
+    
+    Each label set is a child that caches its rendered sample lines; the
+    family caches its rendered block. An update only invalidates the lines
+    of one child, so the exposition is rebuilt from cached text.
+    """
+    
+    TYPE = "untyped"
+    
+    def __init__(self, exporter: 'PrometheusExporter', name: str, documentation: str,
+                 labelnames: Sequence[str]):
+        self.exporter = exporter
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], '_MetricChild'] = {}
+        self._text: Optional[str] = None
+        self._block = 0  # set by the exporter on registration
+    
+    def labels(self, *values: Any, **labels: Any) -> '_MetricChild':
+        """
+        Get the child for a label set, creating it on first use.
+        
+        Args:
+            *values: Label values in the order of the label names
+            **labels: Label values by name
+            
+        Returns:
+            The child metric for the label set
+        """
+        if labels:
+            values = tuple(labels[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self.exporter.lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child(list(zip(self.labelnames, key)))
+                    self._changed(child)
+        return child
+    
+    def _new_child(self, labels: List[Tuple[str, str]]) -> '_MetricChild':
+        raise NotImplementedError
+    
+    def _changed(self, child: '_MetricChild') -> None:
+        """Invalidate the cached text of a child; the exporter lock must be held."""
+        child._text = None
+        self._text = None
+        self.exporter._invalidate(self._block)
+    
+    def render(self) -> str:
+        """Render the family, reusing cached text of unchanged children."""
+        if self._text is None:
+            lines = []
+            if self.documentation:
+                lines.append(f"# HELP {self.name} {self.documentation}\n")
+            lines.append(f"# TYPE {self.name} {self.TYPE}\n")
+            for child in self._children.values():
+                if child._text is None:
+                    child._text = child.render()
+                lines.append(child._text)
+            self._text = "".join(lines)
+        return self._text
+
+
+class _MetricChild:
+    """Samples of one label set of a metric family."""
+    
+    def __init__(self, family: _MetricFamily, labels: List[Tuple[str, str]]):
+        self.family = family
+        self.label_text = _format_labels(labels)
+        self._text: Optional[str] = None
+    
+    def render(self) -> str:
+        raise NotImplementedError
+
+
+class _ValueChild(_MetricChild):
+    """Child holding a single value."""
+    
+    def __init__(self, family: _MetricFamily, labels: List[Tuple[str, str]]):
+        super().__init__(family, labels)
+        self.value: Union[int, float] = 0
+        self._prefix = f"{family.name}{self.label_text} "
+    
+    def _set(self, value: Union[int, float]) -> None:
+        with self.family.exporter.lock:
+            self.value = value
+            self.family._changed(self)
+    
+    def _add(self, amount: Union[int, float]) -> None:
+        with self.family.exporter.lock:
+            self.value += amount
+            self.family._changed(self)
+    
+    def render(self) -> str:
+        return self._prefix + _format_value(self.value) + "\n"
+
+
+class _CounterChild(_ValueChild):
+    """Monotonically increasing value of a counter."""
+    
+    def inc(self, amount: Union[int, float] = 1) -> None:
+        """Increase the counter; counters cannot go down."""
+        if amount < 0:
+            raise ValueError("Counters can only be increased")
+        self._add(amount)
+
+
+class _GaugeChild(_ValueChild):
+    """Value of a gauge."""
+    
+    def set(self, value: Union[int, float]) -> None:
+        """Set the gauge."""
+        self._set(value)
+    
+    def inc(self, amount: Union[int, float] = 1) -> None:
+        """Increase the gauge."""
+        self._add(amount)
+    
+    def dec(self, amount: Union[int, float] = 1) -> None:
+        """Decrease the gauge."""
+        self._add(-amount)
+
+
+class _HistogramChild(_MetricChild):
+    """Bucket counts, sum and count of a histogram."""
+    
+    def __init__(self, family: 'HistogramMetric', labels: List[Tuple[str, str]]):
+        super().__init__(family, labels)
+        self.bucket_counts = [0] * (len(family.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._bucket_prefixes = [
+            f"{family.name}_bucket{_format_labels(labels + [('le', _format_value(bound))])} "
+            for bound in family.buckets
+        ] + [f"{family.name}_bucket{_format_labels(labels + [('le', '+Inf')])} "]
+        self._sum_prefix = f"{family.name}_sum{self.label_text} "
+        self._count_prefix = f"{family.name}_count{self.label_text} "
+    
+    def observe(self, value: float) -> None:
+        """Record an observation."""
+        index = bisect.bisect_left(self.family.buckets, value)
+        with self.family.exporter.lock:
+            self.bucket_counts[index] += 1
+            self.sum += value
+            self.count += 1
+            self.family._changed(self)
+    
+    def render(self) -> str:
+        lines = []
+        cumulative = 0
+        for prefix, count in zip(self._bucket_prefixes, self.bucket_counts):
+            cumulative += count
+            lines.append(f"{prefix}{cumulative}\n")
+        lines.append(f"{self._sum_prefix}{_format_value(self.sum)}\n")
+        lines.append(f"{self._count_prefix}{self.count}\n")
+        return "".join(lines)
+
+
+class CounterMetric(_MetricFamily):
+    """Prometheus counter; use ``labels`` or the unlabeled ``inc``."""
+    
+    TYPE = "counter"
+    
+    def _new_child(self, labels):
+        return _CounterChild(self, labels)
+    
+    def inc(self, amount: Union[int, float] = 1) -> None:
+        """Increase the unlabeled counter."""
+        self.labels().inc(amount)
+
+
+class GaugeMetric(_MetricFamily):
+    """Prometheus gauge; use ``labels`` or the unlabeled ``set``/``inc``/``dec``."""
+    
+    TYPE = "gauge"
+    
+    def _new_child(self, labels):
+        return _GaugeChild(self, labels)
+    
+    def set(self, value: Union[int, float]) -> None:
+        """Set the unlabeled gauge."""
+        self.labels().set(value)
+    
+    def inc(self, amount: Union[int, float] = 1) -> None:
+        """Increase the unlabeled gauge."""
+        self.labels().inc(amount)
+    
+    def dec(self, amount: Union[int, float] = 1) -> None:
+        """Decrease the unlabeled gauge."""
+        self.labels().dec(amount)
+
+
+class HistogramMetric(_MetricFamily):
+    """Prometheus histogram; use ``labels`` or the unlabeled ``observe``."""
+    
+    TYPE = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    
+    def __init__(self, exporter: 'PrometheusExporter', name: str, documentation: str,
+                 labelnames: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(exporter, name, documentation, labelnames)
+        self.buckets = sorted(float(bound) for bound in buckets if not math.isinf(bound))
+    
+    def _new_child(self, labels):
+        return _HistogramChild(self, labels)
+    
+    def observe(self, value: float) -> None:
+        """Record an observation in the unlabeled histogram."""
+        self.labels().observe(value)
 
 
 class PrometheusExporter(MetricsExporter):
@@ -168,33 +442,51 @@ class PrometheusExporter(MetricsExporter):
     Exports metrics in Prometheus format.
     
     This exporter serves metrics on an HTTP endpoint for Prometheus to scrape.
+    Metrics are registered with a type (``counter``, ``gauge``,
+    ``histogram``) and keep their rendered text between scrapes, so a scrape
+    only re-renders the samples that changed since the previous one.
+    Dictionaries passed to ``export`` are mapped onto gauges.
     """
     
+    NAME_PATTERN = re.compile(r"[^a-zA-Z0-9_:]")
+    BLOCK_SIZE = 256
+    
     def __init__(self, 
                 port: int = 9090, 
                 host: str = "127.0.0.1",
-                endpoint: str = "/metrics"):
+                endpoint: str = "/metrics",
+                namespace: str = "triangulum"):
         """
         Initialize the Prometheus exporter.
         
         Args:
-            port: Port to listen on
+            port: Port to listen on (0 picks a free port)
             host: Host to bind to
             endpoint: Endpoint to serve metrics on
+            namespace: Prefix for metrics passed to ``export``
         """
         super().__init__("prometheus")
         self.port = port
         self.host = host
         self.endpoint = endpoint
+        self.namespace = namespace
         self.metrics: Dict[str, Any] = {}
         self.lock = threading.RLock()
         
+        self._families: Dict[str, _MetricFamily] = {}
+        self._exported_gauges: Dict[str, Optional[_GaugeChild]] = {}
+        
+        # Families are rendered in fixed-size blocks with cached text, so a
+        # scrape after a few updates re-renders a few blocks and joins the rest
+        self._blocks: List[List[_MetricFamily]] = []
+        self._block_text: List[Optional[str]] = []
+        self._exposition: Optional[bytes] = None
+        
         # Start HTTP server
         self._start_server()
     
     def _start_server(self) -> None:
         """Start HTTP server to serve metrics."""
-        import threading
         from http.server import HTTPServer, BaseHTTPRequestHandler
         
         # Define request handler
@@ -202,13 +494,13 @@ class PrometheusExporter(MetricsExporter):
             def do_GET(self):
                 if self.path == self.server.endpoint:
                     # Serve metrics
-                    with self.server.exporter.lock:
-                        metrics_text = self.server.exporter._format_metrics()
+                    body = self.server.exporter._exposition_bytes()
                     
                     self.send_response(200)
-                    self.send_header("Content-Type", "text/plain")
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
                     self.end_headers()
-                    self.wfile.write(metrics_text.encode("utf-8"))
+                    self.wfile.write(body)
                 else:
                     # Not found
                     self.send_response(404)
@@ -224,6 +516,8 @@ class PrometheusExporter(MetricsExporter):
         server = HTTPServer((self.host, self.port), PrometheusHandler)
         server.endpoint = self.endpoint
         server.exporter = self
+        self.server = server
+        self.port = server.server_address[1]
         
         # Start server in background thread
         thread = threading.Thread(
@@ -235,10 +529,84 @@ class PrometheusExporter(MetricsExporter):
         
         logger.info(f"Prometheus metrics server started at http://{self.host}:{self.port}{self.endpoint}")
     
+    def shutdown(self) -> None:
+        """Stop the HTTP server."""
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def _register(self, family_type: type, name: str, documentation: str,
+                  labelnames: Sequence[str], **kwargs: Any) -> _MetricFamily:
+        with self.lock:
+            family = self._families.get(name)
+            if family is not None:
+                if type(family) is not family_type or family.labelnames != tuple(labelnames):
+                    raise ValueError(f"Metric {name} is already registered as a {family.TYPE}")
+                return family
+            family = self._families[name] = family_type(self, name, documentation, labelnames, **kwargs)
+            if not self._blocks or len(self._blocks[-1]) >= self.BLOCK_SIZE:
+                self._blocks.append([])
+                self._block_text.append(None)
+            family._block = len(self._blocks) - 1
+            self._blocks[-1].append(family)
+            self._invalidate(family._block)
+            return family
+    
+    def _invalidate(self, block: int) -> None:
+        """Drop the cached text of a block; the lock must be held."""
+        self._block_text[block] = None
+        self._exposition = None
+    
+    def counter(self, name: str, documentation: str = "", labelnames: Sequence[str] = ()) -> CounterMetric:
+        """
+        Register a counter, or get it if it is already registered.
+        
+        Args:
+            name: Full metric name
+            documentation: Help text
+            labelnames: Names of the labels of the metric
+            
+        Returns:
+            The counter
+        """
+        return self._register(CounterMetric, name, documentation, labelnames)
+    
+    def gauge(self, name: str, documentation: str = "", labelnames: Sequence[str] = ()) -> GaugeMetric:
+        """
+        Register a gauge, or get it if it is already registered.
+        
+        Args:
+            name: Full metric name
+            documentation: Help text
+            labelnames: Names of the labels of the metric
+            
+        Returns:
+            The gauge
+        """
+        return self._register(GaugeMetric, name, documentation, labelnames)
+    
+    def histogram(self, name: str, documentation: str = "", labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = HistogramMetric.DEFAULT_BUCKETS) -> HistogramMetric:
+        """
+        Register a histogram, or get it if it is already registered.
+        
+        Args:
+            name: Full metric name
+            documentation: Help text
+            labelnames: Names of the labels of the metric
+            buckets: Upper bounds of the buckets (+Inf is implied)
+            
+        Returns:
+            The histogram
+        """
+        return self._register(HistogramMetric, name, documentation, labelnames, buckets=buckets)
+    
     def export(self, metrics: Dict[str, Any]) -> bool:
         """
         Export metrics to Prometheus format.
         
+        Numbers become gauges named after their key path (nested dictionary
+        keys are joined with "_"); a list is exported as its last number.
+        
         Args:
             metrics: Dictionary of metrics to export
             
@@ -248,8 +616,64 @@ class PrometheusExporter(MetricsExporter):
         with self.lock:
             # Update metrics
             self.metrics.update(metrics)
+            for key, value in self._flatten(metrics, self.namespace):
+                gauge = self._exported_gauges.get(key, False)
+                if gauge is False:
+                    gauge = self._exported_gauges[key] = self._exported_gauge(key)
+                if gauge is not None:
+                    gauge.set(value)
             return True
     
+    def _flatten(self, metrics: Dict[str, Any], prefix: str) -> Iterator[Tuple[str, Union[int, float]]]:
+        """Yield (key path, number) pairs of a metrics dictionary."""
+        for key, value in metrics.items():
+            key = str(key)
+            # Skip special fields
+            if key.startswith("_"):
+                continue
+            path = f"{prefix}_{key}" if prefix else key
+            if isinstance(value, dict):
+                yield from self._flatten(value, path)
+                continue
+            if isinstance(value, (list, tuple)):
+                numbers = [item for item in value if isinstance(item, (int, float))]
+                if not numbers:
+                    continue
+                value = numbers[-1]
+            if isinstance(value, (int, float)):
+                yield path, value
+    
+    def _exported_gauge(self, key: str) -> Optional[_GaugeChild]:
+        """Get the gauge for an exported key path, or None if the name is taken."""
+        name = self.NAME_PATTERN.sub("_", key)
+        if name[0].isdigit():
+            name = f"_{name}"
+        try:
+            return self.gauge(name).labels()
+        except ValueError as e:
+            logger.warning(f"Not exporting {key}: {e}")
+            return None
+    
+    def _exposition_bytes(self) -> bytes:
+        """
+        Get the exposition, re-rendering only the metrics that changed.
+        
+        Returns:
+            bytes: Metrics in Prometheus text format
+        """
+        exposition = self._exposition
+        if exposition is None:
+            with self.lock:
+                exposition = self._exposition
+                if exposition is None:
+                    for index, text in enumerate(self._block_text):
+                        if text is None:
+                            self._block_text[index] = "".join(
+                                family.render() for family in self._blocks[index]
+                            )
+                    exposition = self._exposition = "".join(self._block_text).encode("utf-8")
+        return exposition
+    
     def _format_metrics(self) -> str:
         """
         Format metrics in Prometheus text format.
@@ -257,41 +681,7 @@ class PrometheusExporter(MetricsExporter):
         Returns:
             str: Metrics in Prometheus text format
         """
-        lines = []
-        
-        # Helper function to process metrics recursively
-        def process_metric(name, value, labels=None):
-            labels_str = ""
-            if labels:
-                labels_str = "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
-            
-            if isinstance(value, (int, float)):
-                lines.append(f"{name}{labels_str} {value}")
-            elif isinstance(value, dict):
-                for k, v in value.items():
-                    new_labels = dict(labels) if labels else {}
-                    if k.isalpha():  # If key can be a label
-                        new_labels[k] = v
-                    else:  # If key needs to be part of the metric name
-                        new_name = f"{name}_{k}"
-                        process_metric(new_name, v, new_labels)
-            elif isinstance(value, list):
-                for i, v in enumerate(value):
-                    new_labels = dict(labels) if labels else {}
-                    new_labels["index"] = i
-                    process_metric(name, v, new_labels)
-        
-        # Process all metrics
-        timestamp = int(time.time() * 1000)
-        for name, value in self.metrics.items():
-            # Skip special fields
-            if name.startswith("_"):
-                continue
-                
-            # Add metric
-            process_metric(f"triangulum_{name}", value)
-        
-        return "\n".join(lines) + "\n"
+        return self._exposition_bytes().decode("utf-8")
 
 
 class CSVExporter(MetricsExporter):
@@ -299,6 +689,9 @@ class CSVExporter(MetricsExporter):
     Exports metrics to CSV files.
     
     This is useful for metrics that need to be analyzed in spreadsheets.
+    Files are only ever appended to: when metrics with new columns arrive,
+    a new part file (``metrics_20240101_1.csv``, ...) with the extended
+    header is started instead of rewriting the current one.
     """
     
     def __init__(self, 
@@ -319,6 +712,8 @@ class CSVExporter(MetricsExporter):
         self.rotate_daily = rotate_daily
         self.current_day = datetime.now().date()
         self.current_file = None
+        self.current_path: Optional[Path] = None
+        self.current_part = 0
         self.lock = threading.RLock()
         self.csv_writer = None
         self.headers = set()
@@ -350,20 +745,14 @@ class CSVExporter(MetricsExporter):
                 
                 # Flatten metrics
                 flat_metrics = self._flatten_metrics(metrics)
+                flat_metrics.setdefault("timestamp", datetime.now().isoformat())
                 
-                # Update headers
-                new_headers = set(flat_metrics.keys())
-                if new_headers - self.headers:
-                    # We have new headers, need to rewrite the file
-                    self.headers.update(new_headers)
-                    self._rewrite_headers()
-                
-                # Write metrics row
-                row = {}
-                for header in self.headers:
-                    row[header] = flat_metrics.get(header, "")
+                # New columns go to a new part with the extended header
+                if not self.headers.issuperset(flat_metrics):
+                    self._start_part(self.headers.union(flat_metrics))
                 
-                self.csv_writer.writerow(row)
+                # Write metrics row; missing columns are left empty
+                self.csv_writer.writerow(flat_metrics)
                 self.current_file.flush()
                 
                 return True
@@ -408,32 +797,48 @@ class CSVExporter(MetricsExporter):
         
         return result
     
-    def _open_file(self) -> None:
-        """Open a new CSV file for writing."""
-        # Generate filename
+    def _part_path(self, part: int) -> Path:
+        """Get the path of a part of the current day's file."""
         date_str = self.current_day.strftime("%Y%m%d")
-        filename = self.filename_template.format(date=date_str)
-        file_path = self.output_dir / filename
-        
-        # Check if file exists
-        file_exists = file_path.exists()
-        
-        # Open file
-        self.current_file = open(file_path, 'a', newline='')
-        self.csv_writer = csv.DictWriter(self.current_file, fieldnames=[])
-        
-        # If new file, write headers
-        if not file_exists:
-            self.headers = {"timestamp"}  # Always include timestamp
-            self._rewrite_headers()
+        file_path = self.output_dir / self.filename_template.format(date=date_str)
+        if part == 0:
+            return file_path
+        return file_path.with_name(f"{file_path.stem}_{part}{file_path.suffix}")
     
-    def _rewrite_headers(self) -> None:
-        """Rewrite headers in the current CSV file."""
-        # Set writer fieldnames
-        self.csv_writer.fieldnames = sorted(self.headers)
-        
-        # Write header row
-        if self.current_file.tell() == 0:  # Only if at start of file
+    def _open_file(self) -> None:
+        """Open the latest part of the current CSV file for appending."""
+        # Continue after the parts written by earlier runs
+        part = 0
+        while self._part_path(part + 1).exists():
+            part += 1
+        path = self._part_path(part)
+        
+        fieldnames = []
+        if path.exists():
+            with open(path, newline='') as f:
+                fieldnames = next(csv.reader(f), [])
+        
+        if fieldnames:
+            self.current_part = part
+            self._open_part(path, fieldnames, write_header=False)
+        else:
+            self.current_part = part - 1
+            self._start_part({"timestamp"})  # Always include timestamp
+    
+    def _start_part(self, headers: set) -> None:
+        """Start the next part file with the given columns."""
+        self._close_file()
+        self.current_part += 1
+        path = self._part_path(self.current_part)
+        self._open_part(path, sorted(headers), write_header=True)
+    
+    def _open_part(self, path: Path, fieldnames: List[str], write_header: bool) -> None:
+        """Open a part file and set up the writer for its columns."""
+        self.current_path = path
+        self.current_file = open(path, 'a', newline='')
+        self.csv_writer = csv.DictWriter(self.current_file, fieldnames=fieldnames, restval="")
+        self.headers = set(fieldnames)
+        if write_header and self.current_file.tell() == 0:
             self.csv_writer.writeheader()
     
     def _close_file(self) -> None:
@@ -0,0 +1,33 @@
+/*
+ * Triangulum dashboard event feed client.
+ *
+ * Loads the compacted snapshot once, then follows the server's event stream
+ * from the snapshot's sequence number so only new events are transferred.
+ */
+function subscribeDashboardFeed(onSnapshot, onEvent) {
+    let source = null;
+
+    function connect(cursor) {
+        if (source) {
+            source.close();
+        }
+        source = new EventSource(`/events?cursor=${cursor}`);
+        source.addEventListener('reset', () => loadSnapshot());
+        ['thought', 'message', 'decision_tree', 'decision_node', 'decision_alternative',
+         'agent_progress', 'global_progress'].forEach(type => {
+            source.addEventListener(type, (message) => onEvent(JSON.parse(message.data)));
+        });
+    }
+
+    function loadSnapshot() {
+        fetch('/data/snapshot.json', {cache: 'no-store'})
+            .then(response => response.json())
+            .then(snapshot => {
+                onSnapshot(snapshot.state);
+                connect(snapshot.sequence);
+            })
+            .catch(error => console.error('Error loading dashboard snapshot:', error));
+    }
+
+    loadSnapshot();
+}
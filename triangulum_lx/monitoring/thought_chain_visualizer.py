@@ -218,7 +218,8 @@ class ThoughtChainVisualizer:
                         chain_id: str, 
                         content: str, 
                         thought_type: str = "analysis",
-                        metadata: Optional[Dict] = None):
+                        metadata: Optional[Dict] = None,
+                        auto_update: bool = True):
         """
         Register a new thought in a chain.
         
@@ -228,6 +229,10 @@ class ThoughtChainVisualizer:
             content: The thought content
             thought_type: Type of thought (analysis, decision, etc.)
             metadata: Additional metadata for the thought
+            auto_update: Whether to update the visualizations when they are due
+        
+        Returns:
+            The thought record that was stored
         """
         timestamp = datetime.datetime.now().isoformat()
         
@@ -269,13 +274,15 @@ class ThoughtChainVisualizer:
         
         # Update visualizations if needed
         current_time = time.time()
-        if current_time - self.last_update >= self.update_interval:
+        if auto_update and current_time - self.last_update >= self.update_interval:
             self.update_visualizations()
             self.last_update = current_time
         
         # Terminal output if enabled
         if self.enable_terminal_output:
             self._print_thought_to_terminal(thought)
+        
+        return thought
     
     def register_connection(self, source_chain_id: str, target_chain_id: str, 
                            connection_type: str = "reference"):
@@ -13,6 +13,8 @@ import json
 import logging
 import datetime
 import uuid
+from collections import deque
+from itertools import islice
 from typing import Dict, List, Any, Optional, Union, Tuple
 
 import matplotlib.pyplot as plt
@@ -37,7 +39,8 @@ class TokenProcessingVisualizer:
                  output_dir: str = "./token_visualization",
                  update_interval: float = 0.5,
                  max_tokens_per_chart: int = 50,
-                 save_raw_data: bool = True):
+                 save_raw_data: bool = True,
+                 max_tokens_retained: int = 1000):
         """
         Initialize the token processing visualizer.
         
@@ -46,11 +49,14 @@ class TokenProcessingVisualizer:
             update_interval: How frequently to update visualizations (seconds)
             max_tokens_per_chart: Maximum number of tokens to show in a single chart
             save_raw_data: Whether to save raw token data in JSON format
+            max_tokens_retained: Maximum number of recent tokens kept in memory
+                per session (older tokens remain in the JSONL data log)
         """
         self.output_dir = output_dir
         self.update_interval = update_interval
         self.max_tokens_per_chart = max_tokens_per_chart
         self.save_raw_data = save_raw_data
+        self.max_tokens_retained = max(1, max_tokens_retained)
         
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
@@ -62,7 +68,15 @@ class TokenProcessingVisualizer:
         self.sessions = {}  # session_id -> session data
         
         # Store token data
-        self.token_data = {}  # session_id -> list of token data
+        self.token_data = {}  # session_id -> deque of the most recent token data
+        
+        # Running aggregates (Welford) per session
+        self._session_stats = {}  # session_id -> running count/mean/M2 values
+        
+        # Sessions changed since the last flush and log records awaiting append
+        self._dirty_sessions = set()
+        self._pending_records = []
+        self.data_log_path = os.path.join(output_dir, "data", "token_log.jsonl")
         
         # Timestamp of last visualization update
         self.last_update = time.time()
@@ -123,7 +137,7 @@ class TokenProcessingVisualizer:
         </div>
         <div class="nav">
             <div class="nav-item" onclick="location.reload()">Refresh</div>
-            <div class="nav-item" onclick="window.open('data/all_sessions.json', '_blank')">View Raw Data</div>
+            <div class="nav-item" onclick="window.open('data/token_log.jsonl', '_blank')">View Raw Data</div>
         </div>
         <div class="session-list">
             <h2>Processing Sessions</h2>
@@ -232,9 +246,19 @@ class TokenProcessingVisualizer:
             "status": "active",
             "token_count": 0,
             "average_confidence": 0.0,
-            "average_processing_time": 0.0
+            "average_processing_time": 0.0,
+            "confidence_stddev": 0.0,
+            "processing_time_stddev": 0.0
+        }
+        self.token_data[session_id] = deque(maxlen=self.max_tokens_retained)
+        self._session_stats[session_id] = {
+            "count": 0,
+            "confidence_mean": 0.0,
+            "confidence_m2": 0.0,
+            "processing_time_mean": 0.0,
+            "processing_time_m2": 0.0
         }
-        self.token_data[session_id] = []
+        self._mark_dirty(session_id)
         logger.info(f"Started token processing session {session_id} for agent {agent_id}")
         self.update_visualizations()
         return session_id
@@ -248,28 +272,43 @@ class TokenProcessingVisualizer:
                  metadata: Optional[Dict] = None):
         """
         Add a token to a processing session.
+        
+        Session aggregates are maintained incrementally, so the cost of adding
+        a token does not depend on how many tokens the session already holds.
         """
         if session_id not in self.sessions:
             logger.warning(f"Session {session_id} not found. Creating new session.")
             session_id = self.start_processing_session("unknown")
         
+        session = self.sessions[session_id]
         token_data = {
             "token": token,
             "confidence": confidence,
             "processing_time_ms": processing_time_ms,
             "timestamp": datetime.datetime.now().isoformat(),
-            "index": len(self.token_data[session_id]),
+            "index": session["token_count"],
             "attention_weights": attention_weights,
             "metadata": metadata or {}
         }
         self.token_data[session_id].append(token_data)
         
-        session = self.sessions[session_id]
-        session["token_count"] = len(self.token_data[session_id])
-        confidence_sum = sum(t["confidence"] for t in self.token_data[session_id])
-        session["average_confidence"] = confidence_sum / session["token_count"]
-        processing_time_sum = sum(t["processing_time_ms"] for t in self.token_data[session_id])
-        session["average_processing_time"] = processing_time_sum / session["token_count"]
+        stats = self._session_stats[session_id]
+        stats["count"] += 1
+        count = stats["count"]
+        for key, value in (("confidence", confidence), ("processing_time", processing_time_ms)):
+            delta = value - stats[f"{key}_mean"]
+            stats[f"{key}_mean"] += delta / count
+            stats[f"{key}_m2"] += delta * (value - stats[f"{key}_mean"])
+        
+        session["token_count"] = count
+        session["average_confidence"] = stats["confidence_mean"]
+        session["average_processing_time"] = stats["processing_time_mean"]
+        session["confidence_stddev"] = (stats["confidence_m2"] / count) ** 0.5
+        session["processing_time_stddev"] = (stats["processing_time_m2"] / count) ** 0.5
+        
+        if self.save_raw_data:
+            self._pending_records.append({"type": "token", "session_id": session_id, **token_data})
+        self._dirty_sessions.add(session_id)
         
         current_time = time.time()
         if current_time - self.last_update >= self.update_interval:
@@ -288,8 +327,7 @@ class TokenProcessingVisualizer:
             logger.warning(f"Session {session_id} not found. Creating new session.")
             session_id = self.start_processing_session("unknown")
         
-        tokens = self.token_data[session_id]
-        token_texts = [tokens[i]["token"] for i in range(min(len(tokens), 20))]
+        token_texts = [t["token"] for t in islice(self.token_data[session_id], 20)]
         
         pattern_id = str(uuid.uuid4())
         attention_data = {
@@ -307,6 +345,7 @@ class TokenProcessingVisualizer:
             json.dump(attention_data, f, indent=2)
         
         self._visualize_attention_pattern(attention_data)
+        self._dirty_sessions.add(session_id)
         
         current_time = time.time()
         if current_time - self.last_update >= self.update_interval:
@@ -323,28 +362,53 @@ class TokenProcessingVisualizer:
         
         self.sessions[session_id]["end_time"] = datetime.datetime.now().isoformat()
         self.sessions[session_id]["status"] = "completed"
+        self._mark_dirty(session_id)
         self.update_visualizations()
         logger.info(f"Ended token processing session {session_id}")
 
     def update_visualizations(self):
-        """Update all token processing visualizations."""
+        """
+        Update token processing visualizations.
+        
+        Only sessions that changed since the last flush are re-rendered, and
+        raw data is appended to the JSONL data log rather than rewritten.
+        """
         try:
             self._update_main_visualization()
-            for session_id in self.sessions:
+            dirty_sessions, self._dirty_sessions = self._dirty_sessions, set()
+            for session_id in dirty_sessions:
                 self._update_session_visualization(session_id)
             
-            if self.save_raw_data:
-                data_path = os.path.join(self.output_dir, "data", "all_sessions.json")
-                with open(data_path, 'w', encoding='utf-8') as f:
-                    json.dump({
-                        "sessions": self.sessions,
-                        "token_data": self.token_data,
-                        "last_updated": datetime.datetime.now().isoformat()
-                    }, f, indent=2)
+            self._flush_data_log()
             
             logger.debug("Token processing visualizations updated")
         except Exception as e:
             logger.error(f"Error updating token processing visualizations: {e}")
+    
+    def _mark_dirty(self, session_id: str):
+        """Mark a session for re-rendering and log its current metadata."""
+        self._dirty_sessions.add(session_id)
+        if self.save_raw_data:
+            self._pending_records.append({
+                "type": "session",
+                "session_id": session_id,
+                **self.sessions[session_id]
+            })
+    
+    def _flush_data_log(self):
+        """Append pending session and token records to the JSONL data log."""
+        if not self._pending_records:
+            return
+        records, self._pending_records = self._pending_records, []
+        with open(self.data_log_path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record))
+                f.write("\n")
+    
+    def _recent_tokens(self, session_id: str, count: int) -> List[Dict]:
+        """Return the last ``count`` retained tokens of a session."""
+        tokens = self.token_data[session_id]
+        return list(islice(tokens, max(0, len(tokens) - count), None))
 
     def _update_main_visualization(self):
         """Update the main visualization HTML file."""
@@ -383,8 +447,7 @@ class TokenProcessingVisualizer:
 
         for session_id in recent_sessions_to_display:
             session = self.sessions[session_id]
-            tokens = self.token_data[session_id]
-            recent_tokens = tokens[-10:]
+            recent_tokens = self._recent_tokens(session_id, 10)
             
             token_html = ""
             for token_data in recent_tokens:
@@ -437,12 +500,13 @@ class TokenProcessingVisualizer:
             return
         
         session = self.sessions[session_id]
-        tokens = self.token_data[session_id]
+        tokens = list(self.token_data[session_id])
         if not tokens:
             return
         
-        self._create_confidence_chart(session_id, tokens)
-        self._create_processing_time_chart(session_id, tokens)
+        chart_tokens = tokens[-self.max_tokens_per_chart:]
+        self._create_confidence_chart(session_id, chart_tokens)
+        self._create_processing_time_chart(session_id, chart_tokens)
         
         token_html = ""
         for token_data in tokens:
@@ -498,10 +562,12 @@ class TokenProcessingVisualizer:
     def _create_confidence_chart(self, session_id: str, tokens: List[Dict]):
         """
         Create a confidence chart for a session.
+        
+        ``tokens`` is expected to be the window of tokens to display.
         """
         try:
             plt.figure(figsize=(12, 6))
-            indices = list(range(len(tokens)))
+            indices = [t["index"] for t in tokens]
             confidences = [t["confidence"] for t in tokens]
             bars = plt.bar(indices, confidences, width=0.8, alpha=0.7)
             for i, bar in enumerate(bars):
@@ -509,14 +575,6 @@ class TokenProcessingVisualizer:
                 elif confidences[i] >= 50: bar.set_color('#faad14')
                 else: bar.set_color('#f5222d')
             
-            max_visible_tokens = min(len(tokens), self.max_tokens_per_chart)
-            if len(tokens) > max_visible_tokens:
-                start_idx = len(tokens) - max_visible_tokens
-                indices = indices[-max_visible_tokens:]
-                confidences = confidences[-max_visible_tokens:]
-                tokens = tokens[-max_visible_tokens:]
-                plt.xlim(start_idx - 0.5, len(tokens) + start_idx - 0.5)
-            
             for i, token_data in enumerate(tokens):
                 token_text = token_data["token"]
                 if len(token_text) > 10: token_text = token_text[:7] + "..."
@@ -538,10 +596,12 @@ class TokenProcessingVisualizer:
     def _create_processing_time_chart(self, session_id: str, tokens: List[Dict]):
         """
         Create a processing time chart for a session.
+        
+        ``tokens`` is expected to be the window of tokens to display.
         """
         try:
             plt.figure(figsize=(12, 6))
-            indices = list(range(len(tokens)))
+            indices = [t["index"] for t in tokens]
             processing_times = [t["processing_time_ms"] for t in tokens]
             plt.plot(indices, processing_times, marker='o', linestyle='-', color='#1890ff', markersize=4, alpha=0.7)
             
@@ -551,11 +611,6 @@ class TokenProcessingVisualizer:
                 ma_indices = indices[window_size-1:]
                 plt.plot(ma_indices, moving_avg, linestyle='-', color='#722ed1', linewidth=2, label=f'{window_size}-token Moving Average')
             
-            max_visible_tokens = min(len(tokens), self.max_tokens_per_chart)
-            if len(tokens) > max_visible_tokens:
-                start_idx = len(tokens) - max_visible_tokens
-                plt.xlim(start_idx - 0.5, len(tokens) + start_idx - 0.5)
-            
             plt.title("Token Processing Time", fontsize=16)
             plt.ylabel("Processing Time (ms)", fontsize=12)
             plt.xlabel("Token Index", fontsize=12)
@@ -11,6 +11,9 @@ from .openai import OpenAIProvider
 from .anthropic import AnthropicProvider
 from .groq import GroqProvider
 from .openrouter import OpenRouterProvider
+from .http_pool import PoolLimits
+from .rate_limiter import RateLimit, Priority, request_priority, configure_rate_limit
+from .tokenization import TokenCountingService, get_token_counter, configure_token_counter
 # Avoid circular imports
 # These are imported elsewhere directly from factory
 
@@ -21,4 +24,12 @@ __all__ = [
     "AnthropicProvider",
     "GroqProvider",
     "OpenRouterProvider",
+    "PoolLimits",
+    "RateLimit",
+    "Priority",
+    "request_priority",
+    "configure_rate_limit",
+    "TokenCountingService",
+    "get_token_counter",
+    "configure_token_counter",
 ]
@@ -4,30 +4,41 @@ Concrete implementation of the LLMProvider for Anthropic models.
 
 import os
 import time
-from typing import List, Dict, Any, Optional, Union, Iterator
+from typing import List, Dict, Any, Optional, Union, Iterator, AsyncIterator
 
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
 from .base import LLMProvider, LLMResponse
+from .http_pool import PoolLimits
 
 class AnthropicProvider(LLMProvider):
     """
     An LLMProvider for interacting with Anthropic's API.
     """
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "claude-3-haiku-20240307"):
-        super().__init__(api_key or os.getenv("ANTHROPIC_API_KEY"), model)
+    rate_limit_key = "anthropic"
+
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 model: str = "claude-3-haiku-20240307",
+                 pool_limits: Optional[PoolLimits] = None):
+        super().__init__(api_key or os.getenv("ANTHROPIC_API_KEY"), model, pool_limits)
         if not self.api_key:
             raise ValueError("Anthropic API key not provided or found in environment variables.")
-        self.client = Anthropic(api_key=self.api_key)
 
-    def generate(
+    def _create_client(self, http_client: Any) -> Anthropic:
+        return Anthropic(api_key=self.api_key, http_client=http_client)
+
+    def _create_async_client(self, http_client: Any) -> AsyncAnthropic:
+        return AsyncAnthropic(api_key=self.api_key, http_client=http_client)
+
+    def _build_params(
         self,
         prompt: Union[str, List[Dict[str, str]]],
         temperature: float = 0.0,
         max_tokens: Optional[int] = 2048,
-        stream: bool = False,
         **kwargs: Any
-    ) -> Union[LLMResponse, Iterator[LLMResponse]]:
+    ) -> Dict[str, Any]:
+        """Build the messages API parameters for a request."""
         self._ensure_deterministic(temperature)
 
         if isinstance(prompt, str):
@@ -35,41 +46,82 @@ class AnthropicProvider(LLMProvider):
         else:
             messages = self._normalize_messages(prompt)
 
-        api_params = {
+        return {
             "model": self.model,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
-            "stream": stream,
             **kwargs,
         }
 
+    def generate(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = 2048,
+        stream: bool = False,
+        **kwargs: Any
+    ) -> Union[LLMResponse, Iterator[LLMResponse]]:
+        api_params = self._build_params(prompt, temperature, max_tokens, **kwargs)
+
         if stream:
             return self._generate_stream(api_params)
         else:
             return self._generate_non_stream(api_params)
 
-    def _generate_non_stream(self, api_params: Dict[str, Any]) -> LLMResponse:
-        start_time = time.time()
-        response = self.client.messages.create(**api_params)
-        latency = time.time() - start_time
-        
+    def _to_response(self, response: Any, latency: float) -> LLMResponse:
         content = response.content[0].text if response.content else ""
         tokens_used = (response.usage.input_tokens + response.usage.output_tokens) if response.usage else None
         
         return LLMResponse(
             content=content,
             model=response.model,
-            latency=latency,
             tokens_used=tokens_used,
-            raw_response=response.model_dump()
+            metadata={"latency": latency, "raw_response": response.model_dump()}
         )
 
+    def _generate_non_stream(self, api_params: Dict[str, Any]) -> LLMResponse:
+        start_time = time.time()
+        response = self._request(api_params, lambda: self.client.messages.create(**api_params))
+        return self._to_response(response, time.time() - start_time)
+
     def _generate_stream(self, api_params: Dict[str, Any]) -> Iterator[LLMResponse]:
+        self._acquire(api_params)
         with self.client.messages.stream(**api_params) as stream:
             for text in stream.text_stream:
                 yield LLMResponse(content=text, model=self.model)
 
+    async def generate_async(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = 2048,
+        **kwargs: Any
+    ) -> LLMResponse:
+        """Async version of generate method."""
+        kwargs.pop("stream", None)
+        api_params = self._build_params(prompt, temperature, max_tokens, **kwargs)
+
+        start_time = time.time()
+        response = await self._arequest(api_params, lambda: self.async_client.messages.create(**api_params))
+        return self._to_response(response, time.time() - start_time)
+
+    async def stream_async(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = 2048,
+        **kwargs: Any
+    ) -> AsyncIterator[LLMResponse]:
+        """Async version of generate with streaming enabled."""
+        kwargs.pop("stream", None)
+        api_params = self._build_params(prompt, temperature, max_tokens, **kwargs)
+
+        await self._aacquire(api_params)
+        async with self.async_client.messages.stream(**api_params) as stream:
+            async for text in stream.text_stream:
+                yield LLMResponse(content=text, model=self.model)
+
     def generate_with_tools(
         self,
         prompt: Union[str, List[Dict[str, str]]],
@@ -93,13 +145,14 @@ class AnthropicProvider(LLMProvider):
             for tool in tools
         ]
 
-        response = self.client.messages.create(
-            model=self.model,
-            messages=messages,
-            tools=anthropic_tools,
-            temperature=temperature,
+        tool_params = {
+            "model": self.model,
+            "messages": messages,
+            "tools": anthropic_tools,
+            "temperature": temperature,
             **kwargs,
-        )
+        }
+        response = self._request(tool_params, lambda: self.client.messages.create(**tool_params))
 
         if response.stop_reason == "tool_use":
             from .base import ToolCall
@@ -116,7 +169,7 @@ class AnthropicProvider(LLMProvider):
             return LLMResponse(
                 content=response.content[0].text if response.content else "",
                 model=response.model,
-                raw_response=response.model_dump()
+                metadata={"raw_response": response.model_dump()}
             )
 
     def _normalize_messages(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
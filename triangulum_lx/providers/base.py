@@ -5,10 +5,34 @@ Base Provider
 Abstract base class for all LLM providers in the Triangulum system.
 """
 
+import time
+import asyncio
+import functools
+import contextvars
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union, AsyncIterator, Callable, Awaitable, Tuple
 from dataclasses import dataclass
 
+from .http_pool import HTTPSessionPool, PoolLimits
+from .rate_limiter import (
+    RateLimit, RateLimiter, get_rate_limiter, get_coalescer, request_key,
+    estimate_request_tokens, estimate_stream_tokens, response_token_count
+)
+from .health import get_provider_stats, response_cost
+
+async def _run_in_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking call in the default executor.
+
+    The call runs in a copy of the current context, so context variables such
+    as the request priority reach the worker thread (``asyncio.to_thread``
+    does the same but needs Python 3.9).
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(None, functools.partial(context.run, func, *args, **kwargs))
+
+
 @dataclass
 class LLMResponse:
     """Response from an LLM provider."""
@@ -49,8 +73,265 @@ class ToolCall:
             self.call_id = str(uuid.uuid4())
 
 class LLMProvider(ABC):
-    """Abstract base class for LLM providers (alias for BaseProvider)."""
-    pass
+    """
+    Abstract base class for LLM providers (alias for BaseProvider).
+    
+    Each provider owns an HTTPSessionPool so that requests reuse pooled
+    keep-alive connections. Subclasses that talk to an HTTP API should
+    override generate_async and stream_async with native async requests; the
+    defaults run the synchronous methods in a worker thread.
+    
+    Requests sent through _request/_arequest share the process-wide rate
+    limiter of ``rate_limit_key`` and the model, and identical concurrent
+    non-streaming requests are coalesced into one API call. Their latency,
+    errors, cost and token usage feed the provider statistics used for
+    routing.
+    """
+    
+    # Name under which rate limits are configured and shared across instances
+    rate_limit_key: str = "default"
+    
+    # Limits applied when none are configured for the provider
+    DEFAULT_RATE_LIMIT: Optional[RateLimit] = None
+    
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 model: Optional[str] = None,
+                 pool_limits: Optional[PoolLimits] = None):
+        """Initialize the provider.
+        
+        Args:
+            api_key: API key, if the backend needs one
+            model: Default model name
+            pool_limits: Connection pool limits for the provider's HTTP clients
+        """
+        self.api_key = api_key
+        self.model = model
+        self.pool_limits = pool_limits or PoolLimits()
+        self._http_pool: Optional[HTTPSessionPool] = None
+        self._reset_clients()
+    
+    def _pool_options(self) -> Dict[str, Any]:
+        """Base URL and headers for the provider's HTTP pool."""
+        return {}
+    
+    @property
+    def http_pool(self) -> HTTPSessionPool:
+        """The provider's pooled HTTP clients, created on first use."""
+        if self._http_pool is None or self._http_pool.closed:
+            self._http_pool = HTTPSessionPool(self.pool_limits, **self._pool_options())
+        return self._http_pool
+    
+    def configure_http_pool(self, limits: PoolLimits) -> None:
+        """Replace the connection pool limits, closing any existing pool.
+        
+        Args:
+            limits: New connection pool limits
+        """
+        self.pool_limits = limits
+        if self._http_pool is not None:
+            self._http_pool.close()
+            self._http_pool = None
+        self._reset_clients()
+    
+    def _create_client(self, http_client: Any) -> Any:
+        """Create the vendor SDK client on top of a pooled httpx client."""
+        raise NotImplementedError(f"{self.__class__.__name__} does not use an SDK client")
+    
+    def _create_async_client(self, http_client: Any) -> Any:
+        """Create the async vendor SDK client on top of a pooled httpx client."""
+        raise NotImplementedError(f"{self.__class__.__name__} does not use an SDK client")
+    
+    @property
+    def client(self) -> Any:
+        """SDK client sharing the provider's pooled HTTP connections."""
+        if self._client is None:
+            self._client = self._create_client(self.http_pool.client)
+        return self._client
+    
+    @client.setter
+    def client(self, value: Any) -> None:
+        self._client = value
+    
+    @property
+    def async_client(self) -> Any:
+        """Async SDK client on the next pooled client of the running event loop."""
+        pool = self.http_pool
+        http_client = pool.async_client
+        if self._async_generation != pool.async_generation:
+            self._async_clients = {}
+            self._async_generation = pool.async_generation
+        
+        client = self._async_clients.get(http_client)
+        if client is None:
+            client = self._async_clients[http_client] = self._create_async_client(http_client)
+        return client
+    
+    def _reset_clients(self) -> None:
+        """Drop clients bound to the previous HTTP pool."""
+        self._client = None
+        self._async_clients: Dict[Any, Any] = {}
+        self._async_generation = -1
+    
+    def _ensure_deterministic(self, temperature: float) -> None:
+        """Hook for enforcing deterministic behavior at low temperatures."""
+        pass
+    
+    def rate_limiter(self, model: Optional[str] = None) -> Optional[RateLimiter]:
+        """The shared rate limiter of a model (default: the provider's model)."""
+        return get_rate_limiter(self.rate_limit_key, model or self.model, self.DEFAULT_RATE_LIMIT)
+    
+    def _acquire(self, payload: Dict[str, Any]) -> Tuple[Optional[RateLimiter], int]:
+        """Wait for rate limit capacity for a request payload."""
+        limiter = self.rate_limiter(payload.get("model"))
+        if limiter is None:
+            return None, 0
+        tokens = estimate_request_tokens(payload)
+        limiter.acquire(tokens)
+        return limiter, tokens
+    
+    async def _aacquire(self, payload: Dict[str, Any]) -> Tuple[Optional[RateLimiter], int]:
+        """Async version of _acquire."""
+        limiter = self.rate_limiter(payload.get("model"))
+        if limiter is None:
+            return None, 0
+        tokens = estimate_request_tokens(payload)
+        await limiter.acquire_async(tokens)
+        return limiter, tokens
+    
+    def _record(self, payload: Dict[str, Any], start_time: float, response: Any) -> Optional[int]:
+        """Record a request in the provider statistics; returns the tokens it used."""
+        tokens = response_token_count(response) if response is not None else None
+        get_provider_stats().record(
+            self.rate_limit_key,
+            payload.get("model") or self.model,
+            time.monotonic() - start_time,
+            success=response is not None,
+            cost=response_cost(response) if response is not None else None,
+            tokens=tokens
+        )
+        return tokens
+    
+    def _settle_stream(self,
+                       payload: Dict[str, Any],
+                       limiter: Optional[RateLimiter],
+                       reserved: int,
+                       start_time: float,
+                       used: Optional[int],
+                       output_chars: int,
+                       success: bool = True) -> int:
+        """
+        Record a finished stream and settle its token reservation.
+        
+        Args:
+            payload: Request payload of the stream
+            limiter: Limiter the reservation was taken from, if any
+            reserved: Tokens reserved by _acquire
+            start_time: Monotonic time the stream was opened
+            used: Total tokens reported by the stream, if any
+            output_chars: Characters streamed, used to estimate the tokens
+                when the stream reported none
+            success: Whether the stream finished without an error
+            
+        Returns:
+            The tokens charged for the stream
+        """
+        if used is None:
+            used = estimate_stream_tokens(payload, output_chars)
+        get_provider_stats().record(
+            self.rate_limit_key,
+            payload.get("model") or self.model,
+            time.monotonic() - start_time,
+            success=success,
+            tokens=used
+        )
+        if limiter is not None:
+            limiter.settle(reserved, used)
+        return used
+    
+    def _request_key(self, payload: Dict[str, Any]) -> str:
+        return request_key(f"{self.rate_limit_key}:{getattr(self, 'base_url', '')}", payload)
+    
+    def _request(self, payload: Dict[str, Any], send: Callable[[], Any]) -> Any:
+        """
+        Send a non-streaming request under the shared rate limit.
+        
+        Args:
+            payload: Request payload, used for the token estimate and as the
+                coalescing key
+            send: Performs the request and returns the raw response
+            
+        Returns:
+            The raw response, possibly shared with concurrent identical requests
+        """
+        def limited() -> Any:
+            limiter, tokens = self._acquire(payload)
+            start_time = time.monotonic()
+            try:
+                response = send()
+            except Exception:
+                self._record(payload, start_time, None)
+                raise
+            used = self._record(payload, start_time, response)
+            if limiter is not None:
+                limiter.settle(tokens, used)
+            return response
+        
+        return get_coalescer().do(self._request_key(payload), limited)
+    
+    async def _arequest(self, payload: Dict[str, Any], send: Callable[[], Awaitable[Any]]) -> Any:
+        """Async version of _request."""
+        async def limited() -> Any:
+            limiter, tokens = await self._aacquire(payload)
+            start_time = time.monotonic()
+            try:
+                response = await send()
+            except Exception:
+                self._record(payload, start_time, None)
+                raise
+            used = self._record(payload, start_time, response)
+            if limiter is not None:
+                limiter.settle(tokens, used)
+            return response
+        
+        return await get_coalescer().do_async(self._request_key(payload), limited)
+    
+    def is_available(self) -> bool:
+        """Check if the provider is available and properly configured."""
+        return True
+    
+    @abstractmethod
+    def generate(self, prompt: Union[str, List[Dict[str, str]]], **kwargs) -> Any:
+        """Generate a response (or an iterator of chunks when streaming)."""
+        pass
+    
+    async def generate_async(self, prompt: Union[str, List[Dict[str, str]]], **kwargs) -> 'LLMResponse':
+        """Async version of generate."""
+        kwargs["stream"] = False
+        return await _run_in_thread(self.generate, prompt, **kwargs)
+    
+    async def stream_async(self, prompt: Union[str, List[Dict[str, str]]], **kwargs) -> AsyncIterator['LLMResponse']:
+        """Async version of generate with streaming enabled."""
+        kwargs["stream"] = True
+        chunks = await _run_in_thread(self.generate, prompt, **kwargs)
+        sentinel = object()
+        while True:
+            chunk = await _run_in_thread(next, chunks, sentinel)
+            if chunk is sentinel:
+                break
+            yield chunk
+    
+    def shutdown(self) -> None:
+        """Close the provider's HTTP clients."""
+        if self._http_pool is not None:
+            self._http_pool.close()
+        self._reset_clients()
+    
+    async def ashutdown(self) -> None:
+        """Close the provider's HTTP clients from inside an event loop."""
+        if self._http_pool is not None:
+            await self._http_pool.aclose()
+        self._reset_clients()
 
 class BaseProvider(ABC):
     """Abstract base class for LLM providers."""
@@ -13,7 +13,10 @@ from pathlib import Path
 import concurrent.futures
 import time
 
-from .base import BaseProvider
+from .base import BaseProvider, LLMProvider
+from .http_pool import PoolLimits
+from .rate_limiter import RateLimit, configure_rate_limit
+from .health import HealthCache, get_provider_stats, expected_value, rank
 from .openai import OpenAIProvider
 from .anthropic import AnthropicProvider
 from .groq import GroqProvider
@@ -45,6 +48,15 @@ class ProviderFactory:
         'local': LocalProvider,
     }
     
+    # Order used when estimates tie, and for {'quality': 'high'}
+    PREFERENCE_ORDER = ['openai', 'anthropic', 'groq', 'openrouter', 'local']
+    
+    # Expected seconds per request for providers without recent statistics
+    DEFAULT_LATENCY_PRIOR = 2.0
+    
+    # Cost per request for providers that do not report costs
+    DEFAULT_COST_PRIORS = {'local': 0.0, 'ollama': 0.0, 'lmstudio': 0.0}
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Initialize the provider factory.
@@ -58,6 +70,23 @@ class ProviderFactory:
         self.startup_errors: Dict[str, str] = {}
         self.config = config or {}
         
+        # Connection limits shared by the HTTP pools of all created providers
+        self.pool_limits = PoolLimits.from_dict(self.config.get("http_pool"))
+        
+        # Process-wide rate limits, keyed by "provider" or "provider/model"
+        for name, limit in self.config.get("rate_limits", {}).items():
+            provider_name, _, model = name.partition("/")
+            configure_rate_limit(provider_name, RateLimit.from_dict(limit), model or None)
+        
+        # Cached availability and rolling request statistics for routing
+        routing = self.config.get("routing", {})
+        self.health_cache = HealthCache(ttl=self.config.get("health_ttl", 60.0))
+        self.provider_stats = get_provider_stats()
+        self.default_objective = routing.get("objective", "latency")
+        self.stats_max_age = routing.get("stats_max_age", 300.0)
+        self.latency_priors: Dict[str, float] = dict(routing.get("latency_priors", {}))
+        self.cost_priors: Dict[str, float] = {**self.DEFAULT_COST_PRIORS, **routing.get("cost_priors", {})}
+        
         # Initialize status for all registered providers
         for provider_type in self.PROVIDER_REGISTRY:
             self.provider_status[provider_type] = ProviderStatus.PENDING
@@ -133,7 +162,7 @@ class ProviderFactory:
                     raise TimeoutError(f"Provider {provider_type} creation timed out after {timeout} seconds")
                 
                 # Create the provider
-                provider = provider_class(provider_config)
+                provider = self._instantiate(provider_class, provider_config)
                 
                 # Verify provider is available
                 if not provider.is_available():
@@ -141,6 +170,7 @@ class ProviderFactory:
                         f"Provider {provider_type} is not available",
                         provider_type
                     )
+                self.health_cache.put(provider_type, True)
                 
                 # Mark provider as ready
                 self.provider_status[provider_type] = ProviderStatus.READY
@@ -164,6 +194,25 @@ class ProviderFactory:
             last_error
         )
     
+    def _instantiate(self, provider_class: Type, provider_config: Dict[str, Any]) -> BaseProvider:
+        """
+        Construct a provider from its configuration.
+        
+        LLMProvider subclasses take their configuration as keyword arguments
+        and get a pooled HTTP session sized by the factory's ``http_pool``
+        limits, unless the provider configuration sets its own.
+        """
+        if not (isinstance(provider_class, type) and issubclass(provider_class, LLMProvider)):
+            return provider_class(provider_config)
+        
+        provider_config = dict(provider_config)
+        pool_limits = provider_config.pop("http_pool", None)
+        provider = provider_class(**provider_config)
+        provider.configure_http_pool(
+            PoolLimits.from_dict(pool_limits) if pool_limits else self.pool_limits
+        )
+        return provider
+    
     def get_or_create_provider(
         self, 
         provider_type: str, 
@@ -186,16 +235,16 @@ class ProviderFactory:
         """
         if provider_type in self.active_providers:
             provider = self.active_providers[provider_type]
-            # Check if provider is still available
-            try:
-                if provider.is_available():
-                    return provider
-                else:
-                    logger.warning(f"Provider {provider_type} no longer available, recreating")
-                    self.shutdown_provider(provider_type)
-            except Exception as e:
-                logger.warning(f"Error checking provider {provider_type} availability: {e}")
-                self.shutdown_provider(provider_type)
+            # Check if provider is still available (cached, refreshed in the background)
+            status = self.health_cache.statuses({provider_type: provider.is_available}).get(provider_type)
+            if status is None or status.available:
+                return provider
+            
+            if status.error:
+                logger.warning(f"Error checking provider {provider_type} availability: {status.error}")
+            logger.warning(f"Provider {provider_type} no longer available, recreating")
+            self.shutdown_provider(provider_type)
+            self.health_cache.invalidate(provider_type)
         
         if not create_if_missing:
             raise ProviderInitError(
@@ -390,8 +439,8 @@ class ProviderFactory:
             try:
                 temp_provider = self.create_provider(provider_type, retry=False)
                 info['available'] = temp_provider.is_available()
-                # Don't keep the temporary provider
-                del temp_provider
+                # Don't keep the temporary provider or its connections
+                temp_provider.shutdown()
             except Exception:
                 info['available'] = False
                 info['status'] = ProviderStatus.FAILED
@@ -537,9 +586,126 @@ class ProviderFactory:
         for provider_type in provider_types:
             results[provider_type] = self.shutdown_provider(provider_type)
         
+        self.health_cache.close()
+        logger.info("All providers shutdown")
+        return results
+    
+    async def ashutdown_all_providers(self) -> Dict[str, bool]:
+        """
+        Shutdown all active providers from inside an event loop.
+        
+        Providers with pooled HTTP sessions close their async clients on the
+        running loop instead of scheduling the close on another one.
+        
+        Returns:
+            Dictionary mapping provider types to shutdown success status
+        """
+        results = {}
+        
+        for provider_type in list(self.active_providers.keys()):
+            provider = self.active_providers[provider_type]
+            if isinstance(provider, LLMProvider):
+                try:
+                    await provider.ashutdown()
+                except Exception as e:
+                    logger.error(f"Error shutting down provider {provider_type}: {e}")
+            results[provider_type] = self.shutdown_provider(provider_type)
+        
+        self.health_cache.close()
         logger.info("All providers shutdown")
         return results
     
+    def _health_check(self, provider_type: str) -> Callable[[], bool]:
+        """Availability check of a provider, using a temporary instance if it is not active."""
+        def check() -> bool:
+            provider = self.active_providers.get(provider_type)
+            if provider is not None:
+                return provider.is_available()
+            
+            # create_provider raises if the provider is not available
+            temp_provider = self.create_provider(provider_type, retry=False)
+            # Don't keep the temporary provider or its connections
+            temp_provider.shutdown()
+            return True
+        
+        return check
+    
+    def estimate(self, provider_type: str, objective: str = "latency", model: Optional[str] = None) -> Optional[float]:
+        """
+        Expected latency (seconds) or cost of one request to a provider.
+        
+        Recent statistics are adjusted for the provider's error rate; without
+        them the configured priors are used. Statistics older than the
+        routing ``stats_max_age`` are ignored, so a provider that was avoided
+        after slowing down is tried again eventually.
+        
+        Args:
+            provider_type: Provider to estimate
+            objective: "latency" or "cost"
+            model: Optional model name for per-model statistics
+            
+        Returns:
+            The estimate, or None if nothing is known
+        """
+        stats = self.provider_stats.get(provider_type, model, max_age=self.stats_max_age)
+        if objective == "cost":
+            if stats is not None and stats.cost is not None:
+                return expected_value(stats.cost, stats.error_rate)
+            return self.cost_priors.get(provider_type)
+        
+        if stats is not None and stats.latency is not None:
+            return expected_value(stats.latency, stats.error_rate)
+        if stats is not None and stats.errors:
+            # Only failures so far
+            return expected_value(self.latency_priors.get(provider_type, self.DEFAULT_LATENCY_PRIOR), stats.error_rate)
+        return self.latency_priors.get(provider_type, self.DEFAULT_LATENCY_PRIOR)
+    
+    def rank_providers(self, provider_types: List[str], criteria: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Order providers from best to worst under the given criteria.
+        
+        Args:
+            provider_types: Providers to rank
+            criteria: Optional criteria:
+                - 'optimize': 'latency' or 'cost' (defaults to the routing objective)
+                - 'speed': 'fast' / 'cost': 'low' select the latency / cost objective
+                - 'quality': 'high' uses the preference order
+                - 'max_latency' / 'max_cost': drop providers estimated above the bound
+                - 'model': use the statistics of a specific model
+            
+        Returns:
+            Ranked provider names
+        """
+        criteria = criteria or {}
+        
+        def preference(provider_type: str) -> int:
+            if provider_type in self.PREFERENCE_ORDER:
+                return self.PREFERENCE_ORDER.index(provider_type)
+            return len(self.PREFERENCE_ORDER)
+        
+        if criteria.get('quality') == 'high':
+            return sorted(provider_types, key=preference)
+        
+        if criteria.get('optimize'):
+            objective = criteria['optimize']
+        elif criteria.get('cost') == 'low':
+            objective = 'cost'
+        elif criteria.get('speed') == 'fast':
+            objective = 'latency'
+        else:
+            objective = self.default_objective
+        
+        model = criteria.get('model')
+        candidates = list(provider_types)
+        for bound, bound_objective in (('max_latency', 'latency'), ('max_cost', 'cost')):
+            if criteria.get(bound) is not None:
+                candidates = [
+                    provider_type for provider_type in candidates
+                    if (self.estimate(provider_type, bound_objective, model) or 0.0) <= criteria[bound]
+                ]
+        
+        return rank(candidates, lambda provider_type: self.estimate(provider_type, objective, model), preference)
+    
     def get_best_provider(
         self, 
         criteria: Optional[Dict[str, Any]] = None,
@@ -548,6 +714,11 @@ class ProviderFactory:
         """
         Get the best available provider based on criteria.
         
+        Availability comes from the health cache: expired entries are
+        refreshed in the background and only providers that were never
+        checked are probed before answering. Available providers are ranked
+        by rank_providers.
+        
         Args:
             criteria: Optional criteria for selection (e.g., {'speed': 'fast', 'cost': 'low'})
             provider_types: Optional list of provider types to consider (default: all registered providers)
@@ -559,60 +730,23 @@ class ProviderFactory:
         if provider_types is None:
             provider_types = self.list_available_providers()
         
-        available_providers = []
+        # Only active providers and providers with a configuration are candidates
+        candidates = [
+            provider_type for provider_type in provider_types
+            if provider_type in self.active_providers or provider_type in self.provider_configs
+        ]
         
-        # Check which providers are available
-        for provider_type in provider_types:
-            # First check if provider is already active
-            if provider_type in self.active_providers:
-                try:
-                    provider = self.active_providers[provider_type]
-                    if provider.is_available():
-                        available_providers.append(provider_type)
-                except Exception:
-                    continue
-            else:
-                # Try to create a temporary provider to check availability
-                try:
-                    is_available = False
-                    
-                    # Skip providers with no configuration
-                    if provider_type not in self.provider_configs:
-                        continue
-                    
-                    temp_provider = self.create_provider(provider_type, retry=False)
-                    is_available = temp_provider.is_available()
-                    
-                    # Don't keep the temporary provider
-                    del temp_provider
-                    
-                    if is_available:
-                        available_providers.append(provider_type)
-                except Exception:
-                    continue
-        
-        if not available_providers:
-            return None
-        
-        # Simple selection logic (can be enhanced with more sophisticated criteria)
-        if criteria:
-            # Prefer providers based on criteria
-            if criteria.get('speed') == 'fast' and 'groq' in available_providers:
-                return 'groq'
-            elif criteria.get('cost') == 'low' and 'local' in available_providers:
-                return 'local'
-            elif criteria.get('quality') == 'high' and 'openai' in available_providers:
-                return 'openai'
-        
-        # Default preference order
-        preference_order = ['openai', 'anthropic', 'groq', 'openrouter', 'local']
-        
-        for preferred in preference_order:
-            if preferred in available_providers:
-                return preferred
-        
-        # Return first available if no preferences match
-        return available_providers[0] if available_providers else None
+        statuses = self.health_cache.statuses(
+            {provider_type: self._health_check(provider_type) for provider_type in candidates},
+            timeout=self.config.get("provider_timeout", 30)
+        )
+        available_providers = [
+            provider_type for provider_type in candidates
+            if provider_type in statuses and statuses[provider_type].available
+        ]
+        
+        ranked = self.rank_providers(available_providers, criteria)
+        return ranked[0] if ranked else None
     
     def load_config_file(self, config_path: str) -> bool:
         """
@@ -697,6 +831,7 @@ class ProviderFactory:
                 # Check if provider is available
                 is_available = provider.is_available()
                 provider_health['available'] = is_available
+                self.health_cache.put(provider_type, is_available)
                 
                 # Check provider-specific health if method exists
                 if hasattr(provider, 'health_check'):
@@ -712,6 +847,10 @@ class ProviderFactory:
                 provider_health['error'] = str(e)
                 results['overall_status'] = 'degraded'
             
+            stats = self.provider_stats.get(provider_type)
+            if stats is not None:
+                provider_health['stats'] = stats.to_dict()
+            
             results['providers'][provider_type] = provider_health
         
         # Check if any provider is available
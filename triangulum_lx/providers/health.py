@@ -0,0 +1,325 @@
+"""
+Provider health caching and rolling performance statistics.
+
+HealthCache keeps the availability of each provider for a TTL and refreshes
+expired entries in the background, so routing decisions read a cached
+value instead of probing backends. ProviderStats keeps exponentially
+weighted latency, error rate, cost and token statistics per provider and
+model; providers record every request they send, and the factory ranks
+candidates by their expected latency or cost.
+"""
+
+import time
+import logging
+import threading
+import concurrent.futures
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, Callable, Tuple, List
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HealthStatus:
+    """Cached availability of a provider."""
+    available: bool
+    checked_at: float
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation."""
+        return asdict(self)
+
+
+class HealthCache:
+    """
+    Availability of providers, cached for a TTL.
+
+    Expired entries keep being served while a background check refreshes
+    them; only providers that were never checked are probed inline.
+    """
+
+    def __init__(self,
+                 ttl: float = 60.0,
+                 max_workers: int = 4,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a health status stays fresh
+            max_workers: Maximum number of concurrent background checks
+            clock: Monotonic clock, replaceable in tests
+        """
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, HealthStatus] = {}
+        self._pending: Dict[str, concurrent.futures.Future] = {}
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    def get(self, provider_type: str) -> Optional[HealthStatus]:
+        """Get the cached status of a provider, fresh or not."""
+        return self._entries.get(provider_type)
+
+    def is_fresh(self, status: HealthStatus) -> bool:
+        return self.clock() - status.checked_at < self.ttl
+
+    def put(self, provider_type: str, available: bool, error: Optional[str] = None) -> HealthStatus:
+        """Store the result of a health check."""
+        status = HealthStatus(available, self.clock(), error)
+        with self._lock:
+            self._entries[provider_type] = status
+        return status
+
+    def invalidate(self, provider_type: Optional[str] = None) -> None:
+        """Forget the status of one provider, or of all providers."""
+        with self._lock:
+            if provider_type is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(provider_type, None)
+
+    def _run_check(self, provider_type: str, check: Callable[[], bool]) -> HealthStatus:
+        try:
+            status = self.put(provider_type, bool(check()))
+        except Exception as e:
+            logger.debug(f"Health check of provider {provider_type} failed: {e}")
+            status = self.put(provider_type, False, str(e))
+        finally:
+            with self._lock:
+                self._pending.pop(provider_type, None)
+        return status
+
+    def refresh(self, provider_type: str, check: Callable[[], bool]) -> concurrent.futures.Future:
+        """
+        Check a provider in the background, unless a check is already running.
+
+        Args:
+            provider_type: Provider to check
+            check: Returns True if the provider is available
+
+        Returns:
+            Future resolving to the new HealthStatus
+        """
+        with self._lock:
+            future = self._pending.get(provider_type)
+            if future is not None:
+                return future
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="provider-health"
+                )
+            future = self._pending[provider_type] = self._executor.submit(self._run_check, provider_type, check)
+            return future
+
+    def statuses(self, checks: Dict[str, Callable[[], bool]], timeout: Optional[float] = None) -> Dict[str, HealthStatus]:
+        """
+        Get the status of several providers.
+
+        Expired entries are returned as they are and refreshed in the
+        background; providers without an entry are checked concurrently and
+        waited for.
+
+        Args:
+            checks: Health check callable per provider type
+            timeout: Maximum seconds to wait for providers without an entry
+
+        Returns:
+            Status per provider type (providers whose first check timed out
+            are left out)
+        """
+        results = {}
+        waiting = {}
+        for provider_type, check in checks.items():
+            status = self.get(provider_type)
+            if status is None:
+                waiting[provider_type] = self.refresh(provider_type, check)
+                continue
+            if not self.is_fresh(status):
+                self.refresh(provider_type, check)
+            results[provider_type] = status
+
+        if waiting:
+            concurrent.futures.wait(waiting.values(), timeout=timeout)
+            for provider_type, future in waiting.items():
+                if future.done() and not future.cancelled():
+                    results[provider_type] = future.result()
+        return results
+
+    def close(self) -> None:
+        """Stop the background checks."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            pending, self._pending = list(self._pending.values()), {}
+        # shutdown(cancel_futures=True) needs Python 3.9
+        for future in pending:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+class ModelStats:
+    """Exponentially weighted request statistics of one provider model."""
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.requests = 0
+        self.errors = 0
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.cost: Optional[float] = None
+        self.tokens: Optional[float] = None
+        self.updated: Optional[float] = None
+
+    def _ewma(self, current: Optional[float], value: float) -> float:
+        return value if current is None else current + self.alpha * (value - current)
+
+    def record(self,
+               latency: float,
+               success: bool,
+               cost: Optional[float],
+               tokens: Optional[int],
+               now: float) -> None:
+        self.requests += 1
+        self.updated = now
+        self.error_rate = self._ewma(self.error_rate if self.requests > 1 else None, 0.0 if success else 1.0)
+        if not success:
+            self.errors += 1
+            return
+        self.latency = self._ewma(self.latency, latency)
+        if cost is not None:
+            self.cost = self._ewma(self.cost, cost)
+        if tokens is not None:
+            self.tokens = self._ewma(self.tokens, tokens)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency": self.latency,
+            "error_rate": self.error_rate,
+            "cost": self.cost,
+            "tokens": self.tokens,
+            "updated": self.updated
+        }
+
+
+class ProviderStats:
+    """
+    Rolling request statistics per provider and per provider model.
+
+    Every record updates both the (provider, model) entry and the provider
+    aggregate stored under model None.
+    """
+
+    def __init__(self, alpha: float = 0.2, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the statistics.
+
+        Args:
+            alpha: Weight of the newest sample in the moving averages
+            clock: Monotonic clock, replaceable in tests
+        """
+        self.alpha = alpha
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, Optional[str]], ModelStats] = {}
+
+    def record(self,
+               provider: str,
+               model: Optional[str],
+               latency: float,
+               success: bool = True,
+               cost: Optional[float] = None,
+               tokens: Optional[int] = None) -> None:
+        """
+        Record the outcome of one request.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            latency: Seconds the request took
+            success: Whether the request succeeded
+            cost: Cost of the request, if reported
+            tokens: Tokens used by the request, if reported
+        """
+        now = self.clock()
+        with self._lock:
+            for key in {(provider, model), (provider, None)}:
+                stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = ModelStats(self.alpha)
+                stats.record(latency, success, cost, tokens, now)
+
+    def get(self, provider: str, model: Optional[str] = None, max_age: Optional[float] = None) -> Optional[ModelStats]:
+        """
+        Get the statistics of a provider (model None) or provider model.
+
+        Args:
+            provider: Provider name
+            model: Optional model name
+            max_age: Ignore statistics not updated for this many seconds
+
+        Returns:
+            The statistics, or None if there are none (or they are too old)
+        """
+        stats = self._stats.get((provider, model))
+        if stats is None or (max_age is not None and self.clock() - stats.updated > max_age):
+            return None
+        return stats
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get all statistics keyed by "provider" or "provider/model"."""
+        with self._lock:
+            return {
+                provider if model is None else f"{provider}/{model}": stats.to_dict()
+                for (provider, model), stats in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        """Drop all statistics."""
+        with self._lock:
+            self._stats.clear()
+
+
+_provider_stats = ProviderStats()
+
+
+def get_provider_stats() -> ProviderStats:
+    """Get the process-wide provider statistics."""
+    return _provider_stats
+
+
+def response_cost(response: Any) -> Optional[float]:
+    """Cost reported by an SDK response object or JSON response, if any."""
+    usage = response.get("usage") if isinstance(response, dict) else getattr(response, "usage", None)
+    cost = usage.get("cost") if isinstance(usage, dict) else getattr(usage, "cost", None)
+    return cost if isinstance(cost, (int, float)) else None
+
+
+def expected_value(value: float, error_rate: float) -> float:
+    """
+    Expected cost of a request including retries.
+
+    With independent failures at ``error_rate`` a request takes 1 / (1 - p)
+    attempts on average; the rate is capped so failing providers rank last
+    instead of dividing by zero.
+    """
+    return value / max(1.0 - error_rate, 0.05)
+
+
+def rank(candidates: List[str],
+         estimate: Callable[[str], Optional[float]],
+         preference: Callable[[str], int]) -> List[str]:
+    """
+    Order candidates by ascending estimate; candidates without an estimate
+    go last. Ties keep the preference order.
+    """
+    def key(candidate: str):
+        value = estimate(candidate)
+        return (value is None, value if value is not None else 0.0, preference(candidate))
+
+    return sorted(candidates, key=key)
@@ -0,0 +1,225 @@
+"""
+Pooled HTTP sessions for LLM providers.
+
+Every provider owns one HTTPSessionPool. The pool lazily creates a
+synchronous and an asynchronous httpx client with bounded, keep-alive
+connection pools, so repeated generations reuse TCP (and TLS) connections
+instead of opening a new one per request. SDK-based providers hand the same
+clients to their vendor SDKs; providers that talk HTTP directly use the JSON
+and line-streaming helpers.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Iterator, AsyncIterator
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolLimits:
+    """Connection pool limits and timeouts for a provider."""
+    max_connections: int = 64
+    max_keepalive_connections: int = 32
+    keepalive_expiry: float = 30.0
+    timeout: float = 120.0
+    connect_timeout: float = 10.0
+    # Connections per async client. httpcore scans every connection for every
+    # queued request when scheduling, so one large async pool becomes CPU
+    # bound under high concurrency; many small pools stay cheap.
+    async_shard_size: int = 8
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'PoolLimits':
+        """Create limits from a configuration dictionary, ignoring unknown keys."""
+        data = data or {}
+        return cls(**{key: value for key, value in data.items() if key in cls.__dataclass_fields__})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation."""
+        return asdict(self)
+
+    @property
+    def async_shards(self) -> int:
+        """Number of async clients the connections are split across."""
+        return max(1, math.ceil(self.max_connections / max(1, self.async_shard_size)))
+
+    def httpx_limits(self, shards: int = 1) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=math.ceil(self.max_connections / shards),
+            max_keepalive_connections=math.ceil(self.max_keepalive_connections / shards),
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    def httpx_timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+
+class HTTPSessionPool:
+    """
+    Lazily created, pooled sync and async HTTP clients for one provider.
+
+    The async connections are split across ``limits.async_shards`` clients
+    that are handed out round-robin. An httpx.AsyncClient is bound to the
+    event loop it was first used on, so the async clients are recreated (and
+    ``async_generation`` incremented) when requested from a different loop.
+    """
+
+    def __init__(self,
+                 limits: Optional[PoolLimits] = None,
+                 base_url: str = "",
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            limits: Connection limits and timeouts
+            base_url: Base URL prepended to relative request paths
+            headers: Headers sent with every request
+        """
+        self.limits = limits or PoolLimits()
+        self.base_url = base_url
+        self.headers = dict(headers or {})
+        self.closed = False
+
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        self._async_clients: List[httpx.AsyncClient] = []
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_next = 0
+        self.async_generation = 0
+
+    def _client_options(self, shards: int = 1) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "headers": self.headers,
+            "limits": self.limits.httpx_limits(shards),
+            "timeout": self.limits.httpx_timeout(),
+        }
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise RuntimeError("HTTP session pool is closed")
+
+    @property
+    def client(self) -> httpx.Client:
+        """Pooled synchronous client."""
+        self._check_open()
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(**self._client_options())
+            return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Next pooled asynchronous client for the running event loop."""
+        self._check_open()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._async_loop is not loop:
+                if self._async_clients:
+                    logger.debug("Event loop changed, creating new async HTTP clients")
+                    self._close_async_clients()
+                self._async_loop = loop
+                self.async_generation += 1
+
+            shards = self.limits.async_shards
+            index = self._async_next % shards
+            self._async_next = index + 1
+            if index == len(self._async_clients):
+                self._async_clients.append(httpx.AsyncClient(**self._client_options(shards)))
+            return self._async_clients[index]
+
+    def post_json(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST a JSON payload and decode the JSON response.
+
+        Raises:
+            httpx.HTTPStatusError: If the response has an error status
+        """
+        response = self.client.post(path, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def iter_lines(self, path: str, payload: Dict[str, Any]) -> Iterator[str]:
+        """POST a JSON payload and yield the non-empty lines of the streamed response."""
+        with self.client.stream("POST", path, json=payload) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield line
+
+    async def apost_json(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Async version of post_json."""
+        response = await self.async_client.post(path, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    async def aiter_lines(self, path: str, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        """Async version of iter_lines."""
+        async with self.async_client.stream("POST", path, json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield line
+
+    def _close_async_clients(self) -> None:
+        """Close the async clients on the loop that owns their connections."""
+        clients, loop = self._async_clients, self._async_loop
+        self._async_clients = []
+        self._async_loop = None
+        self._async_next = 0
+        if not clients or loop is None or loop.is_closed():
+            return
+
+        if loop.is_running():
+            for client in clients:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            for client in clients:
+                loop.run_until_complete(client.aclose())
+        else:
+            # Another loop is running in this thread; the stale clients'
+            # connections are released when they are garbage collected
+            logger.debug("Dropping async HTTP clients of an idle event loop")
+
+    def close(self) -> None:
+        """Close both clients and release their connections."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+            try:
+                self._close_async_clients()
+            except Exception as e:
+                logger.warning(f"Error closing async HTTP clients: {e}")
+
+    async def aclose(self) -> None:
+        """Close both clients from inside an event loop."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            client, self._client = self._client, None
+            async_clients, self._async_clients = self._async_clients, []
+            loop, self._async_loop = self._async_loop, None
+
+        if client is not None:
+            client.close()
+        for async_client in async_clients:
+            if loop is asyncio.get_running_loop():
+                await async_client.aclose()
+            elif loop is not None and not loop.is_closed():
+                asyncio.run_coroutine_threadsafe(async_client.aclose(), loop)
@@ -7,29 +7,37 @@ and LM Studio, allowing hybrid strategies that combine local and cloud models.
 
 import json
 import time
-import requests
-from typing import List, Dict, Any, Optional, Union, Iterator
+import httpx
+from typing import List, Dict, Any, Optional, Union, Iterator, AsyncIterator
 
 from .base import LLMProvider, LLMResponse, Tool, ToolCall, BaseProvider
+from .http_pool import PoolLimits
 
 class OllamaProvider(LLMProvider):
     """
     An LLMProvider for interacting with locally-hosted Ollama models.
     """
 
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3"):
+    rate_limit_key = "ollama"
+
+    def __init__(self,
+                 base_url: str = "http://localhost:11434",
+                 model: str = "llama3",
+                 pool_limits: Optional[PoolLimits] = None):
         # Ollama doesn't use API keys, so we pass None
-        super().__init__(api_key=None, model=model)
+        super().__init__(api_key=None, model=model, pool_limits=pool_limits)
         self.base_url = base_url.rstrip('/')
 
-    def generate(
+    def _pool_options(self) -> Dict[str, Any]:
+        return {"base_url": self.base_url, "headers": {"Content-Type": "application/json"}}
+
+    def _build_payload(
         self,
         prompt: Union[str, List[Dict[str, str]]],
         temperature: float = 0.0,
         max_tokens: Optional[int] = 2048,
-        stream: bool = False,
-        **kwargs: Any
-    ) -> Union[LLMResponse, Iterator[LLMResponse]]:
+        stream: bool = False
+    ) -> Dict[str, Any]:
         self._ensure_deterministic(temperature)
 
         if isinstance(prompt, str):
@@ -37,7 +45,7 @@ class OllamaProvider(LLMProvider):
         else:
             messages = prompt
 
-        payload = {
+        return {
             "model": self.model,
             "messages": messages,
             "stream": stream,
@@ -47,57 +55,85 @@ class OllamaProvider(LLMProvider):
             }
         }
 
+    def generate(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = 2048,
+        stream: bool = False,
+        **kwargs: Any
+    ) -> Union[LLMResponse, Iterator[LLMResponse]]:
+        payload = self._build_payload(prompt, temperature, max_tokens, stream)
+
         if stream:
             return self._generate_stream(payload)
         else:
             return self._generate_non_stream(payload)
 
-    def _generate_non_stream(self, payload: Dict[str, Any]) -> LLMResponse:
-        start_time = time.time()
-        
-        response = requests.post(
-            f"{self.base_url}/api/chat",
-            json=payload,
-            headers={"Content-Type": "application/json"}
-        )
-        response.raise_for_status()
-        
-        latency = time.time() - start_time
-        result = response.json()
-        
+    def _to_response(self, result: Dict[str, Any], latency: float) -> LLMResponse:
         content = result.get("message", {}).get("content", "")
         
         return LLMResponse(
             content=content,
             model=self.model,
-            latency=latency,
-            tokens_used=result.get("eval_count"),  # Ollama provides token counts
-            cost=0.0,  # Local models are free
-            raw_response=result
+            tokens_used=result.get("eval_count") or 0,  # Ollama provides token counts
+            metadata={"latency": latency, "cost": 0.0, "raw_response": result}  # Local models are free
         )
 
-    def _generate_stream(self, payload: Dict[str, Any]) -> Iterator[LLMResponse]:
-        response = requests.post(
-            f"{self.base_url}/api/chat",
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            stream=True
+    def _chunk_to_response(self, line: str) -> Optional[LLMResponse]:
+        try:
+            chunk = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        if not chunk.get("message", {}).get("content"):
+            return None
+        return LLMResponse(
+            content=chunk["message"]["content"],
+            model=self.model,
+            metadata={"cost": 0.0, "raw_response": chunk}
         )
-        response.raise_for_status()
-        
-        for line in response.iter_lines():
-            if line:
-                try:
-                    chunk = json.loads(line.decode('utf-8'))
-                    if chunk.get("message", {}).get("content"):
-                        yield LLMResponse(
-                            content=chunk["message"]["content"],
-                            model=self.model,
-                            cost=0.0,
-                            raw_response=chunk
-                        )
-                except json.JSONDecodeError:
-                    continue
+
+    def _generate_non_stream(self, payload: Dict[str, Any]) -> LLMResponse:
+        start_time = time.time()
+        result = self._request(payload, lambda: self.http_pool.post_json("/api/chat", payload))
+        return self._to_response(result, time.time() - start_time)
+
+    def _generate_stream(self, payload: Dict[str, Any]) -> Iterator[LLMResponse]:
+        self._acquire(payload)
+        for line in self.http_pool.iter_lines("/api/chat", payload):
+            response = self._chunk_to_response(line)
+            if response is not None:
+                yield response
+
+    async def generate_async(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = 2048,
+        **kwargs: Any
+    ) -> LLMResponse:
+        """Async version of generate method."""
+        payload = self._build_payload(prompt, temperature, max_tokens, stream=False)
+
+        start_time = time.time()
+        result = await self._arequest(payload, lambda: self.http_pool.apost_json("/api/chat", payload))
+        return self._to_response(result, time.time() - start_time)
+
+    async def stream_async(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = 2048,
+        **kwargs: Any
+    ) -> AsyncIterator[LLMResponse]:
+        """Async version of generate with streaming enabled."""
+        payload = self._build_payload(prompt, temperature, max_tokens, stream=True)
+
+        await self._aacquire(payload)
+        async for line in self.http_pool.aiter_lines("/api/chat", payload):
+            response = self._chunk_to_response(line)
+            if response is not None:
+                yield response
 
     def generate_with_tools(
         self,
@@ -125,18 +161,25 @@ class LMStudioProvider(LLMProvider):
     An LLMProvider for interacting with LM Studio's local API server.
     """
 
-    def __init__(self, base_url: str = "http://localhost:1234", model: str = "local-model"):
-        super().__init__(api_key=None, model=model)
+    rate_limit_key = "lmstudio"
+
+    def __init__(self,
+                 base_url: str = "http://localhost:1234",
+                 model: str = "local-model",
+                 pool_limits: Optional[PoolLimits] = None):
+        super().__init__(api_key=None, model=model, pool_limits=pool_limits)
         self.base_url = base_url.rstrip('/')
 
-    def generate(
+    def _pool_options(self) -> Dict[str, Any]:
+        return {"base_url": self.base_url, "headers": {"Content-Type": "application/json"}}
+
+    def _build_payload(
         self,
         prompt: Union[str, List[Dict[str, str]]],
         temperature: float = 0.0,
         max_tokens: Optional[int] = 2048,
-        stream: bool = False,
-        **kwargs: Any
-    ) -> Union[LLMResponse, Iterator[LLMResponse]]:
+        stream: bool = False
+    ) -> Dict[str, Any]:
         self._ensure_deterministic(temperature)
 
         if isinstance(prompt, str):
@@ -144,7 +187,7 @@ class LMStudioProvider(LLMProvider):
         else:
             messages = prompt
 
-        payload = {
+        return {
             "model": self.model,
             "messages": messages,
             "temperature": temperature,
@@ -152,62 +195,97 @@ class LMStudioProvider(LLMProvider):
             "stream": stream,
         }
 
+    def generate(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = 2048,
+        stream: bool = False,
+        **kwargs: Any
+    ) -> Union[LLMResponse, Iterator[LLMResponse]]:
+        payload = self._build_payload(prompt, temperature, max_tokens, stream)
+
         if stream:
             return self._generate_stream(payload)
         else:
             return self._generate_non_stream(payload)
 
-    def _generate_non_stream(self, payload: Dict[str, Any]) -> LLMResponse:
-        start_time = time.time()
-        
-        response = requests.post(
-            f"{self.base_url}/v1/chat/completions",
-            json=payload,
-            headers={"Content-Type": "application/json"}
-        )
-        response.raise_for_status()
-        
-        latency = time.time() - start_time
-        result = response.json()
-        
+    def _to_response(self, result: Dict[str, Any], latency: float) -> LLMResponse:
         content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-        tokens_used = result.get("usage", {}).get("total_tokens")
+        tokens_used = result.get("usage", {}).get("total_tokens") or 0
         
         return LLMResponse(
             content=content,
             model=self.model,
-            latency=latency,
             tokens_used=tokens_used,
-            cost=0.0,  # Local models are free
-            raw_response=result
+            metadata={"latency": latency, "cost": 0.0, "raw_response": result}  # Local models are free
         )
 
-    def _generate_stream(self, payload: Dict[str, Any]) -> Iterator[LLMResponse]:
-        response = requests.post(
-            f"{self.base_url}/v1/chat/completions",
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            stream=True
+    def _chunk_to_response(self, line: str) -> Optional[LLMResponse]:
+        """Parse one server-sent event line; returns None for keep-alives and [DONE]."""
+        if not line.startswith("data: "):
+            return None
+        data = line[6:]  # Remove "data: " prefix
+        if data.strip() == "[DONE]":
+            return None
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            return None
+        content_delta = chunk.get("choices", [{}])[0].get("delta", {}).get("content", "")
+        if not content_delta:
+            return None
+        return LLMResponse(
+            content=content_delta,
+            model=self.model,
+            metadata={"cost": 0.0, "raw_response": chunk}
         )
-        response.raise_for_status()
-        
-        for line in response.iter_lines():
-            if line and line.startswith(b"data: "):
-                try:
-                    data = line[6:]  # Remove "data: " prefix
-                    if data.strip() == b"[DONE]":
-                        break
-                    chunk = json.loads(data.decode('utf-8'))
-                    content_delta = chunk.get("choices", [{}])[0].get("delta", {}).get("content", "")
-                    if content_delta:
-                        yield LLMResponse(
-                            content=content_delta,
-                            model=self.model,
-                            cost=0.0,
-                            raw_response=chunk
-                        )
-                except json.JSONDecodeError:
-                    continue
+
+    def _generate_non_stream(self, payload: Dict[str, Any]) -> LLMResponse:
+        start_time = time.time()
+        result = self._request(payload, lambda: self.http_pool.post_json("/v1/chat/completions", payload))
+        return self._to_response(result, time.time() - start_time)
+
+    def _generate_stream(self, payload: Dict[str, Any]) -> Iterator[LLMResponse]:
+        self._acquire(payload)
+        for line in self.http_pool.iter_lines("/v1/chat/completions", payload):
+            if line.strip() == "data: [DONE]":
+                break
+            response = self._chunk_to_response(line)
+            if response is not None:
+                yield response
+
+    async def generate_async(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = 2048,
+        **kwargs: Any
+    ) -> LLMResponse:
+        """Async version of generate method."""
+        payload = self._build_payload(prompt, temperature, max_tokens, stream=False)
+
+        start_time = time.time()
+        result = await self._arequest(payload, lambda: self.http_pool.apost_json("/v1/chat/completions", payload))
+        return self._to_response(result, time.time() - start_time)
+
+    async def stream_async(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = 2048,
+        **kwargs: Any
+    ) -> AsyncIterator[LLMResponse]:
+        """Async version of generate with streaming enabled."""
+        payload = self._build_payload(prompt, temperature, max_tokens, stream=True)
+
+        await self._aacquire(payload)
+        async for line in self.http_pool.aiter_lines("/v1/chat/completions", payload):
+            if line.strip() == "data: [DONE]":
+                break
+            response = self._chunk_to_response(line)
+            if response is not None:
+                yield response
 
     def generate_with_tools(
         self,
@@ -236,13 +314,7 @@ class LMStudioProvider(LLMProvider):
         }
 
         try:
-            response = requests.post(
-                f"{self.base_url}/v1/chat/completions",
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
-            response.raise_for_status()
-            result = response.json()
+            result = self._request(payload, lambda: self.http_pool.post_json("/v1/chat/completions", payload))
             
             response_message = result.get("choices", [{}])[0].get("message", {})
             tool_calls = response_message.get("tool_calls")
@@ -251,8 +323,7 @@ class LMStudioProvider(LLMProvider):
                 return LLMResponse(
                     content=response_message.get("content", ""),
                     model=self.model,
-                    cost=0.0,
-                    raw_response=result
+                    metadata={"cost": 0.0, "raw_response": result}
                 )
 
             # Convert to standardized format
@@ -266,7 +337,7 @@ class LMStudioProvider(LLMProvider):
                 
             return standardized_tool_calls
             
-        except (requests.RequestException, KeyError):
+        except (httpx.HTTPError, KeyError):
             # Fallback to regular generation if tools aren't supported
             return self.generate(prompt, temperature=temperature, **kwargs)
 
@@ -13,7 +13,7 @@ import time
 import json
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional, Union, Iterator, Tuple
+from typing import List, Dict, Any, Optional, Union, Iterator, AsyncIterator, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import backoff
@@ -21,6 +21,9 @@ import backoff
 from openai import OpenAI, APIError, RateLimitError
 from .openai import OpenAIProvider
 from .base import LLMProvider, LLMResponse, Tool, ToolCall
+from .http_pool import PoolLimits
+from .rate_limiter import RateLimit
+from .tokenization import get_token_counter, pack, REPLY_OVERHEAD
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -62,6 +65,13 @@ class O3Provider(OpenAIProvider):
     Includes advanced API abstraction, context management, and role-based configurations.
     """
 
+    # Shared by all o3 provider instances unless configured otherwise
+    DEFAULT_RATE_LIMIT = RateLimit(requests_per_minute=50)
+
+    # Value of a message by role when packing the context, and its decay per turn of age
+    MESSAGE_PRIORITY = {"system": 3.0, "user": 2.0, "assistant": 1.5, "tool": 1.0}
+    RECENCY_DECAY = 0.85
+
     # Model configuration profiles for different agent roles
     MODEL_CONFIGS = {
         AgentRole.ANALYST: ModelConfig(
@@ -122,7 +132,8 @@ class O3Provider(OpenAIProvider):
         additional_context: str = "",
         max_retries: int = 5,
         timeout: float = 120.0,
-        token_limit_buffer: int = 1000
+        token_limit_buffer: int = 1000,
+        pool_limits: Optional[PoolLimits] = None
     ):
         """
         Initialize the O3Provider with enhanced configuration.
@@ -135,9 +146,10 @@ class O3Provider(OpenAIProvider):
             max_retries: Maximum number of retries on rate limit or transient errors
             timeout: API request timeout in seconds
             token_limit_buffer: Safety buffer for token limit calculations
+            pool_limits: Connection pool limits (defaults use ``timeout``)
         """
         # Initialize the parent OpenAIProvider
-        super().__init__(api_key=api_key, model=model)
+        super().__init__(api_key=api_key, model=model, pool_limits=pool_limits or PoolLimits(timeout=timeout))
         
         # Enhanced configuration
         self.role = role if isinstance(role, AgentRole) else AgentRole(role) if role in [r.value for r in AgentRole] else AgentRole.DEFAULT
@@ -146,11 +158,6 @@ class O3Provider(OpenAIProvider):
         self.timeout = timeout
         self.token_limit_buffer = token_limit_buffer
         
-        # Rate limiting and usage tracking
-        self.request_timestamps = []
-        self.tokens_used_last_minute = 0
-        self.last_minute_reset = time.time()
-        
         # Context management
         self.context_store = {}
         
@@ -195,6 +202,12 @@ class O3Provider(OpenAIProvider):
         """
         Optimize messages to fit within token limits while preserving critical information.
         
+        The system message and the most recent user message are always kept.
+        The other messages are packed into the remaining budget by value: the
+        priority of their role, discounted by how far back they are. Tool
+        results are kept or dropped together with the assistant message that
+        requested them.
+        
         Args:
             messages: Original message list
             max_tokens: Maximum tokens allowed
@@ -206,50 +219,38 @@ class O3Provider(OpenAIProvider):
         if not messages or messages[0].get("role") != "system":
             messages = [{"role": "system", "content": self.prepare_system_prompt()}] + messages
             
-        # Simple token estimation (can be replaced with a more accurate tokenizer)
-        estimated_tokens = sum(len(msg.get("content", "")) // 4 for msg in messages)
-        
         # If we're under the limit with buffer, return as is
+        counter = get_token_counter()
         token_limit = max_tokens - self.token_limit_buffer
-        if estimated_tokens <= token_limit:
-            return messages
-            
-        # Otherwise, we need to optimize
-        # Keep system message, most recent user message, and most recent assistant message
-        if len(messages) <= 3:
+        if counter.count_messages(messages) <= token_limit:
             return messages
             
-        # Start with essential messages
-        optimized = [messages[0]]  # System message
-        
-        # Find most recent user and assistant messages
-        recent_user = None
-        recent_assistant = None
-        for msg in reversed(messages[1:]):
-            if msg["role"] == "user" and recent_user is None:
-                recent_user = msg
-            elif msg["role"] == "assistant" and recent_assistant is None:
-                recent_assistant = msg
+        # Group tool results with the assistant message that requested them
+        groups = []
+        for index, msg in enumerate(messages[1:], start=1):
+            if msg.get("role") == "tool" and groups:
+                groups[-1].append(index)
+            else:
+                groups.append([index])
                 
-            if recent_user is not None and recent_assistant is not None:
-                break
-                
-        # Add summary of older messages
-        if len(messages) > 3:
-            # Create a summary message
-            summary = {
-                "role": "system",
-                "content": f"The conversation history has been summarized to save tokens. There were {len(messages) - 3} previous messages."
-            }
-            optimized.append(summary)
-            
-        # Add the most recent messages
-        if recent_assistant:
-            optimized.append(recent_assistant)
-        if recent_user:
-            optimized.append(recent_user)
-            
-        return optimized
+        latest_user = [g for g, group in enumerate(groups) if messages[group[0]].get("role") == "user"][-1:]
+        costs = [sum(counter.count_message(messages[i]) for i in group) for group in groups]
+        values = [
+            self.MESSAGE_PRIORITY.get(messages[group[0]].get("role"), 1.0) * self.RECENCY_DECAY ** (len(groups) - 1 - g)
+            for g, group in enumerate(groups)
+        ]
+        
+        # Reserve room for the system message and a summary of what was dropped
+        summary = {
+            "role": "system",
+            "content": f"The conversation history has been summarized to save tokens. {len(messages)} earlier messages were omitted."
+        }
+        budget = token_limit - counter.count_message(messages[0]) - counter.count_message(summary) - REPLY_OVERHEAD
+        kept = pack(costs, values, budget, required=latest_user)
+        
+        dropped = len(messages) - 1 - sum(len(groups[g]) for g in kept)
+        summary["content"] = f"The conversation history has been summarized to save tokens. {dropped} earlier messages were omitted."
+        return [messages[0], summary] + [messages[i] for g in kept for i in groups[g]]
 
     @backoff.on_exception(
         backoff.expo,
@@ -261,6 +262,10 @@ class O3Provider(OpenAIProvider):
         """
         Make an API request with exponential backoff for rate limits and transient errors.
         
+        Non-streaming requests wait for the shared rate limiter of the model
+        and identical concurrent ones are coalesced into one call; streams
+        are limited by _iter_stream, which settles them when they end.
+        
         Args:
             api_params: Parameters for the API request
             
@@ -269,20 +274,9 @@ class O3Provider(OpenAIProvider):
         """
         self.stats["requests"] += 1
         try:
-            # Track request for rate limiting
-            current_time = time.time()
-            self.request_timestamps = [ts for ts in self.request_timestamps if current_time - ts < 60]
-            self.request_timestamps.append(current_time)
-            
-            # Check if we should throttle (over 50 requests per minute)
-            if len(self.request_timestamps) > 50:
-                sleep_time = 60 - (current_time - self.request_timestamps[0])
-                if sleep_time > 0:
-                    logger.info(f"Rate limiting: sleeping for {sleep_time:.2f}s")
-                    time.sleep(sleep_time)
-            
-            # Make the actual request
-            return self.client.chat.completions.create(**api_params)
+            if api_params.get("stream"):
+                return self.client.chat.completions.create(**api_params)
+            return self._request(api_params, lambda: self.client.chat.completions.create(**api_params))
             
         except (RateLimitError, APIError) as e:
             self.stats["retries"] += 1
@@ -293,7 +287,7 @@ class O3Provider(OpenAIProvider):
             logger.error(f"Unexpected error: {str(e)}")
             raise
 
-    def generate(
+    def _build_params(
         self,
         prompt: Union[str, List[Dict[str, str]]],
         temperature: Optional[float] = None,
@@ -302,9 +296,9 @@ class O3Provider(OpenAIProvider):
         model_name: Optional[str] = None,
         role: Optional[Union[AgentRole, str]] = None,
         **kwargs: Any
-    ) -> Union[LLMResponse, Iterator[LLMResponse]]:
+    ) -> Dict[str, Any]:
         """
-        Generate a response using the o3 model with enhanced features.
+        Build the chat completion parameters for a request from the role profile.
         
         Args:
             prompt: String prompt or list of message dictionaries
@@ -316,7 +310,7 @@ class O3Provider(OpenAIProvider):
             **kwargs: Additional parameters to pass to the API
             
         Returns:
-            LLMResponse or Iterator[LLMResponse] if streaming
+            API parameters
         """
         # Resolve role if provided as string
         if isinstance(role, str):
@@ -360,6 +354,35 @@ class O3Provider(OpenAIProvider):
             # For non-o3 models, use simpler parameters
             api_params["max_tokens"] = max_tokens or config.max_tokens
             api_params["temperature"] = temperature if temperature is not None else config.temperature
+        
+        return api_params
+
+    def generate(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+        model_name: Optional[str] = None,
+        role: Optional[Union[AgentRole, str]] = None,
+        **kwargs: Any
+    ) -> Union[LLMResponse, Iterator[LLMResponse]]:
+        """
+        Generate a response using the o3 model with enhanced features.
+        
+        Args:
+            prompt: String prompt or list of message dictionaries
+            temperature: Override temperature from role config
+            max_tokens: Override max tokens from role config
+            stream: Whether to stream the response
+            model_name: Override model name
+            role: Override role for this request
+            **kwargs: Additional parameters to pass to the API
+            
+        Returns:
+            LLMResponse or Iterator[LLMResponse] if streaming
+        """
+        api_params = self._build_params(prompt, temperature, max_tokens, stream, model_name, role, **kwargs)
             
         # Generate response with automatic retries and backoff
         if stream:
@@ -367,6 +390,29 @@ class O3Provider(OpenAIProvider):
         else:
             return self._generate_non_stream_enhanced(api_params)
 
+    async def generate_async(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        model_name: Optional[str] = None,
+        **kwargs: Any
+    ) -> LLMResponse:
+        """Async version of generate; role overrides are passed as ``role``."""
+        return await super().generate_async(prompt, temperature, max_tokens, model_name, **kwargs)
+
+    async def stream_async(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        model_name: Optional[str] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[LLMResponse]:
+        """Async version of generate with streaming enabled."""
+        async for chunk in super().stream_async(prompt, temperature, max_tokens, model_name, **kwargs):
+            yield chunk
+
     def _generate_non_stream_enhanced(self, api_params: Dict[str, Any]) -> LLMResponse:
         """
         Enhanced non-streaming generation with error handling and statistics.
@@ -405,6 +451,12 @@ class O3Provider(OpenAIProvider):
                 metadata={"error": str(e), "latency": latency}
             )
 
+    def _settle_stream(self, *args: Any, **kwargs: Any) -> int:
+        """Settle a finished stream and count its tokens in the statistics."""
+        tokens_used = super()._settle_stream(*args, **kwargs)
+        self.stats["tokens_used"] += tokens_used
+        return tokens_used
+
     def _generate_stream_enhanced(self, api_params: Dict[str, Any]) -> Iterator[LLMResponse]:
         """
         Enhanced streaming generation with error handling.
@@ -416,8 +468,9 @@ class O3Provider(OpenAIProvider):
             LLMResponse chunks as they are received
         """
         try:
-            stream = self._api_request_with_backoff(api_params)
-            for chunk in stream:
+            for chunk in self._iter_stream(api_params, self._api_request_with_backoff):
+                if not chunk.choices:
+                    continue
                 content_delta = chunk.choices[0].delta.content or ""
                 if content_delta:
                     yield LLMResponse(
@@ -555,7 +608,11 @@ class O3Provider(OpenAIProvider):
         Returns:
             Dictionary with usage statistics
         """
-        return self.stats.copy()
+        stats = self.stats.copy()
+        limiter = self.rate_limiter()
+        if limiter is not None:
+            stats["rate_limiter"] = limiter.stats.copy()
+        return stats
 
     def is_available(self) -> bool:
         """
@@ -5,24 +5,30 @@ Concrete implementation of the LLMProvider for OpenAI models.
 import os
 import time
 import json
-import asyncio
-from typing import List, Dict, Any, Optional, Union, Iterator
+from typing import List, Dict, Any, Optional, Union, Iterator, AsyncIterator, Iterable, Callable
 
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from .base import LLMProvider, LLMResponse
+from .http_pool import PoolLimits
+from .rate_limiter import response_token_count
 
 class OpenAIProvider(LLMProvider):
     """
     An LLMProvider for interacting with OpenAI's API.
     """
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "o3"):
-        super().__init__()  # Adjusted to not pass any arguments
-        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-        self.model = model
+    rate_limit_key = "openai"
+
+    def __init__(self, api_key: Optional[str] = None, model: str = "o3", pool_limits: Optional[PoolLimits] = None):
+        super().__init__(api_key or os.getenv("OPENAI_API_KEY"), model, pool_limits)
         if not self.api_key:
             raise ValueError("OpenAI API key not provided or found in environment variables.")
-        self.client = OpenAI(api_key=self.api_key)
+
+    def _create_client(self, http_client: Any) -> OpenAI:
+        return OpenAI(api_key=self.api_key, http_client=http_client)
+
+    def _create_async_client(self, http_client: Any) -> AsyncOpenAI:
+        return AsyncOpenAI(api_key=self.api_key, http_client=http_client)
 
     def _ensure_deterministic(self, temperature: float) -> None:
         """Ensure deterministic behavior for low temperatures."""
@@ -30,7 +36,7 @@ class OpenAIProvider(LLMProvider):
         # or adjust parameters for deterministic behavior
         pass
 
-    def generate(
+    def _build_params(
         self,
         prompt: Union[str, List[Dict[str, str]]],
         temperature: float = 0.0,
@@ -38,7 +44,8 @@ class OpenAIProvider(LLMProvider):
         stream: bool = False,
         model_name: Optional[str] = None,
         **kwargs: Any
-    ) -> Union[LLMResponse, Iterator[LLMResponse]]:
+    ) -> Dict[str, Any]:
+        """Build the chat completion parameters for a request."""
         self._ensure_deterministic(temperature)
 
         if isinstance(prompt, str):
@@ -60,37 +67,87 @@ class OpenAIProvider(LLMProvider):
         else:
             api_params["max_tokens"] = max_tokens
 
+        return api_params
+
+    def generate(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = 2048,
+        stream: bool = False,
+        model_name: Optional[str] = None,
+        **kwargs: Any
+    ) -> Union[LLMResponse, Iterator[LLMResponse]]:
+        api_params = self._build_params(prompt, temperature, max_tokens, stream, model_name, **kwargs)
+
         if stream:
             return self._generate_stream(api_params)
         else:
             return self._generate_non_stream(api_params)
 
-    def _generate_non_stream(self, api_params: Dict[str, Any]) -> LLMResponse:
-        start_time = time.time()
-        response = self.client.chat.completions.create(**api_params)
-        latency = time.time() - start_time
-        
+    def _to_response(self, response: Any, latency: float) -> LLMResponse:
         content = response.choices[0].message.content or ""
         tokens_used = response.usage.total_tokens if response.usage else None
-        
+
         return LLMResponse(
             content=content,
             model=response.model,
-            latency=latency,
             tokens_used=tokens_used,
-            raw_response=response.model_dump()
+            metadata={"latency": latency, "raw_response": response.model_dump()}
+        )
+
+    def _chunk_to_response(self, chunk: Any) -> Optional[LLMResponse]:
+        if not chunk.choices:
+            return None
+        content_delta = chunk.choices[0].delta.content or ""
+        if not content_delta:
+            return None
+        return LLMResponse(
+            content=content_delta,
+            model=chunk.model or self.model,
+            metadata={"raw_response": chunk.model_dump()}
         )
 
+    def _generate_non_stream(self, api_params: Dict[str, Any]) -> LLMResponse:
+        start_time = time.time()
+        response = self._request(api_params, lambda: self.client.chat.completions.create(**api_params))
+        return self._to_response(response, time.time() - start_time)
+
+    def _iter_stream(self, api_params: Dict[str, Any], create: Callable[[Dict[str, Any]], Iterable[Any]]) -> Iterator[Any]:
+        """
+        Yield the chunks of a completion stream under the shared rate limit.
+        
+        The stream is asked to report its usage in a final chunk. Once it
+        ends, the token reservation is settled with that usage, or with an
+        estimate from the streamed text if no usage was reported.
+        
+        Args:
+            api_params: Parameters of the streaming request
+            create: Opens the stream for the given parameters
+        """
+        api_params = {"stream_options": {"include_usage": True}, **api_params}
+        limiter, reserved = self._acquire(api_params)
+        start_time = time.monotonic()
+        used, output_chars, success = None, 0, True
+        try:
+            for chunk in create(api_params):
+                tokens = response_token_count(chunk)
+                if tokens is not None:
+                    used = tokens
+                if chunk.choices:
+                    output_chars += len(chunk.choices[0].delta.content or "")
+                yield chunk
+        except Exception:
+            success = False
+            raise
+        finally:
+            self._settle_stream(api_params, limiter, reserved, start_time, used, output_chars, success)
+
     def _generate_stream(self, api_params: Dict[str, Any]) -> Iterator[LLMResponse]:
-        stream = self.client.chat.completions.create(**api_params)
-        for chunk in stream:
-            content_delta = chunk.choices[0].delta.content or ""
-            if content_delta:
-                yield LLMResponse(
-                    content=content_delta,
-                    model=chunk.model,
-                    raw_response=chunk.model_dump()
-                )
+        for chunk in self._iter_stream(api_params, lambda params: self.client.chat.completions.create(**params)):
+            response = self._chunk_to_response(chunk)
+            if response is not None:
+                yield response
 
     def generate_with_tools(
         self,
@@ -111,14 +168,15 @@ class OpenAIProvider(LLMProvider):
             {"type": "function", "function": tool.dict()} for tool in tools
         ]
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            tools=openai_tools,
-            tool_choice="auto",
-            temperature=temperature,
+        tool_params = {
+            "model": self.model,
+            "messages": messages,
+            "tools": openai_tools,
+            "tool_choice": "auto",
+            "temperature": temperature,
             **kwargs,
-        )
+        }
+        response = self._request(tool_params, lambda: self.client.chat.completions.create(**tool_params))
 
         response_message = response.choices[0].message
         tool_calls = response_message.tool_calls
@@ -127,7 +185,7 @@ class OpenAIProvider(LLMProvider):
             return LLMResponse(
                 content=response_message.content or "",
                 model=response.model,
-                raw_response=response.model_dump()
+                metadata={"raw_response": response.model_dump()}
             )
 
         # Convert OpenAI tool calls back to our standardized format
@@ -151,10 +209,41 @@ class OpenAIProvider(LLMProvider):
         **kwargs: Any
     ) -> LLMResponse:
         """Async version of generate method."""
-        # For now, we'll run the sync method in a thread pool
-        # In a real implementation, you'd use the async OpenAI client
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None, 
-            lambda: self.generate(prompt, temperature, max_tokens, False, model_name, **kwargs)
-        )
+        kwargs.pop("stream", None)
+        api_params = self._build_params(prompt, temperature, max_tokens, False, model_name, **kwargs)
+
+        start_time = time.time()
+        response = await self._arequest(api_params, lambda: self.async_client.chat.completions.create(**api_params))
+        return self._to_response(response, time.time() - start_time)
+
+    async def stream_async(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = 2048,
+        model_name: Optional[str] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[LLMResponse]:
+        """Async version of generate with streaming enabled."""
+        kwargs.pop("stream", None)
+        api_params = self._build_params(prompt, temperature, max_tokens, True, model_name, **kwargs)
+
+        api_params.setdefault("stream_options", {"include_usage": True})
+        limiter, reserved = await self._aacquire(api_params)
+        start_time = time.monotonic()
+        used, output_chars, success = None, 0, True
+        try:
+            stream = await self.async_client.chat.completions.create(**api_params)
+            async for chunk in stream:
+                tokens = response_token_count(chunk)
+                if tokens is not None:
+                    used = tokens
+                response = self._chunk_to_response(chunk)
+                if response is not None:
+                    output_chars += len(response.content)
+                    yield response
+        except Exception:
+            success = False
+            raise
+        finally:
+            self._settle_stream(api_params, limiter, reserved, start_time, used, output_chars, success)
@@ -5,10 +5,13 @@ Concrete implementation of the LLMProvider for OpenRouter.
 import os
 import time
 import json
-from typing import List, Dict, Any, Optional, Union, Iterator
+from typing import List, Dict, Any, Optional, Union, Iterator, AsyncIterator
 
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from .base import LLMProvider, LLMResponse
+from .http_pool import PoolLimits
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
 class OpenRouterProvider(LLMProvider):
     """
@@ -16,24 +19,31 @@ class OpenRouterProvider(LLMProvider):
     access to a variety of models through an OpenAI-compatible interface.
     """
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "openai/gpt-4o-mini"):
-        super().__init__(api_key or os.getenv("OPENROUTER_API_KEY"), model)
+    rate_limit_key = "openrouter"
+
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 model: str = "openai/gpt-4o-mini",
+                 pool_limits: Optional[PoolLimits] = None):
+        super().__init__(api_key or os.getenv("OPENROUTER_API_KEY"), model, pool_limits)
         if not self.api_key:
             raise ValueError("OpenRouter API key not provided or found in environment variables.")
-        
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=self.api_key,
-        )
 
-    def generate(
+    def _create_client(self, http_client: Any) -> OpenAI:
+        return OpenAI(base_url=OPENROUTER_BASE_URL, api_key=self.api_key, http_client=http_client)
+
+    def _create_async_client(self, http_client: Any) -> AsyncOpenAI:
+        return AsyncOpenAI(base_url=OPENROUTER_BASE_URL, api_key=self.api_key, http_client=http_client)
+
+    def _build_params(
         self,
         prompt: Union[str, List[Dict[str, str]]],
         temperature: float = 0.0,
         max_tokens: Optional[int] = 2048,
         stream: bool = False,
         **kwargs: Any
-    ) -> Union[LLMResponse, Iterator[LLMResponse]]:
+    ) -> Dict[str, Any]:
+        """Build the chat completion parameters for a request."""
         self._ensure_deterministic(temperature)
 
         if isinstance(prompt, str):
@@ -41,7 +51,7 @@ class OpenRouterProvider(LLMProvider):
         else:
             messages = prompt
 
-        api_params = {
+        return {
             "model": self.model,
             "messages": messages,
             "temperature": temperature,
@@ -50,16 +60,22 @@ class OpenRouterProvider(LLMProvider):
             **kwargs,
         }
 
+    def generate(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = 2048,
+        stream: bool = False,
+        **kwargs: Any
+    ) -> Union[LLMResponse, Iterator[LLMResponse]]:
+        api_params = self._build_params(prompt, temperature, max_tokens, stream, **kwargs)
+
         if stream:
             return self._generate_stream(api_params)
         else:
             return self._generate_non_stream(api_params)
 
-    def _generate_non_stream(self, api_params: Dict[str, Any]) -> LLMResponse:
-        start_time = time.time()
-        response = self.client.chat.completions.create(**api_params)
-        latency = time.time() - start_time
-        
+    def _to_response(self, response: Any, latency: float) -> LLMResponse:
         content = response.choices[0].message.content or ""
         tokens_used = response.usage.total_tokens if response.usage else None
         cost = getattr(response.usage, 'cost', None)
@@ -67,22 +83,67 @@ class OpenRouterProvider(LLMProvider):
         return LLMResponse(
             content=content,
             model=response.model,
-            cost=cost,
-            latency=latency,
             tokens_used=tokens_used,
-            raw_response=response.model_dump()
+            metadata={"latency": latency, "cost": cost, "raw_response": response.model_dump()}
         )
 
+    def _chunk_to_response(self, chunk: Any) -> Optional[LLMResponse]:
+        if not chunk.choices:
+            return None
+        content_delta = chunk.choices[0].delta.content or ""
+        if not content_delta:
+            return None
+        return LLMResponse(
+            content=content_delta,
+            model=chunk.model,
+            metadata={"raw_response": chunk.model_dump()}
+        )
+
+    def _generate_non_stream(self, api_params: Dict[str, Any]) -> LLMResponse:
+        start_time = time.time()
+        response = self._request(api_params, lambda: self.client.chat.completions.create(**api_params))
+        return self._to_response(response, time.time() - start_time)
+
     def _generate_stream(self, api_params: Dict[str, Any]) -> Iterator[LLMResponse]:
+        self._acquire(api_params)
         stream = self.client.chat.completions.create(**api_params)
         for chunk in stream:
-            content_delta = chunk.choices[0].delta.content or ""
-            if content_delta:
-                yield LLMResponse(
-                    content=content_delta,
-                    model=chunk.model,
-                    raw_response=chunk.model_dump()
-                )
+            response = self._chunk_to_response(chunk)
+            if response is not None:
+                yield response
+
+    async def generate_async(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = 2048,
+        **kwargs: Any
+    ) -> LLMResponse:
+        """Async version of generate method."""
+        kwargs.pop("stream", None)
+        api_params = self._build_params(prompt, temperature, max_tokens, False, **kwargs)
+
+        start_time = time.time()
+        response = await self._arequest(api_params, lambda: self.async_client.chat.completions.create(**api_params))
+        return self._to_response(response, time.time() - start_time)
+
+    async def stream_async(
+        self,
+        prompt: Union[str, List[Dict[str, str]]],
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = 2048,
+        **kwargs: Any
+    ) -> AsyncIterator[LLMResponse]:
+        """Async version of generate with streaming enabled."""
+        kwargs.pop("stream", None)
+        api_params = self._build_params(prompt, temperature, max_tokens, True, **kwargs)
+
+        await self._aacquire(api_params)
+        stream = await self.async_client.chat.completions.create(**api_params)
+        async for chunk in stream:
+            response = self._chunk_to_response(chunk)
+            if response is not None:
+                yield response
 
     def generate_with_tools(
         self,
@@ -103,14 +164,15 @@ class OpenRouterProvider(LLMProvider):
             {"type": "function", "function": tool.dict()} for tool in tools
         ]
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            tools=openai_tools,
-            tool_choice="auto",
-            temperature=temperature,
+        tool_params = {
+            "model": self.model,
+            "messages": messages,
+            "tools": openai_tools,
+            "tool_choice": "auto",
+            "temperature": temperature,
             **kwargs,
-        )
+        }
+        response = self._request(tool_params, lambda: self.client.chat.completions.create(**tool_params))
 
         response_message = response.choices[0].message
         tool_calls = response_message.tool_calls
@@ -119,7 +181,7 @@ class OpenRouterProvider(LLMProvider):
             return LLMResponse(
                 content=response_message.content or "",
                 model=response.model,
-                raw_response=response.model_dump()
+                metadata={"raw_response": response.model_dump()}
             )
 
         from .base import ToolCall
@@ -0,0 +1,378 @@
+"""
+Process-wide rate limiting and request coalescing for LLM providers.
+
+Every (provider, model) pair shares one RateLimiter, no matter how many
+provider instances or agents issue requests. A limiter holds two token
+buckets, one for requests and one for tokens per minute, and hands out
+reservations: callers learn how long to wait and sleep (or await) outside
+the lock, so waiting never blocks other callers. Priority lanes are
+implemented as reserves: lower-priority requests may not drain a bucket
+below a fraction of its capacity that is kept for orchestrator-critical
+calls.
+
+Identical in-flight requests are coalesced by SingleFlight, so N agents
+asking the same question cost one API call.
+"""
+
+import time
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+import concurrent.futures
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from enum import IntEnum
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Request priority lanes, most urgent first."""
+    CRITICAL = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+_current_priority: ContextVar[Priority] = ContextVar("triangulum_request_priority", default=Priority.NORMAL)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """
+    Run the provider requests issued in this context at ``priority``.
+
+    The priority follows asyncio tasks started inside the context and the
+    blocking calls that ``LLMProvider.generate_async`` and ``stream_async``
+    run in the default executor.
+    """
+    token = _current_priority.set(Priority(priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Priority:
+    """Get the priority of requests issued from the current context."""
+    return _current_priority.get()
+
+
+@dataclass
+class RateLimit:
+    """Per-minute request and token limits; None means unlimited."""
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    # Fraction of each bucket reserved per priority lane above the caller's
+    # lane; CRITICAL requests may use the whole bucket
+    critical_reserve: float = 0.1
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RateLimit':
+        """Create limits from a configuration dictionary, ignoring unknown keys."""
+        return cls(**{key: value for key, value in data.items() if key in cls.__dataclass_fields__})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation."""
+        return asdict(self)
+
+
+class TokenBucket:
+    """
+    Token bucket that allows reservations to run into debt.
+
+    A reservation always succeeds and returns the time until the bucket
+    would have covered it, which keeps callers in FIFO order within a lane
+    without a waiting queue.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, floor: float, now: float) -> float:
+        """Seconds until ``amount`` can be taken without going below ``floor``."""
+        self._refill(now)
+        amount = min(amount, self.capacity - floor)
+        return max(0.0, (amount + floor - self.tokens) / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RateLimiter:
+    """Request and token limits shared by all callers of one provider model."""
+
+    def __init__(self, limit: RateLimit, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Request and token limits
+            clock: Monotonic clock, replaceable in tests
+        """
+        self.limit = limit
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._requests = TokenBucket(limit.requests_per_minute, clock) if limit.requests_per_minute else None
+        self._tokens = TokenBucket(limit.tokens_per_minute, clock) if limit.tokens_per_minute else None
+
+        self.stats = {
+            "requests": 0,
+            "throttled": 0,
+            "wait_seconds": 0.0
+        }
+
+    def reserve(self, tokens: int = 0, priority: Optional[Priority] = None) -> float:
+        """
+        Reserve capacity for one request.
+
+        Args:
+            tokens: Estimated tokens used by the request
+            priority: Lane of the request (defaults to the context priority)
+
+        Returns:
+            Seconds the caller has to wait before sending the request
+        """
+        priority = current_priority() if priority is None else Priority(priority)
+        reserve = self.limit.critical_reserve * int(priority)
+
+        with self._lock:
+            now = self.clock()
+            wait = 0.0
+            for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+                if bucket is not None and amount:
+                    wait = max(wait, bucket.wait_time(amount, bucket.capacity * reserve, now))
+            for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+                if bucket is not None and amount:
+                    bucket.take(amount)
+
+            self.stats["requests"] += 1
+            if wait > 0:
+                self.stats["throttled"] += 1
+                self.stats["wait_seconds"] += wait
+            return wait
+
+    def acquire(self, tokens: int = 0, priority: Optional[Priority] = None) -> float:
+        """Reserve capacity and sleep until it is available; returns the wait."""
+        wait = self.reserve(tokens, priority)
+        if wait > 0:
+            logger.info(f"Rate limiting: waiting {wait:.2f}s")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: int = 0, priority: Optional[Priority] = None) -> float:
+        """Async version of acquire that yields to the event loop while waiting."""
+        wait = self.reserve(tokens, priority)
+        if wait > 0:
+            logger.info(f"Rate limiting: waiting {wait:.2f}s")
+            await asyncio.sleep(wait)
+        return wait
+
+    def settle(self, reserved_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Correct a token reservation once the actual usage is known."""
+        if self._tokens is None or actual_tokens is None:
+            return
+        with self._lock:
+            self._tokens.refund(reserved_tokens - actual_tokens)
+
+
+_limits: Dict[Tuple[str, Optional[str]], RateLimit] = {}
+_limiters: Dict[Tuple[str, str], Optional[RateLimiter]] = {}
+_registry_lock = threading.Lock()
+
+
+def configure_rate_limit(provider: str, limit: Optional[RateLimit], model: Optional[str] = None) -> None:
+    """
+    Set the limits of a provider, or of one of its models.
+
+    Model limits take precedence over provider limits. Limiters that were
+    already created for the provider are replaced.
+
+    Args:
+        provider: Provider name (e.g. "openai")
+        limit: Limits to apply, or None to remove them
+        model: Optional model name
+    """
+    with _registry_lock:
+        if limit is None:
+            _limits.pop((provider, model), None)
+        else:
+            _limits[(provider, model)] = limit
+        for key in [key for key in _limiters if key[0] == provider and (model is None or key[1] == model)]:
+            del _limiters[key]
+
+
+def get_rate_limiter(provider: str, model: str, default: Optional[RateLimit] = None) -> Optional[RateLimiter]:
+    """
+    Get the process-wide limiter of a provider model.
+
+    Args:
+        provider: Provider name
+        model: Model name
+        default: Limits used when none are configured for the provider
+
+    Returns:
+        The shared RateLimiter, or None if the model is unlimited
+    """
+    key = (provider, model)
+    limiter = _limiters.get(key, False)
+    if limiter is not False:
+        return limiter
+
+    with _registry_lock:
+        if key not in _limiters:
+            limit = _limits.get(key) or _limits.get((provider, None)) or default
+            _limiters[key] = RateLimiter(limit) if limit else None
+        return _limiters[key]
+
+
+def reset_rate_limiters() -> None:
+    """Remove all configured limits and limiters."""
+    with _registry_lock:
+        _limits.clear()
+        _limiters.clear()
+
+
+def estimate_request_tokens(payload: Dict[str, Any]) -> int:
+    """
+    Estimate the tokens a chat request can consume.
+
+    Prompt tokens are approximated as four characters per token; the
+    requested completion budget is added because providers count it
+    against the limit when the request is admitted.
+    """
+    chars = 0
+    for message in payload.get("messages") or []:
+        content = message.get("content") if isinstance(message, dict) else None
+        chars += len(content) if isinstance(content, str) else len(json.dumps(content, default=str))
+    chars += len(payload.get("system") or "")
+
+    completion = (payload.get("max_tokens") or payload.get("max_completion_tokens")
+                  or (payload.get("options") or {}).get("num_predict") or 0)
+    return chars // 4 + max(0, int(completion))
+
+
+def estimate_stream_tokens(payload: Dict[str, Any], output_chars: int) -> int:
+    """Estimate the tokens a streamed chat request used from its prompt and streamed output."""
+    prompt = {key: payload[key] for key in ("messages", "system") if key in payload}
+    return estimate_request_tokens(prompt) + output_chars // 4
+
+
+def response_token_count(response: Any) -> Optional[int]:
+    """Total tokens reported by an SDK response object or JSON response, if any."""
+    if isinstance(response, dict):
+        usage = response.get("usage") or {}
+        if usage.get("total_tokens") is not None:
+            return usage["total_tokens"]
+        if "eval_count" in response:
+            return response.get("eval_count", 0) + response.get("prompt_eval_count", 0)
+        return None
+
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    total = getattr(usage, "total_tokens", None)
+    if total is None and getattr(usage, "input_tokens", None) is not None:
+        total = usage.input_tokens + (getattr(usage, "output_tokens", 0) or 0)
+    return total if isinstance(total, int) else None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into one.
+
+    The first caller of a key runs the call; callers arriving while it is in
+    flight wait for and share its result or exception. Sync and async
+    callers of the same key share one flight.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, concurrent.futures.Future] = {}
+        self.stats = {
+            "calls": 0,
+            "coalesced": 0
+        }
+
+    def _join(self, key: str) -> Tuple[concurrent.futures.Future, bool]:
+        with self._lock:
+            self.stats["calls"] += 1
+            future = self._flights.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future, False
+            future = self._flights[key] = concurrent.futures.Future()
+            return future, True
+
+    def _land(self, key: str) -> None:
+        with self._lock:
+            self._flights.pop(key, None)
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run ``fn`` unless a call with the same key is in flight, and share its outcome."""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._land(key)
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async version of do."""
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            result = await fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._land(key)
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently in flight."""
+        with self._lock:
+            return len(self._flights)
+
+
+_coalescer = SingleFlight()
+
+
+def get_coalescer() -> SingleFlight:
+    """Get the process-wide request coalescer."""
+    return _coalescer
+
+
+def request_key(namespace: str, payload: Dict[str, Any]) -> str:
+    """Stable key of a request payload for coalescing."""
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return f"{namespace}:{hashlib.sha256(encoded).hexdigest()}"
@@ -7,28 +7,39 @@ through careful integration with the response cache.
 """
 
 import time
+import asyncio
 import logging
-from typing import Callable, Any, List, Dict, Optional
+from typing import Callable, Awaitable, Any, List, Dict, Optional, Iterator, Tuple
 
 from ..agents.llm_config import get_provider_config, LLM_CONFIG
 from ..agents.response_cache import get_response_cache
 from .factory import get_provider
+from .rate_limiter import Priority, current_priority, request_priority, get_coalescer, request_key
 
 logger = logging.getLogger(__name__)
 
 class RequestManager:
     """
     Manages requests to LLM providers, adding a layer of resilience.
+    
+    Requests run in a priority lane (see rate_limiter.Priority) and
+    identical requests issued concurrently by several agents are coalesced,
+    so only one of them goes through the cache, retries and fallbacks.
     """
 
-    def __init__(self, agent_name: str, prompt: str):
+    def __init__(self, agent_name: str, prompt: str, priority: Optional[Priority] = None):
         self.agent_name = agent_name
         self.prompt = prompt
+        self.priority = current_priority() if priority is None else priority
         self.cache = get_response_cache()
 
-    def execute(self) -> Any:
+    def _request_key(self) -> str:
+        return request_key("request_manager", {"agent": self.agent_name, "prompt": self.prompt})
+
+    def _attempts(self) -> Iterator[Tuple[str, str, str]]:
         """
-        Executes the LLM generation request with retry and fallback logic.
+        Yield (provider name, model name, cache key model) for the primary
+        provider followed by the fallbacks.
         """
         primary_config = LLM_CONFIG["agent_model_mapping"][self.agent_name]
         provider_sequence = [primary_config["provider"]]
@@ -37,16 +48,26 @@ class RequestManager:
         fallback_providers = LLM_CONFIG.get("fallback_providers", [])
         provider_sequence.extend(fallback_providers)
 
-        last_exception = None
+        # The cache key is always based on the *primary* intended provider
+        # to ensure deterministic replay of the fallback logic.
+        primary_provider_name = provider_sequence[0]
+        cache_key_model = primary_config.get("model") or get_provider_config(primary_provider_name).get("default_model")
 
         for provider_name in provider_sequence:
             model_name = primary_config.get("model") or get_provider_config(provider_name).get("default_model")
-            
-            # The cache key is always based on the *primary* intended provider
-            # to ensure deterministic replay of the fallback logic.
-            primary_provider_name = provider_sequence[0]
-            cache_key_model = primary_config.get("model") or get_provider_config(primary_provider_name).get("default_model")
-            
+            yield provider_name, model_name, cache_key_model
+
+    def execute(self) -> Any:
+        """
+        Executes the LLM generation request with retry and fallback logic.
+        """
+        with request_priority(self.priority):
+            return get_coalescer().do(self._request_key(), self._execute)
+
+    def _execute(self) -> Any:
+        last_exception = None
+
+        for provider_name, model_name, cache_key_model in self._attempts():
             cached_response = self.cache.get(self.agent_name, cache_key_model, self.prompt)
             if cached_response:
                 logger.info(f"Returning cached response for agent '{self.agent_name}'")
@@ -56,9 +77,6 @@ class RequestManager:
                 logger.info(f"Attempting request for agent '{self.agent_name}' with provider '{provider_name}'")
                 provider = get_provider(provider_name, get_provider_config(provider_name))
                 
-                # This is a simplified execution. A real implementation would
-                # use the provider's generate method and handle specific exceptions.
-                # For now, we simulate a successful call.
                 response = self._execute_with_retries(provider.generate, self.prompt, model_name=model_name)
 
                 # Cache the successful response against the primary provider's key
@@ -73,29 +91,93 @@ class RequestManager:
         # If all providers in the sequence fail
         raise RuntimeError(f"All LLM providers failed for agent '{self.agent_name}'. Last error: {last_exception}")
 
-    def _execute_with_retries(self, func: Callable, *args, **kwargs) -> Any:
+    async def execute_async(self) -> Any:
         """
-        Executes a function with a simple retry mechanism for transient errors.
+        Async version of execute; waits for rate limits and retries without
+        blocking the event loop.
         """
+        with request_priority(self.priority):
+            return await get_coalescer().do_async(self._request_key(), self._execute_async)
+
+    async def _execute_async(self) -> Any:
+        last_exception = None
+
+        for provider_name, model_name, cache_key_model in self._attempts():
+            cached_response = self.cache.get(self.agent_name, cache_key_model, self.prompt)
+            if cached_response:
+                logger.info(f"Returning cached response for agent '{self.agent_name}'")
+                return cached_response.content
+
+            try:
+                logger.info(f"Attempting request for agent '{self.agent_name}' with provider '{provider_name}'")
+                provider = get_provider(provider_name, get_provider_config(provider_name))
+                
+                response = await self._execute_with_retries_async(
+                    provider.generate_async, self.prompt, model_name=model_name
+                )
+
+                # Cache the successful response against the primary provider's key
+                self.cache.put(self.agent_name, cache_key_model, self.prompt, response)
+                
+                return response.content
+
+            except Exception as e:
+                logger.warning(f"Request failed for provider '{provider_name}': {e}. Trying next fallback.")
+                last_exception = e
+        
+        # If all providers in the sequence fail
+        raise RuntimeError(f"All LLM providers failed for agent '{self.agent_name}'. Last error: {last_exception}")
+
+    def _retry_delays(self) -> List[float]:
+        """Exponential backoff delays between attempts."""
         max_retries = LLM_CONFIG.get("request_retries", 3)
         base_delay = LLM_CONFIG.get("retry_delay_seconds", 1)
+        return [base_delay * (2 ** attempt) for attempt in range(max_retries - 1)]
+
+    def _execute_with_retries(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Executes a function with a simple retry mechanism for transient errors.
+        """
+        delays = self._retry_delays()
         
-        for attempt in range(max_retries):
+        for attempt in range(len(delays) + 1):
             try:
                 return func(*args, **kwargs)
             except Exception as e:
                 # In a real implementation, we would check for specific transient error codes
                 # (e.g., 5xx server errors, 429 rate limit).
-                if attempt == max_retries - 1:
+                if attempt == len(delays):
                     raise e # Re-raise the last exception
                 
-                delay = base_delay * (2 ** attempt)
-                logger.info(f"Attempt {attempt + 1}/{max_retries} failed. Retrying in {delay:.2f} seconds...")
+                delay = delays[attempt]
+                logger.info(f"Attempt {attempt + 1}/{len(delays) + 1} failed. Retrying in {delay:.2f} seconds...")
                 time.sleep(delay)
 
-def managed_generate(agent_name: str, prompt: str) -> str:
+    async def _execute_with_retries_async(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Async version of _execute_with_retries."""
+        delays = self._retry_delays()
+        
+        for attempt in range(len(delays) + 1):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                if attempt == len(delays):
+                    raise e # Re-raise the last exception
+                
+                delay = delays[attempt]
+                logger.info(f"Attempt {attempt + 1}/{len(delays) + 1} failed. Retrying in {delay:.2f} seconds...")
+                await asyncio.sleep(delay)
+
+def managed_generate(agent_name: str, prompt: str, priority: Optional[Priority] = None) -> str:
     """
     A convenience function to create and execute a request manager.
     """
-    manager = RequestManager(agent_name=agent_name, prompt=prompt)
+    manager = RequestManager(agent_name=agent_name, prompt=prompt, priority=priority)
     return manager.execute()
+
+async def managed_generate_async(agent_name: str, prompt: str, priority: Optional[Priority] = None) -> str:
+    """
+    Async version of managed_generate.
+    """
+    manager = RequestManager(agent_name=agent_name, prompt=prompt, priority=priority)
+    return await manager.execute_async()
@@ -0,0 +1,223 @@
+"""
+Token counting and budget-constrained context packing.
+
+All components that need token counts share one TokenCountingService. It
+uses a local BPE tokenizer (tiktoken) when one is installed and falls back
+to counting words and punctuation marks otherwise. Counts are memoised per
+text, so a conversation that is re-packed on every call is only tokenized
+once per message.
+
+pack() chooses which items (messages) to keep under a token budget by
+solving a 0/1 knapsack over their values, instead of keeping a fixed number
+of recent items.
+"""
+
+import re
+import json
+import math
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Sequence, Iterable
+
+import numpy as np
+
+# Try to import tiktoken, but make it optional
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
+logger = logging.getLogger(__name__)
+
+# Tokens added by chat APIs around every message and before the reply
+MESSAGE_OVERHEAD = 4
+REPLY_OVERHEAD = 3
+
+
+class RegexTokenizer:
+    """Approximate tokenizer that counts words and punctuation marks."""
+    name = "regex"
+    _pattern = re.compile(r"\w+|[^\w\s]")
+
+    def count(self, text: str) -> int:
+        return len(self._pattern.findall(text))
+
+
+class TiktokenTokenizer:
+    """BPE tokenizer backed by tiktoken."""
+
+    def __init__(self, encoding: str = "o200k_base"):
+        """
+        Initialize the tokenizer.
+
+        Args:
+            encoding: Name of the tiktoken encoding
+        """
+        self.name = encoding
+        self._encoding = tiktoken.get_encoding(encoding)
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+def default_tokenizer():
+    """Get the most accurate tokenizer available."""
+    if HAS_TIKTOKEN:
+        try:
+            return TiktokenTokenizer()
+        except Exception as e:
+            # Encodings are downloaded on first use and may be unavailable offline
+            logger.warning(f"Could not load tiktoken encoding, using regex token counts: {e}")
+    return RegexTokenizer()
+
+
+class TokenCountingService:
+    """Token counter with an LRU memo of counts per text."""
+
+    def __init__(self, tokenizer=None, cache_size: int = 8192):
+        """
+        Initialize the service.
+
+        Args:
+            tokenizer: Object with a ``count(text) -> int`` method (defaults
+                to the most accurate tokenizer available)
+            cache_size: Maximum number of memoised texts
+        """
+        self.tokenizer = tokenizer or default_tokenizer()
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache: Dict[str, int] = OrderedDict()
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0
+        }
+
+    def count(self, text: str) -> int:
+        """Count the tokens of a text."""
+        if not text:
+            return 0
+
+        with self._lock:
+            tokens = self._cache.get(text)
+            if tokens is not None:
+                self._cache.move_to_end(text)
+                self.stats["hits"] += 1
+                return tokens
+
+        tokens = self.tokenizer.count(text)
+        with self._lock:
+            self.stats["misses"] += 1
+            self._cache[text] = tokens
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def count_message(self, message: Dict[str, Any]) -> int:
+        """Count the tokens of a chat message, including the per-message overhead."""
+        content = message.get("content")
+        if content is not None and not isinstance(content, str):
+            content = json.dumps(content, default=str)
+        tokens = MESSAGE_OVERHEAD + self.count(content)
+        if message.get("name"):
+            tokens += self.count(message["name"])
+        if message.get("tool_calls"):
+            tokens += self.count(json.dumps(message["tool_calls"], default=str))
+        return tokens
+
+    def count_messages(self, messages: Iterable[Dict[str, Any]]) -> int:
+        """Count the tokens of a chat request's messages."""
+        return sum(self.count_message(message) for message in messages) + REPLY_OVERHEAD
+
+    def clear(self) -> None:
+        """Drop all memoised counts."""
+        with self._lock:
+            self._cache.clear()
+
+
+_token_counter: Optional[TokenCountingService] = None
+_token_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCountingService:
+    """Get the process-wide token counting service."""
+    global _token_counter
+    if _token_counter is None:
+        with _token_counter_lock:
+            if _token_counter is None:
+                _token_counter = TokenCountingService()
+    return _token_counter
+
+
+def configure_token_counter(tokenizer=None, cache_size: int = 8192) -> TokenCountingService:
+    """
+    Replace the process-wide token counting service.
+
+    Args:
+        tokenizer: Object with a ``count(text) -> int`` method, or None for
+            the most accurate tokenizer available
+        cache_size: Maximum number of memoised texts
+
+    Returns:
+        The new service
+    """
+    global _token_counter
+    with _token_counter_lock:
+        _token_counter = TokenCountingService(tokenizer, cache_size)
+    return _token_counter
+
+
+def pack(costs: Sequence[int],
+         values: Sequence[float],
+         budget: int,
+         required: Iterable[int] = (),
+         resolution: int = 1024) -> List[int]:
+    """
+    Choose the items of highest total value whose total cost fits a budget.
+
+    Required items are always kept, even if they alone exceed the budget.
+    The remaining budget is split into at most ``resolution`` buckets and
+    item costs are rounded up to whole buckets, which bounds the dynamic
+    program to O(items * resolution) while never exceeding the budget.
+
+    Args:
+        costs: Token cost of each item
+        values: Value of each item
+        budget: Maximum total cost
+        required: Indices of items that must be kept
+        resolution: Maximum number of budget buckets
+
+    Returns:
+        Sorted indices of the kept items
+    """
+    required = set(required)
+    remaining = budget - sum(costs[i] for i in required)
+    optional = [i for i in range(len(costs)) if i not in required and costs[i] <= remaining and values[i] > 0]
+    if not optional or sum(costs[i] for i in optional) <= remaining:
+        return sorted(required.union(optional))
+
+    scale = max(1.0, remaining / resolution)
+    capacity = int(remaining // scale)
+    weights = [math.ceil(costs[i] / scale) for i in optional]
+
+    best = np.zeros(capacity + 1)
+    keep = np.zeros((len(optional), capacity + 1), dtype=bool)
+    for row, (i, weight) in enumerate(zip(optional, weights)):
+        if weight == 0:
+            keep[row] = True
+            best += values[i]
+            continue
+        candidate = best[:capacity + 1 - weight] + values[i]
+        take = candidate > best[weight:]
+        keep[row, weight:] = take
+        best[weight:] = np.where(take, candidate, best[weight:])
+
+    chosen = set(required)
+    c = capacity
+    for row in range(len(optional) - 1, -1, -1):
+        if keep[row, c]:
+            chosen.add(optional[row])
+            c -= weights[row]
+    return sorted(chosen)
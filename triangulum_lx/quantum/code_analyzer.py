@@ -18,6 +18,8 @@ from typing import Dict, List, Any, Optional, Union, Tuple, Set
 from pathlib import Path
 from collections import defaultdict
 
+from ..tooling.source_cache import get_source_cache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -96,8 +98,7 @@ class QuantumCodeAnalyzer:
         
         try:
             # Read file content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = get_source_cache().read(file_path).text
             
             # Perform analysis based on file type
             file_ext = os.path.splitext(file_path)[1].lower()
@@ -298,9 +299,8 @@ class QuantumCodeAnalyzer:
         
         try:
             # Read file content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                lines = content.split('\n')
+            content = get_source_cache().read(file_path).text
+            lines = content.split('\n')
             
             # Determine language
             file_ext = os.path.splitext(file_path)[1].lower()
@@ -424,9 +424,8 @@ class QuantumCodeAnalyzer:
             # Read file content if available
             file_path = bug_info.get("file")
             if file_path and os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    lines = content.split('\n')
+                content = get_source_cache().read(file_path).text
+                lines = content.split('\n')
                 
                 # Extract context around bug
                 line_num = bug_info.get("line", 0)
@@ -786,8 +785,7 @@ class QuantumCodeAnalyzer:
         
         try:
             # Read file content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = get_source_cache().read(file_path).text
             
             # Determine file type
             file_ext = os.path.splitext(file_path)[1].lower()
@@ -1129,8 +1127,7 @@ class QuantumCodeAnalyzer:
                 return self.code_embeddings[file_path]
             
             # Read file content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = get_source_cache().read(file_path).text
             
             # Generate embedding using quantum acceleration if available
             if self.use_quantum and QUANTUM_AVAILABLE:
@@ -11,21 +11,117 @@ import ast
 import logging
 import re
 import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Set, Any, Optional, Tuple
 
+from .source_cache import get_source_cache
+
 logger = logging.getLogger(__name__)
 
+
+class _RelationshipVisitor(ast.NodeVisitor):
+    """Collects imports, definitions and calls of a module in one pass."""
+
+    def __init__(self):
+        self.imports: Set[str] = set()
+        self.functions: Set[str] = set()
+        self.classes: Set[str] = set()
+        self.methods: Set[str] = set()
+        self.function_calls: Counter = Counter()
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for name in node.names:
+            self.imports.add(name.name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module:
+            self.imports.add(node.module)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self.functions.add(node.name)
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.classes.add(node.name)
+        # Also map methods to this file
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef):
+                self.methods.add(f"{node.name}.{item.name}")
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if isinstance(node.func, ast.Name):
+            # Direct function call: func()
+            self.function_calls[node.func.id] += 1
+        elif isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name):
+            # Method call: obj.method()
+            self.function_calls[f"{node.func.value.id}.{node.func.attr}"] += 1
+        self.generic_visit(node)
+
+
+def _extract_file(file_path: str) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Extract the facts of one file that do not depend on other files.
+
+    Runs in worker processes, so it only returns picklable data.
+
+    Args:
+        file_path: Path to the Python file
+
+    Returns:
+        Tuple of the file path, the extracted facts (None on failure) and an
+        error message (None on success)
+    """
+    try:
+        visitor = _RelationshipVisitor()
+        visitor.visit(get_source_cache().read(file_path).tree)
+    except Exception as e:
+        return file_path, None, str(e)
+    return file_path, {
+        'imports': visitor.imports,
+        'functions': visitor.functions,
+        'classes': visitor.classes,
+        'methods': visitor.methods,
+        'function_calls': dict(visitor.function_calls)
+    }, None
+
+
+def _new_relationship_entry() -> Dict[str, Any]:
+    return {
+        'imports': set(),
+        'imported_by': set(),
+        'functions': set(),
+        'classes': set(),
+        'function_calls': {},
+        'dependencies': set()
+    }
+
+
 class CodeRelationshipAnalyzer:
     """
     Analyzes code files to determine relationships between them, including imports,
     function calls, and other dependencies.
+
+    While an analysis runs, the list-valued relationship fields are held in
+    sets; they are converted to sorted lists when it finishes.
     """
 
-    def __init__(self):
-        """Initialize the CodeRelationshipAnalyzer."""
+    def __init__(self, max_workers: Optional[int] = None, parallel_threshold: int = 200):
+        """
+        Initialize the CodeRelationshipAnalyzer.
+
+        Args:
+            max_workers: Maximum number of worker processes for analyzing
+                directories (None uses the number of CPUs, 1 disables workers)
+            parallel_threshold: Minimum number of files for which worker
+                processes are used
+        """
         self.relationships = {}
         self.import_map = {}  # Maps module names to file paths
         self.function_map = {}  # Maps function names to file paths
+        self.max_workers = max_workers
+        self.parallel_threshold = parallel_threshold
 
     def analyze_directory(self, directory: str) -> Dict[str, Any]:
         """
@@ -47,11 +143,12 @@ class CodeRelationshipAnalyzer:
         self._build_module_map(all_files, directory)
 
         # Second pass: Analyze each file for imports and function definitions
-        for file_path in all_files:
-            self._analyze_file(file_path)
+        for file_path, facts, error in self._extract_files(all_files):
+            self._merge_file(file_path, facts, error)
 
         # Third pass: Resolve function calls and build cross-references
         self._resolve_function_calls()
+        self._finalize_relationships()
 
         logger.info(f"Analyzed {len(self.relationships)} files")
         return self.relationships
@@ -96,14 +193,18 @@ class CodeRelationshipAnalyzer:
         self._build_module_map(absolute_paths, base_dir or os.getcwd())
         
         # Analyze each file
+        existing_paths = []
         for file_path in absolute_paths:
             if os.path.exists(file_path):
-                self._analyze_file(file_path)
+                existing_paths.append(file_path)
             else:
                 logger.warning(f"File not found: {file_path}")
+        for file_path, facts, error in self._extract_files(existing_paths):
+            self._merge_file(file_path, facts, error)
                 
         # Resolve function calls
         self._resolve_function_calls()
+        self._finalize_relationships()
         
         logger.info(f"Analyzed {len(self.relationships)} files for relationships")
         return self.relationships
@@ -147,163 +248,94 @@ class CodeRelationshipAnalyzer:
                 dir_module = os.path.dirname(rel_path).replace(os.path.sep, '.')
                 self.import_map[dir_module] = file_path
 
-    def _analyze_file(self, file_path: str) -> None:
+    def _extract_files(self, files: List[str]):
         """
-        Analyze a Python file to determine its relationships.
+        Extract the facts of files, in worker processes for large sets.
 
         Args:
-            file_path: Path to the Python file
-        """
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Initialize relationships for this file
-            self.relationships[file_path] = {
-                'imports': [],
-                'imported_by': [],
-                'functions': [],
-                'classes': [],
-                'function_calls': {},
-                'dependencies': []
-            }
-
-            # Parse the file
-            tree = ast.parse(content, filename=file_path)
-
-            # Analyze imports
-            self._analyze_imports(file_path, tree)
-
-            # Analyze function and class definitions
-            self._analyze_definitions(file_path, tree)
-
-            # Analyze function calls
-            self._analyze_function_calls(file_path, tree)
-
-        except Exception as e:
-            logger.error(f"Error analyzing file {file_path}: {e}")
+            files: List of Python file paths
 
-    def _analyze_imports(self, file_path: str, tree: ast.Module) -> None:
+        Returns:
+            Iterable of (file path, facts, error) tuples in the order of files
         """
-        Analyze imports in a Python file.
+        max_workers = self.max_workers or os.cpu_count() or 1
+        if max_workers > 1 and len(files) >= self.parallel_threshold:
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    chunksize = max(1, len(files) // (max_workers * 4))
+                    return list(executor.map(_extract_file, files, chunksize=chunksize))
+            except Exception as e:
+                logger.warning(f"Parallel analysis failed, analyzing files serially: {e}")
+        return map(_extract_file, files)
 
-        Args:
-            file_path: Path to the Python file
-            tree: AST of the Python file
-        """
-        imports = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for name in node.names:
-                    imported_module = name.name
-                    imports.append(imported_module)
-                    if imported_module in self.import_map:
-                        imported_file = self.import_map[imported_module]
-                        if imported_file != file_path:  # Avoid self-imports
-                            if imported_file not in self.relationships:
-                                self.relationships[imported_file] = {
-                                    'imports': [],
-                                    'imported_by': [],
-                                    'functions': [],
-                                    'classes': [],
-                                    'function_calls': {},
-                                    'dependencies': []
-                                }
-                            if file_path not in self.relationships[imported_file]['imported_by']:
-                                self.relationships[imported_file]['imported_by'].append(file_path)
-
-                            if imported_file not in self.relationships[file_path]['imports']:
-                                self.relationships[file_path]['imports'].append(imported_file)
-
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    imported_module = node.module
-                    imports.append(imported_module)
-                    if imported_module in self.import_map:
-                        imported_file = self.import_map[imported_module]
-                        if imported_file != file_path:  # Avoid self-imports
-                            if imported_file not in self.relationships:
-                                self.relationships[imported_file] = {
-                                    'imports': [],
-                                    'imported_by': [],
-                                    'functions': [],
-                                    'classes': [],
-                                    'function_calls': {},
-                                    'dependencies': []
-                                }
-                            if file_path not in self.relationships[imported_file]['imported_by']:
-                                self.relationships[imported_file]['imported_by'].append(file_path)
-
-                            if imported_file not in self.relationships[file_path]['imports']:
-                                self.relationships[file_path]['imports'].append(imported_file)
-
-    def _analyze_definitions(self, file_path: str, tree: ast.Module) -> None:
+    def _analyze_file(self, file_path: str) -> None:
         """
-        Analyze function and class definitions in a Python file.
+        Analyze a Python file to determine its relationships.
 
         Args:
             file_path: Path to the Python file
-            tree: AST of the Python file
         """
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                function_name = node.name
-                self.relationships[file_path]['functions'].append(function_name)
-                self.function_map[function_name] = file_path
-
-            elif isinstance(node, ast.ClassDef):
-                class_name = node.name
-                self.relationships[file_path]['classes'].append(class_name)
-
-                # Also map methods to this file
-                for item in node.body:
-                    if isinstance(item, ast.FunctionDef):
-                        method_name = f"{class_name}.{item.name}"
-                        self.function_map[method_name] = file_path
-
-    def _analyze_function_calls(self, file_path: str, tree: ast.Module) -> None:
+        self._merge_file(*_extract_file(file_path))
+
+    def _merge_file(self, file_path: str, facts: Optional[Dict[str, Any]], error: Optional[str] = None) -> None:
         """
-        Analyze function calls in a Python file.
+        Merge the extracted facts of a file into the relationships.
 
         Args:
             file_path: Path to the Python file
-            tree: AST of the Python file
+            facts: Facts returned by _extract_file, or None if it failed
+            error: Error message if extraction failed
         """
-        function_calls = {}
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    # Direct function call: func()
-                    function_name = node.func.id
-                    if function_name not in function_calls:
-                        function_calls[function_name] = 0
-                    function_calls[function_name] += 1
-
-                elif isinstance(node, ast.Attribute):
-                    # Method call: obj.method()
-                    if isinstance(node.func.value, ast.Name):
-                        object_name = node.func.value.id
-                        method_name = node.func.attr
-                        full_name = f"{object_name}.{method_name}"
-                        if full_name not in function_calls:
-                            function_calls[full_name] = 0
-                        function_calls[full_name] += 1
-
-        self.relationships[file_path]['function_calls'] = function_calls
+        if facts is None:
+            logger.error(f"Error analyzing file {file_path}: {error}")
+            return
+
+        info = self._relationship_entry(file_path)
+        info['functions'].update(facts['functions'])
+        info['classes'].update(facts['classes'])
+        info['function_calls'] = facts['function_calls']
+
+        for imported_module in facts['imports']:
+            imported_file = self.import_map.get(imported_module)
+            if imported_file and imported_file != file_path:  # Avoid self-imports
+                info['imports'].add(imported_file)
+                self._relationship_entry(imported_file)['imported_by'].add(file_path)
+
+        for function_name in facts['functions']:
+            self.function_map[function_name] = file_path
+        for method_name in facts['methods']:
+            self.function_map[method_name] = file_path
+
+    def _relationship_entry(self, file_path: str) -> Dict[str, Any]:
+        """Get the set-backed relationships of a file, creating them if needed."""
+        info = self.relationships.get(file_path)
+        if info is None:
+            info = self.relationships[file_path] = _new_relationship_entry()
+        return info
 
     def _resolve_function_calls(self) -> None:
         """
         Resolve function calls to determine file dependencies.
         """
         for file_path, info in self.relationships.items():
-            for function_name, count in info['function_calls'].items():
-                if function_name in self.function_map:
-                    called_file = self.function_map[function_name]
-                    if called_file != file_path:  # Avoid self-dependencies
-                        if called_file not in info['dependencies']:
-                            info['dependencies'].append(called_file)
+            dependencies = info['dependencies']
+            for function_name in info['function_calls']:
+                called_file = self.function_map.get(function_name)
+                if called_file and called_file != file_path:  # Avoid self-dependencies
+                    dependencies.add(called_file)
+
+    def _finalize_relationships(self) -> None:
+        """Convert the set-backed relationship fields to sorted lists."""
+        self.relationships = self._serializable_relationships()
+
+    def _serializable_relationships(self) -> Dict[str, Any]:
+        return {
+            file_path: {
+                key: sorted(value) if isinstance(value, set) else value
+                for key, value in info.items()
+            }
+            for file_path, info in self.relationships.items()
+        }
 
     def save_relationships(self, output_path: str) -> None:
         """
@@ -318,7 +350,7 @@ class CodeRelationshipAnalyzer:
             os.makedirs(output_dir, exist_ok=True)
             
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(self.relationships, f, indent=2)
+            json.dump(self._serializable_relationships(), f, indent=2)
 
         logger.info(f"Saved relationships to {output_path}")
 
@@ -6,13 +6,15 @@ and analyzing dependencies between files in a codebase.
 """
 
 from enum import Enum, auto
-from typing import Dict, List, Set, Optional, Any, Tuple, Iterator, NamedTuple
+from typing import Dict, List, Set, Optional, Any, Tuple, Iterator, Iterable, NamedTuple
 import json
 import time
 import hashlib
 from dataclasses import dataclass, field
 from pathlib import Path
 
+import numpy as np
+
 
 class DependencyType(Enum):
     """Types of dependencies between files."""
@@ -174,6 +176,28 @@ class DependencyGraph:
         self.created_at = time.time()
         self.modified_at = self.created_at
         self.version = version
+        self.revision = 0  # incremented on every structural change
+        self._frozen: Optional['CompactDependencyGraph'] = None
+    
+    def _touch(self) -> None:
+        """Record a structural change."""
+        self.modified_at = time.time()
+        self.revision += 1
+    
+    def freeze(self) -> 'CompactDependencyGraph':
+        """
+        Get a frozen, array-backed copy of the graph for repeated queries.
+        
+        The copy is cached and rebuilt only after the graph has changed.
+        
+        Returns:
+            CompactDependencyGraph with the current nodes and edges
+        """
+        frozen = self._frozen
+        if frozen is None or frozen.revision != self.revision:
+            frozen = CompactDependencyGraph.from_graph(self)
+            self._frozen = frozen
+        return frozen
     
     def add_node(self, node: FileNode) -> None:
         """
@@ -187,7 +211,7 @@ class DependencyGraph:
             self._outgoing[node.path] = {}
         if node.path not in self._incoming:
             self._incoming[node.path] = {}
-        self.modified_at = time.time()
+        self._touch()
     
     def add_edge(self, source: str, target: str, metadata: DependencyMetadata) -> None:
         """
@@ -205,7 +229,7 @@ class DependencyGraph:
         # Add the edge
         self._outgoing.setdefault(source, {})[target] = metadata
         self._incoming.setdefault(target, {})[source] = metadata
-        self.modified_at = time.time()
+        self._touch()
     
     def get_node(self, path: str) -> Optional[FileNode]:
         """
@@ -270,6 +294,18 @@ class DependencyGraph:
         """
         return iter(self._outgoing.get(path, {}))
     
+    def predecessors(self, path: str) -> Iterator[str]:
+        """
+        Get an iterator over the predecessors of a node.
+        
+        Args:
+            path: Path of the file
+            
+        Returns:
+            Iterator over the files that directly depend on the node
+        """
+        return iter(self._incoming.get(path, {}))
+    
     def remove_node(self, path: str) -> None:
         """
         Remove a node and all its edges from the graph.
@@ -297,7 +333,7 @@ class DependencyGraph:
         if path in self._incoming:
             del self._incoming[path]
         
-        self.modified_at = time.time()
+        self._touch()
     
     def has_path(self, source: str, target: str, max_depth: int = 100) -> bool:
         """
@@ -573,3 +609,548 @@ class DependencyGraph:
         for source, targets in self._outgoing.items():
             for target, metadata in targets.items():
                 yield DependencyEdge(source, target, metadata)
+
+
+class CompactDependencyGraph:
+    """
+    A frozen, array-backed dependency graph for build-once/query-many use.
+    
+    File paths are interned into a path table and addressed by integer ids.
+    Forward adjacency is stored in CSR form (``out_indptr``/``out_indices``)
+    and reverse adjacency in CSC form (``in_indptr``/``in_indices``). Edge
+    metadata is kept in arrays parallel to the CSR edge order, and
+    ``in_edge_ids`` maps each reverse entry back to its forward edge.
+    
+    Traversals expand whole integer frontiers at once against a visited
+    bitmap, and batched reachability propagates one bit per source so up to
+    64 sources are answered in a single pass. The read API mirrors
+    DependencyGraph, so analyzers can use either representation.
+    """
+    
+    # Number of sources answered per pass of batched reachability
+    BITSET_WIDTH = 64
+    
+    def __init__(self,
+                 paths: List[str],
+                 nodes: List[FileNode],
+                 sources: np.ndarray,
+                 targets: np.ndarray,
+                 metadata: List[DependencyMetadata],
+                 created_at: Optional[float] = None,
+                 modified_at: Optional[float] = None,
+                 version: str = "1.0",
+                 revision: int = 0):
+        """
+        Build the compact graph from parallel edge arrays.
+        
+        Args:
+            paths: Interned path table; the position of a path is its id
+            nodes: FileNode for each path id
+            sources: Source id of each edge
+            targets: Target id of each edge
+            metadata: DependencyMetadata of each edge
+            created_at: Creation time of the source graph
+            modified_at: Modification time of the source graph
+            version: Version of the source graph
+            revision: Revision of the source graph this copy was built from
+        """
+        self.paths = list(paths)
+        self.path_ids: Dict[str, int] = {path: i for i, path in enumerate(self.paths)}
+        self._nodes = list(nodes)
+        self.created_at = created_at if created_at is not None else time.time()
+        self.modified_at = modified_at if modified_at is not None else self.created_at
+        self.version = version
+        self.revision = revision
+        
+        n = len(self.paths)
+        sources = np.asarray(sources, dtype=np.int32)
+        targets = np.asarray(targets, dtype=np.int32)
+        
+        # Forward adjacency (CSR): edges sorted by source, then target
+        order = np.lexsort((targets, sources))
+        self.edge_sources = sources[order]
+        self.out_indices = targets[order]
+        self.out_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.edge_sources, minlength=n), out=self.out_indptr[1:])
+        
+        # Reverse adjacency (CSC): edge ids sorted by target, then source
+        self.in_edge_ids = np.lexsort((self.edge_sources, self.out_indices))
+        self.in_indices = self.edge_sources[self.in_edge_ids]
+        self.in_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.out_indices, minlength=n), out=self.in_indptr[1:])
+        
+        # Edge metadata in CSR edge order
+        self._metadata = [metadata[i] for i in order]
+        self.edge_types = np.array([m.dependency_type.value for m in self._metadata], dtype=np.int8)
+        self.edge_confidence = np.array([m.confidence for m in self._metadata], dtype=np.float32)
+        self.edge_verified = np.array([m.verified for m in self._metadata], dtype=bool)
+    
+    @classmethod
+    def from_graph(cls, graph: DependencyGraph) -> 'CompactDependencyGraph':
+        """
+        Build a compact copy of a DependencyGraph.
+        
+        Args:
+            graph: The graph to copy
+            
+        Returns:
+            CompactDependencyGraph with the same nodes and edges
+        """
+        paths = list(graph)
+        path_ids = {path: i for i, path in enumerate(paths)}
+        
+        sources = []
+        targets = []
+        metadata = []
+        for edge in graph.edges():
+            sources.append(path_ids[edge.source])
+            targets.append(path_ids[edge.target])
+            metadata.append(edge.metadata)
+        
+        return cls(
+            paths=paths,
+            nodes=[graph.get_node(path) for path in paths],
+            sources=np.array(sources, dtype=np.int32),
+            targets=np.array(targets, dtype=np.int32),
+            metadata=metadata,
+            created_at=graph.created_at,
+            modified_at=graph.modified_at,
+            version=graph.version,
+            revision=getattr(graph, "revision", 0)
+        )
+    
+    def freeze(self) -> 'CompactDependencyGraph':
+        """Return the graph itself; it is already frozen."""
+        return self
+    
+    def to_graph(self) -> DependencyGraph:
+        """
+        Convert back to a mutable DependencyGraph.
+        
+        Returns:
+            DependencyGraph with the same nodes and edges
+        """
+        graph = DependencyGraph(version=self.version)
+        for node in self._nodes:
+            graph.add_node(node)
+        for edge in self.edges():
+            graph.add_edge(edge.source, edge.target, edge.metadata)
+        graph.created_at = self.created_at
+        return graph
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("CompactDependencyGraph is read-only; use to_graph() to get a mutable copy")
+    
+    add_node = _readonly
+    add_edge = _readonly
+    remove_node = _readonly
+    
+    # ------------------------------------------------------------------
+    # Id-level queries
+    # ------------------------------------------------------------------
+    
+    def ids_of(self, paths: Iterable[str]) -> np.ndarray:
+        """
+        Get the ids of the given paths, skipping unknown paths.
+        
+        Args:
+            paths: File paths
+            
+        Returns:
+            Array of path ids
+        """
+        path_ids = self.path_ids
+        return np.array([path_ids[p] for p in paths if p in path_ids], dtype=np.int64)
+    
+    def out_degrees(self) -> np.ndarray:
+        """Get the number of dependencies of every node, indexed by id."""
+        return np.diff(self.out_indptr)
+    
+    def in_degrees(self) -> np.ndarray:
+        """Get the number of dependents of every node, indexed by id."""
+        return np.diff(self.in_indptr)
+    
+    def _adjacency(self, reverse: bool) -> Tuple[np.ndarray, np.ndarray]:
+        if reverse:
+            return self.in_indptr, self.in_indices
+        return self.out_indptr, self.out_indices
+    
+    @staticmethod
+    def _expand(frontier: np.ndarray, indptr: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the neighbours of every frontier node.
+        
+        Returns:
+            Tuple of (neighbour ids, number of neighbours per frontier node)
+        """
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=indices.dtype), counts
+        
+        # Offset of each neighbour slot inside its row, shifted to the row start
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+        return indices[offsets], counts
+    
+    def reachable(self,
+                  sources: Iterable[int],
+                  reverse: bool = False,
+                  max_depth: Optional[int] = None,
+                  stop_at: Optional[int] = None) -> np.ndarray:
+        """
+        Compute the nodes reachable from a set of sources.
+        
+        Sources are only marked when they are reached again through a path of
+        length one or more (i.e. when they lie on a cycle).
+        
+        Args:
+            sources: Source ids
+            reverse: Follow edges backwards (dependents instead of dependencies)
+            max_depth: Maximum path length to follow
+            stop_at: Stop as soon as this id has been reached
+            
+        Returns:
+            Boolean visited bitmap indexed by id
+        """
+        indptr, indices = self._adjacency(reverse)
+        visited = np.zeros(len(self.paths), dtype=bool)
+        frontier = np.unique(np.fromiter(sources, dtype=np.int64))
+        depth = 0
+        
+        while frontier.size and (max_depth is None or depth < max_depth):
+            neighbours, _ = self._expand(frontier, indptr, indices)
+            neighbours = neighbours[~visited[neighbours]]
+            frontier = np.unique(neighbours)
+            visited[frontier] = True
+            depth += 1
+            
+            if stop_at is not None and visited[stop_at]:
+                break
+        
+        return visited
+    
+    def reachable_bitsets(self,
+                          sources: np.ndarray,
+                          reverse: bool = False,
+                          max_depth: Optional[int] = None) -> np.ndarray:
+        """
+        Propagate one reachability bit per source through the graph.
+        
+        Only newly gained bits are propagated, so every (node, source) pair is
+        expanded at most once. Bits advance one edge per step, so a bit first
+        arrives at a node after exactly its BFS distance from the source.
+        
+        Args:
+            sources: Up to ``BITSET_WIDTH`` source ids
+            reverse: Follow edges backwards (dependents instead of dependencies)
+            max_depth: Maximum path length to follow
+            
+        Returns:
+            uint64 array indexed by id; bit ``i`` is set when the node is
+            reachable from ``sources[i]`` through a path of length one or more
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        if len(sources) > self.BITSET_WIDTH:
+            raise ValueError(f"At most {self.BITSET_WIDTH} sources can be propagated at once")
+        
+        indptr, indices = self._adjacency(reverse)
+        reached = np.zeros(len(self.paths), dtype=np.uint64)
+        frontier = sources
+        pending = np.left_shift(np.uint64(1), np.arange(len(sources), dtype=np.uint64))
+        depth = 0
+        
+        while frontier.size and (max_depth is None or depth < max_depth):
+            depth += 1
+            neighbours, counts = self._expand(frontier, indptr, indices)
+            if not neighbours.size:
+                break
+            bits = np.repeat(pending, counts)
+            
+            # Merge the bits arriving at each neighbour
+            order = np.argsort(neighbours, kind='stable')
+            neighbours = neighbours[order]
+            bits = bits[order]
+            unique, first = np.unique(neighbours, return_index=True)
+            merged = np.bitwise_or.reduceat(bits, first)
+            
+            gained = merged & ~reached[unique]
+            keep = gained != 0
+            frontier = unique[keep].astype(np.int64)
+            pending = gained[keep]
+            reached[frontier] |= pending
+        
+        return reached
+    
+    def nearest_sources(self,
+                        sources: Iterable[int],
+                        reverse: bool = False,
+                        max_depth: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Label every node with its distance from the nearest source in one BFS.
+        
+        All sources start in the same frontier, so the traversal costs
+        O(V + E) however many sources there are. Ties between sources at the
+        same distance go to the lowest source id.
+        
+        Args:
+            sources: Source ids (distance 0)
+            reverse: Follow edges backwards (dependents instead of dependencies)
+            max_depth: Maximum path length to follow
+            
+        Returns:
+            Tuple of (distance, nearest source id) arrays indexed by id; both
+            are -1 for nodes that were not reached
+        """
+        indptr, indices = self._adjacency(reverse)
+        n = len(self.paths)
+        distance = np.full(n, -1, dtype=np.int64)
+        nearest = np.full(n, -1, dtype=np.int64)
+        
+        frontier = np.unique(np.fromiter(sources, dtype=np.int64))
+        distance[frontier] = 0
+        nearest[frontier] = frontier
+        depth = 0
+        
+        while frontier.size and (max_depth is None or depth < max_depth):
+            depth += 1
+            neighbours, counts = self._expand(frontier, indptr, indices)
+            labels = np.repeat(nearest[frontier], counts)
+            
+            unseen = distance[neighbours] < 0
+            neighbours = neighbours[unseen]
+            labels = labels[unseen]
+            if not neighbours.size:
+                break
+            
+            # Keep the lowest source label for each newly reached node
+            order = np.lexsort((labels, neighbours))
+            neighbours = neighbours[order]
+            labels = labels[order]
+            frontier, first = np.unique(neighbours, return_index=True)
+            distance[frontier] = depth
+            nearest[frontier] = labels[first]
+        
+        return distance, nearest
+    
+    def reach_counts(self, sources: Iterable[int], reverse: bool = False) -> np.ndarray:
+        """
+        Count the nodes reachable from each source.
+        
+        Args:
+            sources: Source ids
+            reverse: Count dependents instead of dependencies
+            
+        Returns:
+            Array with the number of reachable nodes for each source
+        """
+        sources = np.fromiter(sources, dtype=np.int64)
+        counts = np.zeros(len(sources), dtype=np.int64)
+        
+        for start in range(0, len(sources), self.BITSET_WIDTH):
+            batch = sources[start:start + self.BITSET_WIDTH]
+            reached = self.reachable_bitsets(batch, reverse=reverse)
+            # One column per source bit, independent of the platform byte order
+            octets = reached.astype('<u8').view(np.uint8).reshape(-1, 8)
+            bits = np.unpackbits(octets, axis=1, bitorder='little')
+            counts[start:start + len(batch)] = bits.sum(axis=0)[:len(batch)]
+        
+        return counts
+    
+    # ------------------------------------------------------------------
+    # DependencyGraph-compatible API
+    # ------------------------------------------------------------------
+    
+    def get_node(self, path: str) -> Optional[FileNode]:
+        """Get a node by path."""
+        node_id = self.path_ids.get(path)
+        return self._nodes[node_id] if node_id is not None else None
+    
+    def _edge_id(self, source_id: int, target_id: int) -> Optional[int]:
+        start, end = self.out_indptr[source_id], self.out_indptr[source_id + 1]
+        position = start + int(np.searchsorted(self.out_indices[start:end], target_id))
+        if position < end and self.out_indices[position] == target_id:
+            return int(position)
+        return None
+    
+    def get_edge(self, source: str, target: str) -> Optional[DependencyMetadata]:
+        """Get the metadata for an edge."""
+        if source not in self.path_ids or target not in self.path_ids:
+            return None
+        edge_id = self._edge_id(self.path_ids[source], self.path_ids[target])
+        return self._metadata[edge_id] if edge_id is not None else None
+    
+    def get_outgoing_edges(self, source: str) -> Dict[str, DependencyMetadata]:
+        """Get all outgoing edges from a node as a target -> metadata mapping."""
+        source_id = self.path_ids.get(source)
+        if source_id is None:
+            return {}
+        start, end = self.out_indptr[source_id], self.out_indptr[source_id + 1]
+        return {
+            self.paths[target_id]: self._metadata[start + i]
+            for i, target_id in enumerate(self.out_indices[start:end].tolist())
+        }
+    
+    def get_incoming_edges(self, target: str) -> Dict[str, DependencyMetadata]:
+        """Get all incoming edges to a node as a source -> metadata mapping."""
+        target_id = self.path_ids.get(target)
+        if target_id is None:
+            return {}
+        start, end = self.in_indptr[target_id], self.in_indptr[target_id + 1]
+        return {
+            self.paths[source_id]: self._metadata[edge_id]
+            for source_id, edge_id in zip(self.in_indices[start:end].tolist(),
+                                          self.in_edge_ids[start:end].tolist())
+        }
+    
+    def successors(self, path: str) -> Iterator[str]:
+        """Get an iterator over the successors of a node."""
+        node_id = self.path_ids.get(path)
+        if node_id is None:
+            return iter(())
+        ids = self.out_indices[self.out_indptr[node_id]:self.out_indptr[node_id + 1]]
+        return (self.paths[i] for i in ids.tolist())
+    
+    def predecessors(self, path: str) -> Iterator[str]:
+        """Get an iterator over the predecessors of a node."""
+        node_id = self.path_ids.get(path)
+        if node_id is None:
+            return iter(())
+        ids = self.in_indices[self.in_indptr[node_id]:self.in_indptr[node_id + 1]]
+        return (self.paths[i] for i in ids.tolist())
+    
+    def has_path(self, source: str, target: str, max_depth: int = 100) -> bool:
+        """Check if there is a path from source to target."""
+        if source not in self.path_ids or target not in self.path_ids:
+            return False
+        if source == target:
+            return True
+        
+        target_id = self.path_ids[target]
+        visited = self.reachable([self.path_ids[source]], max_depth=max_depth, stop_at=target_id)
+        return bool(visited[target_id])
+    
+    def find_cycles(self) -> List[List[str]]:
+        """
+        Find cycles in the graph.
+        
+        Uses the same depth-first search as DependencyGraph.find_cycles, run
+        iteratively so deep graphs do not hit the recursion limit.
+        
+        Returns:
+            List of cycles, where each cycle is a list of node paths
+        """
+        indptr = self.out_indptr.tolist()
+        indices = self.out_indices.tolist()
+        state = [0] * len(self.paths)  # 0 = unvisited, 1 = on the current path, 2 = done
+        cycles = []
+        
+        for root in range(len(self.paths)):
+            if state[root]:
+                continue
+            
+            state[root] = 1
+            path = [root]
+            position = {root: 0}
+            stack = [[root, indptr[root]]]
+            
+            while stack:
+                frame = stack[-1]
+                node, cursor = frame
+                if cursor < indptr[node + 1]:
+                    frame[1] += 1
+                    next_node = indices[cursor]
+                    if state[next_node] == 1:
+                        cycles.append([self.paths[i] for i in path[position[next_node]:]])
+                    elif state[next_node] == 0:
+                        state[next_node] = 1
+                        position[next_node] = len(path)
+                        path.append(next_node)
+                        stack.append([next_node, indptr[next_node]])
+                else:
+                    stack.pop()
+                    path.pop()
+                    del position[node]
+                    state[node] = 2
+        
+        return cycles
+    
+    def get_subgraph(self, paths: List[str]) -> DependencyGraph:
+        """Extract a mutable subgraph containing only the specified nodes."""
+        return self.to_graph().get_subgraph(paths)
+    
+    def transitive_dependencies(self, path: str) -> Set[str]:
+        """Get all transitive dependencies of a file."""
+        return self.dependencies_of([path])
+    
+    def transitive_dependents(self, path: str) -> Set[str]:
+        """Get all transitive dependents of a file."""
+        return self.dependents_of([path])
+    
+    def dependencies_of(self, paths: Iterable[str], max_depth: Optional[int] = None) -> Set[str]:
+        """
+        Get the union of the transitive dependencies of several files in one pass.
+        
+        Args:
+            paths: File paths
+            max_depth: Maximum path length to follow
+            
+        Returns:
+            Set of paths reachable from any of the files
+        """
+        visited = self.reachable(self.ids_of(paths), max_depth=max_depth)
+        return {self.paths[i] for i in np.flatnonzero(visited).tolist()}
+    
+    def dependents_of(self, paths: Iterable[str], max_depth: Optional[int] = None) -> Set[str]:
+        """
+        Get the union of the transitive dependents of several files in one pass.
+        
+        Args:
+            paths: File paths
+            max_depth: Maximum path length to follow
+            
+        Returns:
+            Set of paths that depend on any of the files
+        """
+        visited = self.reachable(self.ids_of(paths), reverse=True, max_depth=max_depth)
+        return {self.paths[i] for i in np.flatnonzero(visited).tolist()}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the graph to the DependencyGraph dictionary representation."""
+        return {
+            "version": self.version,
+            "nodes": {path: node.to_dict() for path, node in zip(self.paths, self._nodes)},
+            "edges": [
+                {"source": edge.source, "target": edge.target, "metadata": edge.metadata.to_dict()}
+                for edge in self.edges()
+            ],
+            "created_at": self.created_at,
+            "modified_at": self.modified_at
+        }
+    
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """Convert the graph to a JSON string."""
+        return json.dumps(self.to_dict(), indent=indent)
+    
+    def __len__(self) -> int:
+        """Get the number of nodes in the graph."""
+        return len(self.paths)
+    
+    def __contains__(self, path: str) -> bool:
+        """Check if a node exists in the graph."""
+        return path in self.path_ids
+    
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over node paths in the graph."""
+        return iter(self.paths)
+    
+    def nodes(self) -> Iterator[FileNode]:
+        """Iterate over nodes in the graph."""
+        return iter(self._nodes)
+    
+    def edges(self) -> Iterator[DependencyEdge]:
+        """Iterate over edges in the graph."""
+        paths = self.paths
+        for edge_id, (source_id, target_id) in enumerate(zip(self.edge_sources.tolist(),
+                                                              self.out_indices.tolist())):
+            yield DependencyEdge(paths[source_id], paths[target_id], self._metadata[edge_id])
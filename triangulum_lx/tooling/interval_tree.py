@@ -0,0 +1,155 @@
+"""
+Interval tree for line-range queries.
+
+Intervals are kept in a treap ordered by (start, key), where every node also
+stores the largest end in its subtree. Insertions and removals take
+O(log n) expected time; an overlap query takes O(log n + k) for k results.
+"""
+
+import random
+from typing import Any, Hashable, List, Optional, Tuple
+
+
+class _Node:
+    __slots__ = ("start", "end", "key", "value", "priority", "max_end", "left", "right")
+
+    def __init__(self, start: int, end: int, key: Hashable, value: Any, priority: float):
+        self.start = start
+        self.end = end
+        self.key = key
+        self.value = value
+        self.priority = priority
+        self.max_end = end
+        self.left: Optional['_Node'] = None
+        self.right: Optional['_Node'] = None
+
+    def update(self) -> None:
+        max_end = self.end
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+def _split(node: Optional[_Node], pivot: Tuple[int, Any]) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Split a treap into the nodes ordered before ``pivot`` and the rest."""
+    if node is None:
+        return None, None
+    if (node.start, node.key) < pivot:
+        left, right = _split(node.right, pivot)
+        node.right = left
+        node.update()
+        return node, right
+    left, right = _split(node.left, pivot)
+    node.left = right
+    node.update()
+    return left, node
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """Merge two treaps where every node of ``left`` is ordered before ``right``."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+class IntervalTree:
+    """
+    Closed integer intervals with a unique key each.
+
+    Keys must be comparable with each other; they break ties between
+    intervals that start on the same line.
+    """
+
+    def __init__(self):
+        self._root: Optional[_Node] = None
+        self._size = 0
+        self._random = random.Random()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, start: int, end: int, key: Hashable, value: Any = None) -> None:
+        """
+        Add an interval.
+
+        Args:
+            start: First line of the interval
+            end: Last line of the interval (inclusive)
+            key: Unique key of the interval
+            value: Value returned by queries
+        """
+        start, end = min(start, end), max(start, end)
+        left, right = _split(self._root, (start, key))
+        node = _Node(start, end, key, value, self._random.random())
+        self._root = _merge(_merge(left, node), right)
+        self._size += 1
+
+    def remove(self, start: int, end: int, key: Hashable) -> bool:
+        """
+        Remove an interval.
+
+        Args:
+            start: First line the interval was inserted with
+            end: Last line the interval was inserted with
+            key: Key of the interval
+
+        Returns:
+            True if the interval was found and removed
+        """
+        pivot = (min(start, end), key)
+        parents = []
+        node = self._root
+        while node is not None and (node.start, node.key) != pivot:
+            parents.append(node)
+            node = node.left if pivot < (node.start, node.key) else node.right
+        if node is None:
+            return False
+
+        replacement = _merge(node.left, node.right)
+        if not parents:
+            self._root = replacement
+        elif parents[-1].left is node:
+            parents[-1].left = replacement
+        else:
+            parents[-1].right = replacement
+        for parent in reversed(parents):
+            parent.update()
+        self._size -= 1
+        return True
+
+    def overlapping(self, start: int, end: int) -> List[Tuple[int, int, Any]]:
+        """
+        Find the intervals that share at least one line with [start, end].
+
+        Returns:
+            (start, end, value) of each interval, ordered by start and key
+        """
+        start, end = min(start, end), max(start, end)
+        results = []
+        stack = [(self._root, False)]
+        while stack:
+            node, visited = stack.pop()
+            if node is None:
+                continue
+            if visited:
+                if node.end >= start:
+                    results.append((node.start, node.end, node.value))
+                continue
+            if node.max_end < start:
+                continue
+            # In-order: left subtree, node, right subtree
+            if node.start <= end:
+                stack.append((node.right, False))
+                stack.append((node, True))
+            stack.append((node.left, False))
+        return results
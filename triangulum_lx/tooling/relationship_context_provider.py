@@ -8,7 +8,9 @@ for self-healing and debugging purposes.
 import os
 import json
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, FrozenSet, Iterable, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -19,18 +21,41 @@ class RelationshipContextProvider:
     This class serves as a bridge between the code relationship analyzer
     and the self-healing system, providing context about relationships
     for diagnostic and repair purposes.
+
+    Files are assigned stable integer indices and their neighbours (imports
+    and importers) are kept as index tuples. Neighbourhood queries are
+    answered from a bounded memo keyed by (file, depth); reloading
+    relationships only drops the memo entries that reach a changed file.
     """
 
-    def __init__(self, relationships_path: Optional[str] = None):
+    def __init__(self, relationships_path: Optional[str] = None, neighbourhood_cache_size: int = 4096):
         """
         Initialize the RelationshipContextProvider.
 
         Args:
             relationships_path: Path to the relationships JSON file (optional)
+            neighbourhood_cache_size: Maximum number of memoised neighbourhoods
         """
         self.relationships = {}
         self.dependency_graph = {}
         self.reverse_dependency_graph = {}
+        self.neighbourhood_cache_size = neighbourhood_cache_size
+
+        # Integer-indexed adjacency; indices are never reused
+        self._file_index: Dict[str, int] = {}
+        self._files: List[str] = []
+        self._neighbours: List[Tuple[int, ...]] = []
+        self._indexed_relationships = None
+
+        self._neighbourhoods: Dict[Tuple[int, int], FrozenSet[int]] = OrderedDict()
+        self._circular: Optional[List[Tuple[str, str]]] = None
+        self._circular_by_file: Dict[str, List[str]] = {}
+        self._lock = threading.RLock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0
+        }
         
         if relationships_path and os.path.exists(relationships_path):
             self.load_relationships_from_file(relationships_path)
@@ -100,17 +125,104 @@ class RelationshipContextProvider:
 
     def _build_dependency_graphs(self) -> None:
         """
-        Build dependency graphs from relationships.
-        """
-        self.dependency_graph = {}
-        self.reverse_dependency_graph = {}
-        
-        for file_path, info in self.relationships.items():
-            # Forward dependencies (what this file imports)
-            self.dependency_graph[file_path] = info.get("imports", [])
-            
-            # Reverse dependencies (what files import this file)
-            self.reverse_dependency_graph[file_path] = info.get("imported_by", [])
+        Build dependency graphs and the indexed adjacency from relationships.
+
+        Memoised neighbourhoods that contain a file whose neighbours changed
+        are dropped; all others stay valid.
+        """
+        with self._lock:
+            relationships = self.relationships
+            self.dependency_graph = {}
+            self.reverse_dependency_graph = {}
+
+            for file_path, info in relationships.items():
+                # Forward dependencies (what this file imports)
+                self.dependency_graph[file_path] = info.get("imports", [])
+
+                # Reverse dependencies (what files import this file)
+                self.reverse_dependency_graph[file_path] = info.get("imported_by", [])
+
+            changed: Set[int] = set()
+            seen: Set[int] = set()
+            for file_path, info in relationships.items():
+                index = self._index(file_path)
+                seen.add(index)
+                neighbours = tuple(sorted({
+                    self._index(other)
+                    for other in (*info.get("imports", []), *info.get("imported_by", []))
+                }))
+                if neighbours != self._neighbours[index]:
+                    self._neighbours[index] = neighbours
+                    changed.add(index)
+
+            # Files that are no longer described have no neighbours
+            for index, neighbours in enumerate(self._neighbours):
+                if neighbours and index not in seen:
+                    self._neighbours[index] = ()
+                    changed.add(index)
+
+            if changed:
+                self._invalidate(changed)
+            self._indexed_relationships = relationships
+
+    def _index(self, file_path: str) -> int:
+        index = self._file_index.get(file_path)
+        if index is None:
+            index = self._file_index[file_path] = len(self._files)
+            self._files.append(file_path)
+            self._neighbours.append(())
+        return index
+
+    def _invalidate(self, changed: Set[int]) -> None:
+        """Drop memoised results that may depend on the neighbours of changed files."""
+        # A neighbourhood can only change if it expands through a changed file
+        stale = [
+            key for key, result in self._neighbourhoods.items()
+            if key[0] in changed or not changed.isdisjoint(result)
+        ]
+        for key in stale:
+            del self._neighbourhoods[key]
+        self.stats["invalidations"] += len(stale)
+        self._circular = None
+        self._circular_by_file = {}
+
+    def _ensure_index(self) -> None:
+        """Rebuild the index if relationships were replaced without load_relationships."""
+        if self.relationships is not self._indexed_relationships:
+            self._build_dependency_graphs()
+
+    def _neighbourhood(self, index: int, depth: int) -> FrozenSet[int]:
+        """Get the indices of files within depth hops of a file, excluding itself."""
+        key = (index, depth)
+        with self._lock:
+            result = self._neighbourhoods.get(key)
+            if result is not None:
+                self._neighbourhoods.move_to_end(key)
+                self.stats["hits"] += 1
+                return result
+            self.stats["misses"] += 1
+
+            neighbours = self._neighbours
+            visited = {index}
+            frontier = [index]
+            for _ in range(depth):
+                next_frontier = []
+                for node in frontier:
+                    for neighbour in neighbours[node]:
+                        if neighbour not in visited:
+                            visited.add(neighbour)
+                            next_frontier.append(neighbour)
+                if not next_frontier:
+                    break
+                frontier = next_frontier
+            visited.discard(index)
+            result = frozenset(visited)
+
+            if self.neighbourhood_cache_size > 0:
+                self._neighbourhoods[key] = result
+                while len(self._neighbourhoods) > self.neighbourhood_cache_size:
+                    self._neighbourhoods.popitem(last=False)
+            return result
 
     def get_related_files(self, file_path: str, max_depth: int = 2) -> List[str]:
         """
@@ -123,32 +235,26 @@ class RelationshipContextProvider:
         Returns:
             List of related file paths
         """
+        self._ensure_index()
         if file_path not in self.relationships:
             return []
-        
-        # Start with direct dependencies
-        related_files = set(self.dependency_graph.get(file_path, []))
-        related_files.update(self.reverse_dependency_graph.get(file_path, []))
-        
-        # Add deeper dependencies if requested
-        if max_depth > 1:
-            for depth in range(1, max_depth):
-                new_related = set()
-                for related in related_files:
-                    new_related.update(self.dependency_graph.get(related, []))
-                    new_related.update(self.reverse_dependency_graph.get(related, []))
-                
-                # Remove files we've already considered
-                new_related.difference_update(related_files)
-                new_related.discard(file_path)
-                
-                # Add new related files
-                related_files.update(new_related)
-        
-        # Remove the original file if it somehow got included
-        related_files.discard(file_path)
-        
-        return list(related_files)
+
+        files = self._files
+        return sorted(files[i] for i in self._neighbourhood(self._file_index[file_path], max(1, max_depth)))
+
+    def get_related_files_batch(self, file_paths: Iterable[str], max_depth: int = 2) -> Dict[str, List[str]]:
+        """
+        Get files related to each of many files.
+
+        Args:
+            file_paths: Paths of the files
+            max_depth: Maximum depth of relationships to consider
+
+        Returns:
+            Dictionary mapping each file path to its related file paths
+        """
+        self._ensure_index()
+        return {file_path: self.get_related_files(file_path, max_depth) for file_path in file_paths}
 
     def get_circular_dependencies(self) -> List[Tuple[str, str]]:
         """
@@ -157,16 +263,35 @@ class RelationshipContextProvider:
         Returns:
             List of (file1, file2) tuples representing circular dependencies
         """
-        circular = []
-        
-        for file_path, dependencies in self.dependency_graph.items():
-            for dependency in dependencies:
-                if dependency in self.dependency_graph and file_path in self.dependency_graph[dependency]:
-                    # Ensure we only report each circular dependency once
-                    if (dependency, file_path) not in circular:
-                        circular.append((file_path, dependency))
-        
-        return circular
+        return list(self._circular_index()[0])
+
+    def _circular_index(self) -> Tuple[List[Tuple[str, str]], Dict[str, List[str]]]:
+        """Get the circular dependencies and the partners of each file in one."""
+        self._ensure_index()
+        with self._lock:
+            if self._circular is None:
+                circular = []
+                reported = set()
+                by_file: Dict[str, List[str]] = {}
+                dependency_sets = {
+                    file_path: set(dependencies)
+                    for file_path, dependencies in self.dependency_graph.items()
+                }
+
+                for file_path, dependencies in self.dependency_graph.items():
+                    for dependency in dependencies:
+                        if file_path in dependency_sets.get(dependency, ()):
+                            # Ensure we only report each circular dependency once
+                            if (dependency, file_path) not in reported:
+                                reported.add((file_path, dependency))
+                                circular.append((file_path, dependency))
+                                by_file.setdefault(file_path, []).append(dependency)
+                                if dependency != file_path:
+                                    by_file.setdefault(dependency, []).append(file_path)
+
+                self._circular = circular
+                self._circular_by_file = by_file
+            return self._circular, self._circular_by_file
 
     def get_most_dependent_files(self, limit: int = 10) -> List[Tuple[str, int]]:
         """
@@ -178,6 +303,8 @@ class RelationshipContextProvider:
         Returns:
             List of (file_path, count) tuples sorted by dependency count
         """
+        self._ensure_index()
+
         # Count the number of files that depend on each file
         dependents = {}
         for file_path, imported_by in self.reverse_dependency_graph.items():
@@ -259,15 +386,12 @@ class RelationshipContextProvider:
             })
         
         # Check for circular dependencies
-        circular = self.get_circular_dependencies()
-        for file1, file2 in circular:
-            if file1 == file_path or file2 == file_path:
-                other = file2 if file1 == file_path else file1
-                suggestions.append({
-                    "type": "resolve_circular_dependency",
-                    "reason": "Circular dependency",
-                    "description": f"Circular dependency between {os.path.basename(file_path)} and {os.path.basename(other)}, consider refactoring"
-                })
+        for other in self._circular_index()[1].get(file_path, []):
+            suggestions.append({
+                "type": "resolve_circular_dependency",
+                "reason": "Circular dependency",
+                "description": f"Circular dependency between {os.path.basename(file_path)} and {os.path.basename(other)}, consider refactoring"
+            })
         
         return suggestions
 
@@ -281,6 +405,7 @@ class RelationshipContextProvider:
         Returns:
             Dictionary containing impact analysis
         """
+        self._ensure_index()
         if file_path not in self.relationships:
             return {}
         
@@ -288,13 +413,14 @@ class RelationshipContextProvider:
         direct_dependents = self.reverse_dependency_graph.get(file_path, [])
         
         # Get all files that indirectly depend on this file
-        indirect_dependents = []
+        file_index = self._file_index
+        indirect = set()
         for direct in direct_dependents:
-            related = self.get_related_files(direct)
-            indirect_dependents.extend([r for r in related if r not in direct_dependents and r != file_path])
-        
-        # Remove duplicates
-        indirect_dependents = list(set(indirect_dependents))
+            if direct in self.relationships:
+                indirect.update(self._neighbourhood(file_index[direct], 2))
+        indirect.difference_update(file_index[direct] for direct in direct_dependents)
+        indirect.discard(file_index[file_path])
+        indirect_dependents = sorted(self._files[i] for i in indirect)
         
         # Calculate risk level based on number of dependents
         risk_level = "low"
@@ -28,6 +28,8 @@ from .test_runner import TestRunner
 from .patch_bundle import PatchBundle
 from .dependency_graph import DependencyGraph
 from .incremental_analyzer import IncrementalAnalyzer
+from .interval_tree import IntervalTree
+from .staged_commit import StagedCommit, recover_journals
 from ..core.rollback_manager import RollbackManager, SnapshotType
 
 logger = logging.getLogger(__name__)
@@ -142,27 +144,122 @@ class RepairPlan:
         """
         return {change.file_path for change in self.changes}
     
-    def conflicts_with(self, other: 'RepairPlan') -> List[Tuple[FileChange, FileChange, ConflictType]]:
+    def conflicts_with(self,
+                       other: 'RepairPlan',
+                       index: Optional['ChangeIndex'] = None) -> List[Tuple[FileChange, FileChange, ConflictType]]:
         """
         Check if this repair plan conflicts with another repair plan.
         
         Args:
             other: Another RepairPlan to check against
+            index: Maintained index that may contain the other plan's changes;
+                a temporary index is built if it does not
             
         Returns:
             List of tuples (change1, change2, conflict_type) for each conflict
         """
-        conflicts = []
+        if index is None or other.id not in index:
+            index = ChangeIndex()
+            index.add_plan(other)
+        plan_ids = {other.id}
         
+        conflicts = []
         for change1 in self.changes:
-            for change2 in other.changes:
-                conflict_type = change1.conflicts_with(change2)
-                if conflict_type != ConflictType.NONE:
-                    conflicts.append((change1, change2, conflict_type))
+            for _, _, change2, conflict_type in index.find_conflicts(change1, plan_ids):
+                conflicts.append((change1, change2, conflict_type))
         
         return conflicts
 
 
+class ChangeIndex:
+    """
+    Per-file interval index of the changes of repair plans.
+    
+    Lookups only compare a change against the indexed changes whose line
+    range overlaps or touches it, instead of against every change.
+    """
+    
+    def __init__(self):
+        """Initialize an empty index."""
+        self._trees: Dict[str, IntervalTree] = {}
+        self._plans: Dict[str, List[FileChange]] = {}
+    
+    def __contains__(self, plan_id: str) -> bool:
+        return plan_id in self._plans
+    
+    def __len__(self) -> int:
+        return len(self._plans)
+    
+    def add_plan(self, plan: RepairPlan) -> None:
+        """
+        Index the changes of a repair plan, replacing any previous entry.
+        
+        Args:
+            plan: The repair plan to index
+        """
+        self.remove_plan(plan.id)
+        changes = list(plan.changes)
+        self._plans[plan.id] = changes
+        for position, change in enumerate(changes):
+            tree = self._trees.get(change.file_path)
+            if tree is None:
+                tree = self._trees[change.file_path] = IntervalTree()
+            tree.insert(change.start_line, change.end_line, (plan.id, position), (plan.id, position, change))
+    
+    def remove_plan(self, plan_id: str) -> bool:
+        """
+        Remove the changes of a repair plan from the index.
+        
+        Args:
+            plan_id: ID of the repair plan
+            
+        Returns:
+            True if the plan was indexed
+        """
+        changes = self._plans.pop(plan_id, None)
+        if changes is None:
+            return False
+        for position, change in enumerate(changes):
+            tree = self._trees[change.file_path]
+            tree.remove(change.start_line, change.end_line, (plan_id, position))
+            if not tree:
+                del self._trees[change.file_path]
+        return True
+    
+    def find_conflicts(self, 
+                       change: FileChange,
+                       plan_ids: Optional[Set[str]] = None) -> List[Tuple[str, int, FileChange, ConflictType]]:
+        """
+        Find the indexed changes that conflict with a change.
+        
+        Args:
+            change: The change to check
+            plan_ids: Only report changes of these plans (all plans if None)
+            
+        Returns:
+            List of tuples (plan_id, position, other_change, conflict_type),
+            ordered by plan ID and position of the change within its plan
+        """
+        tree = self._trees.get(change.file_path)
+        if tree is None:
+            return []
+        
+        # Adjacent changes conflict too, so widen the range by one line
+        start = min(change.start_line, change.end_line) - 1
+        end = max(change.start_line, change.end_line) + 1
+        
+        conflicts = []
+        for _, _, (plan_id, position, other) in tree.overlapping(start, end):
+            if plan_ids is not None and plan_id not in plan_ids:
+                continue
+            conflict_type = change.conflicts_with(other)
+            if conflict_type != ConflictType.NONE:
+                conflicts.append((plan_id, position, other, conflict_type))
+        
+        conflicts.sort(key=lambda conflict: (conflict[0], conflict[1]))
+        return conflicts
+
+
 class RepairTool:
     """
     Enhanced repair tool for applying coordinated fixes across multiple files.
@@ -174,7 +271,8 @@ class RepairTool:
     def __init__(self, 
                  rollback_manager: Optional[RollbackManager] = None,
                  relationships_path: Optional[str] = None,
-                 dependency_graph: Optional[DependencyGraph] = None):
+                 dependency_graph: Optional[DependencyGraph] = None,
+                 journal_dir: Optional[str] = None):
         """
         Initialize the RepairTool.
         
@@ -182,6 +280,8 @@ class RepairTool:
             rollback_manager: RollbackManager for transaction management
             relationships_path: Path to the relationships JSON file
             dependency_graph: DependencyGraph for code dependencies
+            journal_dir: Directory for the write-out journal (defaults to a
+                directory in the rollback manager's storage)
         """
         # Initialize components
         self.rollback_manager = rollback_manager or RollbackManager()
@@ -194,12 +294,21 @@ class RepairTool:
         # Default relationships path if not provided
         self.relationships_path = relationships_path or "triangulum_relationships.json"
         
+        # Finish write-outs interrupted by a crash before accepting new repairs
+        self.journal_dir = journal_dir or os.path.join(self.rollback_manager.storage_dir, "repair_journal")
+        recovered = recover_journals(self.journal_dir)
+        if recovered:
+            logger.warning(f"Recovered {recovered} interrupted repair write-outs")
+        
         # Track repair plans
         self.repair_plans: Dict[str, RepairPlan] = {}
         self.active_repairs: Dict[str, str] = {}  # Maps repair ID to transaction ID
         self.completed_repairs: List[str] = []
         self.failed_repairs: List[str] = []
         
+        # Interval index of the changes of pending and in-progress repairs
+        self.change_index = ChangeIndex()
+        
         # Lock for thread safety
         self.lock = threading.RLock()
         
@@ -240,6 +349,7 @@ class RepairTool:
             
             # Add to repair plans
             self.repair_plans[repair_id] = repair_plan
+            self.change_index.add_plan(repair_plan)
             
             logger.info(f"Created repair plan {repair_id}: {name}")
             return repair_plan
@@ -275,7 +385,7 @@ class RepairTool:
             if not repair_plan or not other_repair_plan:
                 return []
             
-            return repair_plan.conflicts_with(other_repair_plan)
+            return repair_plan.conflicts_with(other_repair_plan, self.change_index)
     
     def resolve_conflicts(self, 
                          conflicts: List[Tuple[FileChange, FileChange, ConflictType]],
@@ -353,10 +463,11 @@ class RepairTool:
             return False, validation_messages
         
         # Check that changes don't conflict with each other
+        index = ChangeIndex()
+        index.add_plan(repair_plan)
         for i, change1 in enumerate(repair_plan.changes):
-            for j, change2 in enumerate(repair_plan.changes[i+1:], i+1):
-                conflict_type = change1.conflicts_with(change2)
-                if conflict_type != ConflictType.NONE:
+            for _, j, _, conflict_type in index.find_conflicts(change1):
+                if j > i:
                     validation_messages.append(
                         f"Conflict between changes {i} and {j}: {conflict_type.name}"
                     )
@@ -576,6 +687,7 @@ class RepairTool:
                     
                     # Track the transaction ID
                     self.active_repairs[repair_id] = transaction.id
+                    self.change_index.add_plan(repair_plan)
                     
                     # Take snapshots of all affected files
                     affected_files = repair_plan.get_affected_files()
@@ -584,116 +696,28 @@ class RepairTool:
                     impact_boundary = set(repair_plan.metadata.get("impact_boundary", []))
                     all_affected = affected_files.union(impact_boundary)
                     
-                    for file_path in all_affected:
-                        if os.path.exists(file_path):
-                            self.rollback_manager.add_file_snapshot(file_path)
+                    self.rollback_manager.add_file_snapshots(
+                        [file_path for file_path in all_affected if os.path.exists(file_path)]
+                    )
                     
                     # Apply changes in a specific order to minimize conflicts
                     ordered_changes = self._order_changes_for_application(repair_plan.changes)
                     
-                    # Apply changes
-                    applied_changes = []
-                    for change in ordered_changes:
-                        # Read the current file content
-                        try:
-                            with open(change.file_path, 'r', encoding='utf-8') as f:
-                                current_content = f.read()
-                        except Exception as e:
-                            raise Exception(f"Failed to read file {change.file_path}: {e}")
-                        
-                        # Apply the change
-                        if change.change_type == "replace":
-                            # Get the line range to replace
-                            lines = current_content.splitlines()
-                            
-                            # Ensure line numbers are valid
-                            if change.start_line < 1 or change.end_line > len(lines):
-                                raise Exception(
-                                    f"Invalid line range: {change.start_line}-{change.end_line} "
-                                    f"(file has {len(lines)} lines)"
-                                )
-                            
-                            # Replace the lines
-                            new_lines = lines.copy()
-                            new_lines[change.start_line-1:change.end_line] = change.new_content.splitlines()
-                            new_content = "\n".join(new_lines)
-                            
-                            # Write the new content
-                            with open(change.file_path, 'w', encoding='utf-8') as f:
-                                f.write(new_content)
-                            
-                            applied_changes.append({
-                                "file_path": change.file_path,
-                                "change_type": change.change_type,
-                                "start_line": change.start_line,
-                                "end_line": change.end_line,
-                                "success": True
-                            })
-                        
-                        elif change.change_type == "insert":
-                            # Get the line to insert after
-                            lines = current_content.splitlines()
-                            
-                            # Ensure line number is valid
-                            if change.start_line < 0 or change.start_line > len(lines):
-                                raise Exception(
-                                    f"Invalid line number: {change.start_line} "
-                                    f"(file has {len(lines)} lines)"
-                                )
-                            
-                            # Insert the lines
-                            new_lines = lines.copy()
-                            new_lines.insert(change.start_line, change.new_content)
-                            new_content = "\n".join(new_lines)
-                            
-                            # Write the new content
-                            with open(change.file_path, 'w', encoding='utf-8') as f:
-                                f.write(new_content)
-                            
-                            applied_changes.append({
-                                "file_path": change.file_path,
-                                "change_type": change.change_type,
-                                "start_line": change.start_line,
-                                "success": True
-                            })
-                        
-                        elif change.change_type == "delete":
-                            # Get the line range to delete
-                            lines = current_content.splitlines()
-                            
-                            # Ensure line numbers are valid
-                            if change.start_line < 1 or change.end_line > len(lines):
-                                raise Exception(
-                                    f"Invalid line range: {change.start_line}-{change.end_line} "
-                                    f"(file has {len(lines)} lines)"
-                                )
-                            
-                            # Delete the lines
-                            new_lines = lines.copy()
-                            del new_lines[change.start_line-1:change.end_line]
-                            new_content = "\n".join(new_lines)
-                            
-                            # Write the new content
-                            with open(change.file_path, 'w', encoding='utf-8') as f:
-                                f.write(new_content)
-                            
-                            applied_changes.append({
-                                "file_path": change.file_path,
-                                "change_type": change.change_type,
-                                "start_line": change.start_line,
-                                "end_line": change.end_line,
-                                "success": True
-                            })
+                    # Compute the new content of every file before touching any of them
+                    new_contents, applied_changes = self._render_changes(ordered_changes)
+                    
+                    # Write all files at once; a failure leaves every file unchanged
+                    staged_commit = StagedCommit(self.journal_dir, name=repair_id)
+                    for file_path, new_content in new_contents.items():
+                        staged_commit.stage(file_path, new_content)
+                    staged_commit.commit()
                     
                     # Update dependency graph with the changes
                     if hasattr(self, 'incremental_analyzer') and self.incremental_analyzer:
-                        updated_files = {}
-                        for file_path in affected_files:
-                            try:
-                                with open(file_path, 'r', encoding='utf-8') as f:
-                                    updated_files[file_path] = f.read()
-                            except Exception as e:
-                                logger.warning(f"Error reading updated file {file_path}: {e}")
+                        updated_files = {
+                            file_path: new_contents[file_path]
+                            for file_path in affected_files if file_path in new_contents
+                        }
                         
                         # Update the dependency graph incrementally
                         self.incremental_analyzer.analyze_changes(updated_files)
@@ -704,6 +728,7 @@ class RepairTool:
                     
                     # Remove from active repairs
                     del self.active_repairs[repair_id]
+                    self.change_index.remove_plan(repair_id)
                     
                     return {
                         "success": True,
@@ -721,8 +746,10 @@ class RepairTool:
                     # Remove from active repairs
                     if repair_id in self.active_repairs:
                         del self.active_repairs[repair_id]
+                    self.change_index.remove_plan(repair_id)
                     
-                    # The transaction will be rolled back automatically
+                    # Files are only written by the staged commit, which leaves
+                    # them all unchanged if it fails
                     logger.error(f"Error applying repair {repair_id}: {e}", exc_info=True)
                     
                     return {
@@ -743,23 +770,20 @@ class RepairTool:
         """
         conflicts = []
         
-        # Get all active repairs
-        for active_id, transaction_id in self.active_repairs.items():
-            active_plan = self.get_repair_plan(active_id)
-            if not active_plan:
-                continue
-            
-            # Check for conflicts
-            plan_conflicts = repair_plan.conflicts_with(active_plan)
-            if plan_conflicts:
-                for change1, change2, conflict_type in plan_conflicts:
-                    conflicts.append({
-                        "repair_id": active_id,
-                        "repair_name": active_plan.name,
-                        "file_path": change1.file_path,
-                        "conflict_type": conflict_type.name,
-                        "lines": f"{change1.start_line}-{change1.end_line}"
-                    })
+        active_ids = {active_id for active_id in self.active_repairs if active_id != repair_plan.id}
+        if not active_ids:
+            return conflicts
+        
+        # Look up each change in the interval index of active repairs
+        for change in repair_plan.changes:
+            for active_id, _, _, conflict_type in self.change_index.find_conflicts(change, active_ids):
+                conflicts.append({
+                    "repair_id": active_id,
+                    "repair_name": self.repair_plans[active_id].name,
+                    "file_path": change.file_path,
+                    "conflict_type": conflict_type.name,
+                    "lines": f"{change.start_line}-{change.end_line}"
+                })
         
         return conflicts
     
@@ -791,6 +815,80 @@ class RepairTool:
         
         return ordered_changes
     
+    def _render_changes(self, ordered_changes: List[FileChange]) -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
+        """
+        Compute the new content of the files touched by a list of changes.
+        
+        Each file is read once and its changes are applied in memory, in the
+        given order.
+        
+        Args:
+            ordered_changes: Changes in application order
+            
+        Returns:
+            Tuple of (new content per file in order of first change,
+            description of each applied change)
+            
+        Raises:
+            Exception: If a file cannot be read or a change has an invalid line range
+        """
+        new_contents: Dict[str, str] = {}
+        applied_changes = []
+        
+        for change in ordered_changes:
+            # Read the current file content
+            if change.file_path not in new_contents:
+                try:
+                    with open(change.file_path, 'r', encoding='utf-8') as f:
+                        new_contents[change.file_path] = f.read()
+                except Exception as e:
+                    raise Exception(f"Failed to read file {change.file_path}: {e}")
+            
+            lines = new_contents[change.file_path].splitlines()
+            applied = {
+                "file_path": change.file_path,
+                "change_type": change.change_type,
+                "start_line": change.start_line,
+                "end_line": change.end_line,
+                "success": True
+            }
+            
+            if change.change_type == "replace":
+                # Ensure line numbers are valid
+                if change.start_line < 1 or change.end_line > len(lines):
+                    raise Exception(
+                        f"Invalid line range: {change.start_line}-{change.end_line} "
+                        f"(file has {len(lines)} lines)"
+                    )
+                lines[change.start_line-1:change.end_line] = change.new_content.splitlines()
+            
+            elif change.change_type == "insert":
+                # Ensure line number is valid
+                if change.start_line < 0 or change.start_line > len(lines):
+                    raise Exception(
+                        f"Invalid line number: {change.start_line} "
+                        f"(file has {len(lines)} lines)"
+                    )
+                lines.insert(change.start_line, change.new_content)
+                del applied["end_line"]
+            
+            elif change.change_type == "delete":
+                # Ensure line numbers are valid
+                if change.start_line < 1 or change.end_line > len(lines):
+                    raise Exception(
+                        f"Invalid line range: {change.start_line}-{change.end_line} "
+                        f"(file has {len(lines)} lines)"
+                    )
+                del lines[change.start_line-1:change.end_line]
+            
+            else:
+                continue
+            
+            new_contents[change.file_path] = "\n".join(lines)
+            applied_changes.append(applied)
+        
+        return new_contents, applied_changes
+    
     def rollback_repair(self, repair_id: str) -> Dict[str, Any]:
         """
         Rollback a repair.
@@ -822,6 +920,7 @@ class RepairTool:
                     
                     # Remove from active repairs
                     del self.active_repairs[repair_id]
+                    self.change_index.remove_plan(repair_id)
                     
                     return {
                         "success": True,
@@ -0,0 +1,347 @@
+"""
+Shared cache of decoded source files and their syntax trees.
+
+Agents and analyzers that look at the same file during a run (bug detection,
+relationship analysis, dependency parsing, repair) get it from one
+process-wide SourceCache instead of each reading and parsing it again.
+Entries are keyed by (path, content hash), hold the decoded text, a line
+offset table and the parsed tree, and are evicted least recently used first
+once their estimated memory exceeds the budget.
+
+Parsed trees can additionally be pickled to a directory shared by worker
+processes, so each distinct file content is parsed only once per machine.
+Only point that directory at a location that no untrusted user can write
+to, since trees are loaded with pickle.
+
+Trees are shared between callers and must be treated as read-only; copy a
+tree (copy.deepcopy) before transforming it.
+"""
+
+import os
+import ast
+import sys
+import time
+import pickle
+import hashlib
+import logging
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Approximate memory of a parsed tree per character of source
+AST_BYTES_PER_CHAR = 28
+# Approximate memory of a list entry holding one line
+LINE_OVERHEAD = 80
+# A file modified this close to when it was read may change again without
+# its modification time changing, so its stat is not trusted
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def _text_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+class SourceFile:
+    """Decoded text of a file with a lazily built line table and syntax tree."""
+
+    def __init__(self, path: Optional[str], text: str, digest: str, cache: Optional['SourceCache'] = None):
+        """
+        Initialize the source file.
+
+        Args:
+            path: Path of the file, or None for text that is not from a file
+            text: Decoded content
+            digest: Hash of the content
+            cache: Cache that accounts for the memory of this entry
+        """
+        self.path = path
+        self.text = text
+        self.digest = digest
+        self._cache = cache
+        self._lines: Optional[List[str]] = None
+        self._line_offsets: Optional[List[int]] = None
+        self._tree: Optional[ast.Module] = None
+        self._error: Optional[SyntaxError] = None
+        self._lock = threading.Lock()
+
+    @property
+    def lines(self) -> List[str]:
+        """Lines of the text without line endings."""
+        if self._lines is None:
+            self._lines = self.text.splitlines()
+            self._grow(LINE_OVERHEAD * len(self._lines))
+        return self._lines
+
+    @property
+    def line_offsets(self) -> List[int]:
+        """Offset in the text at which each line starts (index 0 is line 1)."""
+        if self._line_offsets is None:
+            offsets = [0]
+            position = self.text.find("\n")
+            while position != -1:
+                offsets.append(position + 1)
+                position = self.text.find("\n", position + 1)
+            self._line_offsets = offsets
+            self._grow(LINE_OVERHEAD // 2 * len(offsets))
+        return self._line_offsets
+
+    def line(self, lineno: int) -> str:
+        """Get a line by its 1-based number, or an empty string if out of range."""
+        lines = self.lines
+        if 1 <= lineno <= len(lines):
+            return lines[lineno - 1]
+        return ""
+
+    def offset(self, lineno: int, col: int = 0) -> int:
+        """Convert a 1-based line number and column to an offset in the text."""
+        offsets = self.line_offsets
+        return offsets[min(max(lineno, 1), len(offsets)) - 1] + col
+
+    def lineno(self, offset: int) -> int:
+        """Convert an offset in the text to a 1-based line number."""
+        return bisect_right(self.line_offsets, offset)
+
+    @property
+    def tree(self) -> ast.Module:
+        """
+        Syntax tree of the text.
+
+        Raises:
+            SyntaxError: If the text is not valid Python
+        """
+        if self._tree is None and self._error is None:
+            with self._lock:
+                if self._tree is None and self._error is None:
+                    self._parse()
+        if self._error is not None:
+            raise self._error
+        return self._tree
+
+    def _parse(self) -> None:
+        cache = self._cache
+        tree = cache._load_tree(self.digest) if cache else None
+        if tree is None:
+            try:
+                tree = ast.parse(self.text, filename=self.path or "<unknown>")
+            except SyntaxError as e:
+                self._error = e
+                return
+            if cache:
+                cache._store_tree(self.digest, tree)
+        self._tree = tree
+        self._grow(AST_BYTES_PER_CHAR * len(self.text))
+
+    def _grow(self, size: int) -> None:
+        if self._cache is not None:
+            self._cache._grow(self, size)
+
+
+class SourceCache:
+    """Process-wide LRU cache of SourceFiles bounded by estimated memory."""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, disk_dir: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Maximum estimated memory of the cached entries
+            disk_dir: Optional directory for pickled syntax trees shared
+                between processes
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.total_bytes = 0
+        self._lock = threading.RLock()
+        self._entries: Dict[Tuple[Optional[str], str], SourceFile] = OrderedDict()
+        self._sizes: Dict[int, int] = {}
+        self._stats: Dict[Tuple[str, str], Tuple[int, int, int, str]] = {}  # (path, encoding) -> (mtime_ns, size, recorded_ns, digest)
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "disk_hits": 0
+        }
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def read(self, path: str, encoding: str = "utf-8") -> SourceFile:
+        """
+        Get a file, reading it only if it changed since it was cached.
+
+        Line endings are translated to "\\n" as when reading in text mode.
+
+        Args:
+            path: Path of the file
+            encoding: Text encoding of the file
+
+        Returns:
+            The cached file
+
+        Raises:
+            OSError: If the file cannot be read
+            UnicodeDecodeError: If the file cannot be decoded
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with self._lock:
+            known = self._stats.get((path, encoding))
+            if known and known[:2] == (stat.st_mtime_ns, stat.st_size) \
+                    and stat.st_mtime_ns + RACY_WINDOW_NS < known[2]:
+                source = self._lookup((path, known[3]))
+                if source is not None:
+                    return source
+
+        recorded_ns = time.time_ns()
+        with open(path, "rb") as f:
+            text = f.read().decode(encoding)
+        if "\r" in text:
+            # Same newline translation as reading in text mode
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+        # Keyed like source(), so callers holding the text share the entry
+        digest = _text_digest(text)
+        with self._lock:
+            self._stats[(path, encoding)] = (stat.st_mtime_ns, stat.st_size, recorded_ns, digest)
+            source = self._lookup((path, digest))
+            if source is not None:
+                return source
+            return self._insert(SourceFile(path, text, digest, self))
+
+    def source(self, text: str, path: Optional[str] = None) -> SourceFile:
+        """
+        Get the cached entry for text that the caller already holds.
+
+        Args:
+            text: Source text
+            path: Optional path the text belongs to
+
+        Returns:
+            The cached entry
+        """
+        digest = _text_digest(text)
+        if path is not None:
+            path = os.path.abspath(path)
+        with self._lock:
+            source = self._lookup((path, digest))
+            if source is not None:
+                return source
+            return self._insert(SourceFile(path, text, digest, self))
+
+    def parse(self, text: str, path: Optional[str] = None) -> ast.Module:
+        """
+        Get the syntax tree of source text.
+
+        Raises:
+            SyntaxError: If the text is not valid Python
+        """
+        return self.source(text, path).tree
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._stats.clear()
+            self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Tuple[Optional[str], str]) -> Optional[SourceFile]:
+        source = self._entries.get(key)
+        if source is None:
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return source
+
+    def _insert(self, source: SourceFile) -> SourceFile:
+        self._entries[(source.path, source.digest)] = source
+        self._sizes[id(source)] = 0
+        self._grow(source, sys.getsizeof(source.text))
+        return source
+
+    def _grow(self, source: SourceFile, size: int) -> None:
+        """Account for memory added to an entry and evict entries over the budget."""
+        with self._lock:
+            if id(source) not in self._sizes:
+                # Entry was already evicted
+                return
+            self._sizes[id(source)] += size
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= self._sizes.pop(id(evicted))
+                self.stats["evictions"] += 1
+
+    def _tree_path(self, digest: str) -> str:
+        version = f"{sys.version_info.major}{sys.version_info.minor}"
+        return os.path.join(self.disk_dir, f"{digest}-py{version}.ast")
+
+    def _load_tree(self, digest: str) -> Optional[ast.Module]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._tree_path(digest), "rb") as f:
+                tree = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable cached tree {digest}: {e}")
+            return None
+        self.stats["disk_hits"] += 1
+        return tree
+
+    def _store_tree(self, digest: str, tree: ast.Module) -> None:
+        if not self.disk_dir:
+            return
+        path = self._tree_path(digest)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                pickle.dump(tree, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.debug(f"Could not store tree {digest}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
+_source_cache: Optional[SourceCache] = None
+_source_cache_lock = threading.Lock()
+
+
+def get_source_cache() -> SourceCache:
+    """Get the process-wide source cache."""
+    global _source_cache
+    if _source_cache is None:
+        with _source_cache_lock:
+            if _source_cache is None:
+                _source_cache = SourceCache()
+    return _source_cache
+
+
+def configure_source_cache(max_bytes: int = 256 * 1024 * 1024, disk_dir: Optional[str] = None) -> SourceCache:
+    """
+    Replace the process-wide source cache.
+
+    Args:
+        max_bytes: Maximum estimated memory of the cached entries
+        disk_dir: Optional directory for pickled syntax trees shared
+            between processes
+
+    Returns:
+        The new cache
+    """
+    global _source_cache
+    with _source_cache_lock:
+        _source_cache = SourceCache(max_bytes, disk_dir)
+    return _source_cache
@@ -0,0 +1,253 @@
+"""
+Atomic multi-file write-out with crash recovery.
+
+StagedCommit writes the new content of every file to a temporary file in
+the same directory, syncs them all, records them in a journal and only then
+renames them over their targets with os.replace. Each target therefore
+holds either its old or its new content, never a partial write. If the
+process dies while renaming, recover_journals() finishes the renames from
+the journal, so a plan is never left half-applied on disk.
+"""
+
+import os
+import json
+import uuid
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TEMP_SUFFIX = ".triangulum-tmp"
+
+# Identifies this process in journals; a restarted process can reuse the PID
+# (routinely PID 1 in containers) but never the token
+_INSTANCE_TOKEN = uuid.uuid4().hex
+
+
+def _fsync_file(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(path: str) -> None:
+    """Persist the directory entries of ``path``; not supported on every platform."""
+    try:
+        fd = os.open(path or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _journal_owner_alive(journal: Dict) -> bool:
+    pid = journal.get("pid", -1)
+    if pid == os.getpid():
+        return journal.get("instance") == _INSTANCE_TOKEN
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _write_file(path: str, data: bytes, mode: Optional[int] = None) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+    if mode is not None:
+        os.chmod(path, mode)
+
+
+class StagedCommit:
+    """
+    A batch of file writes that is applied all at once.
+
+    Files are replaced in the order they were staged. If a replacement
+    fails, the files replaced so far are restored to their old content.
+    """
+
+    def __init__(self, journal_dir: str, name: Optional[str] = None):
+        """
+        Initialize the commit.
+
+        Args:
+            journal_dir: Directory for the crash recovery journal
+            name: Name recorded in the journal (e.g. the repair ID)
+        """
+        self.journal_dir = journal_dir
+        self.name = name
+        self.id = str(uuid.uuid4())
+        self.journal_path = os.path.join(journal_dir, f"{self.id}.json")
+        self._files: Dict[str, bytes] = {}
+
+    def stage(self, file_path: str, content: str, encoding: str = "utf-8") -> None:
+        """
+        Add the new content of a file to the batch.
+
+        Args:
+            file_path: Path of the file to write
+            content: New content of the file
+            encoding: Text encoding of the file
+        """
+        self._files[os.path.abspath(file_path)] = content.encode(encoding)
+
+    def _write_journal(self, state: str, entries: List[Dict[str, str]]) -> None:
+        """Atomically write the journal."""
+        os.makedirs(self.journal_dir, exist_ok=True)
+        temp_path = self.journal_path + TEMP_SUFFIX
+        data = {"id": self.id, "name": self.name, "pid": os.getpid(),
+                "instance": _INSTANCE_TOKEN, "state": state, "entries": entries}
+        _write_file(temp_path, json.dumps(data, indent=2).encode("utf-8"))
+        _fsync_file(temp_path)
+        os.replace(temp_path, self.journal_path)
+        _fsync_dir(self.journal_dir)
+
+    def _remove_journal(self) -> None:
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+
+    def commit(self) -> List[str]:
+        """
+        Write all staged files.
+
+        Returns:
+            Paths of the written files, in order
+
+        Raises:
+            OSError: If a file could not be written; no target is left
+                modified in that case
+        """
+        if not self._files:
+            return []
+
+        entries = [
+            {"target": target, "temp": os.path.join(os.path.dirname(target), f".{os.path.basename(target)}.{self.id[:8]}{TEMP_SUFFIX}")}
+            for target in self._files
+        ]
+        originals: Dict[str, Optional[bytes]] = {}
+
+        # Stage: write every temp file, then sync them as a batch
+        self._write_journal("staging", entries)
+        try:
+            for entry in entries:
+                target = entry["target"]
+                mode = None
+                if os.path.exists(target):
+                    with open(target, "rb") as f:
+                        originals[target] = f.read()
+                    mode = os.stat(target).st_mode & 0o7777
+                else:
+                    originals[target] = None
+                _write_file(entry["temp"], self._files[target], mode)
+            for entry in entries:
+                _fsync_file(entry["temp"])
+        except Exception:
+            self._discard(entries)
+            raise
+
+        # Commit: from here on, recovery rolls the batch forward
+        self._write_journal("committing", entries)
+        replaced = []
+        try:
+            for entry in entries:
+                os.replace(entry["temp"], entry["target"])
+                replaced.append(entry["target"])
+        except Exception as e:
+            logger.error(f"Staged commit {self.id} failed after {len(replaced)} files, restoring them: {e}")
+            self._restore(replaced, originals)
+            self._discard(entries)
+            raise
+
+        for directory in {os.path.dirname(entry["target"]) for entry in entries}:
+            _fsync_dir(directory)
+        self._remove_journal()
+        return replaced
+
+    def _discard(self, entries: List[Dict[str, str]]) -> None:
+        """Remove leftover temp files and the journal."""
+        for entry in entries:
+            try:
+                os.remove(entry["temp"])
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove temp file {entry['temp']}: {e}")
+        self._remove_journal()
+
+    def _restore(self, replaced: List[str], originals: Dict[str, Optional[bytes]]) -> None:
+        """Put back the old content of files that were already replaced."""
+        for target in replaced:
+            try:
+                if originals[target] is None:
+                    os.remove(target)
+                    continue
+                temp_path = target + TEMP_SUFFIX
+                _write_file(temp_path, originals[target], os.stat(target).st_mode & 0o7777)
+                _fsync_file(temp_path)
+                os.replace(temp_path, target)
+            except OSError as e:
+                logger.error(f"Could not restore {target}: {e}")
+
+
+def recover_journals(journal_dir: str) -> int:
+    """
+    Complete or discard staged commits interrupted by a crash.
+
+    Commits that were still staging are discarded; commits that had started
+    replacing files are rolled forward, since all their temp files were
+    synced before the first replacement. Journals of processes that are
+    still running are left alone.
+
+    Args:
+        journal_dir: Directory of the journals
+
+    Returns:
+        Number of journals recovered
+    """
+    if not os.path.isdir(journal_dir):
+        return 0
+
+    recovered = 0
+    for filename in sorted(os.listdir(journal_dir)):
+        path = os.path.join(journal_dir, filename)
+        if not filename.endswith(".json"):
+            continue
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                journal = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read journal {path}: {e}")
+            continue
+
+        if _journal_owner_alive(journal):
+            continue
+
+        roll_forward = journal.get("state") == "committing"
+        for entry in journal.get("entries", []):
+            if not os.path.exists(entry["temp"]):
+                continue
+            if roll_forward:
+                os.replace(entry["temp"], entry["target"])
+            else:
+                os.remove(entry["temp"])
+        os.remove(path)
+        recovered += 1
+        logger.warning(
+            f"Recovered staged commit {journal.get('id')} ({journal.get('name')}): "
+            f"{'rolled forward' if roll_forward else 'discarded'}"
+        )
+    return recovered
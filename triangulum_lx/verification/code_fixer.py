@@ -13,6 +13,8 @@ import difflib
 import logging
 from typing import Dict, List, Any, Optional, Union, Tuple
 
+from ..tooling.source_cache import get_source_cache
+
 logger = logging.getLogger(__name__)
 
 class CodeFixer:
@@ -173,7 +175,7 @@ class CodeFixer:
         }
         
         try:
-            tree = ast.parse(code)
+            tree = get_source_cache().parse(code)
             
             # Extract imports
             for node in ast.walk(tree):